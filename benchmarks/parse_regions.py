@@ -0,0 +1,109 @@
+"""
+エンドポイントごとの部分パースのベンチマーク
+
+各パース関数について、ページ全体をパースした場合と :data:`manaba.parsers.REGIONS` の領域だけをパースした場合の
+パース時間と最大メモリ使用量 (tracemalloc) を比較します。
+
+使い方:
+    python benchmarks/parse_regions.py [--fixtures DIR] [--number N] [--parser lxml --parser html.parser]
+
+Notes:
+    --fixtures には manaba/test_fixtures と同じファイル名で保存した実際の manaba のページを置いたディレクトリを指定できます。
+    html5lib は SoupStrainer に対応していないため、常にページ全体をパースします (比較の基準として表示します)。
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bs4.builder import builder_registry  # noqa: E402
+
+from manaba import parsers  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "manaba", "test_fixtures")
+
+ENDPOINTS: list[tuple[str, str]] = [
+    ("parse_login_form", "login.html"),
+    ("parse_course", "course_1001.html"),
+    ("parse_courses", "home_course.html"),
+    ("parse_querys", "course_1001_query.html"),
+    ("parse_query_details", "course_1001_query_2001.html"),
+    ("parse_drill_details", "course_1001_drill_2003.html"),
+    ("parse_surveys", "course_1001_survey.html"),
+    ("parse_survey_details", "course_1001_survey_2001.html"),
+    ("parse_reports", "course_1001_report.html"),
+    ("parse_report_details", "course_1001_report_2001.html"),
+    ("parse_threads", "course_1001_topics.html"),
+    ("parse_thread", "course_1001_topics_3001_tflat.html"),
+    ("parse_news_list", "course_1001_news.html"),
+    ("parse_news", "course_1001_news_4001.html"),
+    ("parse_contents", "course_1001_page.html"),
+    ("parse_content_pages", "page_abc123.html"),
+    ("parse_content_page", "page_abc123_5001.html"),
+]
+
+
+def measure(markup: str,
+            parser: str,
+            regions: Optional[tuple[str, ...]],
+            number: int) -> tuple[float, int]:
+    """
+    パース時間と最大メモリ使用量を計測する
+
+    Args:
+        markup: ページの HTML
+        parser: パーサーバックエンド
+        regions: パースする領域 (None の場合はページ全体)
+        number: 繰り返し回数
+
+    Returns:
+        tuple[float, int]: 1 回あたりのパース時間 (ミリ秒), 最大メモリ使用量 (バイト)
+    """
+    start = time.perf_counter()
+    for _ in range(number):
+        parsers.parse_html(markup, parser, regions)
+    elapsed = (time.perf_counter() - start) / number * 1000
+
+    tracemalloc.start()
+    parsers.parse_html(markup, parser, regions)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--fixtures", default=FIXTURES, help="ページを置いたディレクトリ")
+    argument_parser.add_argument("--number", type=int, default=50, help="繰り返し回数")
+    argument_parser.add_argument("--parser", action="append", help="比較するパーサーバックエンド (複数指定可)")
+    args = argument_parser.parse_args()
+
+    backends = [backend for backend in (args.parser or ["lxml", "html.parser"])
+                if builder_registry.lookup(backend) is not None]
+
+    print("%-22s %-12s %10s %10s %7s %10s %10s %7s" % (
+        "endpoint", "parser", "full ms", "region ms", "time", "full KiB", "region KiB", "memory"))
+    for name, filename in ENDPOINTS:
+        path = os.path.join(args.fixtures, filename)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            markup = f.read()
+
+        html5lib_time, html5lib_peak = measure(markup, "html5lib", None, args.number)
+        print("%-22s %-12s %10.3f %10s %7s %10.1f %10s %7s" % (
+            name, "html5lib", html5lib_time, "-", "-", html5lib_peak / 1024, "-", "-"))
+        for backend in backends:
+            full_time, full_peak = measure(markup, backend, None, args.number)
+            region_time, region_peak = measure(markup, backend, parsers.REGIONS[name], args.number)
+            print("%-22s %-12s %10.3f %10.3f %6.0f%% %10.1f %10.1f %6.0f%%" % (
+                name, backend, full_time, region_time, (region_time / full_time - 1) * 100,
+                full_peak / 1024, region_peak / 1024, (region_peak / full_peak - 1) * 100))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+エンドポイント・パーサー関数のベンチマーク
+
+Manaba の各 get_* エンドポイントと、パーサーの補助関数 (_parse_status, _parse_grade_bar, process_datetime,
+コース一覧の各表示形式のパーサー) について、データ量を変えたページで次の値を計測します。
+
+    wall_ms: 1 回あたりの実行時間 (エンドポイントは manaba 代替サーバーとの通信を含む)
+    parse_ms: 1 回あたりのパース時間 (HTTP 通信を含まない)
+    peak_kib: パース中の最大メモリ使用量 (tracemalloc)
+
+使い方:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --baseline results.json  (前回の結果と比較し、悪化した項目があれば終了コード 1)
+    python benchmarks/suite.py --baseline  (リポジトリの基準値 benchmarks/baseline.json と比較)
+
+基準値の更新:
+    benchmarks/baseline.json は、既定の --sizes・--parser・--number で計測した基準値で、リポジトリに含めて管理します。
+    性能が意図して変わる変更をした場合は、同じ変更の中で次のコマンドで作成しなおしてコミットしてください。
+
+        python benchmarks/suite.py --output benchmarks/baseline.json
+
+Notes:
+    ページは :class:`manaba.standin.ManabaStandInServer` で作成します。--sizes で small, medium, large を指定できます。
+    時間は --number 回のうち最も短いもの、最大メモリ使用量は 1 回目の値です。
+    時間はマシンに依存するため、基準値と異なる環境 (meta の platform・python・beautifulsoup4・parser) で比較すると警告を表示します。
+    別のマシンで悪化を調べる場合は、変更前のコミットで --output した結果を --baseline に指定してください。
+    CPU を共有する環境では時間の揺らぎが大きいため、--number を増やすか --threshold を大きくしてください。
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Union
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import bs4  # noqa: E402
+
+from manaba import Manaba, parsers  # noqa: E402
+from manaba.standin import ManabaStandInServer  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "manaba", "test_fixtures")
+
+# リポジトリに含めている基準値
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+SIZES: dict[str, dict[str, int]] = {
+    "small": {"courses": 10, "querys": 3, "surveys": 3, "reports": 3, "threads": 3, "comments": 20, "news": 20,
+              "contents": 2, "pages": 3},
+    "medium": {"courses": 100, "querys": 10, "surveys": 10, "reports": 10, "threads": 20, "comments": 1000,
+               "news": 200, "contents": 10, "pages": 20},
+    "large": {"courses": 500, "querys": 30, "surveys": 30, "reports": 30, "threads": 50, "comments": 10000,
+              "news": 2000, "contents": 20, "pages": 100},
+}
+
+Result = dict[str, float]
+
+Args = tuple[Union[int, str], ...]
+
+
+def endpoints(base_url: str,
+              size: dict[str, int]) -> list[tuple[str, Args, str, Callable[..., object], Args]]:
+    """
+    計測するエンドポイントの一覧
+
+    Returns:
+        list: (メソッド名, メソッドの引数, ページ名, パース関数, パース関数の引数)
+    """
+    drill_id = 2000 + size["querys"]
+    return [
+        ("get_courses", (), "home_course", parsers.parse_courses, ()),
+        ("get_courses_all", (), "home_course_all", parsers.parse_courses, ()),
+        ("get_course", (1001,), "course_1001", parsers.parse_course, (1001,)),
+        ("get_querys", (1001,), "course_1001_query", parsers.parse_querys, (1001,)),
+        ("get_query", (1001, 2001), "course_1001_query_2001", parsers.parse_query_details, (1001, 2001)),
+        ("get_drill", (1001, drill_id), "course_1001_drill_%d" % drill_id, parsers.parse_drill_details,
+         (1001, drill_id)),
+        ("get_surveys", (1001,), "course_1001_survey", parsers.parse_surveys, (1001,)),
+        ("get_survey", (1001, 2001), "course_1001_survey_2001", parsers.parse_survey_details, (1001, 2001)),
+        ("get_reports", (1001,), "course_1001_report", parsers.parse_reports, (1001,)),
+        ("get_report", (1001, 2001), "course_1001_report_2001", parsers.parse_report_details, (1001, 2001)),
+        ("get_threads", (1001,), "course_1001_topics", parsers.parse_threads, (1001,)),
+        ("get_thread", (1001, 3001), "course_1001_topics_3001_tflat", parsers.parse_thread,
+         (1001, 3001, base_url)),
+        ("get_news_list", (1001,), "course_1001_news", parsers.parse_news_list, (1001,)),
+        ("get_news", (1001, 4001), "course_1001_news_4001", parsers.parse_news, (1001, 4001, base_url)),
+        ("get_contents", (1001,), "course_1001_page", parsers.parse_contents, (1001,)),
+        ("get_content_pages", ("c1001n1",), "page_c1001n1", parsers.parse_content_pages, ("c1001n1",)),
+        ("get_content_page", ("c1001n1", 5001), "page_c1001n1_5001", parsers.parse_content_page,
+         ("c1001n1", 5001, base_url)),
+    ]
+
+
+def measure(function: Callable[[], object],
+            number: int,
+            inner: int = 1) -> tuple[float, float]:
+    """
+    実行時間と最大メモリ使用量を計測する
+
+    Args:
+        function: 計測する関数
+        number: 計測回数
+        inner: 1 回の計測で関数を呼び出す回数
+
+    Returns:
+        tuple[float, float]: 1 回あたりの実行時間 (ミリ秒, 最短), 最大メモリ使用量 (KiB)
+    """
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # timeit と同じく、計測中はガベージコレクションを止める
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(number):
+            start = time.perf_counter()
+            for _ in range(inner):
+                function()
+            best = min(best, (time.perf_counter() - start) / inner * 1000)
+    finally:
+        gc.enable()
+    return best, peak / 1024
+
+
+def bench_endpoints(size_name: str,
+                    backend: str,
+                    number: int) -> dict[str, Result]:
+    """
+    各 get_* エンドポイントを計測する
+    """
+    results: dict[str, Result] = {}
+    size = SIZES[size_name]
+    with ManabaStandInServer(**size) as server:
+        client = Manaba(server.base_url, backend)
+        client.login("benchmark", "benchmark")
+        for method, args, page, parse, parse_args in endpoints(server.base_url, size):
+            markup = server.render(page, {})
+            if markup is None:
+                raise ValueError("stand-in page is not found (" + page + ")")
+            wall_ms, _ = measure(lambda: getattr(client, method)(*args), number)
+            parse_ms, peak_kib = measure(lambda: parse(markup, *parse_args, backend), number)
+            results["%s[%s]" % (method, size_name)] = {"wall_ms": wall_ms, "parse_ms": parse_ms, "peak_kib": peak_kib}
+    return results
+
+
+def bench_helpers(size_name: str,
+                  backend: str,
+                  number: int) -> dict[str, Result]:
+    """
+    パーサーの補助関数を計測する
+    """
+    results: dict[str, Result] = {}
+    size = SIZES[size_name]
+    server = ManabaStandInServer(**size)
+    try:
+        for list_format, helper in (("thumbnail", parsers._get_courses_from_thumbnail),
+                                    ("list", parsers._get_courses_from_list)):
+            soup = parsers.parse_html(server.render("home_course", {"chglistformat": [list_format]}) or "", backend)
+            my_courses = soup.find("div", {"class": "mycourses-body"})
+            results["%s[%s]" % (helper.__name__, size_name)] = _helper_result(lambda: helper(my_courses), number)
+
+        soup = parsers.parse_html(server.render("home_course", {"chglistformat": ["timetable"]}) or "", backend)
+        my_courses = soup.find("div", {"class": "mycourses-body"})
+        course_list = soup.find("table", {"class": "courselist"})
+        results["_get_courses_from_timetable[%s]" % size_name] = _helper_result(
+            lambda: parsers._get_courses_from_timetable(my_courses, course_list), number)
+    finally:
+        server.server_close()
+
+    # 以下はデータ量によらないため、small の場合のみ計測する
+    if size_name == "small":
+        statuses = ["受付開始待ち", "受付中\n未提出", "受付中\n提出済み", "受付終了\n提出済み"]
+        results["_parse_status"] = _helper_result(lambda: [parsers._parse_status(status) for status in statuses],
+                                                  number, 1000)
+
+        with open(os.path.join(FIXTURES, "course_1001_query_2001.html"), encoding="utf-8") as f:
+            gradelist = parsers.parse_html(f.read(), backend).find("table", {"class": "gradelist"})
+        results["_parse_grade_bar"] = _helper_result(lambda: parsers._parse_grade_bar(gradelist), number, 1000)
+
+        datetimes = ["2021-04-12 09:00", "2021-04-19 23:59:59", "2021-04-19  23:59", ""]
+        results["process_datetime"] = _helper_result(
+            lambda: [parsers.process_datetime(value) for value in datetimes], number, 1000)
+    return results
+
+
+def _helper_result(function: Callable[[], object],
+                   number: int,
+                   inner: int = 10) -> Result:
+    elapsed, peak_kib = measure(function, number, inner)
+    return {"wall_ms": elapsed, "parse_ms": elapsed, "peak_kib": peak_kib}
+
+
+def compare(results: dict[str, Result],
+            baseline: dict[str, Result],
+            threshold: float) -> list[str]:
+    """
+    前回の結果と比較する
+
+    Args:
+        results: 今回の結果
+        baseline: 前回の結果
+        threshold: 悪化とみなす増加率 (0.25 の場合は 25% 以上の増加)
+
+    Returns:
+        list[str]: 悪化した項目 ("名前.指標" の一覧)
+    """
+    regressions = []
+    print("%-44s %-9s %12s %12s %8s" % ("benchmark", "metric", "baseline", "current", "change"))
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        for metric, value in results[name].items():
+            base = baseline[name].get(metric)
+            if base is None or base == 0:
+                continue
+            change = value / base - 1
+            mark = ""
+            if change > threshold:
+                regressions.append(name + "." + metric)
+                mark = " !"
+            print("%-44s %-9s %12.4f %12.4f %7.1f%%%s" % (name, metric, base, value, change * 100, mark))
+    return regressions
+
+
+def main() -> int:
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--sizes", default="small,medium", help="データ量 (small, medium, large をカンマ区切り)")
+    argument_parser.add_argument("--parser", default=parsers.DEFAULT_PARSER, help="パーサーバックエンド")
+    argument_parser.add_argument("--number", type=int, default=5, help="計測回数")
+    argument_parser.add_argument("--output", help="結果を保存する JSON ファイル")
+    argument_parser.add_argument("--baseline", nargs="?", const=BASELINE,
+                                 help="比較する前回の結果の JSON ファイル (ファイルを指定しない場合は benchmarks/baseline.json)")
+    argument_parser.add_argument("--threshold", type=float, default=0.25, help="悪化とみなす増加率")
+    args = argument_parser.parse_args()
+
+    results: dict[str, Result] = {}
+    for size_name in args.sizes.split(","):
+        if size_name not in SIZES:
+            argument_parser.error("unknown size (" + size_name + ")")
+        results.update(bench_endpoints(size_name, args.parser, args.number))
+        results.update(bench_helpers(size_name, args.parser, args.number))
+
+    report = {
+        "meta": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "beautifulsoup4": bs4.__version__,
+            "parser": args.parser,
+            "number": args.number,
+        },
+        "results": results,
+    }
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.baseline is None:
+        print("%-44s %10s %10s %10s" % ("benchmark", "wall ms", "parse ms", "peak KiB"))
+        for name in sorted(results):
+            print("%-44s %10.4f %10.4f %10.1f" % (name, results[name]["wall_ms"], results[name]["parse_ms"],
+                                                  results[name]["peak_kib"]))
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline_report = json.load(f)
+    baseline: dict[str, Result] = baseline_report["results"]
+    for key, value in report["meta"].items():
+        baseline_value = baseline_report.get("meta", {}).get(key)
+        if key != "number" and baseline_value != value:
+            print("warning: %s differs from the baseline (%s != %s)" % (key, value, baseline_value))
+    regressions = compare(results, baseline, args.threshold)
+    if len(regressions) != 0:
+        print("regressions: " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
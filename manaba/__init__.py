@@ -5,326 +5,696 @@ Library for get various information about manaba.
 manabaのさまざまな情報を取得するためのライブラリです。
 """
 import datetime
-import re
-from typing import Optional, Union
-from urllib.parse import parse_qs, urlencode, urljoin, urlparse
+import functools
+import json
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterator, Optional, TypeVar, Union, cast
+from urllib.parse import urlparse
 
-import bs4.element
 import requests
-from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
 from requests import Response
+from requests.adapters import BaseAdapter, HTTPAdapter
 
-from manaba.models.ManabaAnswerViewType import get_answer_view_type
 from manaba.models.ManabaContent import ManabaContent
 from manaba.models.ManabaContentPage import ManabaContentPage
 from manaba.models.ManabaCourse import ManabaCourse
 from manaba.models.ManabaCourseLamps import ManabaCourseLamps
 from manaba.models.ManabaCourseNews import ManabaCourseNews
+from manaba.models.ManabaDownloadResult import ManabaDownloadResult
+from manaba.models.ManabaDownloadStatus import ManabaDownloadStatus
 from manaba.models.ManabaDrillDetails import ManabaDrillDetails
 from manaba.models.ManabaFile import ManabaFile
 from manaba.models.ManabaGradePosition import ManabaGradePosition
-from manaba.models.ManabaPortfolioType import get_portfolio_type
+from manaba.models.ManabaModel import ManabaModel
 from manaba.models.ManabaQuery import ManabaQuery
 from manaba.models.ManabaQueryDetails import ManabaQueryDetails
 from manaba.models.ManabaReport import ManabaReport
 from manaba.models.ManabaReportDetails import ManabaReportDetails
-from manaba.models.ManabaResultViewType import get_result_view_type
-from manaba.models.ManabaStudentReSubmitType import get_student_resubmit_type
 from manaba.models.ManabaSurvey import ManabaSurvey
 from manaba.models.ManabaSurveyDetails import ManabaSurveyDetails
 from manaba.models.ManabaTaskStatus import ManabaTaskStatus
-from manaba.models.ManabaTaskStatusFlag import ManabaTaskStatusFlag, get_task_status
-from manaba.models.ManabaTaskYourStatusFlag import ManabaTaskYourStatusFlag, get_your_status
 from manaba.models.ManabaThread import ManabaThread
 from manaba.models.ManabaThreadComment import ManabaThreadComment
+from manaba.models.ManabaCourseSnapshot import ManabaCourseSnapshot
+from manaba.models.ManabaSnapshotError import ManabaSnapshotError
+from manaba.models.ManabaThreadUpdate import ManabaThreadUpdate
+from manaba.models.ManabaSyncResult import ManabaSyncResult
+from manaba.models.ManabaFetchEvent import ManabaFetchEvent
+from manaba.models.ManabaTrace import ManabaTrace
+from manaba.models.ManabaPollTarget import ManabaPollTarget
+from manaba import parsers, urls
+from manaba.cache import ManabaCache
+from manaba.exceptions import ManabaContentDisabled, ManabaInternalError, ManabaNotFound, ManabaNotLoggedIn
+from manaba.parsers import DEFAULT_PARSER, JST
+from manaba.concurrency import ManabaConcurrencyGovernor
+from manaba.ratelimit import ManabaRateLimiter
+from manaba.retry import ManabaRetryPolicy
+from manaba.store import ManabaStore, StoreKey, fingerprint
+from manaba.trace import ManabaTraceBuffer
+
+T = TypeVar("T")
+
+ManabaFetchObserver = Callable[[ManabaFetchEvent], None]
+
+# snapshot_course() で取得できる情報の種類
+SNAPSHOT_KINDS: tuple[str, ...] = ("course", "querys", "surveys", "reports", "threads", "news_list", "contents")
+
+# poll() で取得する一覧の種類
+POLL_KINDS: tuple[str, ...] = ("querys", "surveys", "reports", "threads", "news_list")
+
+# コース一覧ページのステータスランプと、ランプが点いている場合に取得する一覧の種類の対応
+# (小テスト・アンケート・レポートの締め切りはデッドラインランプ、採点結果の公開はグラッドランプに表示される。個人ランプに対応する一覧はない)
+LAMP_POLL_KINDS: dict[str, tuple[str, ...]] = {
+    "news": ("news_list",),
+    "deadline": ("querys", "surveys", "reports"),
+    "grad": ("querys", "reports"),
+    "thread": ("threads",),
+    "individual": (),
+}
+
+_SnapshotTask = Callable[[], "tuple[list[_SnapshotTask], Optional[ManabaSnapshotError]]"]
+
+
+def _snapshot_task(kind: str,
+                   item_id: Optional[Union[int, str]],
+                   fetch: Callable[[], T],
+                   on_result: Callable[[T], list[_SnapshotTask]]) -> _SnapshotTask:
+    """
+    スナップショットの 1 項目を取得するタスクを作成する
+
+    Args:
+        kind: 項目の種類
+        item_id: 項目の ID (一覧ページの場合は None)
+        fetch: 項目を取得する関数
+        on_result: 取得結果を受け取り、続けて実行するタスクを返す関数
+
+    Returns:
+        _SnapshotTask: 続けて実行するタスクと、発生したエラーを返すタスク
+    """
 
-JST = datetime.timezone(datetime.timedelta(hours=+9), 'JST')
+    def run() -> tuple[list[_SnapshotTask], Optional[ManabaSnapshotError]]:
+        try:
+            result = fetch()
+        except Exception as e:
+            return [], ManabaSnapshotError(kind, item_id, e)
+        return on_result(result), None
+
+    return run
 
 
 class Manaba:
     """
     manaba 基本ライブラリ
+
+    Notes:
+        1 つのインスタンスを複数のスレッドから同時に使用できます。ログインは 1 回で、すべてのスレッドで同じセッションを使用します。
+        同時に使用するスレッド数を pool_size に指定すると、その数の接続を保持するコネクションプールを使用します。
+        ログイン・セッション切れ時の再ログインはスレッド間で排他し、複数のスレッドが同時にセッション切れを検出した場合も再ログインは 1 回のみ行います。
     """
 
     def __init__(self,
-                 base_url: str) -> None:
+                 base_url: str,
+                 parser: str = DEFAULT_PARSER,
+                 cache: Optional[ManabaCache] = None,
+                 retry: Optional[ManabaRetryPolicy] = None,
+                 parse_executor: Optional[Executor] = None,
+                 transport: Optional[BaseAdapter] = None,
+                 observers: Optional[list[ManabaFetchObserver]] = None,
+                 trace: Optional[ManabaTraceBuffer] = None,
+                 pool_size: Optional[int] = None,
+                 rate_limiter: Optional[ManabaRateLimiter] = None,
+                 governor: Optional[ManabaConcurrencyGovernor] = None,
+                 single_flight: bool = True,
+                 keep_latest_response: bool = False) -> None:
+        """
+        manaba 基本ライブラリ
+
+        Args:
+            base_url: manaba のベース URL
+            parser: HTML のパースに使用する BeautifulSoup のパーサーバックエンド (html5lib, lxml, html.parser)
+            cache: ページキャッシュ (指定しない場合はキャッシュしない)
+            retry: リトライポリシー (指定しない場合は再試行しない)
+            parse_executor: ページのパースを実行する executor (指定しない場合は呼び出したスレッドでパースする)
+            transport: manaba への通信に使用する transport (記録・再生を行う :class:`manaba.cassette.ManabaCassette` など、指定しない場合は requests の既定)
+            observers: ページを取得するたびに :class:`ManabaFetchEvent` を渡して呼び出す関数 (集計には :class:`manaba.metrics.ManabaMetrics` を使用できます)
+            trace: リクエストを記録するリングバッファー (指定しない場合は、本文を保持せずに直近 100 件を記録する)
+            pool_size: このインスタンスを同時に使用するスレッド数 (ホストごとのコネクションプールの接続数、指定しない場合は requests の既定の 10)
+            rate_limiter: リクエストを制限するレートリミッター (複数の Manaba・プロセスで共有できます、指定しない場合は制限しない)
+            governor: 同時に送信するリクエスト数を応答時間とエラーから調整する (複数の Manaba で共有できます、指定しない場合はスレッド数のみで決まる)
+            single_flight: 複数のスレッドが同時に同じページを取得する場合に、リクエスト・パースを 1 回にまとめるか
+            keep_latest_response: get_latest_response() のために、スレッドごとに最後のレスポンス (本文を含む) を保持するか (非推奨)
+
+        Raises:
+            ValueError: 指定したパーサーバックエンドが利用できない場合、pool_size が 1 未満の場合
+        """
+        if builder_registry.lookup(parser) is None:
+            raise ValueError("parser backend is not available (" + parser + ")")
+        if pool_size is not None and pool_size < 1:
+            raise ValueError("pool_size must be 1 or more")
+
         self.session: requests.Session = requests.Session()
+        if pool_size is not None:
+            # プールの接続がすべて使用中の場合は、接続を使い捨てずに空くまで待つ
+            adapter = HTTPAdapter(pool_maxsize=pool_size, pool_block=True)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        if transport is not None:
+            base = urlparse(base_url)
+            self.session.mount(base.scheme + "://" + base.netloc + "/", transport)
         self.__base_url: str = base_url
+        self.__parser: str = parser
+        self.__cache: Optional[ManabaCache] = cache
+        self.__retry: Optional[ManabaRetryPolicy] = retry
+        self.__parse_executor: Optional[Executor] = parse_executor
+        self.__observers: list[ManabaFetchObserver] = list(observers or [])
+        self.__rate_limiter: Optional[ManabaRateLimiter] = rate_limiter
+        self.__governor: Optional[ManabaConcurrencyGovernor] = governor
+        self.__single_flight: bool = single_flight
+        self.__in_flight: dict[tuple[str, str, str], Future[object]] = {}
+        self.__in_flight_lock = threading.Lock()
+        self.__account: Optional[str] = None
+        self.__credentials: Optional[tuple[str, str]] = None
         self.__logged_in: bool = False
-        self.__response: Optional[Response] = None
-
-    def login(self,
-              username: str,
-              password: str) -> bool:
+        self.__login_lock = threading.RLock()
+        self.__login_generation: int = 0
+        self.__trace: ManabaTraceBuffer = trace if trace is not None else ManabaTraceBuffer()
+        self.__keep_latest_response: bool = keep_latest_response
+        self.__latest = threading.local()
+
+    @property
+    def parser(self) -> str:
         """
-        manaba にログインする
-
-        Args:
-            username: manaba ユーザー名
-            password: manaba パスワード
+        HTML のパースに使用するパーサーバックエンド
 
         Returns:
-            bool: ログインできたか
+            str: パーサーバックエンド名
         """
-        self.__response = self.session.get(urljoin(self.__base_url, "/ct/login"))
-        if self.__response.status_code != 200:
-            return False
-        soup = BeautifulSoup(self.__response.text, "html5lib")
+        return self.__parser
 
-        login_form_box = soup.find("div", {"id": "login-form-box"})
-        session_value1 = login_form_box.find("input", {"name": "SessionValue1"}).get("value")
-        session_value = login_form_box.find("input", {"name": "SessionValue"}).get("value")
-        login_value = login_form_box.find("input", {"name": "login"}).get("value")
+    @property
+    def cache(self) -> Optional[ManabaCache]:
+        """
+        ページキャッシュ
 
-        self.__response = self.session.post(urljoin(self.__base_url, "/ct/login"), params={
-            "userid": username,
-            "password": password,
-            "login": login_value,
-            "manaba-form": "1",
-            "sessionValue1": session_value1,
-            "sessionValue": session_value
-        })
+        Returns:
+            Optional[ManabaCache]: ページキャッシュ (キャッシュしない場合は None)
+        """
+        return self.__cache
 
-        self.__logged_in = len(self.__response.history) == 1 and self.__response.history[0].status_code == 302
+    @property
+    def trace(self) -> ManabaTraceBuffer:
+        """
+        リクエストを記録するリングバッファー
 
-        return self.__logged_in
+        Returns:
+            ManabaTraceBuffer: リングバッファー (:func:`manaba.trace.ManabaTraceBuffer.query` で検索できます)
+        """
+        return self.__trace
 
-    def get_course(self,
-                   course_id: int) -> ManabaCourse:
+    def add_observer(self,
+                     observer: ManabaFetchObserver) -> None:
         """
-        指定したコース ID のコース情報(ManabaCourse)を取得します。
+        ページ取得イベントを受け取る関数を追加する
 
         Args:
-            course_id: 取得するコースのコース ID
+            observer: ページを取得するたびに :class:`ManabaFetchEvent` を渡して呼び出す関数
 
-        Returns:
-            ManabaCourse: 取得するコースのコース ID
+        Notes:
+            get_* (iter_news などから呼び出すものを含む) でページを取得するたびに、成功・失敗にかかわらず呼び出します。
+            stream_thread, download_files と、single_flight で他のスレッドの取得結果を待った場合は対象外です。
+            observer は get_* を呼び出したスレッドで同期的に呼び出されるため、時間のかかる処理は行わないでください。
         """
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
+        self.__observers.append(observer)
 
-        self.__response = self.session.get(urljoin(self.__base_url, "/ct/course_" + str(course_id)))
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
+    def _request(self,
+                 method: str,
+                 url: str,
+                 **kwargs: object) -> Response:
+        """
+        リクエストを送信し、リングバッファーに記録する
 
-        if soup.find("a", {"id": "coursename"}).has_attr("title"):
-            title = soup.find("a", {"id": "coursename"}).get("title")
-        else:
-            title = soup.find("a", {"id": "coursename"}).text
-        teacher = soup.find("span", {"class": "courseteacher"}).text
-        lecture_at = soup.find("span", {"class": "coursedata-info"}).find("span").text
-        year = int(soup.find("span", {"class": "coursedata-info"}).text.replace(lecture_at, ""))
+        Args:
+            method: リクエストメソッド
+            url: リクエストの URL
+            **kwargs: requests.Session.request に渡す引数
 
-        return ManabaCourse(title, course_id, year, lecture_at, teacher, None)
+        Returns:
+            Response: レスポンス
 
-    def get_courses(self) -> list[ManabaCourse]:
+        Notes:
+            rate_limiter, governor が設定されている場合は、この順にリクエストを送信できるまで待ちます (待った時間はトレースの所要時間に含みません)。
+            governor には、応答時間と失敗 (5xx・429 のレスポンス、接続エラー・タイムアウト) を記録します。
         """
-        参加しているコース情報を取得する
+        # レートリミッターで待っているリクエストを送信中として数えないよう、トークンを取得してから governor の空きを待つ
+        if self.__rate_limiter is not None:
+            self.__rate_limiter.acquire(urlparse(url).hostname or "")
+        governor = self.__governor
+        ticket = governor.acquire() if governor is not None else None
+        elapsed = 0.0
+        failed = False
+        try:
+            started = time.time()
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)  # type: ignore[arg-type]
+            except Exception as e:
+                elapsed = time.perf_counter() - start
+                failed = isinstance(e, (requests.ConnectionError, requests.Timeout))
+                self.__latest.trace = self.__trace.record(method, url, started, elapsed, error=e)
+                raise
+            elapsed = time.perf_counter() - start
+            failed = response.status_code >= 500 or response.status_code == 429
+        finally:
+            if governor is not None and ticket is not None:
+                governor.release(ticket, elapsed, failed)
+        self.__latest.trace = self.__trace.record(method, url, started, elapsed, response,
+                                                  stream=kwargs.get("stream") is True)
+        if self.__keep_latest_response:
+            self.__latest.response = response
+        return response
+
+    def _get(self,
+             url: str,
+             headers: Optional[dict[str, str]] = None,
+             stream: bool = False,
+             method: str = "GET") -> Response:
+        """
+        ページを取得する
+
+        Args:
+            url: 取得するページの URL
+            headers: 追加するリクエストヘッダー
+            stream: レスポンス本文を読み込まずに返すか (ファイルのダウンロードに使用)
+            method: リクエストメソッド (ファイルの更新の確認には HEAD を使用)
 
         Returns:
-            list[ManabaCourse]: 参加しているコース情報
+            Response: レスポンス
+
+        Raises:
+            ManabaNotLoggedIn: ログインしていない場合 (セッションが切れていて、再ログインできなかった場合を含む)
+            ManabaNotFound: ページが見つからない (404, 403) 場合
 
         Notes:
-            詳細情報は :func:`manaba.Manaba.get_course` で取得できます。
+            リトライポリシーが設定されている場合は、一時的なエラーの再試行・セッション切れ時の再ログインを行います。
         """
         if not self.__logged_in:
             raise ManabaNotLoggedIn()
 
-        self.__response = self.session.get(urljoin(self.__base_url, "/ct/home_course"))
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
+        retry = self.__retry
+        attempt = 0
+        relogged_in = False
+        while True:
+            generation = self.__login_generation
+            try:
+                response = self._request(method, url, headers=headers, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if retry is None or attempt >= retry.max_retries:
+                    raise
+                time.sleep(retry.delay(attempt))
+                attempt += 1
+                continue
 
-        if soup.find("ul", {"class": "infolist-tab"}) is None:
-            raise ManabaInternalError()
+            if self._is_login_response(response, stream):
+                response.close()
+                if retry is not None and retry.relogin and not relogged_in:
+                    relogged_in = True
+                    if self._relogin(generation):
+                        continue
+                self._expire_session(generation)
+                raise ManabaNotLoggedIn()
+
+            if retry is not None and response.status_code in retry.statuses and attempt < retry.max_retries:
+                response.close()
+                time.sleep(retry.delay(attempt, response))
+                attempt += 1
+                continue
+            break
 
-        correct_list_format_href: str = soup \
-            .find("ul", {"class": "infolist-tab"}) \
-            .find("li", {"class": "current"}) \
-            .find("a") \
-            .get("href")
-        correct_list_format = parse_qs(urlparse(correct_list_format_href).query)["chglistformat"][0]
+        if response.status_code == 404 or response.status_code == 403:
+            raise ManabaNotFound()
+        response.raise_for_status()
+        return response
 
-        my_courses = soup.find("div", {"class": "mycourses-body"})
+    def _relogin(self,
+                 generation: int) -> bool:
+        """
+        セッション切れを検出した場合に再ログインする
 
-        if correct_list_format == "thumbnail":
-            return self._get_courses_from_thumbnail(my_courses)
-        if correct_list_format == "list":
-            return self._get_courses_from_list(my_courses)
-        if correct_list_format == "timetable":
-            return self._get_courses_from_timetable(my_courses, soup.find("table", {"class": "courselist"}))
+        Args:
+            generation: セッション切れを検出したリクエストを送信した時点のログイン回数
 
-        return []
+        Returns:
+            bool: ログインしている状態になったか
 
-    def get_courses_all(self) -> list[ManabaCourse]:
+        Notes:
+            他のスレッドが既に再ログインしている (ログイン回数が変わっている) 場合は、再ログインせずにその結果を返します。
         """
-        参加しているすべてのコース情報を取得する
+        with self.__login_lock:
+            if self.__login_generation != generation:
+                return self.__logged_in
+            if self.__credentials is None:
+                return False
+            return self.login(*self.__credentials)
+
+    def _expire_session(self,
+                        generation: int) -> None:
+        """
+        セッション切れを検出した場合に、ログインしていない状態にする
 
-        Returns:
-            list[ManabaCourse]: 参加しているすべてのコース情報
+        Args:
+            generation: セッション切れを検出したリクエストを送信した時点のログイン回数
 
         Notes:
-            詳細情報は :func:`manaba.Manaba.get_course` で取得できます。
+            他のスレッドが既にログインし直している場合は、その状態を維持します。
         """
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
-
-        self.__response = self.session.get(urljoin(self.__base_url, "/ct/home_course_all"))
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
+        with self.__login_lock:
+            if self.__login_generation == generation:
+                self.__logged_in = False
+                self.__account = None
+
+    def _is_login_response(self,
+                           response: Response,
+                           stream: bool) -> bool:
+        """
+        レスポンスがログインページ (セッション切れ) かどうかを調べる
 
-        if soup.find("ul", {"class": "infolist-tab"}) is None:
-            raise ManabaInternalError()
+        Args:
+            response: レスポンス
+            stream: レスポンス本文を読み込まずに返すか (True の場合は URL のみで判定する)
 
-        correct_list_format_href: str = soup \
-            .find("ul", {"class": "infolist-tab"}) \
-            .find("li", {"class": "current"}) \
-            .find("a") \
-            .get("href")
-        correct_list_format = parse_qs(urlparse(correct_list_format_href).query)["chglistformat"][0]
+        Returns:
+            bool: ログインページか
+        """
+        if urlparse(str(response.url)).path == urlparse(urls.login_url(self.__base_url)).path:
+            return True
+        if stream or response.status_code != 200 or "html" not in response.headers.get("Content-Type", ""):
+            return False
+        return parsers.is_login_page(response.text)
 
-        my_courses = soup.find("div", {"class": "mycourses-body"})
+    def _fetch(self,
+               endpoint: str,
+               url: str,
+               parse: Callable[[str], T]) -> T:
+        """
+        ページを取得してパースする
 
-        if correct_list_format == "thumbnail":
-            return self._get_courses_from_thumbnail(my_courses)
-        if correct_list_format == "list":
-            return self._get_courses_from_list(my_courses)
-        if correct_list_format == "timetable":
-            return self._get_courses_from_timetable(my_courses, soup.find("table", {"class": "courselist"}))
+        Args:
+            endpoint: エンドポイント名 (ページ取得イベントに使用する、呼び出し元のメソッド名)
+            url: 取得するページの URL
+            parse: ページの HTML をパースする関数
 
-        return []
+        Returns:
+            T: パース結果
 
-    def _get_courses_from_thumbnail(self,
-                                    my_courses: bs4.element.Tag) -> list[ManabaCourse]:
+        Notes:
+            single_flight が True の場合、同じアカウント・エンドポイント・URL のページを取得中の他のスレッドがあれば、
+            リクエストせずにその結果 (同じモデルのインスタンス、または同じ例外) を待って返します。
+        """
+        if not self.__single_flight:
+            return self._load(endpoint, url, parse)
+
+        key = (str(self.__account), endpoint, url)
+        with self.__in_flight_lock:
+            future = self.__in_flight.get(key)
+            leader = future is None
+            if future is None:
+                future = Future()
+                self.__in_flight[key] = future
+        if not leader:
+            return cast(T, future.result())
+
+        try:
+            result = self._load(endpoint, url, parse)
+        except BaseException as e:
+            with self.__in_flight_lock:
+                del self.__in_flight[key]
+            future.set_exception(e)
+            raise
+        with self.__in_flight_lock:
+            del self.__in_flight[key]
+        future.set_result(result)
+        return result
+
+    def _load(self,
+              endpoint: str,
+              url: str,
+              parse: Callable[[str], T]) -> T:
         """
-        参加しているコース情報を取得する (サムネイル表示の場合)
+        ページを取得してパースする (同時に取得中の同じページをまとめない)
 
         Args:
-            my_courses: コース一覧のHTMLタグエレメント
+            endpoint: エンドポイント名 (ページ取得イベントに使用する、呼び出し元のメソッド名)
+            url: 取得するページの URL
+            parse: ページの HTML をパースする関数
 
         Returns:
-            list[ManabaCourse]: 参加しているコース情報
+            T: パース結果
+
+        Notes:
+            ページキャッシュが設定されている場合は、キャッシュを使用します。
+            observers が設定されている場合は、通信・パース・モデルの組み立ての時間を計測してページ取得イベントを渡します。
+        """
+        if len(self.__observers) == 0:
+            if self.__cache is None:
+                return self._parse(parse, self._get(url).text)
+            return self.__cache.fetch((str(self.__account), url), functools.partial(self._get, url),
+                                      functools.partial(self._parse, parse))
+
+        status: Optional[int] = None
+        bytes_received = 0
+        network_time = 0.0
+        parse_time = 0.0
+        build_time = 0.0
+        cached = True
+
+        def get(headers: Optional[dict[str, str]] = None) -> Response:
+            nonlocal status, bytes_received, network_time
+            start = time.perf_counter()
+            try:
+                response = self._get(url, headers)
+            finally:
+                network_time += time.perf_counter() - start
+            status = response.status_code
+            bytes_received += len(response.content)
+            return response
+
+        def measured_parse(markup: str) -> T:
+            nonlocal parse_time, build_time, cached
+            cached = False
+            result, parse_time, total_time = self._parse(functools.partial(parsers.measure_parse, parse), markup)
+            build_time = max(total_time - parse_time, 0.0)
+            return result
+
+        def notify(error: Optional[Exception]) -> None:
+            event = ManabaFetchEvent(endpoint, url, status, bytes_received, network_time, parse_time, build_time,
+                                     cached and error is None, error)
+            for observer in list(self.__observers):
+                observer(event)
+
+        try:
+            if self.__cache is None:
+                result = measured_parse(get().text)
+            else:
+                result = self.__cache.fetch((str(self.__account), url), get, measured_parse)
+        except Exception as e:
+            notify(e)
+            raise
+        notify(None)
+        return result
+
+    def _parse(self,
+               parse: Callable[[str], T],
+               markup: str) -> T:
         """
-        course_cards = my_courses.find_all("div", {"class": "coursecard"})
+        ページをパースする
 
-        courses = []
-        course_card: bs4.element.Tag
-        for course_card in course_cards:
-            title_link = course_card.find("div", {"class": "course-card-title"}).find("a")
-            course_name = title_link.text.strip()
-            course_link = title_link.get("href")
-            course_id: int = int(re.sub(r"course_([0-9]+)", r"\1", course_link))
+        Args:
+            parse: ページの HTML をパースする関数 (:mod:`manaba.parsers` の関数に、HTML 以外の引数をキーワード引数で束縛したもの)
+            markup: ページの HTML
 
-            course_items: bs4.element.Tag = course_card.find("dl", {"class": "courseitems"})
-            dts = course_items.find_all("dt", {"class": "courseitemtext"}, recursive=False)
-            dds = course_items.find_all("dd", {"class": "courseitemdetail"}, recursive=False)
+        Returns:
+            T: パース結果
 
-            year: Optional[int] = None
-            lecture_at: Optional[str] = None
-            teacher: Optional[str] = None
+        Notes:
+            parse_executor が設定されている場合は、executor 上でパースします。
+            ProcessPoolExecutor を使用する場合、parse と HTML が pickle でワーカープロセスに送られ、パース結果のモデルが pickle で返されます。
+        """
+        if self.__parse_executor is None:
+            return parse(markup)
+        return self.__parse_executor.submit(parse, markup).result()
 
-            dt: bs4.element.Tag
-            dd: bs4.element.Tag
-            for dt, dd in zip(dts, dds):
-                dt_text = dt.text.strip()
-                dd_text = dd.text.strip()
+    def login(self,
+              username: str,
+              password: str) -> bool:
+        """
+        manaba にログインする
 
-                if dt_text == "時限":
-                    lecture_at = dd.find("span").text
-                    year = int(dd_text.replace(dd.find("span").text, ""))
-                elif dt_text == "担当":
-                    teacher = dd_text
+        Args:
+            username: manaba ユーザー名
+            password: manaba パスワード
 
-            status_lamps = self._get_lamps_from_card(course_card.find("div", {"class": "course-card-status"}))
+        Returns:
+            bool: ログインできたか
+        """
+        with self.__login_lock:
+            try:
+                response = self._request("GET", urls.login_url(self.__base_url))
+                if response.status_code != 200:
+                    return False
+                login_form = parsers.parse_login_form(response.text, self.__parser)
+
+                response = self._request("POST", urls.login_url(self.__base_url), params={
+                    "userid": username,
+                    "password": password,
+                    "login": login_form["login"],
+                    "manaba-form": "1",
+                    "sessionValue1": login_form["sessionValue1"],
+                    "sessionValue": login_form["sessionValue"]
+                })
+
+                self.__logged_in = len(response.history) == 1 and response.history[0].status_code == 302
+                self.__account = username if self.__logged_in else None
+                if self.__logged_in and self.__retry is not None and self.__retry.relogin:
+                    # セッション切れ時の再ログインに使用する
+                    self.__credentials = (username, password)
+
+                return self.__logged_in
+            finally:
+                # 再ログインを待っていた他のスレッドが、ログインし直したことを検出するために使用する
+                self.__login_generation += 1
+
+    def save_session(self,
+                     path: str) -> None:
+        """
+        ログイン状態 (Cookie) をファイルに保存します。
 
-            courses.append(ManabaCourse(course_name, course_id, year, lecture_at, teacher, status_lamps))
+        Args:
+            path: 保存先のファイルパス
+
+        Raises:
+            ManabaNotLoggedIn: ログインしていない場合
+
+        Notes:
+            ファイルにはセッション Cookie が含まれるため、所有者のみが読み書きできるパーミッションで作成します。
+        """
+        if not self.__logged_in:
+            raise ManabaNotLoggedIn()
 
-        return courses
+        data = {
+            "base_url": self.__base_url,
+            "account": self.__account,
+            "cookies": [{
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "expires": cookie.expires,
+                "secure": cookie.secure
+            } for cookie in self.session.cookies]
+        }
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
 
-    def _get_courses_from_list(self,
-                               my_courses: bs4.element.Tag) -> list[ManabaCourse]:
+    def load_session(self,
+                     path: str,
+                     verify: bool = True) -> bool:
         """
-        参加しているコース情報を取得する (リスト表示の場合)
+        :func:`manaba.Manaba.save_session` で保存したログイン状態を読み込みます。
 
         Args:
-            my_courses: コース一覧のHTMLタグエレメント
+            path: 保存したファイルパス
+            verify: 読み込んだセッションが有効か :func:`manaba.Manaba.is_session_valid` で確認するか
 
         Returns:
-            list[ManabaCourse]: 参加しているコース情報
+            bool: ログイン状態を復元できたか (ファイルがない・ベース URL が異なる・セッションが無効な場合は False)
+
+        Notes:
+            verify が False の場合はリクエストを行いません。セッションが期限切れの場合、以降のページ取得で失敗します。
         """
-        course_rows = my_courses.find_all("tr", class_=["courselist-c", "courselist-r"])
+        if not os.path.exists(path):
+            return False
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get("base_url") != self.__base_url:
+            return False
 
-        courses = []
-        for course_row in course_rows:
-            course_name = course_row.find("span", {"class": "courselist-title"}).text.strip()
-            course_link = course_row.find("span", {"class": "courselist-title"}).find("a").get("href")
-            course_id: int = int(re.sub(r"course_([0-9]+)", r"\1", course_link))
+        with self.__login_lock:
+            for cookie in data.get("cookies", []):
+                self.session.cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"],
+                                         expires=cookie["expires"], secure=cookie["secure"])
+            account = data.get("account")
+            self.__account = str(account) if account is not None else None
+            self.__logged_in = True
+            self.__login_generation += 1
+        if verify:
+            return self.is_session_valid()
+        return True
+
+    def is_session_valid(self) -> bool:
+        """
+        現在のセッションでログインしている状態か、ページを 1 回取得して確認します。
 
-            status_lamps = self._get_lamps_from_card(course_row.find("div", {"class": "course-card-status"}))
-            course_tds = course_row.find_all("td")
-            course_year = int(course_tds[1].text.strip()) if len(course_tds) > 1 else None
-            course_time = course_tds[2].text.strip() if len(course_tds) > 2 else None
-            course_teacher = course_tds[3].text.strip() if len(course_tds) > 3 else None
+        Returns:
+            bool: ログインしている状態か
 
-            courses.append(ManabaCourse(course_name, course_id, course_year, course_time, course_teacher, status_lamps))
+        Notes:
+            セッションが無効な場合はログインしていない状態になり、再度 :func:`manaba.Manaba.login` する必要があります。
+        """
+        if not self.__logged_in:
+            return False
 
-        return courses
+        generation = self.__login_generation
+        response = self._request("GET", urls.courses_url(self.__base_url), allow_redirects=False)
+        if response.status_code == 200 and not parsers.is_login_page(response.text):
+            return True
+        self._expire_session(generation)
+        return self.__logged_in
 
-    def _get_courses_from_timetable(self,
-                                    my_courses: bs4.element.Tag,
-                                    course_list: bs4.element.Tag) \
-            -> list[ManabaCourse]:
+    def get_course(self,
+                   course_id: int) -> ManabaCourse:
         """
-        参加しているコース情報を取得する (曜日表示の場合)
+        指定したコース ID のコース情報(ManabaCourse)を取得します。
 
         Args:
-            my_courses: コース一覧のHTMLタグエレメント
+            course_id: 取得するコースのコース ID
 
         Returns:
-            list[ManabaCourse]: 参加しているコース情報
+            ManabaCourse: 取得するコースのコース ID
         """
-        course_cards = my_courses.find_all("div", class_=["courselistweekly-c", "courselistweekly-r"])
+        return self._fetch("get_course", urls.course_url(self.__base_url, course_id),
+                           functools.partial(parsers.parse_course, course_id=course_id, parser=self.__parser))
 
-        courses = []
-        for course_card in course_cards:
-            course_name = course_card.find("a").text.strip()
-            course_link = course_card.find("a").get("href")
-            course_id: int = int(re.sub(r"course_([0-9]+)", r"\1", course_link))
-
-            status_lamps = self._get_lamps_from_card(course_card.find("div", {"class": "coursestatus"}))
-
-            courses.append(ManabaCourse(course_name, course_id, None, None, None, status_lamps))
-
-        other_courses = self._get_courses_from_list(course_list)
-        courses.extend(other_courses)
+    def get_courses(self) -> list[ManabaCourse]:
+        """
+        参加しているコース情報を取得する
 
-        return courses
+        Returns:
+            list[ManabaCourse]: 参加しているコース情報
 
-    @staticmethod
-    def _get_lamps_from_card(course_status: bs4.element.Tag) -> ManabaCourseLamps:
+        Notes:
+            詳細情報は :func:`manaba.Manaba.get_course` で取得できます。
         """
-        カードからステータスランプを取得する
+        return self._fetch("get_courses", urls.courses_url(self.__base_url),
+                           functools.partial(parsers.parse_courses, parser=self.__parser))
 
-        Args:
-            course_status: カードのHTMLタグエレメント
+    def get_courses_all(self) -> list[ManabaCourse]:
+        """
+        参加しているすべてのコース情報を取得する
 
         Returns:
-            ManabaCourseLamps: コースステータスランプ
-        """
-        course_statuses = course_status \
-            .find_all("img")
-        return ManabaCourseLamps(
-            course_statuses[0].get("src").endswith("on.png"),
-            course_statuses[1].get("src").endswith("on.png"),
-            course_statuses[2].get("src").endswith("on.png"),
-            course_statuses[3].get("src").endswith("on.png"),
-            course_statuses[4].get("src").endswith("on.png")
-        )
+            list[ManabaCourse]: 参加しているすべてのコース情報
+
+        Notes:
+            詳細情報は :func:`manaba.Manaba.get_course` で取得できます。
+        """
+        return self._fetch("get_courses_all", urls.courses_all_url(self.__base_url),
+                           functools.partial(parsers.parse_courses, parser=self.__parser))
 
     def get_querys(self,
                    course_id: int) -> list[ManabaQuery]:
@@ -340,45 +710,8 @@ class Manaba:
         Notes:
             詳細情報は :func:`manaba.Manaba.get_query` で取得できます。
         """
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
-
-        self.__response = self.session.get(urljoin(self.__base_url, "/ct/course_" + str(course_id)) + "_query")
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
-        std_list = soup.find("table", {"class": "stdlist"})
-        if std_list is None:
-            return []
-
-        query_tags = std_list.find_all("tr", class_=["row", "row0", "row1"])
-        querys = []
-        for query_tag in query_tags:
-            query_td_tags = query_tag.findAll("td")
-            query_title = query_tag.find("h3").text.strip()
-            query_status_lamp = query_tag.find("h3").find("img").get("src").endswith("on.png")
-            query_link = query_tag.find("h3").find("a").get("href")
-            query_id: int = int(re.sub(r"course_[0-9]+_(?:query|drill)_([0-9]+)", r"\1", query_link))
-            query_is_drill = "drill" in query_link
-
-            query_status = self._parse_status(query_td_tags[1].text.strip())
-
-            query_start_time = self.process_datetime(query_td_tags[2].text.strip())
-            query_end_time = self.process_datetime(query_td_tags[3].text.strip())
-
-            querys.append(ManabaQuery(
-                course_id,
-                query_id,
-                query_title,
-                query_status,
-                query_status_lamp,
-                query_start_time,
-                query_end_time,
-                query_is_drill
-            ))
-
-        return querys
+        return self._fetch("get_querys", urls.querys_url(self.__base_url, course_id),
+                           functools.partial(parsers.parse_querys, course_id=course_id, parser=self.__parser))
 
     def get_query(self,
                   course_id: int,
@@ -393,71 +726,8 @@ class Manaba:
         Returns:
             ManabaQueryDetails: 小テスト詳細情報
         """
-
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
-
-        self.__response = self.session.get(
-            urljoin(self.__base_url, "/ct/course_" + str(course_id)) + "_query_" + str(query_id))
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
-
-        if soup.find("table", {"class": "stdlist-query"}) is None:
-            raise ManabaNotFound()
-
-        query_title = soup.find("tr", {"class": "title"}).text.strip()
-
-        details = {}
-        detail_trs = soup.find("table", {"class": "stdlist-query"}).find_all("tr")
-        for tr in detail_trs:
-            if tr.get("class") == "title":
-                continue
-
-            th = tr.find("th")
-            td = tr.find("td")
-            if th is None or td is None:
-                continue
-
-            details[th.text.strip()] = td.text.strip()
-
-        portfolio_type = get_portfolio_type(self._opt_value(details, "ポートフォリオ"))
-        result_view_type = get_result_view_type(self._opt_value(details, "採点結果と正解の公開"))
-
-        status_value = self._opt_value(details, "状態")
-        status = None
-        if status_value is not None:
-            if soup.find("table", {"class": "stdlist-query"}).find("span", {"class": "expired"}) is not None:
-                status = ManabaTaskStatus(ManabaTaskStatusFlag.CLOSED, ManabaTaskYourStatusFlag.UNSUBMITTED)
-            else:
-                status = self._parse_status(status_value)
-
-        gradelist = soup.find("table", {"class": "gradelist"})
-        grade: Union[int, None] = None
-        position = None
-        if gradelist is not None:
-            grade_str = gradelist.find("td", {"class": "grade"}).text
-            try:
-                grade = int(grade_str)
-            except ValueError:
-                grade = None
-
-            position = self._parse_grade_bar(gradelist)
-
-        return ManabaQueryDetails(
-            course_id,
-            query_id,
-            query_title,
-            self._opt_value(details, "課題に関する説明"),
-            self.process_datetime(self._opt_value(details, "受付開始日時")),
-            self.process_datetime(self._opt_value(details, "受付終了日時")),
-            portfolio_type,
-            result_view_type,
-            status,
-            grade,
-            position
-        )
+        return self._fetch("get_query", urls.query_url(self.__base_url, course_id, query_id),
+                           functools.partial(parsers.parse_query_details, course_id=course_id, query_id=query_id, parser=self.__parser))
 
     def get_drill(self,
                   course_id: int,
@@ -472,87 +742,8 @@ class Manaba:
         Returns:
             ManabaDrillDetails: 小テストドリル詳細情報
         """
-
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
-
-        self.__response = self.session.get(
-            urljoin(self.__base_url, "/ct/course_" + str(course_id)) + "_drill_" + str(drill_id))
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
-
-        if soup.find("table", {"class": "stdlist-query"}) is None:
-            raise ManabaNotFound()
-
-        query_title = soup.find("tr", {"class": "title"}).text.strip()
-
-        details = {}
-        detail_trs = soup.find("table", {"class": "stdlist-query"}).find_all("tr")
-        for tr in detail_trs:
-            if tr.get("class") == "title":
-                continue
-
-            th = tr.find("th")
-            td = tr.find("td")
-            if th is None or td is None:
-                continue
-
-            details[th.text.strip()] = td.text.strip()
-
-        portfolio_type = get_portfolio_type(self._opt_value(details, "ポートフォリオ"))
-
-        status_value = self._opt_value(details, "状態")
-        status = None
-        if status_value is not None:
-            if soup.find("table", {"class": "stdlist-query"}).find("span", {"class": "expired"}) is not None:
-                status = ManabaTaskStatus(ManabaTaskStatusFlag.CLOSED, ManabaTaskYourStatusFlag.UNSUBMITTED)
-            else:
-                status = self._parse_status(status_value)
-                if status.your_status is None:
-                    # 受付中で未回答の場合、your_statusはNoneになる
-                    status = ManabaTaskStatus(status.task_status, ManabaTaskYourStatusFlag.UNSUBMITTED)
-
-        submission_limit = -1
-        raw_submission_limit = self._opt_value(details, "提出上限")
-        if raw_submission_limit is not None:
-            match = re.search(r"([0-9]+)回まで", raw_submission_limit)
-            if match is not None:
-                submission_limit = int(match.group(1))
-
-        answer_view_type = get_answer_view_type(self._opt_value(details, "正解の公開"))
-
-        count_exams = None
-        max_score = None
-        if status_value is not None:
-            match = re.search(r"受験回数: ([0-9]+)回(?:\n|.)*?\(最高得点 ([0-9]+)\)", status_value)
-            if match is not None:
-                count_exams = int(match.group(1))
-                max_score = int(match.group(2))
-
-        raw_passing_conditions = self._opt_value(details, "合格条件")
-        passing_conditions = -1
-        if raw_passing_conditions is not None:
-            num_passing_conditions = re.sub(r"([0-9]+).*", r"\1", raw_passing_conditions)
-            if num_passing_conditions is not None and num_passing_conditions.isdigit():
-                passing_conditions = int(num_passing_conditions)
-
-        return ManabaDrillDetails(
-            course_id,
-            drill_id,
-            query_title,
-            self._opt_value(details, "課題に関する説明"),
-            self.process_datetime(self._opt_value(details, "受付開始日時")),
-            self.process_datetime(self._opt_value(details, "受付終了日時")),
-            submission_limit,
-            portfolio_type,
-            answer_view_type,
-            status,
-            count_exams,
-            max_score,
-            passing_conditions
-        )
+        return self._fetch("get_drill", urls.drill_url(self.__base_url, course_id, drill_id),
+                           functools.partial(parsers.parse_drill_details, course_id=course_id, drill_id=drill_id, parser=self.__parser))
 
     def get_surveys(self,
                     course_id: int) -> list[ManabaSurvey]:
@@ -568,43 +759,8 @@ class Manaba:
         Notes:
             詳細情報は :func:`manaba.Manaba.get_survey` で取得できます。
         """
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
-
-        self.__response = self.session.get(urljoin(self.__base_url, "/ct/course_" + str(course_id)) + "_survey")
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
-        std_list = soup.find("table", {"class": "stdlist"})
-        if std_list is None:
-            return []
-
-        survey_tags = std_list.find_all("tr", class_=["row", "row0", "row1"])
-        surveys = []
-        for survey_tag in survey_tags:
-            survey_td_tags = survey_tag.findAll("td")
-            survey_title = survey_tag.find("h3").text.strip()
-            survey_status_lamp = survey_tag.find("h3").find("img").get("src").endswith("on.png")
-            survey_link = survey_tag.find("h3").find("a").get("href")
-            survey_id: int = int(re.sub(r"course_[0-9]+_survey_([0-9]+)", r"\1", survey_link))
-
-            survey_status = self._parse_status(survey_td_tags[1].text.strip())
-
-            survey_start_time = self.process_datetime(survey_td_tags[2].text.strip())
-            survey_end_time = self.process_datetime(survey_td_tags[3].text.strip())
-
-            surveys.append(ManabaSurvey(
-                course_id,
-                survey_id,
-                survey_title,
-                survey_status,
-                survey_status_lamp,
-                survey_start_time,
-                survey_end_time
-            ))
-
-        return surveys
+        return self._fetch("get_surveys", urls.surveys_url(self.__base_url, course_id),
+                           functools.partial(parsers.parse_surveys, course_id=course_id, parser=self.__parser))
 
     def get_survey(self,
                    course_id: int,
@@ -619,56 +775,8 @@ class Manaba:
         Returns:
             ManabaSurveyDetails: アンケート詳細情報
         """
-
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
-
-        self.__response = self.session.get(
-            urljoin(self.__base_url, "/ct/course_" + str(course_id)) + "_survey_" + str(survey_id))
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
-
-        if soup.find("table", {"class": "stdlist-query"}) is None:
-            raise ManabaNotFound()
-
-        survey_title = soup.find("tr", {"class": "title"}).text.strip()
-
-        details = {}
-        detail_trs = soup.find("table", {"class": "stdlist-query"}).find_all("tr")
-        for tr in detail_trs:
-            if tr.get("class") == "title":
-                continue
-
-            th = tr.find("th")
-            td = tr.find("td")
-            if th is None or td is None:
-                continue
-
-            details[th.text.strip()] = td.text.strip()
-
-        portfolio_type = get_portfolio_type(self._opt_value(details, "ポートフォリオ"))
-        student_resubmit_type = get_student_resubmit_type(self._opt_value(details, "学生による再提出の許可"))
-
-        status_value = self._opt_value(details, "状態")
-        status = None
-        if status_value is not None:
-            if soup.find("table", {"class": "stdlist-query"}).find("span", {"class": "expired"}) is not None:
-                status = ManabaTaskStatus(ManabaTaskStatusFlag.CLOSED, ManabaTaskYourStatusFlag.UNSUBMITTED)
-            else:
-                status = self._parse_status(status_value)
-
-        return ManabaSurveyDetails(
-            course_id,
-            survey_id,
-            survey_title,
-            self.process_datetime(self._opt_value(details, "受付開始日時")),
-            self.process_datetime(self._opt_value(details, "受付終了日時")),
-            portfolio_type,
-            student_resubmit_type,
-            status
-        )
+        return self._fetch("get_survey", urls.survey_url(self.__base_url, course_id, survey_id),
+                           functools.partial(parsers.parse_survey_details, course_id=course_id, survey_id=survey_id, parser=self.__parser))
 
     def get_reports(self,
                     course_id: int) -> list[ManabaReport]:
@@ -684,43 +792,8 @@ class Manaba:
         Notes:
             詳細情報は :func:`manaba.Manaba.get_report` で取得できます。
         """
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
-
-        self.__response = self.session.get(urljoin(self.__base_url, "/ct/course_" + str(course_id)) + "_report")
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
-        std_list = soup.find("table", {"class": "stdlist"})
-        if std_list is None:
-            return []
-
-        report_tags = std_list.find_all("tr", class_=["row", "row0", "row1"])
-        reports = []
-        for report_tag in report_tags:
-            report_td_tags = report_tag.findAll("td")
-            report_title = report_tag.find("h3").text.strip()
-            report_status_lamp = report_tag.find("h3").find("img").get("src").endswith("on.png")
-            report_link = report_tag.find("h3").find("a").get("href")
-            report_id: int = int(re.sub(r"course_[0-9]+_report_([0-9]+)", r"\1", report_link))
-
-            report_status = self._parse_status(report_td_tags[1].text.strip())
-
-            report_start_time = self.process_datetime(report_td_tags[2].text.strip())
-            report_end_time = self.process_datetime(report_td_tags[3].text.strip())
-
-            reports.append(ManabaReport(
-                course_id,
-                report_id,
-                report_title,
-                report_status,
-                report_status_lamp,
-                report_start_time,
-                report_end_time
-            ))
-
-        return reports
+        return self._fetch("get_reports", urls.reports_url(self.__base_url, course_id),
+                           functools.partial(parsers.parse_reports, course_id=course_id, parser=self.__parser))
 
     def get_report(self,
                    course_id: int,
@@ -735,67 +808,8 @@ class Manaba:
         Returns:
             ManabaReportDetails: レポート詳細情報
         """
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
-
-        self.__response = self.session.get(
-            urljoin(self.__base_url, "/ct/course_" + str(course_id)) + "_report_" + str(report_id))
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
-
-        if soup.find("table", {"class": "stdlist-report"}) is None:
-            raise ManabaNotFound()
-
-        report_title = soup.find("tr", {"class": "title"}).text.strip()
-
-        details = {}
-        detail_trs = soup.find("table", {"class": "stdlist-report"}).find_all("tr")
-        for tr in detail_trs:
-            if tr.get("class") == "title":
-                continue
-
-            th = tr.find("th")
-            td = tr.find("td")
-            if th is None or td is None:
-                continue
-            for tag in td.find_all("br"):
-                tag.replace_with("\n")
-
-            details[th.text.strip()] = td.text.strip()
-
-        portfolio_and_view_settings = self._opt_value(details, "ポートフォリオ / 閲覧設定")
-        portfolio_type = None
-        result_view_type = None
-        if portfolio_and_view_settings is not None and " / " in portfolio_and_view_settings:
-            portfolio_type = get_portfolio_type(portfolio_and_view_settings.split(" / ")[0])
-            result_view_type = get_result_view_type(portfolio_and_view_settings.split(" / ")[1])
-
-        student_resubmit_type = get_student_resubmit_type(self._opt_value(details, "学生による再提出の許可"))
-
-        status_value = self._opt_value(details, "状態")
-        status = None
-        if status_value is not None:
-            if (soup.find("table", {"class": "stdlist-report"}).find("span", {"class": "expired"}) is not None) or \
-                    (soup.find("div", {"class": "report-form"}) is not None and
-                     soup.find("div", {"class": "report-form"}).find("span", {"class": "expired"}) is not None):
-                status = ManabaTaskStatus(ManabaTaskStatusFlag.CLOSED, ManabaTaskYourStatusFlag.UNSUBMITTED)
-            else:
-                status = self._parse_status(status_value)
-
-        return ManabaReportDetails(
-            course_id,
-            report_id,
-            report_title,
-            self._opt_value(details, "課題に関する説明"),
-            self.process_datetime(self._opt_value(details, "受付開始日時")),
-            self.process_datetime(self._opt_value(details, "受付終了日時")),
-            portfolio_type,
-            result_view_type,
-            student_resubmit_type,
-            status
-        )
+        return self._fetch("get_report", urls.report_url(self.__base_url, course_id, report_id),
+                           functools.partial(parsers.parse_report_details, course_id=course_id, report_id=report_id, parser=self.__parser))
 
     def get_threads(self,
                     course_id: int) -> list[ManabaThread]:
@@ -811,35 +825,8 @@ class Manaba:
         Notes:
             詳細情報は :func:`manaba.Manaba.get_thread` で取得できます。
         """
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
-
-        self.__response = self.session.get(
-            urljoin(self.__base_url, "/ct/course_" + str(course_id)) + "_topics")
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
-
-        std_list = soup.find("table", {"class": "stdlist"})
-        if std_list is None:
-            return []
-
-        thread_tags = std_list.find_all("tr", class_=["row", "row0", "row1"])
-        threads = []
-        for thread_tag in thread_tags:
-            thread_title = thread_tag.find("span", {"class": "thread-title"}).text.strip()
-            thread_link = thread_tag.find("a", {"class": "threadhead"}).get("href")
-            thread_id: int = int(re.sub(r"course_[0-9]+_topics_([0-9]+)_.+", r"\1", thread_link))
-
-            threads.append(ManabaThread(
-                course_id,
-                thread_id,
-                thread_title,
-                None
-            ))
-
-        return threads
+        return self._fetch("get_threads", urls.threads_url(self.__base_url, course_id),
+                           functools.partial(parsers.parse_threads, course_id=course_id, parser=self.__parser))
 
     def get_thread(self,
                    course_id: int,
@@ -861,84 +848,157 @@ class Manaba:
         Notes:
             start_id の仕様は manaba 自体の仕様ですが、特殊です。スレッドのコメント数が 50 個ある場合、start_id に 5 を指定すると 45 件目以前を取得します。
         """
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
+        return self._fetch("get_thread", urls.thread_url(self.__base_url, course_id, thread_id, start_id, page_len),
+                           functools.partial(parsers.parse_thread, course_id=course_id, thread_id=thread_id, base_url=self.__base_url, parser=self.__parser))
+
+    def get_thread_since(self,
+                         course_id: int,
+                         thread_id: int,
+                         last_comment_id: int,
+                         thread: Optional[ManabaThread] = None,
+                         page_len: int = 50) -> ManabaThreadUpdate:
+        """
+        指定したコース・スレッド ID のスレッドから、指定したコメント ID より新しいコメントを取得します。
 
-        params = {
-            "pagelen": page_len
-        }
-        if start_id is not None:
-            params["start_id"] = start_id
+        Args:
+            course_id: 取得するコースのコース ID
+            thread_id: 取得するスレッドのスレッド ID
+            last_comment_id: 既に取得しているコメントのうち、最も新しいコメントのコメント ID
+            thread: 既に取得しているスレッド詳細情報 (指定した場合、取得したコメントをマージする)
+            page_len: 1 ページで何件コメント取得するか
 
-        self.__response = self.session.get(
-            urljoin(self.__base_url, "/ct/course_" + str(course_id)) + "_topics_" + str(
-                thread_id) + "_tflat?" + urlencode(params))
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
-
-        comments: list[ManabaThreadComment] = []
-        comment_tags = soup.find_all("div", {"class": "articlecontainer"})
-        for comment_tag in comment_tags:
-            comment_id: int = int(comment_tag.find("h3", {"class": "articlenumber"}).text.strip())
-            comment_title: str = comment_tag.find("div", {"class": "articlesubject"}).text.strip()
-            comment_body: bs4.element.Tag = comment_tag.find("div", {"class": "articlebody-msgbody"})
-            article_info: bs4.element.Tag = comment_tag.find("div", {"class": "articleinfo"})
-
-            # 以下、投稿者名と投稿日時が正常に取れない可能性あり
-            comment_author: Optional[str] = None
-            comment_date: Optional[str] = None
-            if article_info.find("span", {"class": "posted-time"}) is not None:
-                if article_info.find("a", {"href": "#"}) is not None:
-                    # リンクになっている投稿者情報があればそれ
-                    comment_author = article_info.find("a").text.strip()
-                else:
-                    # リンクがなければ投稿後のひとつ前のタグ
-                    comment_author = str(
-                        article_info.find("span", {"class": "posted-time"}).previous_sibling.string).strip()
+        Returns:
+            ManabaThreadUpdate: スレッド差分取得結果
 
-                comment_date = article_info.find("span", {"class": "posted-time"}).text.strip()
+        Notes:
+            start_id を使用して新しいコメントから page_len 件ずつさかのぼり、last_comment_id のコメントを含むページまで取得します。
+            取得中に新しいコメントが投稿された場合も、last_comment_id より新しいコメントを取りこぼしません。
+            取得しなおしたコメントのうち、thread に含まれるものと削除状態・タイトル・本文が異なるものは changed_comments として返します。
+            thread を指定しない場合、マージ後のスレッドには last_comment_id より新しいコメントのみが含まれます。
+        """
+        fetched: dict[int, ManabaThreadComment] = {}
+        title: Optional[str] = None
+        start_id: Optional[int] = None
+        while True:
+            page = self.get_thread(course_id, thread_id, start_id, page_len)
+            page_comments = page.comments or []
+            comments = [comment for comment in page_comments if comment.comment_id not in fetched]
+            for comment in comments:
+                fetched[comment.comment_id] = comment
+                if comment.comment_id == 1:
+                    title = comment.title
+
+            # 取得中に新しいコメントが投稿されるとページの範囲がずれ、前のページと重複するため、重複を除かない件数で判定する
+            if len(page_comments) < page_len or len(comments) == 0 or \
+                    min(comment.comment_id for comment in page_comments) <= last_comment_id:
+                break
+            start_id = (start_id or 0) + page_len
+
+        held: dict[int, ManabaThreadComment] = {}
+        if thread is not None:
+            held = {comment.comment_id: comment for comment in thread.comments or []}
+            if title is None:
+                title = thread.title
+
+        new_comments = sorted([comment for comment in fetched.values() if comment.comment_id > last_comment_id],
+                              key=lambda comment: comment.comment_id)
+        changed_comments: list[ManabaThreadComment] = []
+        for comment_id, comment in sorted(fetched.items()):
+            old_comment = held.get(comment_id)
+            if old_comment is None:
+                continue
+            if (old_comment.deleted, old_comment.title, old_comment.html) != (comment.deleted, comment.title, comment.html):
+                changed_comments.append(comment)
 
-            reply_to_id = None
-            if comment_tag.find("div", {"class": "parentmsg-no"}) is not None:
-                reply_to_id = int(comment_tag.find("div", {"class": "parentmsg-no"}).text.strip())
+        if thread is None:
+            merged = {comment.comment_id: comment for comment in new_comments}
+        else:
+            merged = dict(held)
+            merged.update(fetched)
+        return ManabaThreadUpdate(
+            ManabaThread(course_id, thread_id, title, [merged[comment_id] for comment_id in sorted(merged)]),
+            new_comments,
+            changed_comments
+        )
 
-            deleted = comment_tag.find("div", {"class": "articlecontainer-deleted"}) is not None
+    def iter_thread_comments(self,
+                             course_id: int,
+                             thread_id: int,
+                             page_size: int = 50) -> Iterator[ManabaThreadComment]:
+        """
+        指定したコース・スレッド ID のスレッドのコメントを、新しいものから順に 1 ページずつ取得しながら返します。
 
-            manaba_thread_comment = ManabaThreadComment(
-                course_id,
-                thread_id,
-                comment_id,
-                comment_title,
-                comment_author,
-                self.process_datetime(comment_date),
-                reply_to_id,
-                deleted,
-                str(comment_body).replace(" ", "&nbsp;").strip()
-            )
+        Args:
+            course_id: 取得するコースのコース ID
+            thread_id: 取得するスレッドのスレッド ID
+            page_size: 1 ページで何件コメント取得するか
 
-            attachments = comment_tag.find_all("div", {"class": "inlineattachment"})
-            for attachment in attachments:
-                a_tag = attachment.find("div", {"class": "inlineaf-description"}).find("a")
-                manaba_thread_comment.add_file(ManabaFile(
-                    manaba_thread_comment,
-                    re.sub(r"(.+?) - ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})", r"\1",
-                           a_tag.text).strip(),
-                    self.process_datetime(
-                        re.sub(r"(.+?) - ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})", r"\2",
-                               a_tag.text).strip()),
-                    urljoin(self.__base_url + "/ct/", a_tag.get("href"))
-                ))
-
-            comments.append(manaba_thread_comment)
-
-        return ManabaThread(
-            course_id,
-            thread_id,
-            comments[0].title,
-            comments
-        )
+        Returns:
+            Iterator[ManabaThreadComment]: スレッドのコメント (新しい順)
+
+        Notes:
+            start_id を使用して page_size 件ずつさかのぼって取得するため、メモリ上には 1 ページ分のみ保持します。
+            取得中に新しいコメントが投稿されるとページの範囲がずれるため、前のページと重複したコメントは返しません。
+            ページの件数が page_size 未満になるか、ページに未取得のコメントがなくなると終了します。
+        """
+        seen: set[int] = set()
+        start_id: Optional[int] = None
+        while True:
+            page = self.get_thread(course_id, thread_id, start_id, page_size)
+            page_comments = page.comments or []
+            comments = [comment for comment in page_comments if comment.comment_id not in seen]
+            for comment in reversed(comments):
+                seen.add(comment.comment_id)
+                yield comment
+
+            # 重複を除いた件数で判定すると、新しいコメントの投稿でページがずれた場合に最も古いページを取得しない
+            if len(page_comments) < page_size or len(comments) == 0:
+                return
+            start_id = (start_id or 0) + page_size
+
+    def stream_thread(self,
+                      course_id: int,
+                      thread_id: int,
+                      start_id: Optional[int] = None,
+                      page_len: int = 10000,
+                      chunk_size: int = 64 * 1024) -> Iterator[ManabaThreadComment]:
+        """
+        指定したコース・スレッド ID のスレッドのコメントを、ページを受信しながら順に返します。
+
+        Args:
+            course_id: 取得するコースのコース ID
+            thread_id: 取得するスレッドのスレッド ID
+            start_id: 直近から何番目から取得するか (指定しない場合はすべて)
+            page_len: 1 ページで最大何件コメント取得するか (指定しない場合は 10000 件)
+            chunk_size: 1 回に受信するバイト数
+
+        Returns:
+            Iterator[ManabaThreadComment]: スレッドのコメント (ページと同じ古い順)
+
+        Raises:
+            ManabaNotLoggedIn: ログインしていない場合 (セッションが切れている場合を含む)
+            ManabaNotFound: ページが見つからない (404, 403) 場合
+
+        Notes:
+            :func:`manaba.Manaba.get_thread` と異なり、ページ全体を読み込まずに :class:`manaba.parsers.ThreadCommentStream` でコメントを 1 件ずつパースします。
+            コメント数によらずメモリ使用量は一定で、最初のコメントはページの受信が終わる前に返します。
+            ページキャッシュ・parse_executor は使用しません。
+        """
+        # ページの送信後に他のスレッドが再ログインした場合に、新しいセッションを切れたものとしないよう、送信前のログイン回数を使用する
+        generation = self.__login_generation
+        response = self._get(urls.thread_url(self.__base_url, course_id, thread_id, start_id, page_len), stream=True)
+        stream = parsers.ThreadCommentStream(course_id, thread_id, self.__base_url, self.__parser,
+                                             response.encoding or "utf-8")
+        try:
+            for chunk in response.iter_content(chunk_size):
+                comments = stream.feed(chunk)
+                if stream.login_page:
+                    self._expire_session(generation)
+                    raise ManabaNotLoggedIn()
+                yield from comments
+            yield from stream.close()
+        finally:
+            response.close()
 
     def get_news_list(self,
                       course_id: int,
@@ -958,49 +1018,40 @@ class Manaba:
         Notes:
             一部の項目のプロパティは None になります。詳細情報は :func:`manaba.Manaba.get_news` で取得できます。
         """
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
+        return self._fetch("get_news_list", urls.news_list_url(self.__base_url, course_id, start_id, page_len),
+                           functools.partial(parsers.parse_news_list, course_id=course_id, parser=self.__parser))
 
-        params = {
-            "pagelen": page_len
-        }
-        if start_id is not None:
-            params["start_id"] = start_id
-
-        self.__response = self.session.get(
-            urljoin(self.__base_url, "/ct/course_" + str(course_id)) + "_news?" + urlencode(params))
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
+    def iter_news(self,
+                  course_id: int,
+                  page_size: int = 50) -> Iterator[ManabaCourseNews]:
+        """
+        指定したコースのコースニュースを、1 ページずつ取得しながら返します。
 
-        std_list = soup.find("table", {"class": "stdlist"})
-        if std_list is None:
-            return []
+        Args:
+            course_id: 取得するコースのコース ID
+            page_size: 1 ページで何件取得するか
 
-        news_tags = std_list.find_all("tr", class_=["row", "row0", "row1"])
-        news = []
-        for news_tag in news_tags:
-            tds = news_tag.find_all("td")
-            news_title_tag = tds[0]
-            news_title = news_title_tag.text.strip()
-            news_link = news_title_tag.find("a").get("href")
-            news_id: int = int(re.sub(r"course_[0-9]+_news_([0-9]+)", r"\1", news_link))
-            news_author = tds[1].text.strip()
-            news_posted_at = self.process_datetime(tds[2].text.strip())
-
-            news.append(ManabaCourseNews(
-                course_id,
-                news_id,
-                news_title,
-                news_author,
-                news_posted_at,
-                None,
-                None,
-                None
-            ))
+        Returns:
+            Iterator[ManabaCourseNews]: コースのニュース (一覧ページと同じ順)
 
-        return news
+        Notes:
+            start_id を使用して page_size 件ずつ取得するため、メモリ上には 1 ページ分のみ保持します。
+            一部の項目のプロパティは None になります。詳細情報は :func:`manaba.Manaba.get_news` で取得できます。
+            取得中に新しいニュースが掲載されるとページの範囲がずれるため、前のページと重複したニュースは返しません。
+            ページの件数が page_size 未満になるか、ページに未取得のニュースがなくなると終了します。
+        """
+        seen: set[int] = set()
+        start_id: Optional[int] = None
+        while True:
+            page = self.get_news_list(course_id, start_id, page_size)
+            news_list = [news for news in page if news.news_id not in seen]
+            for news in news_list:
+                seen.add(news.news_id)
+                yield news
+
+            if len(page) < page_size or len(news_list) == 0:
+                return
+            start_id = (start_id or 0) + page_size
 
     def get_news(self,
                  course_id: int,
@@ -1012,78 +1063,8 @@ class Manaba:
             course_id: 取得するコースのコース ID
             news_id: 取得するニュースのニュース ID
         """
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
-
-        self.__response = self.session.get(
-            urljoin(self.__base_url, "/ct/course_" + str(course_id)) + "_news_" + str(news_id))
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
-
-        if soup.find("h2", {"class": "msg-subject"}) is None:
-            raise ManabaNotFound()
-
-        news_title = soup.find("h2", {"class": "msg-subject"}).text.strip()
-
-        if soup.find("div", {"class": "msg-info"}).find("a", {"href": "#"}) is not None:
-            news_author = soup \
-                .find("div", {"class": "msg-info"}) \
-                .find("a", {"href": "#"}) \
-                .text.strip()
-        else:
-            news_author = soup \
-                .find("div", {"class": "msg-info"}) \
-                .text.replace("投稿者", "").strip()
-
-        news_posted_at = self.process_datetime(soup.find("span", {"class": "msg-date"}).text.strip())
-        msg_text = soup.find("div", {"class": "msg-text"})
-
-        news_html = str(msg_text).replace(" ", "&nbsp;").strip()
-
-        # last_edit
-        last_modified = soup.find("div", {"class": "msg-lastmod"})
-        last_edited_author = None
-        last_edited_at = None
-        if last_modified is not None:
-            if last_modified.find("a") is not None:
-                last_edited_author = last_modified.find("a").text.strip()
-                last_edited_at = self.process_datetime(
-                    str(last_modified.find("a").next_sibling.string).strip()
-                )
-            else:
-                last_edited_str = last_modified.text.strip()
-                last_edited_author = re.sub(r"最終更新 (.+) ([0-9]{4}-[0-9]{2}-[0-9]{2} +[0-9]{2}:[0-9]{2})", r"\1",
-                                            last_edited_str)
-                last_edited_at = self.process_datetime(
-                    re.sub(r"最終更新 (.+) ([0-9]{4}-[0-9]{2}-[0-9]{2} +[0-9]{2}:[0-9]{2})", r"\2", last_edited_str))
-
-        manaba_course_news = ManabaCourseNews(
-            course_id,
-            news_id,
-            news_title,
-            news_author,
-            news_posted_at,
-            last_edited_author,
-            last_edited_at,
-            news_html
-        )
-
-        attachments = soup.find_all("div", {"class": "inlineattachment"})
-        for attachment in attachments:
-            a_tag = attachment.find("div", {"class": "inlineaf-description"}).find("a")
-            manaba_course_news.add_file(ManabaFile(
-                manaba_course_news,
-                re.sub(r"(.+?) - ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})", r"\1",
-                       a_tag.text).strip(),
-                self.process_datetime(
-                    re.sub(r"(.+?) - ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})", r"\2",
-                           a_tag.text).strip()),
-                urljoin(self.__base_url + "/ct/", a_tag.get("href"))
-            ))
-
-        return manaba_course_news
+        return self._fetch("get_news", urls.news_url(self.__base_url, course_id, news_id),
+                           functools.partial(parsers.parse_news, course_id=course_id, news_id=news_id, base_url=self.__base_url, parser=self.__parser))
 
     def get_contents(self,
                      course_id: int) -> list[ManabaContent]:
@@ -1099,39 +1080,8 @@ class Manaba:
         Notes:
             一部の項目のプロパティは None になります。詳細情報は :func:`manaba.Manaba.get_content_pages` で取得できます。
         """
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
-
-        self.__response = self.session.get(
-            urljoin(self.__base_url, "/ct/course_" + str(course_id)) + "_page")
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
-
-        contents_list = soup.find("table", {"class": "contentslist"})
-        if contents_list is None:
-            return []
-
-        trs = contents_list.find_all("tr")
-        contents = []
-        for tr in trs:
-            about = tr.find("td", {"class": "about-contents"})
-            title = about.find("a").text.strip()
-            link = about.find("a").get("href")
-            content_id = re.sub(r"page_(.+)", r"\1", link)
-            description = about.find("span").text.strip()
-
-            contents.append(ManabaContent(
-                course_id,
-                content_id,
-                title,
-                description,
-                None,
-                None
-            ))
-
-        return contents
+        return self._fetch("get_contents", urls.contents_url(self.__base_url, course_id),
+                           functools.partial(parsers.parse_contents, course_id=course_id, parser=self.__parser))
 
     def get_content_pages(self,
                           content_id: str) -> list[ManabaContentPage]:
@@ -1144,43 +1094,8 @@ class Manaba:
         Notes:
             一部の項目のプロパティは None になります。詳細情報は :func:`manaba.Manaba.get_content_page` で取得できます。
         """
-        if not self.__logged_in:
-            raise ManabaNotLoggedIn()
-
-        self.__response = self.session.get(
-            urljoin(self.__base_url, "/ct/page_" + str(content_id)))
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
-
-        if soup.find("div", {"class": "articletext"}) is None:
-            raise ManabaNotFound()
-
-        course_link = soup.find("a", {"id": "coursename"}).get("href")
-        course_id: int = int(re.sub(r"course_([0-9]+)", r"\1", course_link))
-
-        contents_list = soup.find("ul", {"class": "contentslist"}).find_all("li")
-        pages = []
-        for content in contents_list:
-            page_title = content.text.strip()
-            page_link = content.find("a").get("href")
-            page_id: int = int(re.sub(r"page_[a-z0-9]+_([a-z0-9]+)", r"\1", page_link))
-            pages.append(ManabaContentPage(
-                course_id,
-                content_id,
-                page_id,
-                page_title,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None,
-                None
-            ))
-
-        return pages
+        return self._fetch("get_content_pages", urls.content_url(self.__base_url, content_id),
+                           functools.partial(parsers.parse_content_pages, content_id=content_id, parser=self.__parser))
 
     def get_content_page(self,
                          content_id: str,
@@ -1192,262 +1107,558 @@ class Manaba:
             content_id: 取得するコンテンツページのコンテンツ ID
             page_id: 取得するコンテンツページのコンテンツページ ID
         """
+        return self._fetch("get_content_page", urls.content_url(self.__base_url, content_id, page_id),
+                           functools.partial(parsers.parse_content_page, content_id=content_id, page_id=page_id, base_url=self.__base_url, parser=self.__parser))
+
+    def snapshot_course(self,
+                        course_id: int,
+                        max_workers: int = 8,
+                        kinds: Optional[list[str]] = None) -> ManabaCourseSnapshot:
+        """
+        指定したコースのすべての情報 (コース情報・各一覧とその詳細情報) をまとめて取得します。
+
+        Args:
+            course_id: 取得するコースのコース ID
+            max_workers: 同時に取得するページ数の上限
+            kinds: 取得する情報の種類 (course, querys, surveys, reports, threads, news_list, contents。指定しない場合はすべて)
+
+        Returns:
+            ManabaCourseSnapshot: コーススナップショット
+
+        Raises:
+            ManabaNotLoggedIn: ログインしていない場合
+            ValueError: kinds に不明な種類が含まれている場合
+
+        Notes:
+            一覧・詳細ページはスレッドプール上で並行して取得し、一覧を取得できたものから順に詳細ページの取得を始めます。
+            各項目の取得に失敗しても全体の取得は中断せず、失敗した項目は :func:`ManabaCourseSnapshot.errors` に記録されます。
+            各一覧の順序は一覧ページの順序と同じです。kinds に含まれない一覧は空 (コース情報は None) になります。
+            HTTP セッションのコネクションプールは既定で 10 接続 (pool_size を指定した場合はその数) のため、max_workers はそれ以下にすることを推奨します。
+        """
         if not self.__logged_in:
             raise ManabaNotLoggedIn()
 
-        print(urljoin(self.__base_url, "/ct/page_" + str(content_id) + "_" + str(page_id)))
-        self.__response = self.session.get(
-            urljoin(self.__base_url, "/ct/page_" + str(content_id) + "_" + str(page_id)))
-        if self.__response.status_code == 404 or self.__response.status_code == 403:
-            raise ManabaNotFound()
-        self.__response.raise_for_status()
-        soup = BeautifulSoup(self.__response.text, "html5lib")
+        tasks, build = self._snapshot_tasks(course_id, SNAPSHOT_KINDS if kinds is None else kinds)
+        return build(self._run_snapshot_tasks({course_id: tasks}, max_workers)[course_id])
 
-        if soup.find("div", {"class": "articletext"}) is None:
-            raise ManabaNotFound()
+    def plan_poll(self,
+                  course_ids: Optional[list[int]] = None) -> list[ManabaPollTarget]:
+        """
+        コース一覧ページのステータスランプから、更新を取得するコースと一覧の種類を決めます。
 
-        course_link = soup.find("a", {"id": "coursename"}).get("href")
-        course_id: int = int(re.sub(r"course_([0-9]+)", r"\1", course_link))
-
-        page_title = soup.find("h1", {"class": "pagetitle"}).text.strip()
-
-        pagelimitview = soup.find("div", {"class": "pagelimitview"}).text.strip()
-        publish_start_at = None
-        publish_end_at = None
-        if re.search(
-                r"([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}) ～ ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})",
-                pagelimitview) is not None:
-            # 開始・終了日時両方ある
-            publish_start_at = self.process_datetime(re.sub(
-                r".*([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}) ～ ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})",
-                r"\1",
-                pagelimitview))
-            publish_end_at = self.process_datetime(re.sub(
-                r".*([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}) ～ ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})",
-                r"\2",
-                pagelimitview))
-        elif re.search(r"([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}) ～", pagelimitview) is not None:
-            # 開始日時だけある
-            publish_start_at = self.process_datetime(re.sub(
-                r".*([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}) ～",
-                r"\1",
-                pagelimitview))
-        elif re.search(r"～ ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})", pagelimitview) is not None:
-            # 終了日時だけある
-            publish_end_at = self.process_datetime(re.sub(
-                r".*～ ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})",
-                r"\1",
-                pagelimitview))
-
-        article_author = soup.find("div", {"class": "articleauthor"}).text.strip()
-        last_edited_at = self.process_datetime(
-            re.sub(r"([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}) - (.+)- ([0-9.]+)版", r"\1", article_author))
-        page_author = re.sub(r"([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}) - (.+)- ([0-9.]+)版", r"\2",
-                             article_author)
-        version = re.sub(r"([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}) - (.+)- ([0-9.]+)版", r"\3", article_author)
-        viewable = soup.find("div", {"class": "pageviewdisabled"}) is None
-        html = None
-        if viewable:
-            article_text = soup.find("div", {"class": "articletext"})
-
-            html = str(article_text).replace(" ", "&nbsp;").strip()
-
-        manaba_content_page = ManabaContentPage(
-            course_id,
-            content_id,
-            page_id,
-            page_title,
-            page_author,
-            version,
-            viewable,
-            last_edited_at,
-            publish_start_at,
-            publish_end_at,
-            html
-        )
+        Args:
+            course_ids: 対象とするコースのコース ID (指定しない場合はコース一覧ページのすべてのコース)
 
-        if viewable:
-            attachments = soup.find_all("div", {"class": "inlineattachment"})
-            for attachment in attachments:
-                a_tag = attachment.find("div", {"class": "inlineaf-description"}).find("a")
-                manaba_content_page.add_file(ManabaFile(
-                    manaba_content_page,
-                    re.sub(r"(.+?) - ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})", r"\1",
-                           a_tag.text).strip(),
-                    self.process_datetime(
-                        re.sub(r"(.+?) - ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})", r"\2",
-                               a_tag.text).strip()),
-                    urljoin(self.__base_url + "/ct/", a_tag.get("href"))
-                ))
-
-        return manaba_content_page
+        Returns:
+            list[ManabaPollTarget]: ポーリング対象の一覧 (コース一覧ページの順序。点いているランプがないコースは含まない)
 
-    def get_latest_response(self) -> Optional[Response]:
+        Notes:
+            コース一覧ページ (:func:`manaba.Manaba.get_courses`) を 1 回だけ取得し、ランプと一覧の対応 (:data:`manaba.LAMP_POLL_KINDS`) から対象を決めます。
+            個人ランプに対応する一覧はこのライブラリにないため、個人ランプのみ点いているコースは対象としません。
+            ランプを取得できなかったコースは、すべての一覧を対象とします。
         """
-        最後のレスポンスを返します。デバッグのために利用することを想定しています。
+        targets: list[ManabaPollTarget] = []
+        for course in self.get_courses():
+            if course_ids is not None and course.course_id not in course_ids:
+                continue
+            lamps = course.status_lamps
+            if lamps is None:
+                lit = list(LAMP_POLL_KINDS)
+            else:
+                lit = [lamp for lamp in LAMP_POLL_KINDS if getattr(lamps, lamp)]
+            kinds = [kind for kind in POLL_KINDS if any(kind in LAMP_POLL_KINDS[lamp] for lamp in lit)]
+            if len(kinds) != 0:
+                targets.append(ManabaPollTarget(course, kinds))
+        return targets
+
+    def poll(self,
+             targets: Optional[list[ManabaPollTarget]] = None,
+             max_workers: int = 8) -> list[ManabaCourseSnapshot]:
+        """
+        ポーリング対象のコースの、対象の一覧とその詳細情報のみをまとめて取得します。
+
+        Args:
+            targets: ポーリング対象の一覧 (指定しない場合は :func:`manaba.Manaba.plan_poll` の結果)
+            max_workers: 同時に取得するページ数の上限 (すべてのコースで共有する)
 
         Returns:
-            Optional[Response]: レスポンス (ない場合は None)
+            list[ManabaCourseSnapshot]: 対象のコースごとのコーススナップショット (targets の順序)
+
+        Raises:
+            ManabaNotLoggedIn: ログインしていない場合
+
+        Notes:
+            すべてのコースの一覧・詳細ページを 1 つのスレッドプール上で並行して取得します。
+            各スナップショットは対象の一覧とその詳細情報のみを含み、コース情報は None になります。
+            取得に失敗した項目は、そのコースの :func:`ManabaCourseSnapshot.errors` に記録されます。
         """
-        return self.__response
+        if not self.__logged_in:
+            raise ManabaNotLoggedIn()
 
-    @staticmethod
-    def process_datetime(datetime_str: Optional[str]) -> Optional[datetime.datetime]:
+        if targets is None:
+            targets = self.plan_poll()
+        tasks: dict[int, list[_SnapshotTask]] = {}
+        builds: list[tuple[int, Callable[[list[ManabaSnapshotError]], ManabaCourseSnapshot]]] = []
+        for target in targets:
+            course_tasks, build = self._snapshot_tasks(target.course_id, target.kinds)
+            tasks.setdefault(target.course_id, []).extend(course_tasks)
+            builds.append((target.course_id, build))
+        errors = self._run_snapshot_tasks(tasks, max_workers)
+        return [build(errors[course_id]) for course_id, build in builds]
+
+    def _snapshot_tasks(self,
+                        course_id: int,
+                        kinds: Union[list[str], tuple[str, ...]]) \
+            -> tuple[list[_SnapshotTask], Callable[[list[ManabaSnapshotError]], ManabaCourseSnapshot]]:
         """
-        manabaの日時テキスト(YYYY-MM-DD HH:MM:SS)から datetime.datetime に変換する
+        コーススナップショットを取得するタスクを作成する
 
         Args:
-            datetime_str: manabaの日時テキスト
+            course_id: 取得するコースのコース ID
+            kinds: 取得する情報の種類
 
         Returns:
-            Optional[datetime.datetime]: 変換後の datetime.datetime
+            tuple[list[_SnapshotTask], Callable[[list[ManabaSnapshotError]], ManabaCourseSnapshot]]:
+                最初に実行するタスク, すべてのタスクの完了後に取得に失敗した項目からスナップショットを作成する関数
+
+        Raises:
+            ValueError: kinds に不明な種類が含まれている場合
         """
-        if datetime_str is None or datetime_str == "":
-            return None
-        datetime_str = datetime_str.replace("  ", " ")
-        datetime_format = "%Y-%m-%d %H:%M:%S %z" if len(datetime_str) == 19 else "%Y-%m-%d %H:%M %z"
-        return datetime.datetime.strptime(datetime_str + " +0900", datetime_format).astimezone(JST)
+        unknown = [kind for kind in kinds if kind not in SNAPSHOT_KINDS]
+        if len(unknown) != 0:
+            raise ValueError("unknown snapshot kinds: %s" % ", ".join(unknown))
+
+        course: list[ManabaCourse] = []
+        querys: list[Optional[Union[ManabaQueryDetails, ManabaDrillDetails]]] = []
+        surveys: list[Optional[ManabaSurveyDetails]] = []
+        reports: list[Optional[ManabaReportDetails]] = []
+        threads: list[Optional[ManabaThread]] = []
+        news: list[Optional[ManabaCourseNews]] = []
+        contents: list[ManabaContent] = []
+        content_pages: dict[str, list[Optional[ManabaContentPage]]] = {}
+
+        def store(slots: list[Optional[T]],
+                  index: int) -> Callable[[T], list[_SnapshotTask]]:
+            def on_result(result: T) -> list[_SnapshotTask]:
+                slots[index] = result
+                return []
+
+            return on_result
+
+        def on_course(result: ManabaCourse) -> list[_SnapshotTask]:
+            course.append(result)
+            return []
 
-    @staticmethod
-    def _opt_value(items: dict[str, str],
-                   key: str) -> Optional[str]:
-        if key not in items or items[key] is None:
-            return None
-        return items[key].strip()
+        def on_querys(result: list[ManabaQuery]) -> list[_SnapshotTask]:
+            querys.extend([None] * len(result))
+            tasks: list[_SnapshotTask] = []
+            for i, query in enumerate(result):
+                on_result: Callable[[Union[ManabaQueryDetails, ManabaDrillDetails]], list[_SnapshotTask]] = store(querys, i)
+                if query.is_drill:
+                    tasks.append(_snapshot_task("drill", query.query_id,
+                                                functools.partial(self.get_drill, course_id, query.query_id),
+                                                on_result))
+                else:
+                    tasks.append(_snapshot_task("query", query.query_id,
+                                                functools.partial(self.get_query, course_id, query.query_id),
+                                                on_result))
+            return tasks
+
+        def on_surveys(result: list[ManabaSurvey]) -> list[_SnapshotTask]:
+            surveys.extend([None] * len(result))
+            return [_snapshot_task("survey", survey.survey_id,
+                                   functools.partial(self.get_survey, course_id, survey.survey_id),
+                                   store(surveys, i)) for i, survey in enumerate(result)]
+
+        def on_reports(result: list[ManabaReport]) -> list[_SnapshotTask]:
+            reports.extend([None] * len(result))
+            return [_snapshot_task("report", report.report_id,
+                                   functools.partial(self.get_report, course_id, report.report_id),
+                                   store(reports, i)) for i, report in enumerate(result)]
+
+        def on_threads(result: list[ManabaThread]) -> list[_SnapshotTask]:
+            threads.extend([None] * len(result))
+            return [_snapshot_task("thread", thread.thread_id,
+                                   functools.partial(self.get_thread, course_id, thread.thread_id),
+                                   store(threads, i)) for i, thread in enumerate(result)]
+
+        def on_news_list(result: list[ManabaCourseNews]) -> list[_SnapshotTask]:
+            news.extend([None] * len(result))
+            return [_snapshot_task("news", item.news_id,
+                                   functools.partial(self.get_news, course_id, item.news_id),
+                                   store(news, i)) for i, item in enumerate(result)]
+
+        def on_contents(result: list[ManabaContent]) -> list[_SnapshotTask]:
+            contents.extend(result)
+            return [_snapshot_task("content_pages", content.content_id,
+                                   functools.partial(self.get_content_pages, content.content_id),
+                                   functools.partial(on_content_pages, content.content_id))
+                    for content in result]
+
+        def on_content_pages(content_id: str,
+                             result: list[ManabaContentPage]) -> list[_SnapshotTask]:
+            pages: list[Optional[ManabaContentPage]] = [None] * len(result)
+            content_pages[content_id] = pages
+            return [_snapshot_task("content_page", page.page_id,
+                                   functools.partial(self.get_content_page, content_id, page.page_id),
+                                   store(pages, i)) for i, page in enumerate(result)]
+
+        first: dict[str, _SnapshotTask] = {
+            "course": _snapshot_task("course", None, functools.partial(self.get_course, course_id), on_course),
+            "querys": _snapshot_task("querys", None, functools.partial(self.get_querys, course_id), on_querys),
+            "surveys": _snapshot_task("surveys", None, functools.partial(self.get_surveys, course_id), on_surveys),
+            "reports": _snapshot_task("reports", None, functools.partial(self.get_reports, course_id), on_reports),
+            "threads": _snapshot_task("threads", None, functools.partial(self.get_threads, course_id), on_threads),
+            "news_list": _snapshot_task("news_list", None, functools.partial(self.get_news_list, course_id),
+                                        on_news_list),
+            "contents": _snapshot_task("contents", None, functools.partial(self.get_contents, course_id), on_contents),
+        }
+
+        def build(errors: list[ManabaSnapshotError]) -> ManabaCourseSnapshot:
+            return ManabaCourseSnapshot(
+                course_id,
+                course[0] if len(course) != 0 else None,
+                [query for query in querys if query is not None],
+                [survey for survey in surveys if survey is not None],
+                [report for report in reports if report is not None],
+                [thread for thread in threads if thread is not None],
+                [item for item in news if item is not None],
+                [ManabaContent(content.course_id,
+                               content.content_id,
+                               content.title,
+                               content.description,
+                               content.updated_at,
+                               [page for page in content_pages[content.content_id] if page is not None])
+                 for content in contents if content.content_id in content_pages],
+                errors
+            )
+
+        return [task for kind, task in first.items() if kind in kinds], build
 
     @staticmethod
-    def _parse_status(status_text: str) -> ManabaTaskStatus:
-        statuses = status_text.split("\n")
-        statuses = list(map(lambda x: x.strip(), statuses))
-        statuses = list(filter(lambda x: len(x) != 0, statuses))
-        if len(statuses) == 1:
-            # 受付開始待ちなど1行しか状態がない
-            task_status = get_task_status(statuses[0].strip())
-            if task_status is None:
-                raise ManabaInternalError(
-                    "get_task_status return None (" + statuses[0].strip() + ")")
-            return ManabaTaskStatus(task_status, None)
-
-        if len(statuses) == 2:
-            task_status = get_task_status(statuses[0].strip())
-            if task_status is None:
-                raise ManabaInternalError(
-                    "get_task_status return None (" + statuses[0].strip() + ")")
-
-            your_status: Optional[ManabaTaskYourStatusFlag]
-            if "まだ提出は可能です" in statuses[1]:  # 未提出 & ※遅延として取り扱われますが、まだ提出は可能です。
-                your_status = ManabaTaskYourStatusFlag.UNSUBMITTED
-            elif "回提出済み" in statuses[1]:  # ドリル対策。未合格で締め切られている場合「n回提出済み」になる？
-                your_status = ManabaTaskYourStatusFlag.UNPASSED
-            elif "受験回数" in statuses[1]:  # ドリル対策。未合格で締め切られている場合「受験回数: n」になる
-                your_status = ManabaTaskYourStatusFlag.UNPASSED
-            elif "個別指導／相互閲覧画面へ" in statuses[1] and task_status == ManabaTaskStatusFlag.CLOSED:  # タスククローズ + 未提出？
-                your_status = ManabaTaskYourStatusFlag.UNSUBMITTED
-            else:
-                your_status = get_your_status(statuses[1].strip())
-                if your_status is None:
-                    raise ManabaInternalError(
-                        "your_status return None (" + statuses[1].strip() + ")")
+    def _run_snapshot_tasks(tasks: dict[int, list[_SnapshotTask]],
+                            max_workers: int) -> dict[int, list[ManabaSnapshotError]]:
+        """
+        コーススナップショットを取得するタスクを 1 つのスレッドプール上で実行する
 
-            return ManabaTaskStatus(task_status, your_status)
+        Args:
+            tasks: コース ID ごとの最初に実行するタスク
+            max_workers: 同時に実行するタスク数の上限
 
-        if len(statuses) == 3:
-            task_status = get_task_status(statuses[0].strip())
-            if task_status is None:
-                raise ManabaInternalError(
-                    "get_task_status return None (" + statuses[0].strip() + ")")
+        Returns:
+            dict[int, list[ManabaSnapshotError]]: コース ID ごとの取得に失敗した項目の一覧
+        """
+        errors: dict[int, list[ManabaSnapshotError]] = {course_id: [] for course_id in tasks}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: dict[Future[tuple[list[_SnapshotTask], Optional[ManabaSnapshotError]]], int] = {
+                executor.submit(task): course_id for course_id, course_tasks in tasks.items() for task in course_tasks
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    course_id = pending.pop(future)
+                    next_tasks, error = future.result()
+                    if error is not None:
+                        errors[course_id].append(error)
+                    for task in next_tasks:
+                        pending[executor.submit(task)] = course_id
+        return errors
+
+    def download_files(self,
+                       files: list[ManabaFile],
+                       dest_dir: str,
+                       max_workers: int = 4,
+                       chunk_size: int = 1024 * 1024) -> list[ManabaDownloadResult]:
+        """
+        ファイルを指定したディレクトリにダウンロードします。
 
-            if "まだ提出は可能です" in statuses[1]:  # 未提出 & ※遅延として取り扱われますが、まだ提出は可能です。
-                your_status = ManabaTaskYourStatusFlag.UNSUBMITTED
-            else:
-                your_status = get_your_status(statuses[1].strip())
-                if your_status is None:
-                    your_status = get_your_status(statuses[2].strip())
-                    if your_status is None:
-                        if task_status == ManabaTaskStatusFlag.CLOSED:
-                            your_status = ManabaTaskYourStatusFlag.UNPASSED
-                        else:
-                            raise ManabaInternalError(
-                                "your_status return None (" + statuses[1].strip() + " | " + statuses[2].strip() + ")")
-
-            return ManabaTaskStatus(task_status, your_status)
-
-        if len(statuses) == 4:
-            task_status = get_task_status(statuses[0].strip())
-            if task_status is None:
-                raise ManabaInternalError(
-                    "get_task_status return None (" + statuses[0].strip() + ")")
-
-            if "合格済み" in statuses[3].strip():
-                your_status = ManabaTaskYourStatusFlag.PASSED
-            else:
-                your_status = get_your_status(statuses[2].strip())
-                if your_status is None:
-                    raise ManabaInternalError(
-                        "your_status return None (" + statuses[2].strip() + ")")
+        Args:
+            files: ダウンロードするファイルの一覧
+            dest_dir: 保存先のディレクトリ (存在しない場合は作成する)
+            max_workers: 同時にダウンロードするファイル数の上限
+            chunk_size: 一度に読み込み・書き込みするバイト数
+
+        Returns:
+            list[ManabaDownloadResult]: ファイルごとのダウンロード結果 (files と同じ順)
+
+        Raises:
+            ManabaNotLoggedIn: ログインしていない場合
+
+        Notes:
+            ファイルはチャンクごとに "ファイル名.part" へ書き込み、完了後にファイル名を変更します。
+            "ファイル名.part" が残っている場合は、Range リクエストで続きからダウンロードします。
+            続きは、ダウンロード開始時のファイルの検証子 (ETag または Last-Modified、"ファイル名.part.validator" に保存) を
+            If-Range に指定し、サーバー上のファイルが差し替えられていない場合のみつなげます (差し替えられている場合は最初からダウンロードします)。
+            完了したファイルの更新日時はアップロード日時に設定し、更新日時とサイズが変わっていないファイルはダウンロードしません。
+            ファイル名のパス区切り文字より前の部分は除き、制御文字は "_" に置き換えます (空・"."・".." の場合は "file" とします)。
+            同じファイル名 (大文字・小文字を区別しない) のファイルが複数ある場合、2 件目以降は "ファイル名 (2).拡張子" のように保存します。
+        """
+        if not self.__logged_in:
+            raise ManabaNotLoggedIn()
+
+        os.makedirs(dest_dir, exist_ok=True)
+        paths: list[str] = []
+        used: set[str] = set()
+        for file in files:
+            name = self._safe_file_name(file.name)
+            stem, ext = os.path.splitext(name)
+            number = 1
+            # 大文字・小文字を区別しないファイルシステムでも上書きしないよう、大文字・小文字を無視して比較する
+            while name.casefold() in used:
+                number += 1
+                name = "%s (%d)%s" % (stem, number, ext)
+            used.add(name.casefold())
+            paths.append(os.path.join(dest_dir, name))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(functools.partial(self._download_file, chunk_size=chunk_size), files, paths))
+
+    @staticmethod
+    def _safe_file_name(name: str) -> str:
+        """
+        添付ファイル名を、保存先のディレクトリ内のファイル名として安全な名前にする
 
-            return ManabaTaskStatus(task_status, your_status)
+        Args:
+            name: 添付ファイル名
 
-        raise ManabaInternalError("td_tags length not matched (" + str(len(statuses)) + ")")
+        Returns:
+            str: パス区切り文字の前を除き、NUL などの制御文字を "_" に置き換えたファイル名 (空・"."・".." の場合は "file")
+        """
+        name = name.replace("\\", "/").rsplit("/", 1)[-1]
+        name = "".join("_" if ord(char) < 0x20 or char == "\x7f" else char for char in name).strip()
+        if name in ("", ".", ".."):
+            return "file"
+        return name
+
+    def _download_file(self,
+                       file: ManabaFile,
+                       path: str,
+                       chunk_size: int) -> ManabaDownloadResult:
+        """
+        ファイルを 1 件ダウンロードする
+
+        Args:
+            file: ダウンロードするファイル
+            path: 保存先のパス
+            chunk_size: 一度に読み込み・書き込みするバイト数
+
+        Returns:
+            ManabaDownloadResult: ダウンロード結果
+        """
+        try:
+            uploaded_at = file.uploaded_at.timestamp() if file.uploaded_at is not None else None
+            if os.path.exists(path) and uploaded_at is not None and os.path.getmtime(path) == uploaded_at:
+                try:
+                    head = self._get(file.download_url, stream=True, method="HEAD")
+                except (ManabaNotFound, requests.HTTPError):
+                    head = None
+                if head is not None:
+                    head.close()
+                    length = head.headers.get("Content-Length")
+                    if length is None or int(length) == os.path.getsize(path):
+                        return ManabaDownloadResult(file, path, ManabaDownloadStatus.SKIPPED, 0, None)
+
+            part_path = path + ".part"
+            validator_path = part_path + ".validator"
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            validator: Optional[str] = None
+            if offset > 0 and os.path.exists(validator_path):
+                with open(validator_path, encoding="utf-8") as f:
+                    validator = f.read()
+            # 保存済みの部分と同じ版のファイルの場合のみ続きを返すよう If-Range を付ける (版が分からない場合は最初から取得する)
+            headers = {"Range": "bytes=%d-" % offset, "If-Range": validator} if validator else None
+            try:
+                response = self._get(file.download_url, headers, True)
+            except requests.HTTPError as e:
+                # 保存済みの部分がサーバー上のファイルより大きい (ファイルが差し替えられた)
+                if headers is None or e.response is None or e.response.status_code != 416:
+                    raise
+                response = self._get(file.download_url, stream=True)
+
+            resumed = headers is not None and response.status_code == 206
+            if resumed and self._range_validator(response) != validator:
+                # If-Range に対応していないサーバーが、差し替えられたファイルの続きを返した
+                response.close()
+                response = self._get(file.download_url, stream=True)
+                resumed = False
+            if not resumed:
+                new_validator = self._range_validator(response)
+                if new_validator is not None:
+                    with open(validator_path, "w", encoding="utf-8") as f:
+                        f.write(new_validator)
+                elif os.path.exists(validator_path):
+                    os.remove(validator_path)
+
+            downloaded_bytes = 0
+            with response, open(part_path, "ab" if resumed else "wb") as f:
+                for chunk in response.iter_content(chunk_size):
+                    f.write(chunk)
+                    downloaded_bytes += len(chunk)
+
+            os.replace(part_path, path)
+            if os.path.exists(validator_path):
+                os.remove(validator_path)
+            if uploaded_at is not None:
+                os.utime(path, (uploaded_at, uploaded_at))
+            status = ManabaDownloadStatus.RESUMED if resumed else ManabaDownloadStatus.DOWNLOADED
+            return ManabaDownloadResult(file, path, status, downloaded_bytes, None)
+        except Exception as e:
+            return ManabaDownloadResult(file, path, ManabaDownloadStatus.FAILED, 0, e)
 
     @staticmethod
-    def _parse_grade_bar(gradelist: bs4.element.Tag) -> Optional[ManabaGradePosition]:
-        bar_form = gradelist.find("table", {"class": "form"})
-        if bar_form is None:
-            return None
-
-        bars = bar_form.find_all("td")
-        if len(bars) == 1:
-            below_percent = None
-            my_position_percent = int(bars[0].get("width").replace("%", ""))
-            above_percent = None
-
-            return ManabaGradePosition(below_percent, my_position_percent, above_percent)
-
-        if len(bars) == 2:
-            if bars[0].get("class") is not None and "gradebar" in bars[0].get("class"):
-                # 最低点
-                below_percent = None
-                my_position_percent = int(bars[0].get("width").replace("%", ""))
-                above_percent = int(bars[1].get("width").replace("%", ""))
-            elif bars[1].get("class") is not None and "gradebar" in bars[1].get("class"):
-                below_percent = int(bars[0].get("width").replace("%", ""))
-                my_position_percent = int(bars[1].get("width").replace("%", ""))
-                above_percent = None
-            else:
-                raise ManabaInternalError("_parse_grade_bar not found gradebar")
+    def _range_validator(response: Response) -> Optional[str]:
+        """
+        If-Range に使用するレスポンスの検証子を取得する
 
-            return ManabaGradePosition(below_percent, my_position_percent, above_percent)
+        Args:
+            response: レスポンス
 
-        if len(bars) == 3:
-            below_percent = int(bars[0].get("width").replace("%", ""))
-            my_position_percent = int(bars[1].get("width").replace("%", ""))
-            above_percent = int(bars[2].get("width").replace("%", ""))
+        Returns:
+            Optional[str]: 強い ETag、ない場合は Last-Modified (どちらもない場合は None)
+        """
+        etag = response.headers.get("ETag")
+        if etag is not None and not etag.startswith("W/"):
+            return etag
+        return response.headers.get("Last-Modified")
+
+    def sync(self,
+             store: ManabaStore,
+             course_ids: Optional[list[int]] = None) -> ManabaSyncResult:
+        """
+        参加しているコースの情報をローカルストアに差分同期します。
 
-            return ManabaGradePosition(below_percent, my_position_percent, above_percent)
+        Args:
+            store: 同期先のローカルストア
+            course_ids: 同期するコースのコース ID (指定しない場合は参加しているすべてのコース)
 
-        raise ManabaInternalError("_parse_grade_bar not parseable")
+        Returns:
+            ManabaSyncResult: 同期結果
 
+        Notes:
+            各一覧ページの項目のフィンガープリントをストアと比較し、新規・変更された項目のみ詳細ページを取得します。
+            スレッドのコメントは、保存されている最新のコメント以降を :func:`manaba.Manaba.get_thread_since` で取得します。
+            コンテンツは、すべてのページを取得できた場合のみ保存します (取得に失敗したページは次回の同期で取得しなおします)。
+            一覧ページからなくなった項目はストアから削除しません。
+        """
+        updated: list[StoreKey] = []
+        errors: list[ManabaSnapshotError] = []
 
-class ManabaNotLoggedIn(Exception):
-    """
-    manaba にログインしている必要があるがしていない
-    """
+        def attempt(kind: str,
+                    item_id: Optional[Union[int, str]],
+                    fetch: Callable[[], T]) -> Optional[T]:
+            try:
+                return fetch()
+            except Exception as e:
+                errors.append(ManabaSnapshotError(kind, item_id, e))
+                return None
+
+        def sync_item(course_id: int,
+                      kind: str,
+                      item_id: Union[int, str],
+                      item_fingerprint: str,
+                      fetch: Callable[[], ManabaModel]) -> None:
+            if store.get_fingerprint(course_id, kind, item_id) == item_fingerprint:
+                return
+            model = attempt(kind, item_id, fetch)
+            if model is not None:
+                store.put(course_id, kind, item_id, model, item_fingerprint)
+                updated.append((course_id, kind, str(item_id)))
+
+        courses = attempt("courses", None, self.get_courses_all)
+        for course in courses or []:
+            course_id = course.course_id
+            if course_ids is not None and course_id not in course_ids:
+                continue
+            sync_item(course_id, "course", course_id, fingerprint(course), functools.partial(self.get_course, course_id))
 
+            for query in attempt("querys", None, functools.partial(self.get_querys, course_id)) or []:
+                if query.is_drill:
+                    sync_item(course_id, "drill", query.query_id, fingerprint(query),
+                              functools.partial(self.get_drill, course_id, query.query_id))
+                else:
+                    sync_item(course_id, "query", query.query_id, fingerprint(query),
+                              functools.partial(self.get_query, course_id, query.query_id))
+            for survey in attempt("surveys", None, functools.partial(self.get_surveys, course_id)) or []:
+                sync_item(course_id, "survey", survey.survey_id, fingerprint(survey),
+                          functools.partial(self.get_survey, course_id, survey.survey_id))
+            for report in attempt("reports", None, functools.partial(self.get_reports, course_id)) or []:
+                sync_item(course_id, "report", report.report_id, fingerprint(report),
+                          functools.partial(self.get_report, course_id, report.report_id))
+            for news in attempt("news_list", None, functools.partial(self.get_news_list, course_id)) or []:
+                sync_item(course_id, "news", news.news_id, fingerprint(news),
+                          functools.partial(self.get_news, course_id, news.news_id))
+
+            for content in attempt("contents", None, functools.partial(self.get_contents, course_id)) or []:
+                content_fingerprint = fingerprint(content)
+                if store.get_fingerprint(course_id, "content", content.content_id) == content_fingerprint:
+                    continue
+                pages = attempt("content_pages", content.content_id,
+                                functools.partial(self.get_content_pages, content.content_id))
+                if pages is None:
+                    continue
+                error_count = len(errors)
+                for page in pages:
+                    sync_item(course_id, "content_page", content.content_id + "_" + str(page.page_id), fingerprint(page),
+                              functools.partial(self.get_content_page, content.content_id, page.page_id))
+                if len(errors) != error_count:
+                    # 取得に失敗したページを次回の同期で取得しなおすため、コンテンツのフィンガープリントは保存しない
+                    continue
+                store.put(course_id, "content", content.content_id, content, content_fingerprint)
+                updated.append((course_id, "content", content.content_id))
+
+            for thread in attempt("threads", None, functools.partial(self.get_threads, course_id)) or []:
+                held = [comment for comment in store.items(course_id, "thread_comment", str(thread.thread_id) + "_")
+                        if isinstance(comment, ManabaThreadComment)]
+                held.sort(key=lambda comment: comment.comment_id)
+                last_comment_id = held[-1].comment_id if len(held) != 0 else 0
+                update = attempt("thread", thread.thread_id, functools.partial(
+                    self.get_thread_since, course_id, thread.thread_id, last_comment_id,
+                    ManabaThread(course_id, thread.thread_id, thread.title, held)))
+                if update is None:
+                    continue
+                for comment in update.new_comments + update.changed_comments:
+                    item_id = str(thread.thread_id) + "_" + str(comment.comment_id)
+                    store.put(course_id, "thread_comment", item_id, comment)
+                    updated.append((course_id, "thread_comment", item_id))
+
+        return ManabaSyncResult(updated, errors)
 
-class ManabaNotFound(Exception):
-    """
-    manaba のコース等ページにアクセスしたが、そのページが見つからなかった
-    """
+    def get_latest_response(self) -> Optional[Response]:
+        """
+        このスレッドの最後のレスポンスを返します。デバッグのために利用することを想定しています。
 
+        Returns:
+            Optional[Response]: レスポンス (ない場合、keep_latest_response を指定していない場合は None)
 
-class ManabaInternalError(Exception):
-    """
-    処理に失敗した
-    """
+        Notes:
+            非推奨です。:func:`manaba.Manaba.get_latest_trace` を使用してください。
+            レスポンスの本文を保持し続けないよう、keep_latest_response=True を指定した場合のみ保持します。
+        """
+        warnings.warn("get_latest_response() is deprecated, use get_latest_trace() instead", DeprecationWarning,
+                      stacklevel=2)
+        return cast(Optional[Response], getattr(self.__latest, "response", None))
 
+    def get_latest_trace(self) -> Optional[ManabaTrace]:
+        """
+        このスレッドが最後に送信したリクエストのトレースを返します。デバッグのために利用することを想定しています。
 
-class ManabaContentDisabled(Exception):
-    """
-    コンテンツページが無効化（公開期間外などにより）されている
-    """
+        Returns:
+            Optional[ManabaTrace]: トレース (ない場合、trace の max_entries が 0 の場合は None)
+
+        Notes:
+            他のスレッドのリクエストを含む以前のリクエストは :attr:`manaba.Manaba.trace` から検索できます。
+        """
+        return cast(Optional[ManabaTrace], getattr(self.__latest, "trace", None))
+
+    @staticmethod
+    def process_datetime(datetime_str: Optional[str]) -> Optional[datetime.datetime]:
+        """
+        manabaの日時テキスト(YYYY-MM-DD HH:MM:SS)から datetime.datetime に変換する
+
+        Args:
+            datetime_str: manabaの日時テキスト
+
+        Returns:
+            Optional[datetime.datetime]: 変換後の datetime.datetime
+        """
+        return parsers.process_datetime(datetime_str)
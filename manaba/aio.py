@@ -0,0 +1,368 @@
+"""
+manaba 非同期ライブラリ
+
+:class:`manaba.Manaba` と同じメソッドを asyncio から利用できるようにしたクライアントです。
+HTTP 通信には aiohttp (``pip install get-manaba[async]``) を使用します。
+"""
+import asyncio
+import contextlib
+import functools
+from concurrent.futures import Executor
+from types import TracebackType
+from typing import Callable, Iterator, Optional, Type, TypeVar
+from urllib.parse import urlparse
+
+import aiohttp
+import requests
+from bs4.builder import builder_registry
+
+from manaba import parsers, urls
+from manaba.exceptions import ManabaNotFound, ManabaNotLoggedIn
+from manaba.models.ManabaContent import ManabaContent
+from manaba.models.ManabaContentPage import ManabaContentPage
+from manaba.models.ManabaCourse import ManabaCourse
+from manaba.models.ManabaCourseNews import ManabaCourseNews
+from manaba.models.ManabaDrillDetails import ManabaDrillDetails
+from manaba.models.ManabaQuery import ManabaQuery
+from manaba.models.ManabaQueryDetails import ManabaQueryDetails
+from manaba.models.ManabaReport import ManabaReport
+from manaba.models.ManabaReportDetails import ManabaReportDetails
+from manaba.models.ManabaSurvey import ManabaSurvey
+from manaba.models.ManabaSurveyDetails import ManabaSurveyDetails
+from manaba.models.ManabaThread import ManabaThread
+from manaba.parsers import DEFAULT_PARSER
+
+T = TypeVar("T")
+
+
+@contextlib.contextmanager
+def _requests_errors() -> Iterator[None]:
+    """
+    aiohttp の通信エラーを、:class:`manaba.Manaba` と同じ requests の例外に変換する
+
+    Raises:
+        requests.Timeout: タイムアウトした場合
+        requests.ConnectionError: 接続できなかった場合
+    """
+    try:
+        yield
+    except asyncio.TimeoutError as e:
+        # aiohttp.ServerTimeoutError は ClientConnectionError のサブクラスでもあるため、先に判定する
+        raise requests.Timeout(str(e)) from e
+    except aiohttp.ClientConnectionError as e:
+        raise requests.ConnectionError(str(e)) from e
+
+
+class AsyncManaba:
+    """
+    manaba 非同期ライブラリ
+
+    Notes:
+        ページのパースは :mod:`manaba.parsers` を :class:`manaba.Manaba` と共有し、イベントループをブロックしないよう executor 上で実行します。
+        ページを取得する get_* メソッドと login() のみを提供します。セッション切れ (ログインページへのリダイレクト) の検出と、
+        発生する例外の種類 (ManabaNotLoggedIn, ManabaNotFound, requests.HTTPError, requests.ConnectionError, requests.Timeout) は
+        :class:`manaba.Manaba` と同じです。
+        :class:`manaba.Manaba` の次の機能はありません: リトライ・セッション切れ時の再ログイン、ページキャッシュ、
+        iter_news() などのページ送り、get_thread_since()、snapshot_course()・sync()・download_files() などの一括取得、
+        observers・トレース・レートリミッター・同時リクエスト数の自動調整。
+    """
+
+    def __init__(self,
+                 base_url: str,
+                 parser: str = DEFAULT_PARSER,
+                 connection_limit: int = 100,
+                 parse_executor: Optional[Executor] = None) -> None:
+        """
+        manaba 非同期ライブラリ
+
+        Args:
+            base_url: manaba のベース URL
+            parser: HTML のパースに使用する BeautifulSoup のパーサーバックエンド (html5lib, lxml, html.parser)
+            connection_limit: コネクションプールの最大同時接続数
+            parse_executor: パースを実行する executor (指定しない場合はイベントループの既定の executor)
+
+        Raises:
+            ValueError: 指定したパーサーバックエンドが利用できない場合
+        """
+        if builder_registry.lookup(parser) is None:
+            raise ValueError("parser backend is not available (" + parser + ")")
+
+        self.__base_url: str = base_url
+        self.__parser: str = parser
+        self.__connection_limit: int = connection_limit
+        self.__parse_executor: Optional[Executor] = parse_executor
+        self.__session: Optional[aiohttp.ClientSession] = None
+        self.__logged_in: bool = False
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        HTTP セッション (初回アクセス時に作成されます)
+
+        Returns:
+            aiohttp.ClientSession: HTTP セッション
+        """
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.__connection_limit),
+                cookie_jar=aiohttp.CookieJar(unsafe=True)
+            )
+        return self.__session
+
+    @property
+    def parser(self) -> str:
+        """
+        HTML のパースに使用するパーサーバックエンド
+
+        Returns:
+            str: パーサーバックエンド名
+        """
+        return self.__parser
+
+    async def close(self) -> None:
+        """
+        HTTP セッションを閉じる
+        """
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def __aenter__(self) -> "AsyncManaba":
+        return self
+
+    async def __aexit__(self,
+                        exc_type: Optional[Type[BaseException]],
+                        exc_value: Optional[BaseException],
+                        traceback: Optional[TracebackType]) -> None:
+        await self.close()
+
+    async def _get(self,
+                   url: str) -> str:
+        """
+        ページを取得する
+
+        Args:
+            url: 取得するページの URL
+
+        Returns:
+            str: ページの HTML
+
+        Raises:
+            ManabaNotLoggedIn: ログインしていない場合 (セッションが切れている場合を含む)
+            ManabaNotFound: ページが見つからない (404, 403) 場合
+            requests.HTTPError: そのほかのエラーのレスポンスの場合
+            requests.ConnectionError: 接続できなかった場合
+            requests.Timeout: タイムアウトした場合
+        """
+        if not self.__logged_in:
+            raise ManabaNotLoggedIn()
+
+        with _requests_errors():
+            async with self.session.get(url) as response:
+                if response.status == 404 or response.status == 403:
+                    raise ManabaNotFound()
+                if response.status >= 400:
+                    raise requests.HTTPError("%d %s for url: %s" % (response.status, response.reason, response.url))
+                markup = await response.text()
+                login_page = urlparse(str(response.url)).path == urlparse(urls.login_url(self.__base_url)).path or \
+                    ("html" in response.headers.get("Content-Type", "") and parsers.is_login_page(markup))
+
+        if login_page:
+            self.__logged_in = False
+            raise ManabaNotLoggedIn()
+        return markup
+
+    async def _parse(self,
+                     parse: Callable[[], T]) -> T:
+        """
+        executor 上でページをパースする
+
+        Args:
+            parse: :mod:`manaba.parsers` のパース関数に引数を束縛したもの (functools.partial)
+
+        Returns:
+            T: パース結果
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__parse_executor, parse)
+
+    async def login(self,
+                    username: str,
+                    password: str) -> bool:
+        """
+        manaba にログインする
+
+        Args:
+            username: manaba ユーザー名
+            password: manaba パスワード
+
+        Returns:
+            bool: ログインできたか
+
+        Raises:
+            requests.ConnectionError: 接続できなかった場合
+            requests.Timeout: タイムアウトした場合
+        """
+        with _requests_errors():
+            async with self.session.get(urls.login_url(self.__base_url)) as response:
+                if response.status != 200:
+                    return False
+                markup = await response.text()
+            login_form = await self._parse(functools.partial(parsers.parse_login_form, markup, self.__parser))
+
+            async with self.session.post(urls.login_url(self.__base_url), params={
+                "userid": username,
+                "password": password,
+                "login": login_form["login"],
+                "manaba-form": "1",
+                "sessionValue1": login_form["sessionValue1"],
+                "sessionValue": login_form["sessionValue"]
+            }) as response:
+                self.__logged_in = len(response.history) == 1 and response.history[0].status == 302
+
+        return self.__logged_in
+
+    async def get_course(self,
+                         course_id: int) -> ManabaCourse:
+        """
+        指定したコース ID のコース情報を取得します。 (:func:`manaba.Manaba.get_course` を参照)
+        """
+        markup = await self._get(urls.course_url(self.__base_url, course_id))
+        return await self._parse(functools.partial(parsers.parse_course, markup, course_id, self.__parser))
+
+    async def get_courses(self) -> list[ManabaCourse]:
+        """
+        参加しているコース情報を取得する (:func:`manaba.Manaba.get_courses` を参照)
+        """
+        markup = await self._get(urls.courses_url(self.__base_url))
+        return await self._parse(functools.partial(parsers.parse_courses, markup, self.__parser))
+
+    async def get_courses_all(self) -> list[ManabaCourse]:
+        """
+        参加しているすべてのコース情報を取得する (:func:`manaba.Manaba.get_courses_all` を参照)
+        """
+        markup = await self._get(urls.courses_all_url(self.__base_url))
+        return await self._parse(functools.partial(parsers.parse_courses, markup, self.__parser))
+
+    async def get_querys(self,
+                         course_id: int) -> list[ManabaQuery]:
+        """
+        指定したコースの小テスト一覧を取得します。 (:func:`manaba.Manaba.get_querys` を参照)
+        """
+        markup = await self._get(urls.querys_url(self.__base_url, course_id))
+        return await self._parse(functools.partial(parsers.parse_querys, markup, course_id, self.__parser))
+
+    async def get_query(self,
+                        course_id: int,
+                        query_id: int) -> ManabaQueryDetails:
+        """
+        指定したコース・小テスト ID の小テスト詳細情報を取得します。 (:func:`manaba.Manaba.get_query` を参照)
+        """
+        markup = await self._get(urls.query_url(self.__base_url, course_id, query_id))
+        return await self._parse(functools.partial(parsers.parse_query_details, markup, course_id, query_id, self.__parser))
+
+    async def get_drill(self,
+                        course_id: int,
+                        drill_id: int) -> ManabaDrillDetails:
+        """
+        指定したコース・小テストドリル ID の詳細情報を取得します。 (:func:`manaba.Manaba.get_drill` を参照)
+        """
+        markup = await self._get(urls.drill_url(self.__base_url, course_id, drill_id))
+        return await self._parse(functools.partial(parsers.parse_drill_details, markup, course_id, drill_id, self.__parser))
+
+    async def get_surveys(self,
+                          course_id: int) -> list[ManabaSurvey]:
+        """
+        指定したコースのアンケート一覧を取得します。 (:func:`manaba.Manaba.get_surveys` を参照)
+        """
+        markup = await self._get(urls.surveys_url(self.__base_url, course_id))
+        return await self._parse(functools.partial(parsers.parse_surveys, markup, course_id, self.__parser))
+
+    async def get_survey(self,
+                         course_id: int,
+                         survey_id: int) -> ManabaSurveyDetails:
+        """
+        指定したコース・アンケート ID のアンケート詳細情報を取得します。 (:func:`manaba.Manaba.get_survey` を参照)
+        """
+        markup = await self._get(urls.survey_url(self.__base_url, course_id, survey_id))
+        return await self._parse(functools.partial(parsers.parse_survey_details, markup, course_id, survey_id, self.__parser))
+
+    async def get_reports(self,
+                          course_id: int) -> list[ManabaReport]:
+        """
+        指定したコースのレポート一覧を取得します。 (:func:`manaba.Manaba.get_reports` を参照)
+        """
+        markup = await self._get(urls.reports_url(self.__base_url, course_id))
+        return await self._parse(functools.partial(parsers.parse_reports, markup, course_id, self.__parser))
+
+    async def get_report(self,
+                         course_id: int,
+                         report_id: int) -> ManabaReportDetails:
+        """
+        指定したコース・レポート ID のレポート詳細情報を取得します。 (:func:`manaba.Manaba.get_report` を参照)
+        """
+        markup = await self._get(urls.report_url(self.__base_url, course_id, report_id))
+        return await self._parse(functools.partial(parsers.parse_report_details, markup, course_id, report_id, self.__parser))
+
+    async def get_threads(self,
+                          course_id: int) -> list[ManabaThread]:
+        """
+        指定したコースのスレッド一覧を取得します。 (:func:`manaba.Manaba.get_threads` を参照)
+        """
+        markup = await self._get(urls.threads_url(self.__base_url, course_id))
+        return await self._parse(functools.partial(parsers.parse_threads, markup, course_id, self.__parser))
+
+    async def get_thread(self,
+                         course_id: int,
+                         thread_id: int,
+                         start_id: Optional[int] = None,
+                         page_len: int = 10000) -> ManabaThread:
+        """
+        指定したコース・スレッド ID のスレッド詳細情報を取得します。 (:func:`manaba.Manaba.get_thread` を参照)
+        """
+        markup = await self._get(urls.thread_url(self.__base_url, course_id, thread_id, start_id, page_len))
+        return await self._parse(functools.partial(parsers.parse_thread, markup, course_id, thread_id, self.__base_url, self.__parser))
+
+    async def get_news_list(self,
+                            course_id: int,
+                            start_id: Optional[int] = None,
+                            page_len: int = 10000) -> list[ManabaCourseNews]:
+        """
+        指定したコースのコースニュース一覧を取得します。 (:func:`manaba.Manaba.get_news_list` を参照)
+        """
+        markup = await self._get(urls.news_list_url(self.__base_url, course_id, start_id, page_len))
+        return await self._parse(functools.partial(parsers.parse_news_list, markup, course_id, self.__parser))
+
+    async def get_news(self,
+                       course_id: int,
+                       news_id: int) -> ManabaCourseNews:
+        """
+        指定したコース・ニュース ID のニュース詳細情報を取得します。 (:func:`manaba.Manaba.get_news` を参照)
+        """
+        markup = await self._get(urls.news_url(self.__base_url, course_id, news_id))
+        return await self._parse(functools.partial(parsers.parse_news, markup, course_id, news_id, self.__base_url, self.__parser))
+
+    async def get_contents(self,
+                           course_id: int) -> list[ManabaContent]:
+        """
+        指定したコースのコンテンツ一覧を取得します。 (:func:`manaba.Manaba.get_contents` を参照)
+        """
+        markup = await self._get(urls.contents_url(self.__base_url, course_id))
+        return await self._parse(functools.partial(parsers.parse_contents, markup, course_id, self.__parser))
+
+    async def get_content_pages(self,
+                                content_id: str) -> list[ManabaContentPage]:
+        """
+        指定したコンテンツ ID のコンテンツページ一覧を取得します。 (:func:`manaba.Manaba.get_content_pages` を参照)
+        """
+        markup = await self._get(urls.content_url(self.__base_url, content_id))
+        return await self._parse(functools.partial(parsers.parse_content_pages, markup, content_id, self.__parser))
+
+    async def get_content_page(self,
+                               content_id: str,
+                               page_id: int) -> ManabaContentPage:
+        """
+        指定したコンテンツ ID のコンテンツページ詳細を取得します。 (:func:`manaba.Manaba.get_content_page` を参照)
+        """
+        markup = await self._get(urls.content_url(self.__base_url, content_id, page_id))
+        return await self._parse(functools.partial(parsers.parse_content_page, markup, content_id, page_id, self.__base_url, self.__parser))
@@ -0,0 +1,192 @@
+"""
+manaba ページキャッシュ
+
+:class:`manaba.Manaba` のページ取得結果 (パース済みのモデル) を保持し、条件付きリクエストで再検証します。
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, TypeVar, cast
+
+from requests import Response
+
+T = TypeVar("T")
+
+CacheKey = tuple[str, str]
+
+
+class _CacheEntry:
+    """
+    キャッシュエントリー
+    """
+
+    def __init__(self,
+                 model: object,
+                 digest: str,
+                 etag: Optional[str],
+                 last_modified: Optional[str],
+                 stored_at: float):
+        self.model = model
+        self.digest = digest
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        """
+        再検証のための条件付きリクエストヘッダー
+
+        Returns:
+            dict[str, str]: If-None-Match, If-Modified-Since ヘッダー
+        """
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ManabaCache:
+    """
+    manaba ページキャッシュ
+
+    Notes:
+        キーは (アカウント, URL) で、値はパース済みのモデルです。
+        TTL 内のページはリクエストせずにキャッシュから返します。
+        TTL を過ぎたページは ETag / Last-Modified による条件付きリクエストで再検証し、304 Not Modified であればキャッシュから返します。
+        サーバーがこれらのヘッダーに対応していない場合でも、本文のハッシュが一致すればパースせずにキャッシュから返します。
+        キャッシュから返すモデルは前回返したものと同じインスタンスです。
+        スレッドセーフなので、複数の :class:`manaba.Manaba` で共有できます。
+    """
+
+    def __init__(self,
+                 max_entries: int = 256,
+                 ttl: float = 0) -> None:
+        """
+        manaba ページキャッシュ
+
+        Args:
+            max_entries: 保持するページ数の上限 (超えた場合は最も長く使われていないページから破棄する)
+            ttl: 再検証せずにキャッシュを返す秒数 (0 の場合は毎回再検証する)
+
+        Raises:
+            ValueError: max_entries が 1 未満、または ttl が負の場合
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be 1 or more")
+        if ttl < 0:
+            raise ValueError("ttl must be 0 or more")
+
+        self.__max_entries = max_entries
+        self.__ttl = ttl
+        self.__entries: OrderedDict[CacheKey, _CacheEntry] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def max_entries(self) -> int:
+        """
+        保持するページ数の上限
+
+        Returns:
+            int: 保持するページ数の上限
+        """
+        return self.__max_entries
+
+    @property
+    def ttl(self) -> float:
+        """
+        再検証せずにキャッシュを返す秒数
+
+        Returns:
+            float: 秒数
+        """
+        return self.__ttl
+
+    @property
+    def hits(self) -> int:
+        """
+        パースせずにキャッシュから返した回数 (TTL 内・304 Not Modified・本文のハッシュ一致)
+
+        Returns:
+            int: ヒット数
+        """
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """
+        ページをパースした回数
+
+        Returns:
+            int: ミス数
+        """
+        return self.__misses
+
+    def clear(self) -> None:
+        """
+        キャッシュとヒット・ミス数を消去する
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__entries
+
+    def fetch(self,
+              key: CacheKey,
+              get: Callable[[dict[str, str]], Response],
+              parse: Callable[[str], T]) -> T:
+        """
+        キャッシュを使用してページを取得・パースする
+
+        Args:
+            key: キャッシュキー (アカウント, URL)
+            get: 指定したリクエストヘッダーでページを取得する関数
+            parse: ページの HTML をパースする関数
+
+        Returns:
+            T: パース結果
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+                if time.monotonic() - entry.stored_at < self.__ttl:
+                    self.__hits += 1
+                    return cast(T, entry.model)
+
+        response = get(entry.conditional_headers() if entry is not None else {})
+        now = time.monotonic()
+        if entry is not None and response.status_code == 304:
+            with self.__lock:
+                entry.stored_at = now
+                self.__hits += 1
+            return cast(T, entry.model)
+
+        digest = hashlib.sha256(response.content).hexdigest()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if entry is not None and entry.digest == digest:
+            model = cast(T, entry.model)
+            with self.__lock:
+                self.__hits += 1
+        else:
+            model = parse(response.text)
+            with self.__lock:
+                self.__misses += 1
+
+        with self.__lock:
+            self.__entries[key] = _CacheEntry(model, digest, etag, last_modified, now)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+        return model
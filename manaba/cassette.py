@@ -0,0 +1,310 @@
+"""
+manaba カセット (リクエスト・レスポンスの記録と再生)
+
+:class:`manaba.Manaba` の transport として使用し、manaba サーバーとのやり取りをファイルに記録・再生します。
+記録したカセットを再生すると、manaba サーバーなしで :class:`manaba.Manaba` の全 API をオフラインで決定的に実行できます。
+"""
+import base64
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, BinaryIO, Mapping, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3 import HTTPResponse
+
+from manaba.exceptions import ManabaNotRecorded
+
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
+
+CASSETTE_VERSION = 1
+
+# 記録しないヘッダー (Cookie などの認証情報と、本文のデコード後は不要になるもの)
+SCRUBBED_HEADERS = ("set-cookie", "cookie", "authorization", "content-encoding", "transfer-encoding", "content-length")
+
+# 値を記録しないクエリパラメーター (ログインの認証情報)
+SCRUBBED_PARAMS = ("userid", "password", "sessionValue", "sessionValue1")
+
+SCRUBBED_VALUE = "***"
+
+Interaction = dict[str, Union[str, int, float, dict[str, str]]]
+
+
+def scrub_url(url: str) -> str:
+    """
+    URL のクエリパラメーターから認証情報を取り除く
+
+    Args:
+        url: リクエストの URL
+
+    Returns:
+        str: 認証情報の値を置き換え、パラメーターを並べ替えた URL (カセットのキーとして使用)
+    """
+    parsed = urlparse(url)
+    query = sorted((key, SCRUBBED_VALUE if key in SCRUBBED_PARAMS else value)
+                   for key, value in parse_qsl(parsed.query, keep_blank_values=True))
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+class _TeeReader(io.RawIOBase):
+    """
+    ストリーミングのレスポンス本文を読み出しながら、読み出した部分をファイルに書き込む
+    """
+
+    def __init__(self,
+                 response: Response,
+                 path: str,
+                 chunk_size: int = 64 * 1024) -> None:
+        super().__init__()
+        self.__response = response
+        self.__chunks = response.raw.stream(chunk_size, decode_content=True)
+        self.__file: Optional[BinaryIO] = open(path, "wb")
+        self.__buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self,
+                 b: "WriteableBuffer") -> int:
+        view = memoryview(b).cast("B")
+        while len(self.__buffer) == 0:
+            chunk = next(self.__chunks, None)
+            if chunk is None:
+                self.close()
+                return 0
+            if self.__file is not None:
+                self.__file.write(chunk)
+            self.__buffer = chunk
+        size = min(len(view), len(self.__buffer))
+        view[:size] = self.__buffer[:size]
+        self.__buffer = self.__buffer[size:]
+        return size
+
+    def close(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+            self.__response.close()
+        super().close()
+
+
+class ManabaCassette(HTTPAdapter):
+    """
+    manaba カセット
+
+    Notes:
+        mode が "record" の場合、transport でリクエストを送信し、レスポンスを記録します。close() または save() でファイルに保存します。
+        mode が "replay" の場合、ファイルに記録されたレスポンスを返し、通信は行いません。
+        リクエストはメソッドと URL (認証情報を除く) で照合し、同じリクエストが複数回記録されている場合は記録した順に返します。
+        記録した回数より多くリクエストした場合は、最後に記録したレスポンスを返し続けます。
+        Cookie・ログインの認証情報は記録しません。
+        stream=True のリクエスト (ファイルのダウンロード・stream_thread) の本文はメモリ上に保持せず、読み出した部分を
+        "カセットファイルのパス.bodies" ディレクトリのファイルに書き込みながら返します (読み出さなかった部分は記録しません)。
+        スレッドセーフです。
+    """
+
+    def __init__(self,
+                 path: str,
+                 mode: str = "replay",
+                 latency: Optional[float] = 0,
+                 transport: Optional[BaseAdapter] = None) -> None:
+        """
+        manaba カセット
+
+        Args:
+            path: カセットファイルのパス
+            mode: "record" (記録) または "replay" (再生)
+            latency: 再生時にレスポンスを返すまで待機する秒数 (None の場合は記録時の応答時間)
+            transport: 記録時にリクエストを送信する transport (指定しない場合は requests の HTTPAdapter)
+
+        Raises:
+            ValueError: mode が "record", "replay" のいずれでもない場合、または latency が負の場合
+            FileNotFoundError: 再生時にカセットファイルが存在しない場合
+        """
+        super().__init__()
+        if mode not in ("record", "replay"):
+            raise ValueError("mode must be record or replay (" + mode + ")")
+        if latency is not None and latency < 0:
+            raise ValueError("latency must be 0 or more")
+
+        self.__path = path
+        self.__bodies_dir = path + ".bodies"
+        self.__mode = mode
+        self.__latency = latency
+        self.__transport: BaseAdapter = transport if transport is not None else HTTPAdapter()
+        self.__lock = threading.Lock()
+        self.__interactions: list[Interaction] = []
+        self.__queues: dict[tuple[str, str], deque[Interaction]] = {}
+
+        if mode == "replay":
+            with open(path, encoding="utf-8") as f:
+                cassette = json.load(f)
+            for interaction in cassette["interactions"]:
+                key = (str(interaction["method"]), str(interaction["url"]))
+                self.__queues.setdefault(key, deque()).append(interaction)
+
+    @property
+    def mode(self) -> str:
+        """
+        記録・再生のどちらを行うか
+
+        Returns:
+            str: "record" または "replay"
+        """
+        return self.__mode
+
+    def __len__(self) -> int:
+        """
+        記録したリクエスト数 (再生時は 0)
+        """
+        return len(self.__interactions)
+
+    def send(self,  # pylint: disable=arguments-differ
+             request: PreparedRequest,
+             stream: bool = False,
+             timeout: Union[None, float, tuple[float, float], tuple[float, None]] = None,
+             verify: Union[bool, str] = True,
+             cert: Union[None, bytes, str, tuple[Union[bytes, str], Union[bytes, str]]] = None,
+             proxies: Optional[Mapping[str, str]] = None) -> Response:
+        """
+        リクエストを記録・再生する
+
+        Args:
+            request: リクエスト
+            stream: レスポンス本文を読み込まずに返すか
+            timeout: タイムアウト (記録時のみ使用)
+            verify: TLS 証明書を検証するか (記録時のみ使用)
+            cert: クライアント証明書 (記録時のみ使用)
+            proxies: プロキシ (記録時のみ使用)
+
+        Returns:
+            Response: レスポンス
+
+        Raises:
+            ManabaNotRecorded: 再生時に、リクエストに対応するレスポンスが記録されていない場合
+        """
+        key = (str(request.method), scrub_url(str(request.url)))
+        if self.__mode == "replay":
+            interaction = self.__next_interaction(key)
+            delay = self.__latency
+            if delay is None:
+                elapsed = interaction["elapsed"]
+                delay = float(elapsed) if isinstance(elapsed, (int, float)) else 0
+            if delay > 0:
+                time.sleep(delay)
+        else:
+            start = time.monotonic()
+            response = self.__transport.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert,
+                                             proxies=proxies)
+            if stream:
+                return self.__record_stream(request, key, response, time.monotonic() - start)
+            interaction = self.__record(key, response, time.monotonic() - start)
+
+        return self.__build(request, interaction)
+
+    def __next_interaction(self,
+                           key: tuple[str, str]) -> Interaction:
+        with self.__lock:
+            queue = self.__queues.get(key)
+            if queue is None:
+                raise ManabaNotRecorded(key[0] + " " + key[1])
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    @staticmethod
+    def __metadata(key: tuple[str, str],
+                   response: Response,
+                   elapsed: float) -> Interaction:
+        return {
+            "method": key[0],
+            "url": key[1],
+            "status": response.status_code,
+            "headers": {name: value for name, value in response.headers.items()
+                        if name.lower() not in SCRUBBED_HEADERS},
+            "elapsed": round(elapsed, 6),
+        }
+
+    def __record_stream(self,
+                        request: PreparedRequest,
+                        key: tuple[str, str],
+                        response: Response,
+                        elapsed: float) -> Response:
+        interaction = self.__metadata(key, response, elapsed)
+        os.makedirs(self.__bodies_dir, exist_ok=True)
+        with self.__lock:
+            body_file = "%d.bin" % len(self.__interactions)
+            interaction["body_file"] = body_file
+            self.__interactions.append(interaction)
+
+        headers = interaction["headers"]
+        raw = HTTPResponse(body=io.BufferedReader(_TeeReader(response, os.path.join(self.__bodies_dir, body_file))),
+                           headers=dict(headers) if isinstance(headers, dict) else {},
+                           status=response.status_code,
+                           preload_content=False,
+                           request_method=request.method)
+        return self.build_response(request, raw)
+
+    def __record(self,
+                 key: tuple[str, str],
+                 response: Response,
+                 elapsed: float) -> Interaction:
+        interaction = self.__metadata(key, response, elapsed)
+        body = response.content
+        try:
+            interaction["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            interaction["body_base64"] = base64.b64encode(body).decode("ascii")
+        response.close()
+
+        with self.__lock:
+            self.__interactions.append(interaction)
+        return interaction
+
+    def __build(self,
+                request: PreparedRequest,
+                interaction: Interaction) -> Response:
+        body: BinaryIO
+        if "body_file" in interaction:
+            body = open(os.path.join(self.__bodies_dir, str(interaction["body_file"])), "rb")
+        elif "body_base64" in interaction:
+            body = io.BytesIO(base64.b64decode(str(interaction["body_base64"])))
+        else:
+            body = io.BytesIO(str(interaction.get("body", "")).encode("utf-8"))
+        headers = interaction["headers"]
+        status = interaction["status"]
+        raw = HTTPResponse(body=body,
+                           headers=dict(headers) if isinstance(headers, dict) else {},
+                           status=status if isinstance(status, int) else 200,
+                           preload_content=False,
+                           request_method=request.method)
+        return self.build_response(request, raw)
+
+    def save(self) -> None:
+        """
+        記録したリクエスト・レスポンスをカセットファイルに保存する (再生時は何もしない)
+        """
+        if self.__mode != "record":
+            return
+        with self.__lock:
+            cassette = {"version": CASSETTE_VERSION, "interactions": list(self.__interactions)}
+        directory = os.path.dirname(self.__path)
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+        with open(self.__path, "w", encoding="utf-8") as f:
+            json.dump(cassette, f, ensure_ascii=False, indent=1)
+
+    def close(self) -> None:
+        """
+        記録したリクエスト・レスポンスを保存し、transport を閉じる
+
+        Notes:
+            Manaba.session.close() から呼ばれます。
+        """
+        self.save()
+        self.__transport.close()
+        super().close()
@@ -0,0 +1,169 @@
+"""
+manaba 同時リクエスト数の自動調整
+
+:class:`manaba.Manaba` の同時に送信するリクエスト数の上限を、応答時間とエラーから AIMD (加算増加・乗算減少) で調整します。
+snapshot_course(), download_files(), :class:`manaba.pool.ManabaPool` などの並列処理で、ワーカー数を固定せずに
+manaba サーバーの処理能力に合わせた数のリクエストを送信するために使用します。
+"""
+import threading
+from typing import Optional
+
+# acquire() が返す予約 (予約した時点の減少回数, 上限まで使用していたか)
+Ticket = tuple[int, bool]
+
+
+class ManabaConcurrencyGovernor:
+    """
+    manaba 同時リクエスト数の自動調整
+
+    Notes:
+        同時に送信しているリクエストが上限 (limit) に達している間は、acquire() で空きを待ちます。
+        上限まで使用している状態で正常な応答が返るたびに、上限を increase / limit ずつ増やします (上限の数の応答ごとに increase 増える)。
+        5xx・429 のレスポンス、接続エラー・タイムアウト、応答時間の急増 (latency_floor 秒以上で、基準の latency_tolerance 倍以上
+        または latency_limit 秒以上) のいずれかが発生した場合は、上限を decrease 倍に減らします。
+        同じ時期に送信したリクエストの失敗で何度も減らさないように、減らした後は、それ以前に送信したリクエストの失敗を無視します。
+        基準の応答時間は、正常な応答の応答時間の指数移動平均です。
+        1 つのインスタンスを複数のスレッド・複数の Manaba で共有できます。
+    """
+
+    def __init__(self,
+                 initial: int = 4,
+                 min_limit: int = 1,
+                 max_limit: int = 64,
+                 increase: float = 1.0,
+                 decrease: float = 0.5,
+                 latency_tolerance: float = 3.0,
+                 latency_limit: Optional[float] = None,
+                 latency_floor: float = 0.05,
+                 smoothing: float = 0.1) -> None:
+        """
+        manaba 同時リクエスト数の自動調整
+
+        Args:
+            initial: 同時リクエスト数の上限の初期値
+            min_limit: 同時リクエスト数の上限の最小値
+            max_limit: 同時リクエスト数の上限の最大値
+            increase: 上限の数の正常な応答ごとに増やす数
+            decrease: 失敗・応答時間の急増時に上限に掛ける割合 (0 より大きく 1 未満)
+            latency_tolerance: 基準の応答時間の何倍以上を急増とみなすか
+            latency_limit: 急増とみなす応答時間の秒数 (指定しない場合は基準の応答時間との比較のみ)
+            latency_floor: 急増とみなさない応答時間の秒数 (応答時間が非常に短い場合に、わずかな揺らぎを急増とみなさないため)
+            smoothing: 基準の応答時間の指数移動平均の係数 (0 より大きく 1 以下)
+
+        Raises:
+            ValueError: 引数の範囲が正しくない場合
+        """
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= initial <= max_limit")
+        if increase <= 0 or not 0 < decrease < 1 or latency_tolerance <= 1 or not 0 < smoothing <= 1:
+            raise ValueError("increase, decrease, latency_tolerance or smoothing is out of range")
+
+        self.__limit = float(initial)
+        self.__min_limit = min_limit
+        self.__max_limit = max_limit
+        self.__increase = increase
+        self.__decrease = decrease
+        self.__latency_tolerance = latency_tolerance
+        self.__latency_limit = latency_limit
+        self.__latency_floor = latency_floor
+        self.__smoothing = smoothing
+        self.__baseline: Optional[float] = None
+        self.__in_flight = 0
+        self.__decreases = 0
+        self.__condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """
+        現在の同時リクエスト数の上限
+
+        Returns:
+            int: 上限
+        """
+        with self.__condition:
+            return int(self.__limit)
+
+    @property
+    def in_flight(self) -> int:
+        """
+        現在送信しているリクエスト数
+
+        Returns:
+            int: リクエスト数
+        """
+        with self.__condition:
+            return self.__in_flight
+
+    @property
+    def baseline_latency(self) -> Optional[float]:
+        """
+        基準の応答時間
+
+        Returns:
+            Optional[float]: 秒数 (正常な応答がまだない場合は None)
+        """
+        with self.__condition:
+            return self.__baseline
+
+    @property
+    def decreases(self) -> int:
+        """
+        上限を減らした回数
+
+        Returns:
+            int: 回数
+        """
+        with self.__condition:
+            return self.__decreases
+
+    def acquire(self) -> Ticket:
+        """
+        リクエストを送信できるまで待つ
+
+        Returns:
+            Ticket: 予約 (応答を受け取ったら release() に渡してください)
+        """
+        with self.__condition:
+            while self.__in_flight >= int(self.__limit):
+                self.__condition.wait()
+            self.__in_flight += 1
+            return self.__decreases, self.__in_flight >= int(self.__limit)
+
+    def release(self,
+                ticket: Ticket,
+                latency: float,
+                failed: bool = False) -> None:
+        """
+        リクエストの結果を記録し、上限を調整する
+
+        Args:
+            ticket: acquire() が返した予約
+            latency: 応答時間の秒数
+            failed: 失敗したか (5xx・429 のレスポンス、接続エラー・タイムアウト)
+        """
+        epoch, saturated = ticket
+        with self.__condition:
+            self.__in_flight -= 1
+            spike = self.__is_spike(latency)
+            if failed or spike:
+                if epoch == self.__decreases:
+                    self.__limit = max(float(self.__min_limit), self.__limit * self.__decrease)
+                    self.__decreases += 1
+            elif saturated:
+                self.__limit = min(float(self.__max_limit), self.__limit + self.__increase / self.__limit)
+            if not failed:
+                # 応答時間が恒常的に長くなった場合にも追従するよう、急増とみなした応答も基準に含める
+                self.__baseline = latency if self.__baseline is None else \
+                    self.__baseline + (latency - self.__baseline) * self.__smoothing
+            self.__condition.notify_all()
+
+    def __is_spike(self,
+                   latency: float) -> bool:
+        """
+        応答時間が急増しているか
+        """
+        if latency < self.__latency_floor:
+            return False
+        if self.__latency_limit is not None and latency >= self.__latency_limit:
+            return True
+        return self.__baseline is not None and latency >= self.__baseline * self.__latency_tolerance
@@ -0,0 +1,33 @@
+"""
+manaba 例外クラス群
+"""
+
+
+class ManabaNotLoggedIn(Exception):
+    """
+    manaba にログインしている必要があるがしていない
+    """
+
+
+class ManabaNotFound(Exception):
+    """
+    manaba のコース等ページにアクセスしたが、そのページが見つからなかった
+    """
+
+
+class ManabaInternalError(Exception):
+    """
+    処理に失敗した
+    """
+
+
+class ManabaContentDisabled(Exception):
+    """
+    コンテンツページが無効化（公開期間外などにより）されている
+    """
+
+
+class ManabaNotRecorded(Exception):
+    """
+    カセットを再生しているが、リクエストに対応するレスポンスが記録されていなかった
+    """
@@ -0,0 +1,385 @@
+"""
+manaba ページ取得の計測
+
+:class:`manaba.Manaba` の observers に渡すと、ページ取得イベント (:class:`manaba.ManabaFetchEvent`) をエンドポイントごとに集計します。
+どのページの取得に時間がかかっているか (ネットワーク・HTML のパース・モデルの組み立てのどこで時間を使っているか) を調べるために使用します。
+"""
+import bisect
+import math
+import threading
+from typing import Optional
+
+from manaba.concurrency import ManabaConcurrencyGovernor
+from manaba.models.ManabaFetchEvent import ManabaFetchEvent
+
+# ヒストグラムの既定のバケット (上限の秒数)
+DEFAULT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _validate_buckets(buckets: tuple[float, ...]) -> None:
+    """
+    ヒストグラムのバケットの上限が空でなく、昇順であることを確認する
+    """
+    if len(buckets) == 0 or any(a >= b for a, b in zip(buckets, buckets[1:])):
+        raise ValueError("buckets must be non-empty and strictly increasing")
+
+
+class ManabaLatencyHistogram:
+    """
+    所要時間のヒストグラム
+
+    Notes:
+        各バケットには、1 つ前のバケットの上限より大きく、そのバケットの上限以下の値を数えます。
+        最後のバケットの上限より大きい値は、上限が無限大のバケットに数えます。
+    """
+
+    def __init__(self,
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        所要時間のヒストグラム
+
+        Args:
+            buckets: バケットの上限の秒数 (昇順)
+
+        Raises:
+            ValueError: buckets が空、または昇順でない場合
+        """
+        _validate_buckets(buckets)
+        self.__bounds = buckets
+        self.__counts = [0] * (len(buckets) + 1)
+        self.__sum = 0.0
+        self.__max = 0.0
+
+    def observe(self,
+                value: float) -> None:
+        """
+        値を追加する
+
+        Args:
+            value: 所要時間 (秒)
+        """
+        self.__counts[bisect.bisect_left(self.__bounds, value)] += 1
+        self.__sum += value
+        self.__max = max(self.__max, value)
+
+    @property
+    def count(self) -> int:
+        """
+        追加した値の数
+
+        Returns:
+            int: 値の数
+        """
+        return sum(self.__counts)
+
+    @property
+    def sum(self) -> float:
+        """
+        追加した値の合計
+
+        Returns:
+            float: 合計の秒数
+        """
+        return self.__sum
+
+    @property
+    def mean(self) -> float:
+        """
+        追加した値の平均
+
+        Returns:
+            float: 平均の秒数 (値がない場合は 0)
+        """
+        count = self.count
+        return self.__sum / count if count != 0 else 0.0
+
+    @property
+    def max(self) -> float:
+        """
+        追加した値の最大値
+
+        Returns:
+            float: 最大の秒数 (値がない場合は 0)
+        """
+        return self.__max
+
+    @property
+    def buckets(self) -> list[tuple[float, int]]:
+        """
+        バケットごとの値の数
+
+        Returns:
+            list[tuple[float, int]]: (バケットの上限の秒数, そのバケットの値の数) の一覧 (最後のバケットの上限は無限大)
+        """
+        return list(zip(self.__bounds + (math.inf,), self.__counts))
+
+    def quantile(self,
+                 q: float) -> float:
+        """
+        分位数を推定する
+
+        Args:
+            q: 0 以上 1 以下の割合 (0.5 の場合は中央値、0.95 の場合は 95 パーセンタイル)
+
+        Returns:
+            float: 分位数の推定値の秒数 (値がない場合は 0)
+
+        Raises:
+            ValueError: q が 0 以上 1 以下でない場合
+
+        Notes:
+            分位数を含むバケットの中で、値が一様に分布しているものとして線形補間します。
+            上限が無限大のバケットに含まれる場合は、最大値を返します。
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+
+        count = self.count
+        if count == 0:
+            return 0.0
+        rank = q * count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.__counts):
+            if bucket_count == 0 or cumulative + bucket_count < rank:
+                cumulative += bucket_count
+                continue
+            if index == len(self.__bounds):
+                return self.__max
+            lower = self.__bounds[index - 1] if index > 0 else 0.0
+            upper = min(self.__bounds[index], self.__max)
+            return lower + (upper - lower) * (rank - cumulative) / bucket_count
+        return self.__max
+
+
+class ManabaEndpointMetrics:
+    """
+    エンドポイントごとのページ取得の集計
+    """
+
+    def __init__(self,
+                 endpoint: str,
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        エンドポイントごとのページ取得の集計
+
+        Args:
+            endpoint: エンドポイント名
+            buckets: ヒストグラムのバケットの上限の秒数
+        """
+        self.__endpoint = endpoint
+        self.__requests = 0
+        self.__errors = 0
+        self.__cached = 0
+        self.__bytes_received = 0
+        self.__total = ManabaLatencyHistogram(buckets)
+        self.__network = ManabaLatencyHistogram(buckets)
+        self.__parse = ManabaLatencyHistogram(buckets)
+        self.__build = ManabaLatencyHistogram(buckets)
+
+    def observe(self,
+                event: ManabaFetchEvent) -> None:
+        """
+        ページ取得イベントを集計する
+
+        Args:
+            event: ページ取得イベント
+        """
+        self.__requests += 1
+        if event.error is not None:
+            self.__errors += 1
+        if event.cached:
+            self.__cached += 1
+        self.__bytes_received += event.bytes_received
+        self.__total.observe(event.total_time)
+        self.__network.observe(event.network_time)
+        if not event.cached:
+            self.__parse.observe(event.parse_time)
+            self.__build.observe(event.build_time)
+
+    @property
+    def endpoint(self) -> str:
+        """
+        エンドポイント名
+
+        Returns:
+            str: エンドポイント名
+        """
+        return self.__endpoint
+
+    @property
+    def requests(self) -> int:
+        """
+        ページ取得の回数 (エラーを含む)
+
+        Returns:
+            int: 回数
+        """
+        return self.__requests
+
+    @property
+    def errors(self) -> int:
+        """
+        例外が発生したページ取得の回数
+
+        Returns:
+            int: 回数
+        """
+        return self.__errors
+
+    @property
+    def cached(self) -> int:
+        """
+        パースせずにページキャッシュから返した回数
+
+        Returns:
+            int: 回数
+        """
+        return self.__cached
+
+    @property
+    def bytes_received(self) -> int:
+        """
+        受信した本文のバイト数の合計
+
+        Returns:
+            int: バイト数
+        """
+        return self.__bytes_received
+
+    @property
+    def total(self) -> ManabaLatencyHistogram:
+        """
+        ページ取得全体の所要時間のヒストグラム
+
+        Returns:
+            ManabaLatencyHistogram: ヒストグラム
+        """
+        return self.__total
+
+    @property
+    def network(self) -> ManabaLatencyHistogram:
+        """
+        リクエストからレスポンスの受信までの所要時間のヒストグラム
+
+        Returns:
+            ManabaLatencyHistogram: ヒストグラム
+        """
+        return self.__network
+
+    @property
+    def parse(self) -> ManabaLatencyHistogram:
+        """
+        HTML のパースの所要時間のヒストグラム (ページキャッシュから返した場合を除く)
+
+        Returns:
+            ManabaLatencyHistogram: ヒストグラム
+        """
+        return self.__parse
+
+    @property
+    def build(self) -> ManabaLatencyHistogram:
+        """
+        モデルの組み立ての所要時間のヒストグラム (ページキャッシュから返した場合を除く)
+
+        Returns:
+            ManabaLatencyHistogram: ヒストグラム
+        """
+        return self.__build
+
+
+class ManabaMetrics:
+    """
+    ページ取得イベントのエンドポイントごとの集計
+
+    Notes:
+        インスタンスを :class:`manaba.Manaba` の observers に渡す (または add_observer() で追加する) と、ページ取得のたびに集計します。
+        複数のスレッドから同時に呼び出すことができます。
+    """
+
+    def __init__(self,
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+                 governor: Optional[ManabaConcurrencyGovernor] = None) -> None:
+        """
+        ページ取得イベントのエンドポイントごとの集計
+
+        Args:
+            buckets: ヒストグラムのバケットの上限の秒数 (昇順)
+            governor: summary() に現在の同時リクエスト数の上限を含める、同時リクエスト数の自動調整
+
+        Raises:
+            ValueError: buckets が空、または昇順でない場合
+        """
+        _validate_buckets(buckets)
+        self.__buckets = buckets
+        self.__governor = governor
+        self.__endpoints: dict[str, ManabaEndpointMetrics] = {}
+        self.__lock = threading.Lock()
+
+    def __call__(self,
+                 event: ManabaFetchEvent) -> None:
+        """
+        ページ取得イベントを集計する
+
+        Args:
+            event: ページ取得イベント
+        """
+        with self.__lock:
+            metrics = self.__endpoints.get(event.endpoint)
+            if metrics is None:
+                metrics = ManabaEndpointMetrics(event.endpoint, self.__buckets)
+                self.__endpoints[event.endpoint] = metrics
+            metrics.observe(event)
+
+    @property
+    def endpoints(self) -> list[str]:
+        """
+        集計したエンドポイント名の一覧
+
+        Returns:
+            list[str]: エンドポイント名 (名前順)
+        """
+        with self.__lock:
+            return sorted(self.__endpoints)
+
+    def endpoint(self,
+                 endpoint: str) -> Optional[ManabaEndpointMetrics]:
+        """
+        エンドポイントの集計を取得する
+
+        Args:
+            endpoint: エンドポイント名 (get_course など)
+
+        Returns:
+            Optional[ManabaEndpointMetrics]: 集計 (そのエンドポイントのページを取得していない場合は None)
+        """
+        with self.__lock:
+            return self.__endpoints.get(endpoint)
+
+    def summary(self) -> str:
+        """
+        エンドポイントごとの集計の表を作成する
+
+        Returns:
+            str: 表 (所要時間の合計が長い順)
+        """
+        with self.__lock:
+            endpoints = sorted(self.__endpoints.values(), key=lambda metrics: metrics.total.sum, reverse=True)
+            lines = ["%-20s %8s %6s %6s %12s %10s %9s %9s %9s %10s %9s %9s" % (
+                "endpoint", "requests", "errors", "cached", "bytes", "total s", "mean ms", "p50 ms", "p95 ms",
+                "network s", "parse s", "build s")]
+            for metrics in endpoints:
+                lines.append("%-20s %8d %6d %6d %12d %10.3f %9.1f %9.1f %9.1f %10.3f %9.3f %9.3f" % (
+                    metrics.endpoint, metrics.requests, metrics.errors, metrics.cached, metrics.bytes_received,
+                    metrics.total.sum, metrics.total.mean * 1000, metrics.total.quantile(0.5) * 1000,
+                    metrics.total.quantile(0.95) * 1000, metrics.network.sum, metrics.parse.sum, metrics.build.sum))
+        if self.__governor is not None:
+            lines.append("concurrency limit=%d in_flight=%d decreases=%d" % (
+                self.__governor.limit, self.__governor.in_flight, self.__governor.decreases))
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        """
+        集計を消去する
+        """
+        with self.__lock:
+            self.__endpoints.clear()
@@ -0,0 +1,158 @@
+"""
+manaba コーススナップショット
+"""
+from typing import Optional, Union
+
+from manaba.models.ManabaContent import ManabaContent
+from manaba.models.ManabaCourse import ManabaCourse
+from manaba.models.ManabaCourseNews import ManabaCourseNews
+from manaba.models.ManabaDrillDetails import ManabaDrillDetails
+from manaba.models.ManabaModel import ManabaModel
+from manaba.models.ManabaQueryDetails import ManabaQueryDetails
+from manaba.models.ManabaReportDetails import ManabaReportDetails
+from manaba.models.ManabaSnapshotError import ManabaSnapshotError
+from manaba.models.ManabaSurveyDetails import ManabaSurveyDetails
+from manaba.models.ManabaThread import ManabaThread
+
+
+class ManabaCourseSnapshot(ManabaModel):
+    """
+    manaba コーススナップショット (コースのすべての情報)
+    """
+
+    def __init__(self,
+                 course_id: int,
+                 course: Optional[ManabaCourse],
+                 querys: list[Union[ManabaQueryDetails, ManabaDrillDetails]],
+                 surveys: list[ManabaSurveyDetails],
+                 reports: list[ManabaReportDetails],
+                 threads: list[ManabaThread],
+                 news: list[ManabaCourseNews],
+                 contents: list[ManabaContent],
+                 errors: list[ManabaSnapshotError]):
+        """
+        manaba コーススナップショット
+
+        Args:
+            course_id: コース ID
+            course: コース情報
+            querys: 小テスト・小テストドリル詳細情報の一覧
+            surveys: アンケート詳細情報の一覧
+            reports: レポート詳細情報の一覧
+            threads: スレッド詳細情報の一覧
+            news: コースニュース詳細情報の一覧
+            contents: コンテンツの一覧 (ページ詳細を含む)
+            errors: 取得に失敗した項目の一覧
+        """
+        self._course_id = course_id
+        self._course = course
+        self._querys = querys
+        self._surveys = surveys
+        self._reports = reports
+        self._threads = threads
+        self._news = news
+        self._contents = contents
+        self._errors = errors
+
+    @property
+    def course_id(self) -> int:
+        """
+        コース ID (URLの一部)
+        ※コースコードではない
+
+        Returns:
+            int: コース ID
+        """
+        return self._course_id
+
+    @property
+    def course(self) -> Optional[ManabaCourse]:
+        """
+        コース情報
+
+        Returns:
+            Optional[ManabaCourse]: コース情報 (取得に失敗した場合は None)
+        """
+        return self._course
+
+    @property
+    def querys(self) -> list[Union[ManabaQueryDetails, ManabaDrillDetails]]:
+        """
+        小テスト・小テストドリル詳細情報の一覧
+
+        Returns:
+            list[Union[ManabaQueryDetails, ManabaDrillDetails]]: 小テスト・小テストドリル詳細情報の一覧
+        """
+        return self._querys
+
+    @property
+    def surveys(self) -> list[ManabaSurveyDetails]:
+        """
+        アンケート詳細情報の一覧
+
+        Returns:
+            list[ManabaSurveyDetails]: アンケート詳細情報の一覧
+        """
+        return self._surveys
+
+    @property
+    def reports(self) -> list[ManabaReportDetails]:
+        """
+        レポート詳細情報の一覧
+
+        Returns:
+            list[ManabaReportDetails]: レポート詳細情報の一覧
+        """
+        return self._reports
+
+    @property
+    def threads(self) -> list[ManabaThread]:
+        """
+        スレッド詳細情報の一覧
+
+        Returns:
+            list[ManabaThread]: スレッド詳細情報の一覧 (コメントを含む)
+        """
+        return self._threads
+
+    @property
+    def news(self) -> list[ManabaCourseNews]:
+        """
+        コースニュース詳細情報の一覧
+
+        Returns:
+            list[ManabaCourseNews]: コースニュース詳細情報の一覧
+        """
+        return self._news
+
+    @property
+    def contents(self) -> list[ManabaContent]:
+        """
+        コンテンツの一覧
+
+        Returns:
+            list[ManabaContent]: コンテンツの一覧
+
+        Notes:
+            各コンテンツの pages にはコンテンツページ詳細が入ります。
+        """
+        return self._contents
+
+    @property
+    def errors(self) -> list[ManabaSnapshotError]:
+        """
+        取得に失敗した項目の一覧
+
+        Returns:
+            list[ManabaSnapshotError]: 取得に失敗した項目の一覧
+
+        Notes:
+            取得に失敗した項目は、各一覧には含まれません。
+        """
+        return self._errors
+
+    def __str__(self) -> str:
+        return "ManabaCourseSnapshot{course_id=%s,course=%s,querys=%s,surveys=%s,reports=%s,threads=%s,news=%s," \
+               "contents=%s,errors=%s}" % (
+                   self._course_id, self._course, len(self._querys), len(self._surveys), len(self._reports),
+                   len(self._threads), len(self._news), len(self._contents), len(self._errors))
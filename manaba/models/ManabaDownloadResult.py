@@ -0,0 +1,93 @@
+"""
+manaba ファイルダウンロード結果
+"""
+from typing import Optional
+
+from manaba.models.ManabaDownloadStatus import ManabaDownloadStatus
+from manaba.models.ManabaFile import ManabaFile
+from manaba.models.ManabaModel import ManabaModel
+
+
+class ManabaDownloadResult(ManabaModel):
+    """
+    manaba ファイルダウンロード結果
+
+    Notes:
+        このモデルは :func:`manaba.Manaba.download_files` で使用されます。
+    """
+
+    def __init__(self,
+                 file: ManabaFile,
+                 path: str,
+                 status: ManabaDownloadStatus,
+                 downloaded_bytes: int,
+                 error: Optional[Exception]):
+        """
+        manaba ファイルダウンロード結果
+
+        Args:
+            file: ダウンロードしたファイル
+            path: 保存先のパス
+            status: ダウンロード結果のステータス
+            downloaded_bytes: 今回ダウンロードしたバイト数
+            error: 発生した例外 (失敗した場合のみ)
+        """
+        self._file = file
+        self._path = path
+        self._status = status
+        self._downloaded_bytes = downloaded_bytes
+        self._error = error
+
+    @property
+    def file(self) -> ManabaFile:
+        """
+        ダウンロードしたファイル
+
+        Returns:
+            ManabaFile: ダウンロードしたファイル
+        """
+        return self._file
+
+    @property
+    def path(self) -> str:
+        """
+        保存先のパス
+
+        Returns:
+            str: 保存先のパス
+        """
+        return self._path
+
+    @property
+    def status(self) -> ManabaDownloadStatus:
+        """
+        ダウンロード結果のステータス
+
+        Returns:
+            ManabaDownloadStatus: ダウンロード結果のステータス
+        """
+        return self._status
+
+    @property
+    def downloaded_bytes(self) -> int:
+        """
+        今回ダウンロードしたバイト数 (途中からダウンロードした場合は、その続きのバイト数)
+
+        Returns:
+            int: バイト数
+        """
+        return self._downloaded_bytes
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """
+        発生した例外
+
+        Returns:
+            Optional[Exception]: 発生した例外 (失敗していない場合は None)
+        """
+        return self._error
+
+    def __str__(self) -> str:
+        return "ManabaDownloadResult{file=%s,path=%s,status=%s,downloaded_bytes=%s,error=%r}" % (
+            self._file, self._path, self._status, self._downloaded_bytes, self._error)
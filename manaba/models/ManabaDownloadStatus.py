@@ -0,0 +1,24 @@
+"""
+manaba ファイルダウンロード結果のステータス
+"""
+
+from enum import Enum, auto
+
+
+class ManabaDownloadStatus(Enum):
+    """
+    manaba ファイルダウンロード結果のステータス
+    """
+    DOWNLOADED = (auto(), "ダウンロード済み")
+    RESUMED = (auto(), "途中からダウンロード済み")
+    SKIPPED = (auto(), "変更がないためスキップ")
+    FAILED = (auto(), "失敗")
+
+    def __init__(self,
+                 _id: int,
+                 showing_name: str):
+        self.id = _id
+        self.showing_name = showing_name
+
+    def __str__(self) -> str:
+        return "ManabaDownloadStatus{id=%s,showing_name=%s}" % (self.id, self.showing_name)
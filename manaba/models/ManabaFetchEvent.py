@@ -0,0 +1,156 @@
+"""
+manaba ページ取得イベント
+"""
+from typing import Optional
+
+from manaba.models.ManabaModel import ManabaModel
+
+
+class ManabaFetchEvent(ManabaModel):
+    """
+    manaba ページ取得イベント
+
+    Notes:
+        このモデルは :class:`manaba.Manaba` の observers に、get_* でページを 1 件取得するごとに渡されます。
+        時間はすべて秒です。
+    """
+
+    def __init__(self,
+                 endpoint: str,
+                 url: str,
+                 status: Optional[int],
+                 bytes_received: int,
+                 network_time: float,
+                 parse_time: float,
+                 build_time: float,
+                 cached: bool,
+                 error: Optional[Exception]):
+        """
+        manaba ページ取得イベント
+
+        Args:
+            endpoint: エンドポイント名 (get_course など、Manaba のメソッド名)
+            url: ページの URL
+            status: レスポンスのステータスコード (リクエストしなかった場合、またはレスポンスを受け取れなかった場合は None)
+            bytes_received: 受信した本文のバイト数
+            network_time: リクエストからレスポンスの受信までの時間 (再試行・再ログインを含む)
+            parse_time: HTML のパース (BeautifulSoup の木の構築) にかかった時間
+            build_time: パース結果からモデルを組み立てるのにかかった時間
+            cached: パースせずにページキャッシュから返したか
+            error: 発生した例外 (成功した場合は None)
+        """
+        self._endpoint = endpoint
+        self._url = url
+        self._status = status
+        self._bytes_received = bytes_received
+        self._network_time = network_time
+        self._parse_time = parse_time
+        self._build_time = build_time
+        self._cached = cached
+        self._error = error
+
+    @property
+    def endpoint(self) -> str:
+        """
+        エンドポイント名
+
+        Returns:
+            str: Manaba のメソッド名 (get_course など)
+        """
+        return self._endpoint
+
+    @property
+    def url(self) -> str:
+        """
+        ページの URL
+
+        Returns:
+            str: URL
+        """
+        return self._url
+
+    @property
+    def status(self) -> Optional[int]:
+        """
+        レスポンスのステータスコード
+
+        Returns:
+            Optional[int]: ステータスコード (リクエストしなかった場合、またはレスポンスを受け取れなかった場合は None)
+        """
+        return self._status
+
+    @property
+    def bytes_received(self) -> int:
+        """
+        受信した本文のバイト数
+
+        Returns:
+            int: バイト数
+        """
+        return self._bytes_received
+
+    @property
+    def network_time(self) -> float:
+        """
+        リクエストからレスポンスの受信までの時間 (再試行・再ログインを含む)
+
+        Returns:
+            float: 秒数
+        """
+        return self._network_time
+
+    @property
+    def parse_time(self) -> float:
+        """
+        HTML のパースにかかった時間
+
+        Returns:
+            float: 秒数
+        """
+        return self._parse_time
+
+    @property
+    def build_time(self) -> float:
+        """
+        パース結果からモデルを組み立てるのにかかった時間
+
+        Returns:
+            float: 秒数
+        """
+        return self._build_time
+
+    @property
+    def total_time(self) -> float:
+        """
+        ページの取得全体にかかった時間 (network_time, parse_time, build_time の合計)
+
+        Returns:
+            float: 秒数
+        """
+        return self._network_time + self._parse_time + self._build_time
+
+    @property
+    def cached(self) -> bool:
+        """
+        パースせずにページキャッシュから返したか
+
+        Returns:
+            bool: キャッシュから返したか
+        """
+        return self._cached
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """
+        発生した例外
+
+        Returns:
+            Optional[Exception]: 例外 (成功した場合は None)
+        """
+        return self._error
+
+    def __str__(self) -> str:
+        return "ManabaFetchEvent{endpoint=%s,url=%s,status=%s,bytes_received=%s,network_time=%.6f,parse_time=%.6f," \
+               "build_time=%.6f,cached=%s,error=%r}" % (
+                   self._endpoint, self._url, self._status, self._bytes_received, self._network_time,
+                   self._parse_time, self._build_time, self._cached, self._error)
@@ -0,0 +1,60 @@
+"""
+manaba ポーリング対象
+"""
+from manaba.models.ManabaCourse import ManabaCourse
+from manaba.models.ManabaModel import ManabaModel
+
+
+class ManabaPollTarget(ManabaModel):
+    """
+    manaba ポーリング対象 (取得するコースと一覧の種類)
+
+    Notes:
+        このモデルは :func:`manaba.Manaba.plan_poll` と :func:`manaba.Manaba.poll` で使用されます。
+    """
+
+    def __init__(self,
+                 course: ManabaCourse,
+                 kinds: list[str]):
+        """
+        manaba ポーリング対象
+
+        Args:
+            course: コース一覧ページのコース情報
+            kinds: 取得する一覧の種類 (querys, surveys, reports, threads, news_list)
+        """
+        self._course = course
+        self._kinds = kinds
+
+    @property
+    def course_id(self) -> int:
+        """
+        コース ID (URLの一部)
+
+        Returns:
+            int: コース ID
+        """
+        return self._course.course_id
+
+    @property
+    def course(self) -> ManabaCourse:
+        """
+        コース一覧ページのコース情報
+
+        Returns:
+            ManabaCourse: コース情報
+        """
+        return self._course
+
+    @property
+    def kinds(self) -> list[str]:
+        """
+        取得する一覧の種類
+
+        Returns:
+            list[str]: 一覧の種類 (querys, surveys, reports, threads, news_list)
+        """
+        return self._kinds
+
+    def __str__(self) -> str:
+        return "ManabaPollTarget{course_id=%s,kinds=%s}" % (self.course_id, self._kinds)
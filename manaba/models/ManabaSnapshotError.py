@@ -0,0 +1,64 @@
+"""
+manaba コーススナップショット取得時のエラー
+"""
+from typing import Optional, Union
+
+from manaba.models.ManabaModel import ManabaModel
+
+
+class ManabaSnapshotError(ManabaModel):
+    """
+    manaba コーススナップショット取得時のエラー
+
+    Notes:
+        このモデルは :class:`manaba.models.ManabaCourseSnapshot` と :class:`manaba.models.ManabaSyncResult` で使用されます。
+    """
+
+    def __init__(self,
+                 kind: str,
+                 item_id: Optional[Union[int, str]],
+                 error: Exception):
+        """
+        manaba コーススナップショット取得時のエラー
+
+        Args:
+            kind: 取得に失敗した項目の種類 (例えば "course", "reports", "report")
+            item_id: 取得に失敗した項目の ID (一覧ページの場合は None)
+            error: 発生した例外
+        """
+        self._kind = kind
+        self._item_id = item_id
+        self._error = error
+
+    @property
+    def kind(self) -> str:
+        """
+        取得に失敗した項目の種類
+
+        Returns:
+            str: 項目の種類 (course, querys, query, drill, surveys, survey, reports, report, threads, thread, news_list, news, contents, content_pages, content_page)
+        """
+        return self._kind
+
+    @property
+    def item_id(self) -> Optional[Union[int, str]]:
+        """
+        取得に失敗した項目の ID
+
+        Returns:
+            Optional[Union[int, str]]: 項目の ID (一覧ページの場合は None)
+        """
+        return self._item_id
+
+    @property
+    def error(self) -> Exception:
+        """
+        発生した例外
+
+        Returns:
+            Exception: 発生した例外
+        """
+        return self._error
+
+    def __str__(self) -> str:
+        return "ManabaSnapshotError{kind=%s,item_id=%s,error=%r}" % (self._kind, self._item_id, self._error)
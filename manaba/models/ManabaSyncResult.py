@@ -0,0 +1,50 @@
+"""
+manaba 同期結果
+"""
+from manaba.models.ManabaModel import ManabaModel
+from manaba.models.ManabaSnapshotError import ManabaSnapshotError
+
+
+class ManabaSyncResult(ManabaModel):
+    """
+    manaba 同期結果
+
+    Notes:
+        このモデルは :func:`manaba.Manaba.sync` で使用されます。
+    """
+
+    def __init__(self,
+                 updated: list[tuple[int, str, str]],
+                 errors: list[ManabaSnapshotError]):
+        """
+        manaba 同期結果
+
+        Args:
+            updated: 新規・変更のため詳細ページを取得して保存した項目のキー (コース ID, 種類, 項目 ID) の一覧
+            errors: 取得に失敗した項目の一覧
+        """
+        self._updated = updated
+        self._errors = errors
+
+    @property
+    def updated(self) -> list[tuple[int, str, str]]:
+        """
+        新規・変更のため詳細ページを取得して保存した項目のキーの一覧
+
+        Returns:
+            list[tuple[int, str, str]]: (コース ID, 種類, 項目 ID) の一覧
+        """
+        return self._updated
+
+    @property
+    def errors(self) -> list[ManabaSnapshotError]:
+        """
+        取得に失敗した項目の一覧
+
+        Returns:
+            list[ManabaSnapshotError]: 取得に失敗した項目の一覧
+        """
+        return self._errors
+
+    def __str__(self) -> str:
+        return "ManabaSyncResult{updated=%s,errors=%s}" % (len(self._updated), len(self._errors))
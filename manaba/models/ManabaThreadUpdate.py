@@ -0,0 +1,68 @@
+"""
+manaba スレッド差分取得結果
+"""
+from manaba.models.ManabaModel import ManabaModel
+from manaba.models.ManabaThread import ManabaThread
+from manaba.models.ManabaThreadComment import ManabaThreadComment
+
+
+class ManabaThreadUpdate(ManabaModel):
+    """
+    manaba スレッド差分取得結果
+
+    Notes:
+        このモデルは :func:`manaba.Manaba.get_thread_since` で使用されます。
+    """
+
+    def __init__(self,
+                 thread: ManabaThread,
+                 new_comments: list[ManabaThreadComment],
+                 changed_comments: list[ManabaThreadComment]):
+        """
+        manaba スレッド差分取得結果
+
+        Args:
+            thread: 差分をマージしたスレッド詳細情報
+            new_comments: 新しく取得したコメントの一覧
+            changed_comments: 既に保持していたが、削除・編集されていたコメントの一覧
+        """
+        self._thread = thread
+        self._new_comments = new_comments
+        self._changed_comments = changed_comments
+
+    @property
+    def thread(self) -> ManabaThread:
+        """
+        差分をマージしたスレッド詳細情報
+
+        Returns:
+            ManabaThread: スレッド詳細情報
+        """
+        return self._thread
+
+    @property
+    def new_comments(self) -> list[ManabaThreadComment]:
+        """
+        新しく取得したコメントの一覧 (指定したコメント ID より新しいコメント)
+
+        Returns:
+            list[ManabaThreadComment]: コメントの一覧
+        """
+        return self._new_comments
+
+    @property
+    def changed_comments(self) -> list[ManabaThreadComment]:
+        """
+        既に保持していたが、削除・編集されていたコメントの一覧 (取得しなおした内容)
+
+        Returns:
+            list[ManabaThreadComment]: コメントの一覧
+
+        Notes:
+            取得しなおした範囲 (指定したコメント ID 以降を含むページ) にあるコメントのみ検出できます。
+        """
+        return self._changed_comments
+
+    def __str__(self) -> str:
+        return "ManabaThreadUpdate{thread=%s,new_comments=%s,changed_comments=%s}" % (
+            self._thread, len(self._new_comments), len(self._changed_comments))
@@ -0,0 +1,166 @@
+"""
+manaba リクエストトレース
+"""
+import datetime
+import zlib
+from typing import Optional
+
+from manaba.models.ManabaModel import ManabaModel
+
+
+class ManabaTrace(ManabaModel):
+    """
+    manaba リクエストトレース
+
+    Notes:
+        このモデルは :class:`manaba.trace.ManabaTraceBuffer` に、manaba へのリクエスト 1 件ごとに記録されます。
+        レスポンス本文は、バッファーの設定に応じて先頭の一部のみ (圧縮して) 保持するか、保持しません。
+    """
+
+    def __init__(self,
+                 method: str,
+                 url: str,
+                 status: Optional[int],
+                 started_at: datetime.datetime,
+                 elapsed: float,
+                 size: Optional[int],
+                 thread_name: str,
+                 error: Optional[str] = None,
+                 body: Optional[bytes] = None,
+                 body_truncated: bool = False,
+                 body_compressed: bool = False):
+        """
+        manaba リクエストトレース
+
+        Args:
+            method: リクエストメソッド
+            url: レスポンスの URL (リダイレクト後、ログインの認証情報を除く)
+            status: レスポンスのステータスコード (レスポンスを受け取れなかった場合は None)
+            started_at: リクエストを開始した日時
+            elapsed: リクエストの開始からレスポンスの受信までの秒数 (本文を読み込まない場合はヘッダーの受信まで)
+            size: レスポンス本文のバイト数 (本文を読み込まず、Content-Length もない場合は None)
+            thread_name: リクエストしたスレッドの名前
+            error: 発生した例外 (レスポンスを受け取れなかった場合)
+            body: 保持するレスポンス本文 (body_compressed が True の場合は zlib で圧縮したもの)
+            body_truncated: body がレスポンス本文の先頭の一部のみか
+            body_compressed: body を zlib で圧縮しているか
+        """
+        self._method = method
+        self._url = url
+        self._status = status
+        self._started_at = started_at
+        self._elapsed = elapsed
+        self._size = size
+        self._thread_name = thread_name
+        self._error = error
+        self._body = body
+        self._body_truncated = body_truncated
+        self._body_compressed = body_compressed
+
+    @property
+    def method(self) -> str:
+        """
+        リクエストメソッド
+
+        Returns:
+            str: リクエストメソッド
+        """
+        return self._method
+
+    @property
+    def url(self) -> str:
+        """
+        レスポンスの URL (リダイレクト後、ログインの認証情報を除く)
+
+        Returns:
+            str: URL
+        """
+        return self._url
+
+    @property
+    def status(self) -> Optional[int]:
+        """
+        レスポンスのステータスコード
+
+        Returns:
+            Optional[int]: ステータスコード (レスポンスを受け取れなかった場合は None)
+        """
+        return self._status
+
+    @property
+    def started_at(self) -> datetime.datetime:
+        """
+        リクエストを開始した日時
+
+        Returns:
+            datetime.datetime: 日時
+        """
+        return self._started_at
+
+    @property
+    def elapsed(self) -> float:
+        """
+        リクエストの開始からレスポンスの受信までの秒数
+
+        Returns:
+            float: 秒数
+        """
+        return self._elapsed
+
+    @property
+    def size(self) -> Optional[int]:
+        """
+        レスポンス本文のバイト数
+
+        Returns:
+            Optional[int]: バイト数 (不明な場合は None)
+        """
+        return self._size
+
+    @property
+    def thread_name(self) -> str:
+        """
+        リクエストしたスレッドの名前
+
+        Returns:
+            str: スレッド名
+        """
+        return self._thread_name
+
+    @property
+    def error(self) -> Optional[str]:
+        """
+        発生した例外
+
+        Returns:
+            Optional[str]: 例外の文字列表現 (レスポンスを受け取った場合は None)
+        """
+        return self._error
+
+    @property
+    def body(self) -> Optional[bytes]:
+        """
+        保持しているレスポンス本文
+
+        Returns:
+            Optional[bytes]: レスポンス本文 (圧縮している場合は展開したもの、保持していない場合は None)
+        """
+        if self._body is None or not self._body_compressed:
+            return self._body
+        return zlib.decompress(self._body)
+
+    @property
+    def body_truncated(self) -> bool:
+        """
+        保持しているレスポンス本文が先頭の一部のみか
+
+        Returns:
+            bool: 先頭の一部のみか
+        """
+        return self._body_truncated
+
+    def __str__(self) -> str:
+        return "ManabaTrace{method=%s,url=%s,status=%s,started_at=%s,elapsed=%.6f,size=%s,thread_name=%s," \
+               "error=%s,body_truncated=%s}" % (
+                   self._method, self._url, self._status, self._started_at, self._elapsed, self._size,
+                   self._thread_name, self._error, self._body_truncated)
@@ -0,0 +1,1564 @@
+"""
+manaba ページパーサー群
+
+取得したページの HTML からモデルを組み立てます。
+各関数は HTTP 通信を行わない純粋な関数で、HTML は str・bytes のどちらでも受け付けます。
+(bytes の場合、文字コードは HTML の meta 要素などから判定します)
+保存しておいた HTML の再パースや、別プロセスでのパース、パース処理単体のベンチマークにも使用できます。
+同期クライアント (:class:`manaba.Manaba`) と非同期クライアント (:class:`manaba.aio.AsyncManaba`) で共通して使用します。
+"""
+import codecs
+import datetime
+import functools
+import re
+import threading
+import time
+from html.parser import HTMLParser
+from typing import Callable, Optional, TypeVar, Union
+from urllib.parse import parse_qs, urljoin, urlparse
+
+import bs4.element
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+
+from manaba.exceptions import ManabaInternalError, ManabaNotFound
+from manaba.models.ManabaAnswerViewType import get_answer_view_type
+from manaba.models.ManabaContent import ManabaContent
+from manaba.models.ManabaContentPage import ManabaContentPage
+from manaba.models.ManabaCourse import ManabaCourse
+from manaba.models.ManabaCourseLamps import ManabaCourseLamps
+from manaba.models.ManabaCourseNews import ManabaCourseNews
+from manaba.models.ManabaDrillDetails import ManabaDrillDetails
+from manaba.models.ManabaFile import ManabaFile
+from manaba.models.ManabaGradePosition import ManabaGradePosition
+from manaba.models.ManabaPortfolioType import get_portfolio_type
+from manaba.models.ManabaQuery import ManabaQuery
+from manaba.models.ManabaQueryDetails import ManabaQueryDetails
+from manaba.models.ManabaReport import ManabaReport
+from manaba.models.ManabaReportDetails import ManabaReportDetails
+from manaba.models.ManabaResultViewType import get_result_view_type
+from manaba.models.ManabaStudentReSubmitType import get_student_resubmit_type
+from manaba.models.ManabaSurvey import ManabaSurvey
+from manaba.models.ManabaSurveyDetails import ManabaSurveyDetails
+from manaba.models.ManabaTaskStatus import ManabaTaskStatus
+from manaba.models.ManabaTaskStatusFlag import ManabaTaskStatusFlag, get_task_status
+from manaba.models.ManabaTaskYourStatusFlag import ManabaTaskYourStatusFlag, get_your_status
+from manaba.models.ManabaThread import ManabaThread
+from manaba.models.ManabaThreadComment import ManabaThreadComment
+
+JST = datetime.timezone(datetime.timedelta(hours=+9), 'JST')
+DEFAULT_PARSER = "html5lib"
+
+Markup = Union[str, bytes]
+
+T = TypeVar("T")
+M = TypeVar("M", str, bytes)
+
+ATTACHMENT_PATTERN = r"(.+?) - ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})"
+
+
+# 各パース関数が使用するページ内の領域 ("タグ名.クラス名" または "タグ名#ID")
+# ヘッダーなどのナビゲーション部分を除き、これらの領域のみをパースします。
+REGIONS: dict[str, tuple[str, ...]] = {
+    "parse_login_form": ("div#login-form-box",),
+    "parse_course": ("a#coursename", "span.courseteacher", "span.coursedata-info"),
+    "parse_courses": ("ul.infolist-tab", "div.mycourses-body", "table.courselist"),
+    "parse_querys": ("table.stdlist",),
+    "parse_query_details": ("table.stdlist-query", "table.gradelist"),
+    "parse_drill_details": ("table.stdlist-query",),
+    "parse_surveys": ("table.stdlist",),
+    "parse_survey_details": ("table.stdlist-query",),
+    "parse_reports": ("table.stdlist",),
+    "parse_report_details": ("table.stdlist-report", "div.report-form"),
+    "parse_threads": ("table.stdlist",),
+    "parse_thread": ("div.articlecontainer",),
+    "parse_news_list": ("table.stdlist",),
+    "parse_news": ("h2.msg-subject", "div.msg-info", "span.msg-date", "div.msg-text", "div.msg-lastmod",
+                   "div.inlineattachment"),
+    "parse_contents": ("table.contentslist",),
+    "parse_content_pages": ("div.articletext", "a#coursename", "ul.contentslist"),
+    "parse_content_page": ("div.articletext", "a#coursename", "h1.pagetitle", "div.pagelimitview",
+                           "div.articleauthor", "div.pageviewdisabled", "div.inlineattachment"),
+}
+
+
+# parse_html にかかった時間の合計 (スレッドごと)
+_parse_timer = threading.local()
+
+
+def parse_html(markup: Markup,
+               parser: str = DEFAULT_PARSER,
+               regions: Optional[tuple[str, ...]] = None) -> BeautifulSoup:
+    """
+    取得したページの HTML をパースする
+
+    Args:
+        markup: ページの HTML (str または bytes)
+        parser: BeautifulSoup のパーサーバックエンド (html5lib, lxml, html.parser)
+        regions: パースする領域 ("タグ名.クラス名" または "タグ名#ID" の一覧、指定しない場合はページ全体)
+
+    Returns:
+        BeautifulSoup: パース結果
+
+    Notes:
+        ページのパースはすべてこの関数を通して行います。
+        regions は lxml, html.parser でのみ有効です。html5lib は領域を限定したパースに対応していないため、ページ全体をパースします。
+        パースにかかった時間は :func:`measure_parse` で計測できます。
+    """
+    start = time.perf_counter()
+    try:
+        if regions is None or not _supports_regions(parser):
+            return BeautifulSoup(markup, parser)
+        return BeautifulSoup(markup, parser, parse_only=_region_strainer(regions))
+    finally:
+        _parse_timer.elapsed = getattr(_parse_timer, "elapsed", 0.0) + time.perf_counter() - start
+
+
+def measure_parse(parse: Callable[[M], T],
+                  markup: M) -> tuple[T, float, float]:
+    """
+    パース関数を実行し、かかった時間を計測する
+
+    Args:
+        parse: パース関数 (この module の関数に、HTML 以外の引数を束縛したもの)
+        markup: ページの HTML (str または bytes)
+
+    Returns:
+        tuple[T, float, float]: パース結果, HTML のパース (parse_html) にかかった秒数, パース関数全体にかかった秒数
+
+    Notes:
+        パース関数全体の時間から HTML のパースの時間を引いたものが、モデルの組み立てにかかった時間です。
+        module の関数なので、ProcessPoolExecutor のワーカープロセスでも実行できます。
+    """
+    _parse_timer.elapsed = 0.0
+    start = time.perf_counter()
+    result = parse(markup)
+    total = time.perf_counter() - start
+    return result, _parse_timer.elapsed, total
+
+
+@functools.lru_cache(maxsize=None)
+def _supports_regions(parser: str) -> bool:
+    """
+    パーサーバックエンドが領域を限定したパース (SoupStrainer) に対応しているか
+    """
+    builder = builder_registry.lookup(parser)
+    return builder is not None and "html5lib" not in builder.features
+
+
+@functools.lru_cache(maxsize=None)
+def _region_strainer(regions: tuple[str, ...]) -> SoupStrainer:
+    """
+    領域の一覧から、その領域のみをパースする SoupStrainer を作成する
+    """
+    selectors: list[tuple[str, str, str]] = []
+    for region in regions:
+        match = re.fullmatch(r"([a-z0-9]+)([.#])([A-Za-z0-9_-]+)", region)
+        if match is None:
+            raise ValueError("invalid region (" + region + ")")
+        selectors.append((match.group(1), "class" if match.group(2) == "." else "id", match.group(3)))
+
+    def match_region(name: str,
+                     attrs: dict[str, Union[str, list[str]]]) -> bool:
+        for tag_name, key, value in selectors:
+            if name != tag_name or key not in attrs:
+                continue
+            attr = attrs[key]
+            if value in (attr if isinstance(attr, list) else attr.split()):
+                return True
+        return False
+
+    return SoupStrainer(match_region)
+
+
+def parse_login_form(markup: Markup,
+                     parser: str = DEFAULT_PARSER) -> dict[str, str]:
+    """
+    ログインページからログインフォームの隠し項目を取得する
+
+    Args:
+        markup: ログインページの HTML
+        parser: パーサーバックエンド
+
+    Returns:
+        dict[str, str]: sessionValue1, sessionValue, login の値
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_login_form"])
+
+    login_form_box = soup.find("div", {"id": "login-form-box"})
+    return {
+        "sessionValue1": login_form_box.find("input", {"name": "SessionValue1"}).get("value"),
+        "sessionValue": login_form_box.find("input", {"name": "SessionValue"}).get("value"),
+        "login": login_form_box.find("input", {"name": "login"}).get("value")
+    }
+
+
+def is_login_page(markup: Markup) -> bool:
+    """
+    ページがログインページかどうかを調べる
+
+    Args:
+        markup: ページの HTML
+
+    Returns:
+        bool: ログインページか
+
+    Notes:
+        セッションの有効性を確認するために使用するため、HTML のパースは行わずにログインフォームの有無のみを調べます。
+    """
+    if isinstance(markup, bytes):
+        return b'id="login-form-box"' in markup
+    return 'id="login-form-box"' in markup
+
+
+def parse_course(markup: Markup,
+                 course_id: int,
+                 parser: str = DEFAULT_PARSER) -> ManabaCourse:
+    """
+    コースページからコース情報を取得する
+
+    Args:
+        markup: コースページの HTML
+        course_id: コース ID
+        parser: パーサーバックエンド
+
+    Returns:
+        ManabaCourse: コース情報
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_course"])
+
+    if soup.find("a", {"id": "coursename"}).has_attr("title"):
+        title = soup.find("a", {"id": "coursename"}).get("title")
+    else:
+        title = soup.find("a", {"id": "coursename"}).text
+    teacher = soup.find("span", {"class": "courseteacher"}).text
+    lecture_at = soup.find("span", {"class": "coursedata-info"}).find("span").text
+    year = int(soup.find("span", {"class": "coursedata-info"}).text.replace(lecture_at, ""))
+
+    return ManabaCourse(title, course_id, year, lecture_at, teacher, None)
+
+
+def parse_courses(markup: Markup,
+                  parser: str = DEFAULT_PARSER) -> list[ManabaCourse]:
+    """
+    コース一覧ページ (home_course, home_course_all) からコース情報を取得する
+
+    Args:
+        markup: コース一覧ページの HTML
+        parser: パーサーバックエンド
+
+    Returns:
+        list[ManabaCourse]: コース情報
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_courses"])
+
+    if soup.find("ul", {"class": "infolist-tab"}) is None:
+        raise ManabaInternalError()
+
+    correct_list_format_href: str = soup \
+        .find("ul", {"class": "infolist-tab"}) \
+        .find("li", {"class": "current"}) \
+        .find("a") \
+        .get("href")
+    correct_list_format = parse_qs(urlparse(correct_list_format_href).query)["chglistformat"][0]
+
+    my_courses = soup.find("div", {"class": "mycourses-body"})
+
+    if correct_list_format == "thumbnail":
+        return _get_courses_from_thumbnail(my_courses)
+    if correct_list_format == "list":
+        return _get_courses_from_list(my_courses)
+    if correct_list_format == "timetable":
+        return _get_courses_from_timetable(my_courses, soup.find("table", {"class": "courselist"}))
+
+    return []
+
+
+def _get_courses_from_thumbnail(my_courses: bs4.element.Tag) -> list[ManabaCourse]:
+    """
+    参加しているコース情報を取得する (サムネイル表示の場合)
+
+    Args:
+        my_courses: コース一覧のHTMLタグエレメント
+
+    Returns:
+        list[ManabaCourse]: 参加しているコース情報
+    """
+    course_cards = my_courses.find_all("div", {"class": "coursecard"})
+
+    courses = []
+    course_card: bs4.element.Tag
+    for course_card in course_cards:
+        title_link = course_card.find("div", {"class": "course-card-title"}).find("a")
+        course_name = title_link.text.strip()
+        course_link = title_link.get("href")
+        course_id: int = int(re.sub(r"course_([0-9]+)", r"\1", course_link))
+
+        course_items: bs4.element.Tag = course_card.find("dl", {"class": "courseitems"})
+        dts = course_items.find_all("dt", {"class": "courseitemtext"}, recursive=False)
+        dds = course_items.find_all("dd", {"class": "courseitemdetail"}, recursive=False)
+
+        year: Optional[int] = None
+        lecture_at: Optional[str] = None
+        teacher: Optional[str] = None
+
+        dt: bs4.element.Tag
+        dd: bs4.element.Tag
+        for dt, dd in zip(dts, dds):
+            dt_text = dt.text.strip()
+            dd_text = dd.text.strip()
+
+            if dt_text == "時限":
+                lecture_at = dd.find("span").text
+                year = int(dd_text.replace(dd.find("span").text, ""))
+            elif dt_text == "担当":
+                teacher = dd_text
+
+        status_lamps = _get_lamps_from_card(course_card.find("div", {"class": "course-card-status"}))
+
+        courses.append(ManabaCourse(course_name, course_id, year, lecture_at, teacher, status_lamps))
+
+    return courses
+
+
+def _get_courses_from_list(my_courses: bs4.element.Tag) -> list[ManabaCourse]:
+    """
+    参加しているコース情報を取得する (リスト表示の場合)
+
+    Args:
+        my_courses: コース一覧のHTMLタグエレメント
+
+    Returns:
+        list[ManabaCourse]: 参加しているコース情報
+    """
+    course_rows = my_courses.find_all("tr", class_=["courselist-c", "courselist-r"])
+
+    courses = []
+    for course_row in course_rows:
+        course_name = course_row.find("span", {"class": "courselist-title"}).text.strip()
+        course_link = course_row.find("span", {"class": "courselist-title"}).find("a").get("href")
+        course_id: int = int(re.sub(r"course_([0-9]+)", r"\1", course_link))
+
+        status_lamps = _get_lamps_from_card(course_row.find("div", {"class": "course-card-status"}))
+        course_tds = course_row.find_all("td")
+        course_year = int(course_tds[1].text.strip()) if len(course_tds) > 1 else None
+        course_time = course_tds[2].text.strip() if len(course_tds) > 2 else None
+        course_teacher = course_tds[3].text.strip() if len(course_tds) > 3 else None
+
+        courses.append(ManabaCourse(course_name, course_id, course_year, course_time, course_teacher, status_lamps))
+
+    return courses
+
+
+def _get_courses_from_timetable(my_courses: bs4.element.Tag,
+                                course_list: bs4.element.Tag) -> list[ManabaCourse]:
+    """
+    参加しているコース情報を取得する (曜日表示の場合)
+
+    Args:
+        my_courses: コース一覧のHTMLタグエレメント
+        course_list: 曜日・時限が設定されていないコース一覧のHTMLタグエレメント
+
+    Returns:
+        list[ManabaCourse]: 参加しているコース情報
+    """
+    course_cards = my_courses.find_all("div", class_=["courselistweekly-c", "courselistweekly-r"])
+
+    courses = []
+    for course_card in course_cards:
+        course_name = course_card.find("a").text.strip()
+        course_link = course_card.find("a").get("href")
+        course_id: int = int(re.sub(r"course_([0-9]+)", r"\1", course_link))
+
+        status_lamps = _get_lamps_from_card(course_card.find("div", {"class": "coursestatus"}))
+
+        courses.append(ManabaCourse(course_name, course_id, None, None, None, status_lamps))
+
+    other_courses = _get_courses_from_list(course_list)
+    courses.extend(other_courses)
+
+    return courses
+
+
+def _get_lamps_from_card(course_status: bs4.element.Tag) -> ManabaCourseLamps:
+    """
+    カードからステータスランプを取得する
+
+    Args:
+        course_status: カードのHTMLタグエレメント
+
+    Returns:
+        ManabaCourseLamps: コースステータスランプ
+    """
+    course_statuses = course_status \
+        .find_all("img")
+    return ManabaCourseLamps(
+        course_statuses[0].get("src").endswith("on.png"),
+        course_statuses[1].get("src").endswith("on.png"),
+        course_statuses[2].get("src").endswith("on.png"),
+        course_statuses[3].get("src").endswith("on.png"),
+        course_statuses[4].get("src").endswith("on.png")
+    )
+
+
+def parse_querys(markup: Markup,
+                 course_id: int,
+                 parser: str = DEFAULT_PARSER) -> list[ManabaQuery]:
+    """
+    小テスト一覧ページから小テスト一覧を取得する
+
+    Args:
+        markup: 小テスト一覧ページの HTML
+        course_id: コース ID
+        parser: パーサーバックエンド
+
+    Returns:
+        list[ManabaQuery]: コースの小テスト一覧
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_querys"])
+    std_list = soup.find("table", {"class": "stdlist"})
+    if std_list is None:
+        return []
+
+    query_tags = std_list.find_all("tr", class_=["row", "row0", "row1"])
+    querys = []
+    for query_tag in query_tags:
+        query_td_tags = query_tag.findAll("td")
+        query_title = query_tag.find("h3").text.strip()
+        query_status_lamp = query_tag.find("h3").find("img").get("src").endswith("on.png")
+        query_link = query_tag.find("h3").find("a").get("href")
+        query_id: int = int(re.sub(r"course_[0-9]+_(?:query|drill)_([0-9]+)", r"\1", query_link))
+        query_is_drill = "drill" in query_link
+
+        query_status = _parse_status(query_td_tags[1].text.strip())
+
+        query_start_time = process_datetime(query_td_tags[2].text.strip())
+        query_end_time = process_datetime(query_td_tags[3].text.strip())
+
+        querys.append(ManabaQuery(
+            course_id,
+            query_id,
+            query_title,
+            query_status,
+            query_status_lamp,
+            query_start_time,
+            query_end_time,
+            query_is_drill
+        ))
+
+    return querys
+
+
+def _get_details(detail_table: bs4.element.Tag,
+                 replace_br: bool = False) -> dict[str, str]:
+    """
+    詳細ページのテーブルから、見出しと値の組を取得する
+
+    Args:
+        detail_table: 詳細情報テーブルのHTMLタグエレメント
+        replace_br: 値の br タグを改行に置き換えるか
+
+    Returns:
+        dict[str, str]: 見出しと値の組
+    """
+    details = {}
+    detail_trs = detail_table.find_all("tr")
+    for tr in detail_trs:
+        if tr.get("class") == "title":
+            continue
+
+        th = tr.find("th")
+        td = tr.find("td")
+        if th is None or td is None:
+            continue
+        if replace_br:
+            for tag in td.find_all("br"):
+                tag.replace_with("\n")
+
+        details[th.text.strip()] = td.text.strip()
+
+    return details
+
+
+def parse_query_details(markup: Markup,
+                        course_id: int,
+                        query_id: int,
+                        parser: str = DEFAULT_PARSER) -> ManabaQueryDetails:
+    """
+    小テスト詳細ページから小テスト詳細情報を取得する
+
+    Args:
+        markup: 小テスト詳細ページの HTML
+        course_id: コース ID
+        query_id: 小テスト ID
+        parser: パーサーバックエンド
+
+    Returns:
+        ManabaQueryDetails: 小テスト詳細情報
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_query_details"])
+
+    if soup.find("table", {"class": "stdlist-query"}) is None:
+        raise ManabaNotFound()
+
+    query_title = soup.find("tr", {"class": "title"}).text.strip()
+
+    details = _get_details(soup.find("table", {"class": "stdlist-query"}))
+
+    portfolio_type = get_portfolio_type(_opt_value(details, "ポートフォリオ"))
+    result_view_type = get_result_view_type(_opt_value(details, "採点結果と正解の公開"))
+
+    status_value = _opt_value(details, "状態")
+    status = None
+    if status_value is not None:
+        if soup.find("table", {"class": "stdlist-query"}).find("span", {"class": "expired"}) is not None:
+            status = ManabaTaskStatus(ManabaTaskStatusFlag.CLOSED, ManabaTaskYourStatusFlag.UNSUBMITTED)
+        else:
+            status = _parse_status(status_value)
+
+    gradelist = soup.find("table", {"class": "gradelist"})
+    grade: Union[int, None] = None
+    position = None
+    if gradelist is not None:
+        grade_str = gradelist.find("td", {"class": "grade"}).text
+        try:
+            grade = int(grade_str)
+        except ValueError:
+            grade = None
+
+        position = _parse_grade_bar(gradelist)
+
+    return ManabaQueryDetails(
+        course_id,
+        query_id,
+        query_title,
+        _opt_value(details, "課題に関する説明"),
+        process_datetime(_opt_value(details, "受付開始日時")),
+        process_datetime(_opt_value(details, "受付終了日時")),
+        portfolio_type,
+        result_view_type,
+        status,
+        grade,
+        position
+    )
+
+
+def parse_drill_details(markup: Markup,
+                        course_id: int,
+                        drill_id: int,
+                        parser: str = DEFAULT_PARSER) -> ManabaDrillDetails:
+    """
+    小テストドリル詳細ページから小テストドリル詳細情報を取得する
+
+    Args:
+        markup: 小テストドリル詳細ページの HTML
+        course_id: コース ID
+        drill_id: 小テストドリル ID
+        parser: パーサーバックエンド
+
+    Returns:
+        ManabaDrillDetails: 小テストドリル詳細情報
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_drill_details"])
+
+    if soup.find("table", {"class": "stdlist-query"}) is None:
+        raise ManabaNotFound()
+
+    query_title = soup.find("tr", {"class": "title"}).text.strip()
+
+    details = _get_details(soup.find("table", {"class": "stdlist-query"}))
+
+    portfolio_type = get_portfolio_type(_opt_value(details, "ポートフォリオ"))
+
+    status_value = _opt_value(details, "状態")
+    status = None
+    if status_value is not None:
+        if soup.find("table", {"class": "stdlist-query"}).find("span", {"class": "expired"}) is not None:
+            status = ManabaTaskStatus(ManabaTaskStatusFlag.CLOSED, ManabaTaskYourStatusFlag.UNSUBMITTED)
+        else:
+            status = _parse_status(status_value)
+            if status.your_status is None:
+                # 受付中で未回答の場合、your_statusはNoneになる
+                status = ManabaTaskStatus(status.task_status, ManabaTaskYourStatusFlag.UNSUBMITTED)
+
+    submission_limit = -1
+    raw_submission_limit = _opt_value(details, "提出上限")
+    if raw_submission_limit is not None:
+        match = re.search(r"([0-9]+)回まで", raw_submission_limit)
+        if match is not None:
+            submission_limit = int(match.group(1))
+
+    answer_view_type = get_answer_view_type(_opt_value(details, "正解の公開"))
+
+    count_exams = None
+    max_score = None
+    if status_value is not None:
+        match = re.search(r"受験回数: ([0-9]+)回(?:\n|.)*?\(最高得点 ([0-9]+)\)", status_value)
+        if match is not None:
+            count_exams = int(match.group(1))
+            max_score = int(match.group(2))
+
+    raw_passing_conditions = _opt_value(details, "合格条件")
+    passing_conditions = -1
+    if raw_passing_conditions is not None:
+        num_passing_conditions = re.sub(r"([0-9]+).*", r"\1", raw_passing_conditions)
+        if num_passing_conditions is not None and num_passing_conditions.isdigit():
+            passing_conditions = int(num_passing_conditions)
+
+    return ManabaDrillDetails(
+        course_id,
+        drill_id,
+        query_title,
+        _opt_value(details, "課題に関する説明"),
+        process_datetime(_opt_value(details, "受付開始日時")),
+        process_datetime(_opt_value(details, "受付終了日時")),
+        submission_limit,
+        portfolio_type,
+        answer_view_type,
+        status,
+        count_exams,
+        max_score,
+        passing_conditions
+    )
+
+
+def parse_surveys(markup: Markup,
+                  course_id: int,
+                  parser: str = DEFAULT_PARSER) -> list[ManabaSurvey]:
+    """
+    アンケート一覧ページからアンケート一覧を取得する
+
+    Args:
+        markup: アンケート一覧ページの HTML
+        course_id: コース ID
+        parser: パーサーバックエンド
+
+    Returns:
+        list[ManabaSurvey]: コースのアンケート一覧
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_surveys"])
+    std_list = soup.find("table", {"class": "stdlist"})
+    if std_list is None:
+        return []
+
+    survey_tags = std_list.find_all("tr", class_=["row", "row0", "row1"])
+    surveys = []
+    for survey_tag in survey_tags:
+        survey_td_tags = survey_tag.findAll("td")
+        survey_title = survey_tag.find("h3").text.strip()
+        survey_status_lamp = survey_tag.find("h3").find("img").get("src").endswith("on.png")
+        survey_link = survey_tag.find("h3").find("a").get("href")
+        survey_id: int = int(re.sub(r"course_[0-9]+_survey_([0-9]+)", r"\1", survey_link))
+
+        survey_status = _parse_status(survey_td_tags[1].text.strip())
+
+        survey_start_time = process_datetime(survey_td_tags[2].text.strip())
+        survey_end_time = process_datetime(survey_td_tags[3].text.strip())
+
+        surveys.append(ManabaSurvey(
+            course_id,
+            survey_id,
+            survey_title,
+            survey_status,
+            survey_status_lamp,
+            survey_start_time,
+            survey_end_time
+        ))
+
+    return surveys
+
+
+def parse_survey_details(markup: Markup,
+                         course_id: int,
+                         survey_id: int,
+                         parser: str = DEFAULT_PARSER) -> ManabaSurveyDetails:
+    """
+    アンケート詳細ページからアンケート詳細情報を取得する
+
+    Args:
+        markup: アンケート詳細ページの HTML
+        course_id: コース ID
+        survey_id: アンケート ID
+        parser: パーサーバックエンド
+
+    Returns:
+        ManabaSurveyDetails: アンケート詳細情報
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_survey_details"])
+
+    if soup.find("table", {"class": "stdlist-query"}) is None:
+        raise ManabaNotFound()
+
+    survey_title = soup.find("tr", {"class": "title"}).text.strip()
+
+    details = _get_details(soup.find("table", {"class": "stdlist-query"}))
+
+    portfolio_type = get_portfolio_type(_opt_value(details, "ポートフォリオ"))
+    student_resubmit_type = get_student_resubmit_type(_opt_value(details, "学生による再提出の許可"))
+
+    status_value = _opt_value(details, "状態")
+    status = None
+    if status_value is not None:
+        if soup.find("table", {"class": "stdlist-query"}).find("span", {"class": "expired"}) is not None:
+            status = ManabaTaskStatus(ManabaTaskStatusFlag.CLOSED, ManabaTaskYourStatusFlag.UNSUBMITTED)
+        else:
+            status = _parse_status(status_value)
+
+    return ManabaSurveyDetails(
+        course_id,
+        survey_id,
+        survey_title,
+        process_datetime(_opt_value(details, "受付開始日時")),
+        process_datetime(_opt_value(details, "受付終了日時")),
+        portfolio_type,
+        student_resubmit_type,
+        status
+    )
+
+
+def parse_reports(markup: Markup,
+                  course_id: int,
+                  parser: str = DEFAULT_PARSER) -> list[ManabaReport]:
+    """
+    レポート一覧ページからレポート一覧を取得する
+
+    Args:
+        markup: レポート一覧ページの HTML
+        course_id: コース ID
+        parser: パーサーバックエンド
+
+    Returns:
+        list[ManabaReport]: コースのレポート一覧
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_reports"])
+    std_list = soup.find("table", {"class": "stdlist"})
+    if std_list is None:
+        return []
+
+    report_tags = std_list.find_all("tr", class_=["row", "row0", "row1"])
+    reports = []
+    for report_tag in report_tags:
+        report_td_tags = report_tag.findAll("td")
+        report_title = report_tag.find("h3").text.strip()
+        report_status_lamp = report_tag.find("h3").find("img").get("src").endswith("on.png")
+        report_link = report_tag.find("h3").find("a").get("href")
+        report_id: int = int(re.sub(r"course_[0-9]+_report_([0-9]+)", r"\1", report_link))
+
+        report_status = _parse_status(report_td_tags[1].text.strip())
+
+        report_start_time = process_datetime(report_td_tags[2].text.strip())
+        report_end_time = process_datetime(report_td_tags[3].text.strip())
+
+        reports.append(ManabaReport(
+            course_id,
+            report_id,
+            report_title,
+            report_status,
+            report_status_lamp,
+            report_start_time,
+            report_end_time
+        ))
+
+    return reports
+
+
+def parse_report_details(markup: Markup,
+                         course_id: int,
+                         report_id: int,
+                         parser: str = DEFAULT_PARSER) -> ManabaReportDetails:
+    """
+    レポート詳細ページからレポート詳細情報を取得する
+
+    Args:
+        markup: レポート詳細ページの HTML
+        course_id: コース ID
+        report_id: レポート ID
+        parser: パーサーバックエンド
+
+    Returns:
+        ManabaReportDetails: レポート詳細情報
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_report_details"])
+
+    if soup.find("table", {"class": "stdlist-report"}) is None:
+        raise ManabaNotFound()
+
+    report_title = soup.find("tr", {"class": "title"}).text.strip()
+
+    details = _get_details(soup.find("table", {"class": "stdlist-report"}), replace_br=True)
+
+    portfolio_and_view_settings = _opt_value(details, "ポートフォリオ / 閲覧設定")
+    portfolio_type = None
+    result_view_type = None
+    if portfolio_and_view_settings is not None and " / " in portfolio_and_view_settings:
+        portfolio_type = get_portfolio_type(portfolio_and_view_settings.split(" / ")[0])
+        result_view_type = get_result_view_type(portfolio_and_view_settings.split(" / ")[1])
+
+    student_resubmit_type = get_student_resubmit_type(_opt_value(details, "学生による再提出の許可"))
+
+    status_value = _opt_value(details, "状態")
+    status = None
+    if status_value is not None:
+        if (soup.find("table", {"class": "stdlist-report"}).find("span", {"class": "expired"}) is not None) or \
+                (soup.find("div", {"class": "report-form"}) is not None and
+                 soup.find("div", {"class": "report-form"}).find("span", {"class": "expired"}) is not None):
+            status = ManabaTaskStatus(ManabaTaskStatusFlag.CLOSED, ManabaTaskYourStatusFlag.UNSUBMITTED)
+        else:
+            status = _parse_status(status_value)
+
+    return ManabaReportDetails(
+        course_id,
+        report_id,
+        report_title,
+        _opt_value(details, "課題に関する説明"),
+        process_datetime(_opt_value(details, "受付開始日時")),
+        process_datetime(_opt_value(details, "受付終了日時")),
+        portfolio_type,
+        result_view_type,
+        student_resubmit_type,
+        status
+    )
+
+
+def parse_threads(markup: Markup,
+                  course_id: int,
+                  parser: str = DEFAULT_PARSER) -> list[ManabaThread]:
+    """
+    スレッド一覧ページからスレッド一覧を取得する
+
+    Args:
+        markup: スレッド一覧ページの HTML
+        course_id: コース ID
+        parser: パーサーバックエンド
+
+    Returns:
+        list[ManabaThread]: コースのスレッド一覧
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_threads"])
+
+    std_list = soup.find("table", {"class": "stdlist"})
+    if std_list is None:
+        return []
+
+    thread_tags = std_list.find_all("tr", class_=["row", "row0", "row1"])
+    threads = []
+    for thread_tag in thread_tags:
+        thread_title = thread_tag.find("span", {"class": "thread-title"}).text.strip()
+        thread_link = thread_tag.find("a", {"class": "threadhead"}).get("href")
+        thread_id: int = int(re.sub(r"course_[0-9]+_topics_([0-9]+)_.+", r"\1", thread_link))
+
+        threads.append(ManabaThread(
+            course_id,
+            thread_id,
+            thread_title,
+            None
+        ))
+
+    return threads
+
+
+def parse_thread(markup: Markup,
+                 course_id: int,
+                 thread_id: int,
+                 base_url: str,
+                 parser: str = DEFAULT_PARSER) -> ManabaThread:
+    """
+    スレッド詳細ページ (フラット表示) からスレッド詳細情報を取得する
+
+    Args:
+        markup: スレッド詳細ページの HTML
+        course_id: コース ID
+        thread_id: スレッド ID
+        base_url: manaba のベース URL (添付ファイルの URL に使用)
+        parser: パーサーバックエンド
+
+    Returns:
+        ManabaThread: スレッド詳細情報
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_thread"])
+
+    comments: list[ManabaThreadComment] = []
+    comment_tags = soup.find_all("div", {"class": "articlecontainer"})
+    for comment_tag in comment_tags:
+        comments.append(_parse_thread_comment(comment_tag, course_id, thread_id, base_url))
+
+    return ManabaThread(
+        course_id,
+        thread_id,
+        comments[0].title if len(comments) != 0 else None,
+        comments
+    )
+
+
+def _parse_thread_comment(comment_tag: bs4.element.Tag,
+                          course_id: int,
+                          thread_id: int,
+                          base_url: str) -> ManabaThreadComment:
+    """
+    スレッドのコメント 1 件分を取得する
+
+    Args:
+        comment_tag: コメント (div.articlecontainer) のHTMLタグエレメント
+        course_id: コース ID
+        thread_id: スレッド ID
+        base_url: manaba のベース URL
+
+    Returns:
+        ManabaThreadComment: スレッドコメント
+    """
+    comment_id: int = int(comment_tag.find("h3", {"class": "articlenumber"}).text.strip())
+    comment_title: str = comment_tag.find("div", {"class": "articlesubject"}).text.strip()
+    comment_body: bs4.element.Tag = comment_tag.find("div", {"class": "articlebody-msgbody"})
+    article_info: bs4.element.Tag = comment_tag.find("div", {"class": "articleinfo"})
+
+    # 以下、投稿者名と投稿日時が正常に取れない可能性あり
+    comment_author: Optional[str] = None
+    comment_date: Optional[str] = None
+    if article_info.find("span", {"class": "posted-time"}) is not None:
+        if article_info.find("a", {"href": "#"}) is not None:
+            # リンクになっている投稿者情報があればそれ
+            comment_author = article_info.find("a").text.strip()
+        else:
+            # リンクがなければ投稿後のひとつ前のタグ
+            comment_author = str(
+                article_info.find("span", {"class": "posted-time"}).previous_sibling.string).strip()
+
+        comment_date = article_info.find("span", {"class": "posted-time"}).text.strip()
+
+    reply_to_id = None
+    if comment_tag.find("div", {"class": "parentmsg-no"}) is not None:
+        reply_to_id = int(comment_tag.find("div", {"class": "parentmsg-no"}).text.strip())
+
+    deleted = comment_tag.find("div", {"class": "articlecontainer-deleted"}) is not None
+
+    manaba_thread_comment = ManabaThreadComment(
+        course_id,
+        thread_id,
+        comment_id,
+        comment_title,
+        comment_author,
+        process_datetime(comment_date),
+        reply_to_id,
+        deleted,
+        str(comment_body).replace(" ", "&nbsp;").strip()
+    )
+
+    for file in _parse_attachments(comment_tag, manaba_thread_comment, base_url):
+        manaba_thread_comment.add_file(file)
+
+    return manaba_thread_comment
+
+
+class ThreadCommentStream:
+    """
+    スレッド詳細ページ (フラット表示) のストリーミングパーサー
+
+    Notes:
+        ページの HTML を受信したチャンクごとに :func:`feed` に渡すと、閉じられたコメント (div.articlecontainer) を順に返します。
+        標準ライブラリのトークナイザーでコメントの範囲のみを切り出し、コメント 1 件分の HTML だけを parser でパースするため、
+        ページ全体の木は作らず、メモリ上にはコメント 1 件分とチャンクの未処理部分のみを保持します。
+    """
+
+    def __init__(self,
+                 course_id: int,
+                 thread_id: int,
+                 base_url: str,
+                 parser: str = DEFAULT_PARSER,
+                 encoding: str = "utf-8") -> None:
+        """
+        スレッド詳細ページのストリーミングパーサー
+
+        Args:
+            course_id: コース ID
+            thread_id: スレッド ID
+            base_url: manaba のベース URL (添付ファイルの URL に使用)
+            parser: コメント 1 件分の HTML のパースに使用するパーサーバックエンド
+            encoding: bytes のチャンクを渡す場合の文字コード
+        """
+        self.__course_id = course_id
+        self.__thread_id = thread_id
+        self.__base_url = base_url
+        self.__parser = parser
+        self.__decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self.__splitter = _ArticleSplitter()
+
+    @property
+    def login_page(self) -> bool:
+        """
+        ログインページ (セッション切れ) を受信したか
+
+        Returns:
+            bool: ログインページか
+        """
+        return self.__splitter.login_page
+
+    def feed(self,
+             data: Markup) -> list[ManabaThreadComment]:
+        """
+        受信したチャンクを渡す
+
+        Args:
+            data: ページの HTML の一部 (str または bytes)
+
+        Returns:
+            list[ManabaThreadComment]: このチャンクまでで閉じられた、まだ返していないコメント
+        """
+        self.__splitter.feed(self.__decoder.decode(data) if isinstance(data, bytes) else data)
+        return self.__pop_comments()
+
+    def close(self) -> list[ManabaThreadComment]:
+        """
+        ページの終わりまで受信したことを通知する
+
+        Returns:
+            list[ManabaThreadComment]: まだ返していないコメント
+        """
+        self.__splitter.feed(self.__decoder.decode(b"", final=True))
+        self.__splitter.close()
+        return self.__pop_comments()
+
+    def __pop_comments(self) -> list[ManabaThreadComment]:
+        comments: list[ManabaThreadComment] = []
+        for fragment in self.__splitter.pop_fragments():
+            soup = parse_html(fragment, self.__parser, REGIONS["parse_thread"])
+            comments.append(_parse_thread_comment(
+                soup.find("div", {"class": "articlecontainer"}), self.__course_id, self.__thread_id, self.__base_url))
+            # 木は循環参照を持つため、ガベージコレクションを待たずに解放する
+            soup.decompose()
+        return comments
+
+
+class _ArticleSplitter(HTMLParser):
+    """
+    受信した HTML から、コメント (div.articlecontainer) 1 件分ずつの HTML を切り出す
+
+    Notes:
+        コメントの範囲は div タグの入れ子の深さで判定します。
+        文字参照はパースせずにそのまま残すため、切り出した HTML をパースした結果はページ全体をパースした場合と同じになります。
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.login_page = False
+        self.__depth = 0
+        self.__fragment: list[str] = []
+        self.__fragments: list[str] = []
+
+    def pop_fragments(self) -> list[str]:
+        """
+        切り出したコメントの HTML を取り出す
+
+        Returns:
+            list[str]: まだ取り出していないコメントの HTML
+        """
+        fragments = self.__fragments
+        self.__fragments = []
+        return fragments
+
+    def __append(self,
+                 text: str) -> None:
+        if self.__depth > 0:
+            self.__fragment.append(text)
+
+    def handle_starttag(self,
+                        tag: str,
+                        attrs: list[tuple[str, Optional[str]]]) -> None:
+        if tag == "div":
+            if self.__depth > 0:
+                self.__depth += 1
+            elif "articlecontainer" in (dict(attrs).get("class") or "").split():
+                self.__depth = 1
+            elif ("id", "login-form-box") in attrs:
+                self.login_page = True
+        self.__append(self.get_starttag_text() or "")
+
+    def handle_startendtag(self,
+                           tag: str,
+                           attrs: list[tuple[str, Optional[str]]]) -> None:
+        self.__append(self.get_starttag_text() or "")
+
+    def handle_endtag(self,
+                      tag: str) -> None:
+        self.__append("</" + tag + ">")
+        if tag != "div" or self.__depth == 0:
+            return
+        self.__depth -= 1
+        if self.__depth == 0:
+            self.__fragments.append("".join(self.__fragment))
+            self.__fragment = []
+
+    def handle_data(self,
+                    data: str) -> None:
+        self.__append(data)
+
+    def handle_entityref(self,
+                         name: str) -> None:
+        self.__append("&" + name + ";")
+
+    def handle_charref(self,
+                       name: str) -> None:
+        self.__append("&#" + name + ";")
+
+    def handle_comment(self,
+                       data: str) -> None:
+        self.__append("<!--" + data + "-->")
+
+
+def _parse_attachments(tag: bs4.element.Tag,
+                       parent: Union[ManabaThreadComment, ManabaCourseNews, ManabaContentPage],
+                       base_url: str) -> list[ManabaFile]:
+    """
+    添付ファイル (div.inlineattachment) の一覧を取得する
+
+    Args:
+        tag: 添付ファイルを含むHTMLタグエレメント
+        parent: 添付ファイルの親モデル
+        base_url: manaba のベース URL
+
+    Returns:
+        list[ManabaFile]: 添付ファイルの一覧
+    """
+    files = []
+    attachments = tag.find_all("div", {"class": "inlineattachment"})
+    for attachment in attachments:
+        a_tag = attachment.find("div", {"class": "inlineaf-description"}).find("a")
+        files.append(ManabaFile(
+            parent,
+            re.sub(ATTACHMENT_PATTERN, r"\1", a_tag.text).strip(),
+            process_datetime(re.sub(ATTACHMENT_PATTERN, r"\2", a_tag.text).strip()),
+            urljoin(base_url + "/ct/", a_tag.get("href"))
+        ))
+
+    return files
+
+
+def parse_news_list(markup: Markup,
+                    course_id: int,
+                    parser: str = DEFAULT_PARSER) -> list[ManabaCourseNews]:
+    """
+    コースニュース一覧ページからコースニュース一覧を取得する
+
+    Args:
+        markup: コースニュース一覧ページの HTML
+        course_id: コース ID
+        parser: パーサーバックエンド
+
+    Returns:
+        list[ManabaCourseNews]: コースのニュース一覧
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_news_list"])
+
+    std_list = soup.find("table", {"class": "stdlist"})
+    if std_list is None:
+        return []
+
+    news_tags = std_list.find_all("tr", class_=["row", "row0", "row1"])
+    news = []
+    for news_tag in news_tags:
+        tds = news_tag.find_all("td")
+        news_title_tag = tds[0]
+        news_title = news_title_tag.text.strip()
+        news_link = news_title_tag.find("a").get("href")
+        news_id: int = int(re.sub(r"course_[0-9]+_news_([0-9]+)", r"\1", news_link))
+        news_author = tds[1].text.strip()
+        news_posted_at = process_datetime(tds[2].text.strip())
+
+        news.append(ManabaCourseNews(
+            course_id,
+            news_id,
+            news_title,
+            news_author,
+            news_posted_at,
+            None,
+            None,
+            None
+        ))
+
+    return news
+
+
+def parse_news(markup: Markup,
+               course_id: int,
+               news_id: int,
+               base_url: str,
+               parser: str = DEFAULT_PARSER) -> ManabaCourseNews:
+    """
+    コースニュース詳細ページからニュース詳細情報を取得する
+
+    Args:
+        markup: コースニュース詳細ページの HTML
+        course_id: コース ID
+        news_id: ニュース ID
+        base_url: manaba のベース URL (添付ファイルの URL に使用)
+        parser: パーサーバックエンド
+
+    Returns:
+        ManabaCourseNews: ニュース詳細情報
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_news"])
+
+    if soup.find("h2", {"class": "msg-subject"}) is None:
+        raise ManabaNotFound()
+
+    news_title = soup.find("h2", {"class": "msg-subject"}).text.strip()
+
+    if soup.find("div", {"class": "msg-info"}).find("a", {"href": "#"}) is not None:
+        news_author = soup \
+            .find("div", {"class": "msg-info"}) \
+            .find("a", {"href": "#"}) \
+            .text.strip()
+    else:
+        news_author = soup \
+            .find("div", {"class": "msg-info"}) \
+            .text.replace("投稿者", "").strip()
+
+    news_posted_at = process_datetime(soup.find("span", {"class": "msg-date"}).text.strip())
+    msg_text = soup.find("div", {"class": "msg-text"})
+
+    news_html = str(msg_text).replace(" ", "&nbsp;").strip()
+
+    # last_edit
+    last_modified = soup.find("div", {"class": "msg-lastmod"})
+    last_edited_author = None
+    last_edited_at = None
+    if last_modified is not None:
+        if last_modified.find("a") is not None:
+            last_edited_author = last_modified.find("a").text.strip()
+            last_edited_at = process_datetime(
+                str(last_modified.find("a").next_sibling.string).strip()
+            )
+        else:
+            last_edited_str = last_modified.text.strip()
+            last_edited_author = re.sub(r"最終更新 (.+) ([0-9]{4}-[0-9]{2}-[0-9]{2} +[0-9]{2}:[0-9]{2})", r"\1",
+                                        last_edited_str)
+            last_edited_at = process_datetime(
+                re.sub(r"最終更新 (.+) ([0-9]{4}-[0-9]{2}-[0-9]{2} +[0-9]{2}:[0-9]{2})", r"\2", last_edited_str))
+
+    manaba_course_news = ManabaCourseNews(
+        course_id,
+        news_id,
+        news_title,
+        news_author,
+        news_posted_at,
+        last_edited_author,
+        last_edited_at,
+        news_html
+    )
+
+    for file in _parse_attachments(soup, manaba_course_news, base_url):
+        manaba_course_news.add_file(file)
+
+    return manaba_course_news
+
+
+def parse_contents(markup: Markup,
+                   course_id: int,
+                   parser: str = DEFAULT_PARSER) -> list[ManabaContent]:
+    """
+    コンテンツ一覧ページからコンテンツ一覧を取得する
+
+    Args:
+        markup: コンテンツ一覧ページの HTML
+        course_id: コース ID
+        parser: パーサーバックエンド
+
+    Returns:
+        list[ManabaContent]: コースのコンテンツ一覧
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_contents"])
+
+    contents_list = soup.find("table", {"class": "contentslist"})
+    if contents_list is None:
+        return []
+
+    trs = contents_list.find_all("tr")
+    contents = []
+    for tr in trs:
+        about = tr.find("td", {"class": "about-contents"})
+        title = about.find("a").text.strip()
+        link = about.find("a").get("href")
+        content_id = re.sub(r"page_(.+)", r"\1", link)
+        description = about.find("span").text.strip()
+
+        contents.append(ManabaContent(
+            course_id,
+            content_id,
+            title,
+            description,
+            None,
+            None
+        ))
+
+    return contents
+
+
+def parse_content_pages(markup: Markup,
+                        content_id: str,
+                        parser: str = DEFAULT_PARSER) -> list[ManabaContentPage]:
+    """
+    コンテンツページからコンテンツページ一覧を取得する
+
+    Args:
+        markup: コンテンツページの HTML
+        content_id: コンテンツ ID
+        parser: パーサーバックエンド
+
+    Returns:
+        list[ManabaContentPage]: コンテンツページ一覧
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_content_pages"])
+
+    if soup.find("div", {"class": "articletext"}) is None:
+        raise ManabaNotFound()
+
+    course_link = soup.find("a", {"id": "coursename"}).get("href")
+    course_id: int = int(re.sub(r"course_([0-9]+)", r"\1", course_link))
+
+    contents_list = soup.find("ul", {"class": "contentslist"}).find_all("li")
+    pages = []
+    for content in contents_list:
+        page_title = content.text.strip()
+        page_link = content.find("a").get("href")
+        page_id: int = int(re.sub(r"page_[a-z0-9]+_([a-z0-9]+)", r"\1", page_link))
+        pages.append(ManabaContentPage(
+            course_id,
+            content_id,
+            page_id,
+            page_title,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None
+        ))
+
+    return pages
+
+
+def parse_content_page(markup: Markup,
+                       content_id: str,
+                       page_id: int,
+                       base_url: str,
+                       parser: str = DEFAULT_PARSER) -> ManabaContentPage:
+    """
+    コンテンツページからコンテンツページ詳細を取得する
+
+    Args:
+        markup: コンテンツページの HTML
+        content_id: コンテンツ ID
+        page_id: コンテンツページ ID
+        base_url: manaba のベース URL (添付ファイルの URL に使用)
+        parser: パーサーバックエンド
+
+    Returns:
+        ManabaContentPage: コンテンツページ詳細
+    """
+    soup = parse_html(markup, parser, REGIONS["parse_content_page"])
+
+    if soup.find("div", {"class": "articletext"}) is None:
+        raise ManabaNotFound()
+
+    course_link = soup.find("a", {"id": "coursename"}).get("href")
+    course_id: int = int(re.sub(r"course_([0-9]+)", r"\1", course_link))
+
+    page_title = soup.find("h1", {"class": "pagetitle"}).text.strip()
+
+    pagelimitview = soup.find("div", {"class": "pagelimitview"}).text.strip()
+    publish_start_at = None
+    publish_end_at = None
+    if re.search(
+            r"([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}) ～ ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})",
+            pagelimitview) is not None:
+        # 開始・終了日時両方ある
+        publish_start_at = process_datetime(re.sub(
+            r".*([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}) ～ ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})",
+            r"\1",
+            pagelimitview))
+        publish_end_at = process_datetime(re.sub(
+            r".*([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}) ～ ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})",
+            r"\2",
+            pagelimitview))
+    elif re.search(r"([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}) ～", pagelimitview) is not None:
+        # 開始日時だけある
+        publish_start_at = process_datetime(re.sub(
+            r".*([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}) ～",
+            r"\1",
+            pagelimitview))
+    elif re.search(r"～ ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})", pagelimitview) is not None:
+        # 終了日時だけある
+        publish_end_at = process_datetime(re.sub(
+            r".*～ ([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2})",
+            r"\1",
+            pagelimitview))
+
+    article_author = soup.find("div", {"class": "articleauthor"}).text.strip()
+    last_edited_at = process_datetime(
+        re.sub(r"([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}) - (.+)- ([0-9.]+)版", r"\1", article_author))
+    page_author = re.sub(r"([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}) - (.+)- ([0-9.]+)版", r"\2",
+                         article_author)
+    version = re.sub(r"([0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}) - (.+)- ([0-9.]+)版", r"\3", article_author)
+    viewable = soup.find("div", {"class": "pageviewdisabled"}) is None
+    html = None
+    if viewable:
+        article_text = soup.find("div", {"class": "articletext"})
+
+        html = str(article_text).replace(" ", "&nbsp;").strip()
+
+    manaba_content_page = ManabaContentPage(
+        course_id,
+        content_id,
+        page_id,
+        page_title,
+        page_author,
+        version,
+        viewable,
+        last_edited_at,
+        publish_start_at,
+        publish_end_at,
+        html
+    )
+
+    if viewable:
+        for file in _parse_attachments(soup, manaba_content_page, base_url):
+            manaba_content_page.add_file(file)
+
+    return manaba_content_page
+
+
+def process_datetime(datetime_str: Optional[str]) -> Optional[datetime.datetime]:
+    """
+    manabaの日時テキスト(YYYY-MM-DD HH:MM:SS)から datetime.datetime に変換する
+
+    Args:
+        datetime_str: manabaの日時テキスト
+
+    Returns:
+        Optional[datetime.datetime]: 変換後の datetime.datetime
+    """
+    if datetime_str is None or datetime_str == "":
+        return None
+    datetime_str = datetime_str.replace("  ", " ")
+    datetime_format = "%Y-%m-%d %H:%M:%S %z" if len(datetime_str) == 19 else "%Y-%m-%d %H:%M %z"
+    return datetime.datetime.strptime(datetime_str + " +0900", datetime_format).astimezone(JST)
+
+
+def _opt_value(items: dict[str, str],
+               key: str) -> Optional[str]:
+    if key not in items or items[key] is None:
+        return None
+    return items[key].strip()
+
+
+def _parse_status(status_text: str) -> ManabaTaskStatus:
+    statuses = status_text.split("\n")
+    statuses = list(map(lambda x: x.strip(), statuses))
+    statuses = list(filter(lambda x: len(x) != 0, statuses))
+    if len(statuses) == 1:
+        # 受付開始待ちなど1行しか状態がない
+        task_status = get_task_status(statuses[0].strip())
+        if task_status is None:
+            raise ManabaInternalError(
+                "get_task_status return None (" + statuses[0].strip() + ")")
+        return ManabaTaskStatus(task_status, None)
+
+    if len(statuses) == 2:
+        task_status = get_task_status(statuses[0].strip())
+        if task_status is None:
+            raise ManabaInternalError(
+                "get_task_status return None (" + statuses[0].strip() + ")")
+
+        your_status: Optional[ManabaTaskYourStatusFlag]
+        if "まだ提出は可能です" in statuses[1]:  # 未提出 & ※遅延として取り扱われますが、まだ提出は可能です。
+            your_status = ManabaTaskYourStatusFlag.UNSUBMITTED
+        elif "回提出済み" in statuses[1]:  # ドリル対策。未合格で締め切られている場合「n回提出済み」になる？
+            your_status = ManabaTaskYourStatusFlag.UNPASSED
+        elif "受験回数" in statuses[1]:  # ドリル対策。未合格で締め切られている場合「受験回数: n」になる
+            your_status = ManabaTaskYourStatusFlag.UNPASSED
+        elif "個別指導／相互閲覧画面へ" in statuses[1] and task_status == ManabaTaskStatusFlag.CLOSED:  # タスククローズ + 未提出？
+            your_status = ManabaTaskYourStatusFlag.UNSUBMITTED
+        else:
+            your_status = get_your_status(statuses[1].strip())
+            if your_status is None:
+                raise ManabaInternalError(
+                    "your_status return None (" + statuses[1].strip() + ")")
+
+        return ManabaTaskStatus(task_status, your_status)
+
+    if len(statuses) == 3:
+        task_status = get_task_status(statuses[0].strip())
+        if task_status is None:
+            raise ManabaInternalError(
+                "get_task_status return None (" + statuses[0].strip() + ")")
+
+        if "まだ提出は可能です" in statuses[1]:  # 未提出 & ※遅延として取り扱われますが、まだ提出は可能です。
+            your_status = ManabaTaskYourStatusFlag.UNSUBMITTED
+        else:
+            your_status = get_your_status(statuses[1].strip())
+            if your_status is None:
+                your_status = get_your_status(statuses[2].strip())
+                if your_status is None:
+                    if task_status == ManabaTaskStatusFlag.CLOSED:
+                        your_status = ManabaTaskYourStatusFlag.UNPASSED
+                    else:
+                        raise ManabaInternalError(
+                            "your_status return None (" + statuses[1].strip() + " | " + statuses[2].strip() + ")")
+
+        return ManabaTaskStatus(task_status, your_status)
+
+    if len(statuses) == 4:
+        task_status = get_task_status(statuses[0].strip())
+        if task_status is None:
+            raise ManabaInternalError(
+                "get_task_status return None (" + statuses[0].strip() + ")")
+
+        if "合格済み" in statuses[3].strip():
+            your_status = ManabaTaskYourStatusFlag.PASSED
+        else:
+            your_status = get_your_status(statuses[2].strip())
+            if your_status is None:
+                raise ManabaInternalError(
+                    "your_status return None (" + statuses[2].strip() + ")")
+
+        return ManabaTaskStatus(task_status, your_status)
+
+    raise ManabaInternalError("td_tags length not matched (" + str(len(statuses)) + ")")
+
+
+def _parse_grade_bar(gradelist: bs4.element.Tag) -> Optional[ManabaGradePosition]:
+    bar_form = gradelist.find("table", {"class": "form"})
+    if bar_form is None:
+        return None
+
+    bars = bar_form.find_all("td")
+    if len(bars) == 1:
+        below_percent = None
+        my_position_percent = int(bars[0].get("width").replace("%", ""))
+        above_percent = None
+
+        return ManabaGradePosition(below_percent, my_position_percent, above_percent)
+
+    if len(bars) == 2:
+        if bars[0].get("class") is not None and "gradebar" in bars[0].get("class"):
+            # 最低点
+            below_percent = None
+            my_position_percent = int(bars[0].get("width").replace("%", ""))
+            above_percent = int(bars[1].get("width").replace("%", ""))
+        elif bars[1].get("class") is not None and "gradebar" in bars[1].get("class"):
+            below_percent = int(bars[0].get("width").replace("%", ""))
+            my_position_percent = int(bars[1].get("width").replace("%", ""))
+            above_percent = None
+        else:
+            raise ManabaInternalError("_parse_grade_bar not found gradebar")
+
+        return ManabaGradePosition(below_percent, my_position_percent, above_percent)
+
+    if len(bars) == 3:
+        below_percent = int(bars[0].get("width").replace("%", ""))
+        my_position_percent = int(bars[1].get("width").replace("%", ""))
+        above_percent = int(bars[2].get("width").replace("%", ""))
+
+        return ManabaGradePosition(below_percent, my_position_percent, above_percent)
+
+    raise ManabaInternalError("_parse_grade_bar not parseable")
@@ -0,0 +1,347 @@
+"""
+manaba マルチアカウントセッションプール
+
+複数のアカウントの :class:`manaba.Manaba` をまとめてログインさせ、(アカウント, エンドポイント, 引数) の処理を
+ワーカースレッドで公平に実行します。すべてのアカウントでコネクションプールを共有します。
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+from requests.adapters import HTTPAdapter
+
+from manaba import Manaba
+from manaba.cache import ManabaCache
+from manaba.concurrency import ManabaConcurrencyGovernor
+from manaba.parsers import DEFAULT_PARSER
+from manaba.ratelimit import ManabaRateLimiter
+from manaba.retry import ManabaRetryPolicy
+
+WorkItem = tuple[str, str, tuple[object, ...]]
+
+
+class _Job:
+    """
+    プールで実行する処理
+    """
+
+    def __init__(self,
+                 account: str,
+                 endpoint: str,
+                 args: tuple[object, ...],
+                 kwargs: dict[str, object]):
+        self.account = account
+        self.endpoint = endpoint
+        self.args = args
+        self.kwargs = kwargs
+        self.future: "Future[object]" = Future()
+
+
+class ManabaPool:
+    """
+    manaba マルチアカウントセッションプール
+
+    Notes:
+        アカウントごとに :class:`manaba.Manaba` を作成し、login_all() で login_concurrency 件ずつ同時にログインします。
+        ログインの開始は login_interval 秒以上の間隔をあけ、SSO のログインページに一度にリクエストが集中しないようにします。
+        submit() した処理はアカウントごとの待ち行列に入り、ワーカースレッドがアカウントを順番に巡回して 1 件ずつ取り出します (ラウンドロビン)。
+        1 つのアカウントが多くの処理を submit しても、他のアカウントの処理が待たされ続けることはありません。
+        アカウントごとに同時に実行する処理は per_account 件までです。
+        すべての Manaba は max_workers 接続のコネクションプールを共有します。
+    """
+
+    def __init__(self,
+                 base_url: str,
+                 parser: str = DEFAULT_PARSER,
+                 max_workers: int = 16,
+                 per_account: int = 2,
+                 login_concurrency: int = 4,
+                 login_interval: float = 0.0,
+                 cache: Optional[ManabaCache] = None,
+                 retry: Optional[ManabaRetryPolicy] = None,
+                 rate_limiter: Optional[ManabaRateLimiter] = None,
+                 governor: Optional[ManabaConcurrencyGovernor] = None) -> None:
+        """
+        manaba マルチアカウントセッションプール
+
+        Args:
+            base_url: manaba のベース URL
+            parser: HTML のパースに使用する BeautifulSoup のパーサーバックエンド (html5lib, lxml, html.parser)
+            max_workers: 処理を実行するワーカースレッド数 (共有するコネクションプールの接続数)
+            per_account: アカウントごとに同時に実行する処理の上限
+            login_concurrency: 同時にログインするアカウント数の上限
+            login_interval: ログインを開始する間隔の秒数
+            cache: すべてのアカウントで共有するページキャッシュ (キーにアカウントを含むため、アカウント間でモデルは共有されません)
+            retry: リトライポリシー
+            rate_limiter: すべてのアカウントのリクエストを制限するレートリミッター
+            governor: すべてのアカウントで同時に送信するリクエスト数を調整する (max_workers はその上限の最大値になります)
+
+        Raises:
+            ValueError: max_workers, per_account, login_concurrency が 1 未満の場合、login_interval が負の場合
+        """
+        if max_workers < 1 or per_account < 1 or login_concurrency < 1:
+            raise ValueError("max_workers, per_account and login_concurrency must be 1 or more")
+        if login_interval < 0:
+            raise ValueError("login_interval must be 0 or more")
+
+        self.__base_url = base_url
+        self.__parser = parser
+        self.__max_workers = max_workers
+        self.__per_account = per_account
+        self.__login_concurrency = login_concurrency
+        self.__login_interval = login_interval
+        self.__cache = cache
+        self.__retry = retry
+        self.__rate_limiter = rate_limiter
+        self.__governor = governor
+        self.__transport = HTTPAdapter(pool_maxsize=max_workers, pool_block=True)
+
+        self.__clients: dict[str, Manaba] = {}
+        self.__credentials: dict[str, str] = {}
+        self.__queues: dict[str, deque[_Job]] = {}
+        self.__active: dict[str, int] = {}
+        # 待ち行列に処理があるアカウント (巡回する順)
+        self.__ready: deque[str] = deque()
+        self.__condition = threading.Condition()
+        self.__workers: list[threading.Thread] = []
+        self.__closed = False
+
+        self.__login_lock = threading.Lock()
+        self.__next_login = 0.0
+
+    @property
+    def accounts(self) -> list[str]:
+        """
+        追加したアカウントの一覧
+
+        Returns:
+            list[str]: manaba ユーザー名 (追加した順)
+        """
+        with self.__condition:
+            return list(self.__clients)
+
+    def add_account(self,
+                    username: str,
+                    password: str) -> Manaba:
+        """
+        アカウントを追加する
+
+        Args:
+            username: manaba ユーザー名
+            password: manaba パスワード
+
+        Returns:
+            Manaba: アカウントの Manaba (ログインは login_all() または login() で行います)
+
+        Raises:
+            ValueError: 既に追加したアカウントの場合
+        """
+        with self.__condition:
+            if username in self.__clients:
+                raise ValueError("account is already added (" + username + ")")
+            client = Manaba(self.__base_url, self.__parser, cache=self.__cache, retry=self.__retry,
+                            transport=self.__transport, rate_limiter=self.__rate_limiter,
+                            governor=self.__governor)
+            self.__clients[username] = client
+            self.__credentials[username] = password
+            self.__queues[username] = deque()
+            self.__active[username] = 0
+            return client
+
+    def client(self,
+               username: str) -> Manaba:
+        """
+        アカウントの Manaba を取得する
+
+        Args:
+            username: manaba ユーザー名
+
+        Returns:
+            Manaba: アカウントの Manaba
+
+        Raises:
+            ValueError: 追加していないアカウントの場合
+        """
+        with self.__condition:
+            client = self.__clients.get(username)
+        if client is None:
+            raise ValueError("account is not added (" + username + ")")
+        return client
+
+    def login(self,
+              username: str) -> bool:
+        """
+        アカウントでログインする
+
+        Args:
+            username: manaba ユーザー名
+
+        Returns:
+            bool: ログインできたか
+
+        Raises:
+            ValueError: 追加していないアカウントの場合
+
+        Notes:
+            ログインの開始は、他のアカウントのログインから login_interval 秒以上の間隔をあけます。
+        """
+        client = self.client(username)
+        with self.__login_lock:
+            delay = self.__next_login - time.monotonic()
+            self.__next_login = max(self.__next_login, time.monotonic()) + self.__login_interval
+        if delay > 0:
+            time.sleep(delay)
+        return client.login(username, self.__credentials[username])
+
+    def login_all(self) -> dict[str, bool]:
+        """
+        すべてのアカウントでログインする
+
+        Returns:
+            dict[str, bool]: アカウントごとのログインできたか
+
+        Notes:
+            login_concurrency 件ずつ同時にログインします。ログインできなかったアカウントの処理は ManabaNotLoggedIn で失敗します。
+        """
+        accounts = self.accounts
+        with ThreadPoolExecutor(max_workers=self.__login_concurrency) as executor:
+            return dict(zip(accounts, executor.map(self.login, accounts)))
+
+    def submit(self,
+               username: str,
+               endpoint: str,
+               *args: object,
+               **kwargs: object) -> "Future[object]":
+        """
+        アカウントの Manaba のメソッドを呼び出す処理を待ち行列に追加する
+
+        Args:
+            username: manaba ユーザー名
+            endpoint: 呼び出すメソッド名 (get_course など)
+            *args: メソッドの引数
+            **kwargs: メソッドのキーワード引数
+
+        Returns:
+            Future[object]: メソッドの戻り値 (例外が発生した場合はその例外)
+
+        Raises:
+            ValueError: 追加していないアカウントの場合、Manaba の公開メソッドでない場合
+            RuntimeError: close() した後の場合
+        """
+        if endpoint.startswith("_") or not callable(getattr(Manaba, endpoint, None)):
+            raise ValueError("endpoint is not a Manaba method (" + endpoint + ")")
+
+        job = _Job(username, endpoint, args, kwargs)
+        with self.__condition:
+            if self.__closed:
+                raise RuntimeError("pool is closed")
+            queue = self.__queues.get(username)
+            if queue is None:
+                raise ValueError("account is not added (" + username + ")")
+            queue.append(job)
+            if len(queue) == 1:
+                self.__ready.append(username)
+            self.__start_workers()
+            self.__condition.notify()
+        return job.future
+
+    def map(self,
+            items: Iterable[WorkItem]) -> Iterator[object]:
+        """
+        (アカウント, エンドポイント, 引数) の処理をすべて待ち行列に追加し、結果を順に返す
+
+        Args:
+            items: (manaba ユーザー名, メソッド名, 引数) の一覧
+
+        Returns:
+            Iterator[object]: items と同じ順のメソッドの戻り値 (例外が発生した場合は、その結果を返す時点で送出する)
+        """
+        futures = [self.submit(username, endpoint, *args) for username, endpoint, args in items]
+        return (future.result() for future in futures)
+
+    def close(self,
+              wait: bool = True) -> None:
+        """
+        プールを終了する
+
+        Args:
+            wait: 待ち行列の処理がすべて終わるまで待つか (False の場合、実行していない処理はキャンセルする)
+        """
+        with self.__condition:
+            self.__closed = True
+            if not wait:
+                for queue in self.__queues.values():
+                    for job in queue:
+                        job.future.cancel()
+                    queue.clear()
+                self.__ready.clear()
+            self.__condition.notify_all()
+            workers = list(self.__workers)
+            clients = list(self.__clients.values())
+        for worker in workers:
+            worker.join()
+        for client in clients:
+            client.session.close()
+
+    def __enter__(self) -> "ManabaPool":
+        return self
+
+    def __exit__(self,
+                 *args: object) -> None:
+        self.close()
+
+    def __start_workers(self) -> None:
+        """
+        ワーカースレッドを開始する (submit() で初めて処理を追加したときに開始する)
+        """
+        while len(self.__workers) < self.__max_workers:
+            worker = threading.Thread(target=self.__work, name="ManabaPool-%d" % len(self.__workers), daemon=True)
+            self.__workers.append(worker)
+            worker.start()
+
+    def __take(self) -> Optional[_Job]:
+        """
+        次に実行する処理を取り出す (self.__condition を取得した状態で呼び出す)
+
+        Returns:
+            Optional[_Job]: 処理 (実行できる処理がない場合は None)
+        """
+        for _ in range(len(self.__ready)):
+            username = self.__ready.popleft()
+            if self.__active[username] >= self.__per_account:
+                self.__ready.append(username)
+                continue
+            queue = self.__queues[username]
+            job = queue.popleft()
+            if len(queue) != 0:
+                self.__ready.append(username)
+            self.__active[username] += 1
+            return job
+        return None
+
+    def __work(self) -> None:
+        """
+        ワーカースレッドの処理
+        """
+        while True:
+            with self.__condition:
+                job = self.__take()
+                while job is None:
+                    if self.__closed and len(self.__ready) == 0:
+                        return
+                    self.__condition.wait()
+                    job = self.__take()
+                client = self.__clients[job.account]
+
+            try:
+                if job.future.set_running_or_notify_cancel():
+                    try:
+                        job.future.set_result(getattr(client, job.endpoint)(*job.args, **job.kwargs))
+                    except BaseException as e:  # pylint: disable=broad-except
+                        job.future.set_exception(e)
+            finally:
+                with self.__condition:
+                    self.__active[job.account] -= 1
+                    self.__condition.notify_all()
@@ -0,0 +1,164 @@
+"""
+manaba レートリミッター
+
+:class:`manaba.Manaba` のリクエストを、ホストごとに 1 秒あたりのリクエスト数とバースト数で制限します (トークンバケット)。
+1 つのインスタンスを複数のスレッド・複数の Manaba で共有できます。
+path を指定すると状態をファイルに保存し、同じファイルを指定した複数のプロセスで制限を共有します。
+"""
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+# ホストごとのバケットの状態 (トークン数, 最後に更新した時刻)
+_Bucket = tuple[float, float]
+
+
+class ManabaRateLimiter:
+    """
+    manaba レートリミッター
+
+    Notes:
+        ホストごとにトークンバケットを持ち、リクエストごとにトークンを 1 つ消費します。
+        トークンは 1 秒あたり rate 個ずつ、burst 個まで貯まります。トークンがない場合は、次のトークンが貯まる時刻まで待ちます。
+        待っているリクエストは到着した順に、1 / rate 秒間隔で送信されます。
+        path を指定した場合は、状態をファイルに保存し、fcntl によるファイルロックで排他します (POSIX のみ)。
+        この場合、時刻はプロセス間で共通のシステム時刻 (time.time()) を使用します。
+    """
+
+    def __init__(self,
+                 rate: float,
+                 burst: int = 1,
+                 hosts: Optional[dict[str, tuple[float, int]]] = None,
+                 path: Optional[str] = None) -> None:
+        """
+        manaba レートリミッター
+
+        Args:
+            rate: 1 秒あたりのリクエスト数 (hosts に含まれないホストに適用する)
+            burst: 連続して待たずに送信できるリクエスト数 (hosts に含まれないホストに適用する)
+            hosts: ホスト名ごとの (1 秒あたりのリクエスト数, バースト数)
+            path: プロセス間で共有する状態ファイルのパス (指定しない場合はこのプロセス内でのみ共有する)
+
+        Raises:
+            ValueError: rate が 0 以下、burst が 1 未満の場合
+            RuntimeError: path を指定したが、ファイルロック (fcntl) が利用できない場合
+        """
+        self.__limits: dict[str, tuple[float, int]] = dict(hosts or {})
+        for limit_rate, limit_burst in [(rate, burst)] + list(self.__limits.values()):
+            if limit_rate <= 0 or limit_burst < 1:
+                raise ValueError("rate must be positive and burst must be 1 or more")
+        if path is not None and fcntl is None:
+            raise RuntimeError("file backend requires fcntl")
+
+        self.__rate = rate
+        self.__burst = burst
+        self.__path = path
+        self.__buckets: dict[str, _Bucket] = {}
+        self.__lock = threading.Lock()
+
+    @property
+    def path(self) -> Optional[str]:
+        """
+        プロセス間で共有する状態ファイルのパス
+
+        Returns:
+            Optional[str]: パス (プロセス内でのみ共有する場合は None)
+        """
+        return self.__path
+
+    def limit(self,
+              host: str) -> tuple[float, int]:
+        """
+        ホストの制限を取得する
+
+        Args:
+            host: ホスト名
+
+        Returns:
+            tuple[float, int]: 1 秒あたりのリクエスト数, バースト数
+        """
+        return self.__limits.get(host, (self.__rate, self.__burst))
+
+    def acquire(self,
+                host: str) -> float:
+        """
+        ホストへのリクエストを送信できるまで待つ
+
+        Args:
+            host: ホスト名
+
+        Returns:
+            float: 待った秒数
+        """
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def reserve(self,
+                host: str) -> float:
+        """
+        ホストへのリクエストのトークンを予約する (待たない)
+
+        Args:
+            host: ホスト名
+
+        Returns:
+            float: リクエストを送信できるまでの秒数 (予約したリクエストは、この秒数だけ待ってから送信してください)
+        """
+        with self.__lock:
+            if self.__path is None:
+                bucket, delay = self.__take(host, self.__buckets.get(host), time.monotonic())
+                self.__buckets[host] = bucket
+                return delay
+            return self.__reserve_file(host)
+
+    def __reserve_file(self,
+                       host: str) -> float:
+        """
+        状態ファイルのトークンを予約する
+        """
+        assert fcntl is not None and self.__path is not None
+        fd = os.open(self.__path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            with os.fdopen(os.dup(fd), "r+", encoding="utf-8") as f:
+                content = f.read()
+                buckets: dict[str, list[float]] = json.loads(content) if content != "" else {}
+                saved = buckets.get(host)
+                bucket, delay = self.__take(host, (saved[0], saved[1]) if saved is not None else None, time.time())
+                buckets[host] = list(bucket)
+                f.seek(0)
+                f.truncate()
+                json.dump(buckets, f)
+            return delay
+        finally:
+            os.close(fd)  # ファイルを閉じるとロックも解放される
+
+    def __take(self,
+               host: str,
+               bucket: Optional[_Bucket],
+               now: float) -> tuple[_Bucket, float]:
+        """
+        バケットからトークンを 1 つ取り出す
+
+        Args:
+            host: ホスト名
+            bucket: 現在のバケットの状態 (初めてのホストの場合は None)
+            now: 現在の時刻
+
+        Returns:
+            tuple[_Bucket, float]: 更新したバケットの状態, リクエストを送信できるまでの秒数
+        """
+        rate, burst = self.limit(host)
+        tokens, updated = bucket if bucket is not None else (float(burst), now)
+        # トークンが負の場合は、先に予約したリクエストの分
+        tokens = min(float(burst), tokens + max(now - updated, 0) * rate) - 1
+        return (tokens, now), max(-tokens / rate, 0.0)
@@ -0,0 +1,100 @@
+"""
+manaba リトライポリシー
+
+:class:`manaba.Manaba` のページ取得で、一時的なエラー・セッション切れが発生した場合の再試行方法を定めます。
+"""
+import random
+from typing import Optional
+
+from requests import Response
+
+
+class ManabaRetryPolicy:
+    """
+    manaba リトライポリシー
+
+    Notes:
+        接続エラー・タイムアウトと、statuses に含まれるステータスコードのレスポンスを、ジッター付きの指数バックオフで再試行します。
+        relogin が True の場合、セッション切れ (ログインページへのリダイレクト) を検出すると、login() の認証情報で 1 回だけ再ログインします。
+    """
+
+    def __init__(self,
+                 max_retries: int = 3,
+                 backoff: float = 0.5,
+                 max_backoff: float = 30.0,
+                 statuses: tuple[int, ...] = (429, 500, 502, 503, 504),
+                 relogin: bool = True) -> None:
+        """
+        manaba リトライポリシー
+
+        Args:
+            max_retries: 1 回のページ取得で再試行する最大回数
+            backoff: 1 回目の再試行までの最大待機秒数 (再試行ごとに 2 倍になる)
+            max_backoff: 再試行までの待機秒数の上限
+            statuses: 再試行するレスポンスのステータスコード
+            relogin: セッション切れを検出した場合に再ログインするか
+
+        Raises:
+            ValueError: max_retries, backoff, max_backoff が負の場合
+        """
+        if max_retries < 0 or backoff < 0 or max_backoff < 0:
+            raise ValueError("max_retries, backoff and max_backoff must be 0 or more")
+
+        self.__max_retries = max_retries
+        self.__backoff = backoff
+        self.__max_backoff = max_backoff
+        self.__statuses = statuses
+        self.__relogin = relogin
+
+    @property
+    def max_retries(self) -> int:
+        """
+        1 回のページ取得で再試行する最大回数
+
+        Returns:
+            int: 最大回数
+        """
+        return self.__max_retries
+
+    @property
+    def statuses(self) -> tuple[int, ...]:
+        """
+        再試行するレスポンスのステータスコード
+
+        Returns:
+            tuple[int, ...]: ステータスコード
+        """
+        return self.__statuses
+
+    @property
+    def relogin(self) -> bool:
+        """
+        セッション切れを検出した場合に再ログインするか
+
+        Returns:
+            bool: 再ログインするか
+        """
+        return self.__relogin
+
+    def delay(self,
+              attempt: int,
+              response: Optional[Response] = None) -> float:
+        """
+        再試行までの待機秒数を計算する
+
+        Args:
+            attempt: 何回目の再試行か (0 始まり)
+            response: 再試行の原因となったレスポンス (接続エラーの場合は None)
+
+        Returns:
+            float: 待機秒数
+
+        Notes:
+            レスポンスに秒数の Retry-After ヘッダーがある場合は、その秒数 (max_backoff まで) を優先します。
+            それ以外の場合は 0 秒から backoff * 2 ** attempt 秒の間でランダムに決めます (Full Jitter)。
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.__max_backoff)
+        return random.uniform(0, min(self.__max_backoff, self.__backoff * 2 ** attempt))
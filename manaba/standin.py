@@ -0,0 +1,694 @@
+"""
+manaba 代替サーバー
+
+:mod:`manaba.parsers` が想定するマークアップで、合成したデータのページを返すローカル HTTP サーバーです。
+コース数・コメント数などのデータ量と、応答の遅延・エラー率を指定して、:class:`manaba.Manaba` や
+:class:`manaba.aio.AsyncManaba` の負荷試験をローカルで行えます。
+
+``python -m manaba.standin --courses 500 --comments 10000`` のように単体でも起動できます。
+"""
+import argparse
+import datetime
+import hashlib
+import random
+import re
+import threading
+import time
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Optional, Type
+from urllib.parse import parse_qs, urlparse
+
+BASE_DATETIME = datetime.datetime(2021, 4, 1, 9, 0)
+
+SESSION_COOKIE = "sessionid"
+
+HEADER = """<div id="header">
+<div class="header-logo"><a href="home"><img src="/icon-manaba.png" alt="manaba"></a></div>
+<ul class="header-menu">
+<li><a href="home_course">マイページ</a></li>
+<li><a href="home_course_all">コース一覧</a></li>
+<li><a href="home_portfolio">ポートフォリオ</a></li>
+<li><a href="logout">ログアウト</a></li>
+</ul>
+</div>
+"""
+
+LAMPS = ("news", "deadline", "grad", "thread", "individual")
+
+
+class ManabaStandInServer(ThreadingHTTPServer):
+    """
+    manaba 代替サーバー
+
+    Notes:
+        コース ID は 1001 から courses 件、各コースの小テスト・アンケート・レポートの ID は 2001 から、
+        スレッドの ID は 3001 から、ニュースの ID は 4001 から、コンテンツの ID は "c(コース ID)n(番号)" です。
+        ログインすると Cookie を発行し、Cookie のないリクエストはログインページにリダイレクトします。
+        error_rate の割合のリクエスト (ログインと、ログイン後のリダイレクト先を除く) には error_status のエラーを返します。
+        ページと添付ファイルには内容から決まる ETag・Last-Modified を付け、条件付きリクエスト (304) と If-Range 付きの範囲リクエスト (206) に応じます。
+    """
+
+    daemon_threads = True
+
+    def __init__(self,
+                 courses: int = 10,
+                 querys: int = 3,
+                 surveys: int = 3,
+                 reports: int = 3,
+                 threads: int = 3,
+                 comments: int = 20,
+                 news: int = 20,
+                 contents: int = 2,
+                 pages: int = 3,
+                 file_size: int = 64 * 1024,
+                 latency: float = 0,
+                 jitter: float = 0,
+                 error_rate: float = 0,
+                 error_status: int = 503,
+                 seed: int = 0,
+                 host: str = "127.0.0.1",
+                 port: int = 0) -> None:
+        """
+        manaba 代替サーバー
+
+        Args:
+            courses: コース数
+            querys: コースごとの小テスト数 (最後の 1 件は小テストドリル)
+            surveys: コースごとのアンケート数
+            reports: コースごとのレポート数
+            threads: コースごとのスレッド数
+            comments: スレッドごとのコメント数
+            news: コースごとのニュース数
+            contents: コースごとのコンテンツ数
+            pages: コンテンツごとのページ数
+            file_size: 添付ファイルのバイト数
+            latency: 応答までの遅延秒数
+            jitter: 遅延に加える、0 からこの秒数までのランダムな秒数
+            error_rate: エラーを返すリクエストの割合 (0 ～ 1)
+            error_status: エラーとして返すステータスコード
+            seed: 遅延・エラーの乱数のシード
+            host: 待ち受けるホスト
+            port: 待ち受けるポート (0 の場合は空いているポート)
+
+        Raises:
+            ValueError: データ量・遅延が負の場合、または error_rate が 0 ～ 1 の範囲外の場合
+        """
+        if min(courses, querys, surveys, reports, threads, comments, news, contents, pages, file_size) < 0:
+            raise ValueError("data sizes must be 0 or more")
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency and jitter must be 0 or more")
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        super().__init__((host, port), _StandInRequestHandler)
+        self.courses = courses
+        self.querys = querys
+        self.surveys = surveys
+        self.reports = reports
+        self.threads = threads
+        self.comments = comments
+        self.news = news
+        self.contents = contents
+        self.pages = pages
+        self.file_size = file_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.__requests = 0
+        self.__errors = 0
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        manaba のベース URL
+
+        Returns:
+            str: ベース URL
+        """
+        host, port = self.server_address[:2]
+        return "http://%s:%d" % (host if isinstance(host, str) else host.decode("ascii"), port)
+
+    @property
+    def requests(self) -> int:
+        """
+        受け付けたリクエスト数
+
+        Returns:
+            int: リクエスト数
+        """
+        return self.__requests
+
+    @property
+    def errors(self) -> int:
+        """
+        エラーを返したリクエスト数
+
+        Returns:
+            int: リクエスト数
+        """
+        return self.__errors
+
+    def start(self) -> "ManabaStandInServer":
+        """
+        別スレッドでリクエストの受け付けを開始する
+
+        Returns:
+            ManabaStandInServer: このサーバー
+        """
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.serve_forever, daemon=True)
+            self.__thread.start()
+        return self
+
+    def close(self) -> None:
+        """
+        リクエストの受け付けを停止し、サーバーを閉じる
+        """
+        if self.__thread is not None:
+            self.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.server_close()
+
+    def __enter__(self) -> "ManabaStandInServer":
+        return self.start()
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    def next_delay(self,
+                   fail: bool) -> tuple[float, bool]:
+        """
+        リクエストの遅延秒数と、エラーを返すかを決める
+
+        Args:
+            fail: エラーを返してもよいリクエストか
+
+        Returns:
+            tuple[float, bool]: 遅延秒数, エラーを返すか
+        """
+        with self.__lock:
+            self.__requests += 1
+            delay = self.latency + (self.__random.uniform(0, self.jitter) if self.jitter > 0 else 0)
+            error = fail and self.error_rate > 0 and self.__random.random() < self.error_rate
+            if error:
+                self.__errors += 1
+        return delay, error
+
+    def render(self,
+               name: str,
+               params: dict[str, list[str]]) -> Optional[str]:
+        """
+        /ct/ 以下のページの HTML を作成する
+
+        Args:
+            name: /ct/ 以下のパス
+            params: クエリパラメーター
+
+        Returns:
+            Optional[str]: ページの HTML (ページが存在しない場合は None)
+        """
+        if name in ("home", "home_course", "home_course_all"):
+            list_format = params.get("chglistformat", ["list" if name == "home_course_all" else "thumbnail"])[0]
+            body = {"thumbnail": self.__course_cards, "list": self.__course_list, "timetable": self.__course_timetable}
+            if list_format not in body:
+                return None
+            return self.__courses_page("コース一覧" if name == "home_course_all" else "マイページ", name, list_format,
+                                       body[list_format]())
+
+        match = re.fullmatch(r"course_([0-9]+)(?:_([a-z]+)(?:_([0-9]+)(_tflat)?)?)?", name)
+        if match is not None:
+            course_id = int(match.group(1))
+            if not 1001 <= course_id < 1001 + self.courses:
+                return None
+            kind = match.group(2)
+            item_id = int(match.group(3)) if match.group(3) is not None else None
+            return self.__course_page(course_id, kind, item_id, match.group(4) is not None, params)
+
+        match = re.fullmatch(r"page_c([0-9]+)n([0-9]+)(?:_([0-9]+))?", name)
+        if match is not None:
+            course_id, content_no = int(match.group(1)), int(match.group(2))
+            if not (1001 <= course_id < 1001 + self.courses and 1 <= content_no <= self.contents):
+                return None
+            page_no = int(match.group(3)) - 5000 if match.group(3) is not None else 1
+            if not 1 <= page_no <= self.pages:
+                return None
+            return self.__content_page(course_id, content_no, page_no)
+        return None
+
+    def __course_page(self,
+                      course_id: int,
+                      kind: Optional[str],
+                      item_id: Optional[int],
+                      tflat: bool,
+                      params: dict[str, list[str]]) -> Optional[str]:
+        if kind is None:
+            return _page(_course_name(course_id), _course_header(course_id) + """<div class="coursedata">
+<span class="courseteacher">教員 %d</span>
+<span class="coursedata-info">2021<span>%s</span></span>
+</div>
+""" % (course_id, _period(course_id)))
+
+        start_id = int(params.get("start_id", ["0"])[0])
+        page_len = int(params.get("pagelen", ["10000"])[0])
+        if item_id is None:
+            if kind in ("query", "survey", "report"):
+                count = {"query": self.querys, "survey": self.surveys, "report": self.reports}[kind]
+                return _page(kind, _course_header(course_id) + _task_list(course_id, kind, count))
+            if kind == "topics":
+                return _page("スレッド", _course_header(course_id) + _thread_list(course_id, self.threads, self.comments))
+            if kind == "news":
+                return _page("コースニュース", _course_header(course_id) + _news_list(course_id, self.news, start_id, page_len))
+            if kind == "page":
+                return _page("コンテンツ", _course_header(course_id) + _content_list(course_id, self.contents))
+            return None
+
+        if tflat != (kind == "topics"):
+            return None
+        if kind in ("query", "drill", "survey", "report"):
+            index = item_id - 2000
+            count = {"query": self.querys, "drill": self.querys, "survey": self.surveys, "report": self.reports}[kind]
+            if not 1 <= index <= count:
+                return None
+            if kind in ("query", "drill") and (kind == "drill") != (index == count):
+                return None
+            return _page(kind, _course_header(course_id) + _task_details(kind, index))
+        if kind == "topics" and 1 <= item_id - 3000 <= self.threads:
+            return _page("スレッド", _course_header(course_id) + _thread(self.comments, item_id - 3000, start_id, page_len))
+        if kind == "news" and 1 <= item_id - 4000 <= self.news:
+            return _page("コースニュース", _course_header(course_id) + _news(item_id - 4000))
+        return None
+
+    def __courses_page(self,
+                       title: str,
+                       name: str,
+                       list_format: str,
+                       body: str) -> str:
+        tabs = "".join('<li%s><a href="%s?chglistformat=%s">%s</a></li>\n' % (
+            ' class="current"' if list_format == tab else "", name, tab, tab_title)
+            for tab, tab_title in (("thumbnail", "サムネイル"), ("list", "リスト"), ("timetable", "曜日")))
+        return _page(title, '<ul class="infolist-tab">\n' + tabs + "</ul>\n" + body)
+
+    def __course_cards(self) -> str:
+        cards = []
+        for course_id in range(1001, 1001 + self.courses):
+            cards.append("""<div class="coursecard">
+<div class="course-card-title"><a href="course_%d">%s</a></div>
+<dl class="courseitems">
+<dt class="courseitemtext">時限</dt><dd class="courseitemdetail">2021 <span>%s</span></dd>
+<dt class="courseitemtext">担当</dt><dd class="courseitemdetail">教員 %d</dd>
+</dl>
+%s
+</div>
+""" % (course_id, _course_name(course_id), _period(course_id), course_id, _lamps(course_id)))
+        return '<div class="mycourses-body">\n' + "".join(cards) + "</div>\n"
+
+    def __course_list(self) -> str:
+        rows = []
+        for course_id in range(1001, 1001 + self.courses):
+            rows.append("""<tr class="courselist-%s">
+<td><span class="courselist-title"><a href="course_%d">%s</a></span>
+%s</td>
+<td>2021</td><td>%s</td><td>教員 %d</td>
+</tr>
+""" % ("c" if course_id % 2 == 1 else "r", course_id, _course_name(course_id), _lamps(course_id),
+                _period(course_id), course_id))
+        return """<div class="mycourses-body">
+<table class="stdlist courselist">
+<tr class="title"><th>コース名</th><th>年度</th><th>曜日・時限</th><th>担当教員</th></tr>
+""" + "".join(rows) + "</table>\n</div>\n"
+
+    def __course_timetable(self) -> str:
+        cells: dict[tuple[int, str], list[str]] = {}
+        for course_id in range(1001, 1001 + self.courses):
+            weekday, period = _period(course_id)[0], course_id % 6 + 1
+            cells.setdefault((period, weekday), []).append(
+                '<div class="courselistweekly-%s"><a href="course_%d">%s</a>\n<div class="coursestatus">%s</div></div>'
+                % ("c" if course_id % 2 == 1 else "r", course_id, _course_name(course_id), _lamps(course_id, "")))
+        rows = "".join("<tr><th>%d</th>%s</tr>\n" % (period, "".join(
+            "<td>" + "".join(cells.get((period, weekday), [])) + "</td>" for weekday in "月火水木金"))
+            for period in range(1, 7))
+        return """<div class="mycourses-body">
+<table class="stdlist coursetable">
+<tr><th></th><th>月</th><th>火</th><th>水</th><th>木</th><th>金</th></tr>
+%s</table>
+</div>
+<table class="stdlist courselist">
+<tr class="title"><th>コース名</th><th>年度</th><th>曜日・時限</th><th>担当教員</th></tr>
+</table>
+""" % rows
+
+    def __content_page(self,
+                       course_id: int,
+                       content_no: int,
+                       page_no: int) -> str:
+        content_id = "c%dn%d" % (course_id, content_no)
+        links = "".join('<li><a href="page_%s_%d">ページ %d</a></li>\n' % (content_id, 5000 + no, no)
+                        for no in range(1, self.pages + 1))
+        return _page("コンテンツ", """<div id="coursename-cell"><a id="coursename" href="course_%d" title="%s">%s</a></div>
+<div class="contentbody-left">
+<ul class="contentslist">
+%s</ul>
+</div>
+<div class="contentbody-right">
+<h1 class="pagetitle">ページ %d</h1>
+<div class="pagelimitview">公開期間: 2021-04-01 00:00:00 ～ 2021-09-30 23:59:59</div>
+<div class="articleauthor">%s - 教員 %d - 1.0版</div>
+<div class="articletext"><p>ページ %d の本文です。</p>
+<div class="inlineattachment"><div class="inlineaf-description"><a href="file_%d/page%d.pdf">page%d.pdf - %s</a></div></div>
+</div>
+</div>
+""" % (course_id, _course_name(course_id), _course_name(course_id), links, page_no, _datetime(page_no, False), course_id,
+            page_no, 5000 + page_no, page_no, page_no, _datetime(page_no)))
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    """
+    manaba 代替サーバーのリクエストハンドラー
+    """
+
+    protocol_version = "HTTP/1.1"
+    # ヘッダーと本文を別々に送信するため、Nagle アルゴリズムによる遅延を避ける
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        self._handle(True)
+
+    def do_HEAD(self) -> None:  # pylint: disable=invalid-name
+        self._handle(False)
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        self._handle(True)
+
+    def _handle(self,
+                send_body: bool) -> None:
+        server = self.server
+        if not isinstance(server, ManabaStandInServer):
+            raise TypeError("server is not ManabaStandInServer")
+
+        url = urlparse(self.path)
+        name = url.path[len("/ct/"):] if url.path.startswith("/ct/") else None
+        delay, error = server.next_delay(name not in ("login", "home"))
+        if delay > 0:
+            time.sleep(delay)
+        if error:
+            self._respond(server.error_status, b"error", send_body, {"Retry-After": "0"})
+            return
+
+        if name == "login":
+            if self.command == "POST":
+                self._respond(302, b"", send_body, {
+                    "Location": "/ct/home",
+                    "Set-Cookie": SESSION_COOKIE + "=standin; path=/"
+                })
+            else:
+                self._respond(200, _login_page().encode("utf-8"), send_body)
+            return
+
+        if SESSION_COOKIE + "=" not in self.headers.get("Cookie", ""):
+            self._respond(302, b"", send_body, {"Location": "/ct/login"})
+            return
+
+        if name is not None and re.fullmatch(r"file_[0-9]+/.+", name) is not None:
+            self._respond(200, b"\0" * server.file_size, send_body, {"Content-Type": "application/octet-stream"})
+            return
+
+        page = server.render(name, parse_qs(url.query)) if name is not None else None
+        if page is None:
+            self._respond(404, b"Not Found", send_body)
+            return
+        self._respond(200, page.encode("utf-8"), send_body)
+
+    def _respond(self,
+                 status: int,
+                 body: bytes,
+                 send_body: bool,
+                 headers: Optional[dict[str, str]] = None) -> None:
+        headers = {"Content-Type": "text/html; charset=UTF-8", **(headers or {})}
+        if status == 200:
+            # 内容から決まる検証子を付け、条件付きリクエスト (If-None-Match / If-Modified-Since) と
+            # 範囲リクエスト (Range / If-Range) に応じる (日時は前回返した Last-Modified と一致する場合のみ有効)
+            digest = hashlib.sha256(body).hexdigest()
+            etag = '"%s"' % digest[:16]
+            modified = BASE_DATETIME.replace(tzinfo=datetime.timezone.utc) + \
+                datetime.timedelta(seconds=int(digest[16:24], 16) % (365 * 24 * 60 * 60))
+            validators = {"ETag": etag, "Last-Modified": format_datetime(modified, usegmt=True)}
+            headers.update(validators)
+            if self.headers.get("If-None-Match", self.headers.get("If-Modified-Since")) in validators.values():
+                status, body = 304, b""
+                headers = validators
+            else:
+                status, body = self._range(body, validators, headers)
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _range(self,
+               body: bytes,
+               validators: dict[str, str],
+               headers: dict[str, str]) -> tuple[int, bytes]:
+        match = re.fullmatch(r"bytes=([0-9]+)-", self.headers.get("Range", ""))
+        if match is None or self.headers.get("If-Range", validators["ETag"]) not in validators.values():
+            return 200, body
+        start = int(match.group(1))
+        if start >= len(body):
+            headers["Content-Range"] = "bytes */%d" % len(body)
+            return 416, b""
+        headers["Content-Range"] = "bytes %d-%d/%d" % (start, len(body) - 1, len(body))
+        return 206, body[start:]
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def _datetime(index: int,
+              seconds: bool = True) -> str:
+    """
+    番号から決まる日時の文字列
+    """
+    value = BASE_DATETIME + datetime.timedelta(hours=index)
+    return value.strftime("%Y-%m-%d %H:%M:%S" if seconds else "%Y-%m-%d %H:%M")
+
+
+def _course_name(course_id: int) -> str:
+    return "コース %d" % course_id
+
+
+def _period(course_id: int) -> str:
+    return "%s曜 %d限" % ("月火水木金"[course_id % 5], course_id % 6 + 1)
+
+
+def _lamps(course_id: int,
+           wrapper: str = "course-card-status") -> str:
+    images = "".join('<img src="/icon-coursestatus-%s-%s.png" alt="">' % (lamp, "on" if (course_id >> bit) & 1 else "off")
+                     for bit, lamp in enumerate(LAMPS))
+    return images if wrapper == "" else '<div class="' + wrapper + '">' + images + "</div>"
+
+
+def _page(title: str,
+          contents: str) -> str:
+    return """<!DOCTYPE html>
+<html lang="ja">
+<head><meta charset="UTF-8"><title>%s</title>
+<link rel="stylesheet" href="/css/manaba.css"></head>
+<body>
+%s<div class="contents">
+%s</div>
+<div id="footer"><p>manaba 2.971</p></div>
+</body>
+</html>
+""" % (title, HEADER, contents)
+
+
+def _login_page() -> str:
+    return """<!DOCTYPE html>
+<html lang="ja">
+<head><meta charset="UTF-8"><title>manaba - ログイン</title></head>
+<body>
+<div id="login-form-box">
+<form method="post" action="/ct/login">
+<input type="hidden" name="manaba-form" value="1">
+<input type="hidden" name="SessionValue1" value="standin-session-value-1">
+<input type="hidden" name="SessionValue" value="standin-session-value">
+<table>
+<tr><th>ユーザ名</th><td><input type="text" name="userid"></td></tr>
+<tr><th>パスワード</th><td><input type="password" name="password"></td></tr>
+</table>
+<input type="submit" name="login" value="ログイン">
+</form>
+</div>
+</body>
+</html>
+"""
+
+
+def _course_header(course_id: int) -> str:
+    menu = "".join('<li><a href="course_%d_%s">%s</a></li>\n' % (course_id, kind, title) for kind, title in (
+        ("news", "コースニュース"), ("query", "小テスト"), ("survey", "アンケート"), ("report", "レポート"),
+        ("topics", "スレッド"), ("page", "コンテンツ")))
+    return """<div id="coursename-cell"><a id="coursename" href="course_%d" title="%s">%s</a></div>
+<ul class="course-menu">
+%s</ul>
+""" % (course_id, _course_name(course_id), _course_name(course_id), menu)
+
+
+def _task_list(course_id: int,
+               kind: str,
+               count: int) -> str:
+    rows = []
+    for index in range(1, count + 1):
+        drill = kind == "query" and index == count
+        title_kind = "drill" if drill else kind
+        status = ('受付中<br>\n<span class="deadline">未提出</span>', "受付終了<br>\n提出済み", "受付開始待ち")[index % 3]
+        rows.append("""<tr class="row%d">
+<td><h3 class="%s-title"><img src="/icon-%s-off.png" alt=""><a href="course_%d_%s_%d">%s %d</a></h3></td>
+<td class="center">%s</td>
+<td class="center">%s</td>
+<td class="center">%s</td>
+</tr>
+""" % (index % 2, title_kind, title_kind, course_id, title_kind, 2000 + index, kind, index, status,
+            _datetime(index, False), _datetime(index + 168, False)))
+    return """<table class="stdlist">
+<tr class="title"><th>タイトル</th><th>状態</th><th>受付開始日時</th><th>受付終了日時</th></tr>
+""" + "".join(rows) + "</table>\n"
+
+
+def _task_details(kind: str,
+                  index: int) -> str:
+    rows = ["<tr><th>課題に関する説明</th><td>%s %d の説明です。</td></tr>\n" % (kind, index)] if kind != "survey" else []
+    rows.append("<tr><th>受付開始日時</th><td>%s</td></tr>\n" % _datetime(index, False))
+    rows.append("<tr><th>受付終了日時</th><td>%s</td></tr>\n" % _datetime(index + 168, False))
+    if kind == "drill":
+        rows.append("<tr><th>提出上限</th><td>3回まで</td></tr>\n")
+    rows.append("<tr><th>ポートフォリオ</th><td>ポートフォリオに追加しない</td></tr>\n")
+    if kind == "query":
+        rows.append("<tr><th>採点結果と正解の公開</th><td>受付終了時に採点結果と正解を公開</td></tr>\n")
+    if kind == "drill":
+        rows.append("<tr><th>正解の公開</th><td>提出時に公開する</td></tr>\n")
+        rows.append("<tr><th>合格条件</th><td>60点以上</td></tr>\n")
+    if kind in ("survey", "report"):
+        rows.append("<tr><th>学生による再提出の許可</th><td>再提出を許可する</td></tr>\n")
+    rows.append("<tr><th>状態</th><td>受付中<br>\n未提出</td></tr>\n")
+
+    table_class = "stdlist stdlist-report" if kind == "report" else "stdlist stdlist-query"
+    html = '<table class="%s">\n<tr class="title"><th colspan="2">%s %d</th></tr>\n%s</table>\n' % (
+        table_class, kind, index, "".join(rows))
+    if kind == "report":
+        html += '<div class="report-form"><form method="post"><input type="file" name="RptSubmitFile"></form></div>\n'
+    return html
+
+
+def _thread_list(course_id: int,
+                 threads: int,
+                 comments: int) -> str:
+    rows = []
+    for index in range(1, threads + 1):
+        rows.append("""<tr class="row%d">
+<td><a class="threadhead" href="course_%d_topics_%d_summary"><span class="thread-title">スレッド %d</span></a></td>
+<td>%d</td><td>%s</td>
+</tr>
+""" % (index % 2, course_id, 3000 + index, index, comments, _datetime(comments)))
+    return """<table class="stdlist">
+<tr class="title"><th>タイトル</th><th>コメント数</th><th>最終更新日時</th></tr>
+""" + "".join(rows) + "</table>\n"
+
+
+def _thread(comments: int,
+            index: int,
+            start_id: int,
+            page_len: int) -> str:
+    """
+    スレッド詳細ページ (フラット表示) のコメント部分 (start_id, pagelen は manaba と同じく直近から数える)
+    """
+    last = max(comments - start_id, 0)
+    articles = []
+    for comment_id in range(max(last - page_len, 0) + 1, last + 1):
+        title = "スレッド %d" % index if comment_id == 1 else "Re: スレッド %d" % index
+        parent = '<div class="parentmsg-no">%d</div>' % (comment_id - 1) if comment_id > 1 else ""
+        articles.append("""<div class="articlecontainer">
+<div class="articleheader"><h3 class="articlenumber">%d</h3>
+<div class="articlesubject">%s</div></div>
+<div class="articleinfo"><a href="#">投稿者 %d</a> <span class="posted-time">%s</span></div>
+%s<div class="articlebody"><div class="articlebody-msgbody"><p>コメント %d の本文です。</p></div></div>
+</div>
+""" % (comment_id, title, comment_id % 50, _datetime(comment_id), parent, comment_id))
+    return '<div class="topics-tflat">\n' + "".join(articles) + "</div>\n"
+
+
+def _news_list(course_id: int,
+               news: int,
+               start_id: int,
+               page_len: int) -> str:
+    rows = []
+    last = max(news - start_id, 0)
+    for index in range(last, max(last - page_len, 0), -1):
+        rows.append('<tr class="row%d"><td><a href="course_%d_news_%d">ニュース %d</a></td><td>教員 %d</td><td>%s</td></tr>\n'
+                    % (index % 2, course_id, 4000 + index, index, course_id, _datetime(index, False)))
+    return """<table class="stdlist">
+<tr class="title"><th>タイトル</th><th>投稿者</th><th>掲載日時</th></tr>
+""" + "".join(rows) + "</table>\n"
+
+
+def _news(index: int) -> str:
+    return """<div class="msg">
+<h2 class="msg-subject">ニュース %d</h2>
+<div class="msg-info">投稿者 教員 <span class="msg-date">%s</span></div>
+<div class="msg-text"><p>ニュース %d の本文です。</p></div>
+</div>
+""" % (index, _datetime(index, False), index)
+
+
+def _content_list(course_id: int,
+                  contents: int) -> str:
+    rows = "".join('<tr><td class="about-contents"><a href="page_c%dn%d">コンテンツ %d</a>'
+                   '<span class="contents-modtime">%s</span></td><td class="contents-info"></td></tr>\n'
+                   % (course_id, index, index, _datetime(index, False)) for index in range(1, contents + 1))
+    return '<table class="contentslist">\n' + rows + "</table>\n"
+
+
+def main() -> None:
+    """
+    manaba 代替サーバーを起動する (Ctrl+C で停止)
+    """
+    argument_parser = argparse.ArgumentParser(description="manaba 代替サーバー")
+    argument_parser.add_argument("--host", default="127.0.0.1")
+    argument_parser.add_argument("--port", type=int, default=8080)
+    for name, default in (("courses", 10), ("querys", 3), ("surveys", 3), ("reports", 3), ("threads", 3),
+                          ("comments", 20), ("news", 20), ("contents", 2), ("pages", 3), ("file-size", 64 * 1024)):
+        argument_parser.add_argument("--" + name, type=int, default=default)
+    argument_parser.add_argument("--latency", type=float, default=0)
+    argument_parser.add_argument("--jitter", type=float, default=0)
+    argument_parser.add_argument("--error-rate", type=float, default=0)
+    argument_parser.add_argument("--error-status", type=int, default=503)
+    argument_parser.add_argument("--seed", type=int, default=0)
+    args = argument_parser.parse_args()
+
+    server = ManabaStandInServer(args.courses, args.querys, args.surveys, args.reports, args.threads, args.comments,
+                                 args.news, args.contents, args.pages, args.file_size, args.latency, args.jitter,
+                                 args.error_rate, args.error_status, args.seed, args.host, args.port)
+    print("manaba stand-in server: " + server.base_url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
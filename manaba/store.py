@@ -0,0 +1,227 @@
+"""
+manaba ローカルストア
+
+パース済みのモデルを (コース ID, 種類, 項目 ID) をキーとして SQLite に保存します。
+:func:`manaba.Manaba.sync` で差分同期する際に使用します。
+"""
+import datetime
+import enum
+import hashlib
+import pickle
+import sqlite3
+import threading
+from types import TracebackType
+from typing import Optional, Type, Union
+
+from manaba.exceptions import ManabaInternalError
+from manaba.models.ManabaModel import ManabaModel
+
+StoreKey = tuple[int, str, str]
+
+
+def fingerprint(value: object) -> str:
+    """
+    モデルの内容から、変更を検出するためのフィンガープリントを作成する
+
+    Args:
+        value: モデル (または、モデルのプロパティ値)
+
+    Returns:
+        str: フィンガープリント (SHA-256)
+
+    Notes:
+        親モデルへの参照 (_parent) は含みません。
+    """
+    return hashlib.sha256(_canonical(value).encode("utf-8")).hexdigest()
+
+
+def _canonical(value: object) -> str:
+    """
+    モデルをフィンガープリント用の文字列に変換する
+    """
+    if isinstance(value, enum.Enum):
+        return type(value).__name__ + "." + value.name
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_canonical(item) for item in value) + "]"
+    if isinstance(value, ManabaModel):
+        return type(value).__name__ + "{" + ",".join(
+            key + "=" + _canonical(item) for key, item in sorted(vars(value).items()) if key != "_parent") + "}"
+    return repr(value)
+
+
+class ManabaStore:
+    """
+    manaba ローカルストア
+
+    Notes:
+        種類 (kind) は course, query, drill, survey, report, news, content, content_page, thread_comment です。
+        項目 ID は文字列として保存します。スレッドコメントは "スレッドID_コメントID"、コンテンツページは "コンテンツID_ページID" です。
+        スレッドセーフです。
+    """
+
+    def __init__(self,
+                 path: str) -> None:
+        """
+        manaba ローカルストア
+
+        Args:
+            path: SQLite データベースファイルのパス (":memory:" の場合はメモリ上に作成する)
+        """
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__lock = threading.Lock()
+        with self.__lock, self.__connection:
+            self.__connection.execute("""
+                CREATE TABLE IF NOT EXISTS items (
+                    course_id INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    item_id TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    model BLOB NOT NULL,
+                    synced_at TEXT NOT NULL,
+                    PRIMARY KEY (course_id, kind, item_id)
+                )
+            """)
+
+    def close(self) -> None:
+        """
+        データベースを閉じる
+        """
+        self.__connection.close()
+
+    def __enter__(self) -> "ManabaStore":
+        return self
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    def put(self,
+            course_id: int,
+            kind: str,
+            item_id: Union[int, str],
+            model: ManabaModel,
+            item_fingerprint: Optional[str] = None) -> None:
+        """
+        モデルを保存する (既に保存されている場合は上書きする)
+
+        Args:
+            course_id: コース ID
+            kind: 種類
+            item_id: 項目 ID
+            model: 保存するモデル
+            item_fingerprint: 変更の検出に使用するフィンガープリント (指定しない場合はモデルから作成する)
+        """
+        if item_fingerprint is None:
+            item_fingerprint = fingerprint(model)
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO items (course_id, kind, item_id, fingerprint, model, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (course_id, kind, str(item_id), item_fingerprint, pickle.dumps(model),
+                 datetime.datetime.now(datetime.timezone.utc).isoformat()))
+
+    def get(self,
+            course_id: int,
+            kind: str,
+            item_id: Union[int, str]) -> Optional[ManabaModel]:
+        """
+        保存されているモデルを取得する
+
+        Args:
+            course_id: コース ID
+            kind: 種類
+            item_id: 項目 ID
+
+        Returns:
+            Optional[ManabaModel]: モデル (保存されていない場合は None)
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT model FROM items WHERE course_id = ? AND kind = ? AND item_id = ?",
+                (course_id, kind, str(item_id))).fetchone()
+        if row is None:
+            return None
+        return self.__load(row[0])
+
+    def get_fingerprint(self,
+                        course_id: int,
+                        kind: str,
+                        item_id: Union[int, str]) -> Optional[str]:
+        """
+        保存されているモデルのフィンガープリントを取得する
+
+        Args:
+            course_id: コース ID
+            kind: 種類
+            item_id: 項目 ID
+
+        Returns:
+            Optional[str]: フィンガープリント (保存されていない場合は None)
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT fingerprint FROM items WHERE course_id = ? AND kind = ? AND item_id = ?",
+                (course_id, kind, str(item_id))).fetchone()
+        return None if row is None else str(row[0])
+
+    def items(self,
+              course_id: int,
+              kind: str,
+              item_id_prefix: str = "") -> list[ManabaModel]:
+        """
+        保存されているモデルの一覧を取得する
+
+        Args:
+            course_id: コース ID
+            kind: 種類
+            item_id_prefix: 項目 ID の接頭辞 (例えばスレッド 3001 のコメントであれば "3001_")
+
+        Returns:
+            list[ManabaModel]: モデルの一覧 (項目 ID の文字列順)
+        """
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT model FROM items WHERE course_id = ? AND kind = ? AND substr(item_id, 1, ?) = ? "
+                "ORDER BY item_id",
+                (course_id, kind, len(item_id_prefix), item_id_prefix)).fetchall()
+        return [self.__load(row[0]) for row in rows]
+
+    def keys(self) -> list[StoreKey]:
+        """
+        保存されているキーの一覧を取得する
+
+        Returns:
+            list[StoreKey]: (コース ID, 種類, 項目 ID) の一覧
+        """
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT course_id, kind, item_id FROM items ORDER BY course_id, kind, item_id").fetchall()
+        return [(int(row[0]), str(row[1]), str(row[2])) for row in rows]
+
+    def delete(self,
+               course_id: int,
+               kind: str,
+               item_id: Union[int, str]) -> None:
+        """
+        保存されているモデルを削除する
+
+        Args:
+            course_id: コース ID
+            kind: 種類
+            item_id: 項目 ID
+        """
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "DELETE FROM items WHERE course_id = ? AND kind = ? AND item_id = ?",
+                (course_id, kind, str(item_id)))
+
+    @staticmethod
+    def __load(data: bytes) -> ManabaModel:
+        model = pickle.loads(data)
+        if not isinstance(model, ManabaModel):
+            raise ManabaInternalError("stored item is not a manaba model")
+        return model
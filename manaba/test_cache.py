@@ -0,0 +1,113 @@
+import hashlib
+import io
+from typing import Mapping, Optional
+from unittest import TestCase
+from urllib.parse import urlparse
+
+from requests import PreparedRequest, Response
+from urllib3 import HTTPResponse
+
+from manaba import Manaba, ManabaCache
+from manaba.test_conformance import BASE_URL, FixtureAdapter, fixture_response
+
+
+class CountingAdapter(FixtureAdapter):
+    """
+    リクエスト数を数え、必要に応じて ETag による条件付きリクエストに対応するフィクスチャーアダプター
+    """
+
+    def __init__(self,
+                 overrides: Optional[Mapping[str, str]] = None,
+                 etag: bool = False) -> None:
+        super().__init__(overrides)
+        self.etag = etag
+        self.requests: list[PreparedRequest] = []
+
+    def send(self,  # type: ignore[override] # pylint: disable=arguments-differ
+             request: PreparedRequest,
+             **kwargs: object) -> Response:
+        self.requests.append(request)
+        if not self.etag:
+            return super().send(request, **kwargs)
+
+        status, body, headers = fixture_response(str(request.method), urlparse(str(request.url)).path, self.overrides)
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if status == 200 and request.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+        raw = HTTPResponse(body=io.BytesIO(body), headers=dict(headers, ETag=etag), status=status,
+                           preload_content=False)
+        return self.build_response(request, raw)
+
+
+def cached_manaba(cache: ManabaCache,
+                  adapter: CountingAdapter,
+                  username: str = "fixture") -> Manaba:
+    client = Manaba(BASE_URL, cache=cache)
+    client.session.mount(BASE_URL, adapter)
+    if not client.login(username, "fixture"):
+        raise AssertionError("fixture login failed")
+    adapter.requests.clear()
+    return client
+
+
+class TestManabaCache(TestCase):
+    def test_content_hash(self) -> None:
+        cache = ManabaCache()
+        adapter = CountingAdapter()
+        client = cached_manaba(cache, adapter)
+
+        report = client.get_report(1001, 2001)
+        self.assertIs(report, client.get_report(1001, 2001))
+        self.assertEqual(2, len(adapter.requests))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+        # 本文が変わった場合はパースし直す
+        adapter.overrides["/ct/course_1001_report_2001"] = "course_1001_report_2002.html"
+        self.assertIsNot(report, client.get_report(1001, 2001))
+        self.assertEqual((1, 2), (cache.hits, cache.misses))
+
+    def test_etag(self) -> None:
+        cache = ManabaCache()
+        adapter = CountingAdapter(etag=True)
+        client = cached_manaba(cache, adapter)
+
+        thread = client.get_thread(1001, 3001)
+        self.assertIs(thread, client.get_thread(1001, 3001))
+        self.assertIsNone(adapter.requests[0].headers.get("If-None-Match"))
+        self.assertIsNotNone(adapter.requests[1].headers.get("If-None-Match"))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_ttl(self) -> None:
+        cache = ManabaCache(ttl=3600)
+        adapter = CountingAdapter()
+        client = cached_manaba(cache, adapter)
+
+        courses = client.get_courses()
+        self.assertIs(courses, client.get_courses())
+        self.assertEqual(1, len(adapter.requests))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_lru(self) -> None:
+        cache = ManabaCache(max_entries=2)
+        adapter = CountingAdapter()
+        client = cached_manaba(cache, adapter)
+
+        client.get_news(1001, 4001)
+        client.get_news(1001, 4002)
+        client.get_news(1001, 4001)
+        client.get_course(1001)
+        self.assertEqual(2, len(cache))
+        self.assertIn(("fixture", BASE_URL + "/ct/course_1001_news_4001"), cache)
+        self.assertNotIn(("fixture", BASE_URL + "/ct/course_1001_news_4002"), cache)
+
+    def test_account(self) -> None:
+        cache = ManabaCache(ttl=3600)
+        client_a = cached_manaba(cache, CountingAdapter(), "user-a")
+        client_b = cached_manaba(cache, CountingAdapter(), "user-b")
+
+        self.assertIsNot(client_a.get_course(1001), client_b.get_course(1001))
+        self.assertEqual((0, 2), (cache.hits, cache.misses))
+
+    def test_invalid(self) -> None:
+        self.assertRaises(ValueError, ManabaCache, 0)
+        self.assertRaises(ValueError, ManabaCache, 1, -1)
@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from requests import PreparedRequest, Response
+
+import manaba
+from manaba import Manaba, test_conformance
+from manaba.cassette import ManabaCassette
+from manaba.test_conformance import BASE_URL, Dumped, FixtureAdapter, dump
+
+
+class CookieAdapter(FixtureAdapter):
+    """
+    フィクスチャーのレスポンスに Cookie を付けて返すアダプター
+    """
+
+    def send(self,  # type: ignore[override] # pylint: disable=arguments-differ
+             request: PreparedRequest,
+             **kwargs: object) -> Response:
+        response = super().send(request, **kwargs)
+        response.headers["Set-Cookie"] = "sessionid=secret-session; path=/"
+        return response
+
+
+class TestCassette(TestCase):
+    """
+    ManabaCassette で記録したやり取りを再生し、manaba サーバーなしで同じモデルを返すかを調べる
+    """
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cassette.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def record(self) -> list[Dumped]:
+        client = Manaba(BASE_URL, transport=ManabaCassette(self.path, "record", transport=CookieAdapter()))
+        self.assertTrue(client.login("secret-user", "secret-password"))
+        results = [dump(getattr(client, method)(*args)) for method, args in test_conformance.TestAsyncConformance.CALLS]
+        client.session.close()
+        return results
+
+    def test_replay(self) -> None:
+        expected = self.record()
+
+        client = Manaba(BASE_URL, transport=ManabaCassette(self.path))
+        self.assertTrue(client.login("anyone", "anything"))
+        self.assertEqual(expected, [dump(getattr(client, method)(*args))
+                                    for method, args in test_conformance.TestAsyncConformance.CALLS])
+
+    def test_scrubbed(self) -> None:
+        self.record()
+        with open(self.path, encoding="utf-8") as f:
+            content = f.read()
+        self.assertNotIn("secret-password", content)
+        self.assertNotIn("secret-session", content)
+        self.assertNotIn("secret-user", content)
+
+        interactions = json.loads(content)["interactions"]
+        login = [interaction for interaction in interactions if interaction["method"] == "POST"]
+        self.assertEqual(1, len(login))
+        self.assertIn("password=%2A%2A%2A", login[0]["url"])
+
+    def test_latency(self) -> None:
+        self.record()
+        client = Manaba(BASE_URL, transport=ManabaCassette(self.path, latency=0.05))
+        self.assertTrue(client.login("fixture", "fixture"))
+
+        start = time.monotonic()
+        for _ in range(3):
+            client.get_course(1001)
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_not_recorded(self) -> None:
+        self.record()
+        client = Manaba(BASE_URL, transport=ManabaCassette(self.path))
+        self.assertTrue(client.login("fixture", "fixture"))
+        with self.assertRaises(manaba.exceptions.ManabaNotRecorded):
+            client.get_course(9999)
+
+    def test_invalid_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            ManabaCassette(self.path, "rewind")
+
+    def test_stream(self) -> None:
+        client = Manaba(BASE_URL, transport=ManabaCassette(self.path, "record", transport=CookieAdapter()))
+        self.assertTrue(client.login("fixture", "fixture"))
+        expected = dump(list(client.stream_thread(1001, 3001, chunk_size=16)))
+        client.session.close()
+
+        # ストリーミングの本文はカセットファイルに含めず、別のファイルに書き込む
+        with open(self.path, encoding="utf-8") as f:
+            interactions = json.load(f)["interactions"]
+        streamed = [interaction for interaction in interactions if "body_file" in interaction]
+        self.assertEqual(1, len(streamed))
+        self.assertNotIn("body", streamed[0])
+        self.assertNotIn("body_base64", streamed[0])
+        self.assertTrue(os.path.isfile(os.path.join(self.path + ".bodies", streamed[0]["body_file"])))
+
+        client = Manaba(BASE_URL, transport=ManabaCassette(self.path))
+        self.assertTrue(client.login("fixture", "fixture"))
+        self.assertEqual(expected, dump(list(client.stream_thread(1001, 3001, chunk_size=16))))
@@ -0,0 +1,156 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import requests
+
+from manaba import Manaba
+from manaba.concurrency import ManabaConcurrencyGovernor
+from manaba.metrics import ManabaMetrics
+from manaba.ratelimit import ManabaRateLimiter
+from manaba.standin import ManabaStandInServer
+
+
+class TestConcurrencyGovernor(TestCase):
+    """
+    ManabaConcurrencyGovernor が応答時間とエラーから同時リクエスト数の上限を調整するかを調べる
+    """
+
+    def test_increase(self) -> None:
+        governor = ManabaConcurrencyGovernor(initial=2, max_limit=4)
+        for _ in range(20):
+            tickets = [governor.acquire() for _ in range(governor.limit)]
+            for ticket in tickets:
+                governor.release(ticket, 0.01)
+        self.assertEqual(4, governor.limit)
+        self.assertEqual(0, governor.in_flight)
+        self.assertAlmostEqual(0.01, governor.baseline_latency or 0)
+
+    def test_unsaturated(self) -> None:
+        # 上限まで使用していない場合は増やさない
+        governor = ManabaConcurrencyGovernor(initial=4)
+        for _ in range(20):
+            governor.release(governor.acquire(), 0.01)
+        self.assertEqual(4, governor.limit)
+
+    def test_decrease(self) -> None:
+        governor = ManabaConcurrencyGovernor(initial=16)
+        tickets = [governor.acquire() for _ in range(8)]
+        for ticket in tickets:
+            governor.release(ticket, 0.1, failed=True)
+        # 同じ時期に送信したリクエストの失敗では 1 回のみ減らす
+        self.assertEqual((8, 1), (governor.limit, governor.decreases))
+
+        governor.release(governor.acquire(), 0.1, failed=True)
+        self.assertEqual((4, 2), (governor.limit, governor.decreases))
+        for _ in range(5):
+            governor.release(governor.acquire(), 0.1, failed=True)
+        self.assertEqual(1, governor.limit)
+
+    def test_latency_spike(self) -> None:
+        governor = ManabaConcurrencyGovernor(initial=8, latency_tolerance=3)
+        for _ in range(10):
+            governor.release(governor.acquire(), 0.1)
+        self.assertEqual(8, governor.limit)
+        governor.release(governor.acquire(), 0.5)
+        self.assertEqual(4, governor.limit)
+
+        governor = ManabaConcurrencyGovernor(initial=8, latency_limit=1.0)
+        governor.release(governor.acquire(), 1.5)
+        self.assertEqual(4, governor.limit)
+
+        # latency_floor 未満の揺らぎは急増とみなさない
+        governor = ManabaConcurrencyGovernor(initial=8)
+        governor.release(governor.acquire(), 0.001)
+        governor.release(governor.acquire(), 0.01)
+        self.assertEqual(8, governor.limit)
+
+    def test_blocking(self) -> None:
+        governor = ManabaConcurrencyGovernor(initial=1)
+        ticket = governor.acquire()
+        acquired = threading.Event()
+
+        def run() -> None:
+            governor.release(governor.acquire(), 0.01)
+            acquired.set()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+        governor.release(ticket, 0.01)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            ManabaConcurrencyGovernor(initial=8, max_limit=4)
+        with self.assertRaises(ValueError):
+            ManabaConcurrencyGovernor(decrease=1)
+
+
+class TestGovernedManaba(TestCase):
+    """
+    Manaba のリクエストに ManabaConcurrencyGovernor が適用されるかを調べる
+    """
+
+    def test_healthy(self) -> None:
+        # 負荷の高い環境での応答時間の揺らぎを急増とみなさないよう、急増の判定を無効にする
+        governor = ManabaConcurrencyGovernor(initial=1, max_limit=6, latency_floor=60, latency_tolerance=1000)
+        with ManabaStandInServer(courses=8, latency=0.01) as server:
+            client = Manaba(server.base_url, "html.parser", governor=governor)
+            self.assertTrue(client.login("standin", "standin"))
+            peak = 0
+
+            def fetch(course_id: int) -> str:
+                nonlocal peak
+                peak = max(peak, governor.in_flight)
+                return client.get_course(course_id).name
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                names = list(executor.map(fetch, [1001 + index % 8 for index in range(64)]))
+        self.assertEqual(64, len(names))
+        self.assertGreater(governor.limit, 1)
+        self.assertLessEqual(peak, 6)
+        metrics = ManabaMetrics(governor=governor)
+        self.assertEqual("concurrency limit=%d in_flight=0 decreases=0" % governor.limit,
+                         metrics.summary().splitlines()[-1])
+
+    def test_rate_limited(self) -> None:
+        # レートリミッターで待っている間は送信中として数えない
+        waiting = threading.Event()
+        resume = threading.Event()
+
+        class BlockingRateLimiter(ManabaRateLimiter):
+            def acquire(self,
+                        host: str) -> float:
+                waiting.set()
+                resume.wait(5)
+                return super().acquire(host)
+
+        governor = ManabaConcurrencyGovernor(initial=4)
+        with ManabaStandInServer(courses=1) as server:
+            client = Manaba(server.base_url, "html.parser", governor=governor, rate_limiter=BlockingRateLimiter(100, 1))
+            resume.set()
+            self.assertTrue(client.login("standin", "standin"))
+            waiting.clear()
+            resume.clear()
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                name = executor.submit(lambda: client.get_course(1001).name)
+                self.assertTrue(waiting.wait(5))
+                self.assertEqual(0, governor.in_flight)
+                resume.set()
+                self.assertEqual("コース 1001", name.result())
+        self.assertEqual(0, governor.in_flight)
+
+    def test_server_errors(self) -> None:
+        governor = ManabaConcurrencyGovernor(initial=8)
+        with ManabaStandInServer(error_rate=1, error_status=503) as server:
+            client = Manaba(server.base_url, "html.parser", governor=governor)
+            self.assertTrue(client.login("standin", "standin"))
+            for _ in range(4):
+                with self.assertRaises(requests.HTTPError):
+                    client.get_course(1001)
+                # 失敗したリクエストも枠を返すため、上限が 1 まで減っても待ち続けない
+                self.assertEqual(0, governor.in_flight)
+        self.assertEqual(1, governor.limit)
+        self.assertEqual(0, governor.in_flight)
@@ -0,0 +1,348 @@
+import datetime
+import enum
+import asyncio
+import io
+import os
+import threading
+from typing import Mapping, Optional, Union
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase, skipIf
+from urllib.parse import urlparse
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+import manaba
+from manaba import Manaba
+from manaba.models.ManabaModel import ManabaModel
+
+try:
+    from manaba.aio import AsyncManaba
+except ImportError:  # aiohttp がインストールされていない
+    AsyncManaba = None  # type: ignore[assignment,misc]
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "test_fixtures")
+BASE_URL = "https://manaba.example.com"
+
+Dumped = Union[None, bool, int, str, list["Dumped"], dict[str, "Dumped"]]
+
+
+def fixture_response(method: str,
+                     path: str,
+                     overrides: Mapping[str, str]) -> tuple[int, bytes, dict[str, str]]:
+    """
+    リクエストに対応するフィクスチャーのステータスコード・本文・ヘッダーを返す
+    """
+    if method == "POST" and path == "/ct/login":
+        return 302, b"", {"Location": "/ct/home"}
+    if path == "/ct/home":
+        path = "/ct/home_course"
+
+    filename = overrides.get(path, path.replace("/ct/", "", 1) + ".html")
+    filepath = os.path.join(FIXTURES_DIR, filename)
+    if not os.path.exists(filepath):
+        return 404, b"Not Found", {}
+    with open(filepath, "rb") as f:
+        return 200, f.read(), {"Content-Type": "text/html; charset=UTF-8"}
+
+
+class FixtureAdapter(HTTPAdapter):
+    """
+    test_fixtures ディレクトリの HTML を manaba のページとして返すアダプター
+    """
+
+    def __init__(self,
+                 overrides: Optional[Mapping[str, str]] = None) -> None:
+        super().__init__()
+        self.overrides = dict(overrides or {})
+
+    def send(self,  # type: ignore[override] # pylint: disable=arguments-differ
+             request: PreparedRequest,
+             **kwargs: object) -> Response:
+        status, body, headers = fixture_response(str(request.method), urlparse(str(request.url)).path, self.overrides)
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, preload_content=False)
+        return self.build_response(request, raw)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    test_fixtures ディレクトリの HTML を manaba のページとして返すローカル HTTP サーバー
+    """
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), FixtureRequestHandler)
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def base_url(self) -> str:
+        return "http://127.0.0.1:" + str(self.server_address[1])
+
+    def close(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        self._respond("GET")
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        self._respond("POST")
+
+    def _respond(self,
+                 method: str) -> None:
+        status, body, headers = fixture_response(method, urlparse(self.path).path, {})
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def fixture_manaba(parser: str,
+                   overrides: Optional[Mapping[str, str]] = None) -> Manaba:
+    """
+    フィクスチャーを返すようにした、ログイン済みの Manaba を作成する
+    """
+    client = Manaba(BASE_URL, parser)
+    client.session.mount(BASE_URL, FixtureAdapter(overrides))
+    if not client.login("fixture", "fixture"):
+        raise AssertionError("fixture login failed")
+    return client
+
+
+def dump(value: object) -> Dumped:
+    """
+    モデルを比較可能な値に変換する (親モデルへの参照は辿らない)
+    """
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [dump(item) for item in value]
+    if isinstance(value, ManabaModel):
+        result: dict[str, Dumped] = {"__class__": type(value).__name__}
+        for key, item in vars(value).items():
+            if key != "_parent":
+                result[key] = dump(item)
+        return result
+    raise TypeError("unsupported value: " + repr(value))
+
+
+class TestParserConformance(TestCase):
+    """
+    フィクスチャー HTML に対して、各パーサーバックエンドが html5lib と同じモデルを返すかを調べる
+    """
+    BACKENDS = ["lxml", "html.parser"]
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def assertConformance(self,
+                          method: str,
+                          *args: Union[int, str],
+                          overrides: Optional[Mapping[str, str]] = None) -> Dumped:
+        expected = dump(getattr(fixture_manaba("html5lib", overrides), method)(*args))
+        for backend in self.BACKENDS:
+            with self.subTest(backend=backend, method=method, args=args):
+                actual = dump(getattr(fixture_manaba(backend, overrides), method)(*args))
+                self.assertEqual(expected, actual, backend + " の " + method + " の結果が html5lib と異なります。")
+        return expected
+
+    def test_unknown_parser(self) -> None:
+        self.assertRaises(ValueError, Manaba, BASE_URL, "unknown-parser")
+
+    def test_not_found(self) -> None:
+        for backend in ["html5lib"] + self.BACKENDS:
+            client = fixture_manaba(backend)
+            self.assertRaises(manaba.ManabaNotFound, client.get_report, 1001, 9999)
+
+    def test_get_courses(self) -> None:
+        thumbnail = self.assertConformance("get_courses")
+        courses_all = self.assertConformance("get_courses_all")
+        timetable = self.assertConformance("get_courses",
+                                           overrides={"/ct/home_course": "home_course_timetable.html"})
+        assert isinstance(thumbnail, list) and isinstance(courses_all, list) and isinstance(timetable, list)
+        self.assertEqual(2, len(thumbnail))
+        self.assertEqual(3, len(courses_all))
+        self.assertEqual(3, len(timetable))
+
+    def test_get_course(self) -> None:
+        course = self.assertConformance("get_course", 1001)
+        assert isinstance(course, dict)
+        self.assertEqual("プログラミング演習 I", course["_name"])
+        self.assertEqual(2021, course["_year"])
+
+    def test_get_querys(self) -> None:
+        self.assertConformance("get_querys", 1001)
+        self.assertConformance("get_query", 1001, 2001)
+        self.assertConformance("get_drill", 1001, 2003)
+
+    def test_get_surveys(self) -> None:
+        self.assertConformance("get_surveys", 1001)
+        self.assertConformance("get_survey", 1001, 2001)
+
+    def test_get_reports(self) -> None:
+        self.assertConformance("get_reports", 1001)
+        report = self.assertConformance("get_report", 1001, 2001)
+        assert isinstance(report, dict)
+        self.assertEqual("教科書 1 章の演習問題を解き、\nPDF で提出してください。", report["_description"])
+        self.assertConformance("get_report", 1001, 2002)
+
+    def test_get_threads(self) -> None:
+        self.assertConformance("get_threads", 1001)
+        thread = self.assertConformance("get_thread", 1001, 3001)
+        assert isinstance(thread, dict) and isinstance(thread["_comments"], list)
+        self.assertEqual(4, len(thread["_comments"]))
+
+    def test_get_news(self) -> None:
+        self.assertConformance("get_news_list", 1001)
+        self.assertConformance("get_news", 1001, 4001)
+        self.assertConformance("get_news", 1001, 4002)
+
+    def test_get_contents(self) -> None:
+        self.assertConformance("get_contents", 1001)
+        self.assertConformance("get_content_pages", "abc123")
+        self.assertConformance("get_content_page", "abc123", 5001)
+
+
+class TestPureParsers(TestCase):
+    """
+    manaba.parsers の関数が HTTP 通信なしで、str・bytes のどちらからでも Manaba と同じモデルを返すかを調べる
+    """
+    CALLS: list[tuple[str, str, tuple[Union[int, str], ...], tuple[Union[int, str], ...]]] = [
+        ("get_courses", "home_course.html", (), ()),
+        ("get_course", "course_1001.html", (1001,), (1001,)),
+        ("get_querys", "course_1001_query.html", (1001,), (1001,)),
+        ("get_query", "course_1001_query_2001.html", (1001, 2001), (1001, 2001)),
+        ("get_drill", "course_1001_drill_2003.html", (1001, 2003), (1001, 2003)),
+        ("get_surveys", "course_1001_survey.html", (1001,), (1001,)),
+        ("get_survey", "course_1001_survey_2001.html", (1001, 2001), (1001, 2001)),
+        ("get_reports", "course_1001_report.html", (1001,), (1001,)),
+        ("get_report", "course_1001_report_2001.html", (1001, 2001), (1001, 2001)),
+        ("get_threads", "course_1001_topics.html", (1001,), (1001,)),
+        ("get_thread", "course_1001_topics_3001_tflat.html", (1001, 3001), (1001, 3001, BASE_URL)),
+        ("get_news_list", "course_1001_news.html", (1001,), (1001,)),
+        ("get_news", "course_1001_news_4001.html", (1001, 4001), (1001, 4001, BASE_URL)),
+        ("get_contents", "course_1001_page.html", (1001,), (1001,)),
+        ("get_content_pages", "page_abc123.html", ("abc123",), ("abc123",)),
+        ("get_content_page", "page_abc123_5001.html", ("abc123", 5001), ("abc123", 5001, BASE_URL)),
+    ]
+    PARSERS = {
+        "get_courses": manaba.parsers.parse_courses,
+        "get_course": manaba.parsers.parse_course,
+        "get_querys": manaba.parsers.parse_querys,
+        "get_query": manaba.parsers.parse_query_details,
+        "get_drill": manaba.parsers.parse_drill_details,
+        "get_surveys": manaba.parsers.parse_surveys,
+        "get_survey": manaba.parsers.parse_survey_details,
+        "get_reports": manaba.parsers.parse_reports,
+        "get_report": manaba.parsers.parse_report_details,
+        "get_threads": manaba.parsers.parse_threads,
+        "get_thread": manaba.parsers.parse_thread,
+        "get_news_list": manaba.parsers.parse_news_list,
+        "get_news": manaba.parsers.parse_news,
+        "get_contents": manaba.parsers.parse_contents,
+        "get_content_pages": manaba.parsers.parse_content_pages,
+        "get_content_page": manaba.parsers.parse_content_page,
+    }
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_parsers(self) -> None:
+        client = fixture_manaba("html5lib")
+        for method, filename, args, parser_args in self.CALLS:
+            expected = dump(getattr(client, method)(*args))
+            with open(os.path.join(FIXTURES_DIR, filename), "rb") as f:
+                body = f.read()
+            parse = self.PARSERS[method]
+            for backend in ["html5lib"] + TestParserConformance.BACKENDS:
+                for markup in [body, body.decode("utf-8")]:
+                    with self.subTest(method=method, backend=backend, markup=type(markup).__name__):
+                        self.assertEqual(expected, dump(parse(markup, *parser_args, backend)))  # type: ignore[operator]
+
+    def test_regions(self) -> None:
+        for method, filename, _, _ in self.CALLS:
+            regions = manaba.parsers.REGIONS[self.PARSERS[method].__name__]
+            with open(os.path.join(FIXTURES_DIR, filename), "rb") as f:
+                body = f.read()
+            for backend in TestParserConformance.BACKENDS:
+                with self.subTest(method=method, backend=backend):
+                    full = manaba.parsers.parse_html(body, backend)
+                    restricted = manaba.parsers.parse_html(body, backend, regions)
+                    self.assertLess(len(restricted.find_all(True)), len(full.find_all(True)))
+                    self.assertIsNone(restricted.find("head"))
+
+    def test_is_login_page(self) -> None:
+        with open(os.path.join(FIXTURES_DIR, "login.html"), "rb") as f:
+            body = f.read()
+        self.assertTrue(manaba.parsers.is_login_page(body))
+        self.assertTrue(manaba.parsers.is_login_page(body.decode("utf-8")))
+        self.assertFalse(manaba.parsers.is_login_page("<html></html>"))
+
+
+@skipIf(AsyncManaba is None, "aiohttp is not installed")
+class TestAsyncConformance(TestCase):
+    """
+    AsyncManaba が Manaba と同じモデルを返すかを調べる
+    """
+    CALLS: list[tuple[str, tuple[Union[int, str], ...]]] = [
+        ("get_courses", ()),
+        ("get_courses_all", ()),
+        ("get_course", (1001,)),
+        ("get_querys", (1001,)),
+        ("get_query", (1001, 2001)),
+        ("get_drill", (1001, 2003)),
+        ("get_surveys", (1001,)),
+        ("get_survey", (1001, 2001)),
+        ("get_reports", (1001,)),
+        ("get_report", (1001, 2001)),
+        ("get_threads", (1001,)),
+        ("get_thread", (1001, 3001)),
+        ("get_news_list", (1001,)),
+        ("get_news", (1001, 4002)),
+        ("get_contents", (1001,)),
+        ("get_content_pages", ("abc123",)),
+        ("get_content_page", ("abc123", 5001)),
+    ]
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+        self.server = FixtureServer()
+
+    def tearDown(self) -> None:
+        self.server.close()
+
+    def test_conformance(self) -> None:
+        client = Manaba(self.server.base_url)
+        self.assertTrue(client.login("fixture", "fixture"))
+        expected = [dump(getattr(client, method)(*args)) for method, args in self.CALLS]
+
+        async def run() -> list[Dumped]:
+            async with AsyncManaba(self.server.base_url) as async_client:
+                self.assertTrue(await async_client.login("fixture", "fixture"))
+                results = await asyncio.gather(*[getattr(async_client, method)(*args) for method, args in self.CALLS])
+                return [dump(result) for result in results]
+
+        self.assertEqual(expected, asyncio.run(run()))
+
+    def test_not_logged_in(self) -> None:
+        async def run() -> None:
+            async with AsyncManaba(self.server.base_url) as async_client:
+                with self.assertRaises(manaba.ManabaNotLoggedIn):
+                    await async_client.get_courses()
+                self.assertTrue(await async_client.login("fixture", "fixture"))
+                with self.assertRaises(manaba.ManabaNotFound):
+                    await async_client.get_report(1001, 9999)
+
+        asyncio.run(run())
@@ -0,0 +1,149 @@
+import datetime
+import io
+import os
+import re
+import tempfile
+from typing import Optional
+from unittest import TestCase
+
+from requests import PreparedRequest, Response
+from urllib3 import HTTPResponse
+
+import manaba
+from manaba import Manaba, ManabaDownloadStatus, ManabaFile
+from manaba.test_cache import CountingAdapter
+from manaba.test_conformance import BASE_URL, fixture_manaba
+
+CONTENT = bytes(range(256)) * 64
+
+
+class FileAdapter(CountingAdapter):
+    """
+    添付ファイル (/ct/file_*) に Range・If-Range リクエスト対応で CONTENT を返すフィクスチャーアダプター
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.file_etag = '"v1"'
+
+    def send(self,  # type: ignore[override] # pylint: disable=arguments-differ
+             request: PreparedRequest,
+             **kwargs: object) -> Response:
+        if "/ct/file_" not in str(request.url):
+            return super().send(request, **kwargs)
+
+        self.requests.append(request)
+        status, body = 200, CONTENT
+        headers = {"Content-Length": str(len(CONTENT)), "ETag": self.file_etag}
+        match = re.fullmatch(r"bytes=([0-9]+)-", request.headers.get("Range", ""))
+        if match is not None and request.headers.get("If-Range", self.file_etag) == self.file_etag:
+            start = int(match.group(1))
+            if start >= len(CONTENT):
+                status, body = 416, b""
+            else:
+                status, body = 206, CONTENT[start:]
+            headers = {"Content-Length": str(len(body)), "ETag": self.file_etag}
+        if request.method == "HEAD":
+            body = b""
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, preload_content=False,
+                           request_method=request.method)
+        return self.build_response(request, raw)
+
+
+class TestDownloadFiles(TestCase):
+    def setUp(self) -> None:
+        self.adapter = FileAdapter()
+        self.client = Manaba(BASE_URL)
+        self.client.session.mount(BASE_URL, self.adapter)
+        self.assertTrue(self.client.login("fixture", "fixture"))
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_download(self) -> None:
+        thread = fixture_manaba("html5lib").get_thread(1001, 3001)
+        assert thread.comments is not None
+        files = thread.comments[0].files + thread.comments[0].files
+
+        results = self.client.download_files(files, self.directory.name, chunk_size=1000)
+        self.assertEqual([ManabaDownloadStatus.DOWNLOADED] * 2, [result.status for result in results])
+        self.assertEqual(["guide.pdf", "guide (2).pdf"], [os.path.basename(result.path) for result in results])
+        for result in results:
+            with open(result.path, "rb") as f:
+                self.assertEqual(CONTENT, f.read())
+            assert files[0].uploaded_at is not None
+            self.assertEqual(files[0].uploaded_at.timestamp(), os.path.getmtime(result.path))
+
+        # 変更がなければダウンロードしない
+        results = self.client.download_files(files, self.directory.name)
+        self.assertEqual([ManabaDownloadStatus.SKIPPED] * 2, [result.status for result in results])
+        # 更新の確認 (HEAD) も、ほかのリクエストと同じくトレースに記録される
+        self.assertEqual("HEAD", self.adapter.requests[-1].method)
+        latest = self.client.trace.latest
+        assert latest is not None
+        self.assertEqual("HEAD", latest.method)
+
+    def test_resume(self) -> None:
+        file = ManabaFile(manaba.ManabaModel(), "lecture.pdf", datetime.datetime(2021, 4, 12, tzinfo=manaba.JST),
+                          BASE_URL + "/ct/file_1/lecture.pdf")
+        self.write_part(CONTENT[:1000], '"v1"')
+
+        result = self.client.download_files([file], self.directory.name)[0]
+        self.assertEqual(ManabaDownloadStatus.RESUMED, result.status)
+        self.assertEqual(len(CONTENT) - 1000, result.downloaded_bytes)
+        self.assertEqual("bytes=1000-", self.adapter.requests[-1].headers["Range"])
+        self.assertEqual('"v1"', self.adapter.requests[-1].headers["If-Range"])
+        with open(result.path, "rb") as f:
+            self.assertEqual(CONTENT, f.read())
+        self.assertFalse(os.path.exists(result.path + ".part"))
+        self.assertFalse(os.path.exists(result.path + ".part.validator"))
+
+    def test_resume_replaced(self) -> None:
+        file = ManabaFile(manaba.ManabaModel(), "lecture.pdf", None, BASE_URL + "/ct/file_1/lecture.pdf")
+        # 途中までダウンロードした後に、サーバー上のファイルが差し替えられた
+        self.write_part(b"x" * 1000, '"v0"')
+
+        result = self.client.download_files([file], self.directory.name)[0]
+        self.assertEqual(ManabaDownloadStatus.DOWNLOADED, result.status)
+        self.assertEqual(len(CONTENT), result.downloaded_bytes)
+        with open(result.path, "rb") as f:
+            self.assertEqual(CONTENT, f.read())
+
+    def test_resume_without_validator(self) -> None:
+        file = ManabaFile(manaba.ManabaModel(), "lecture.pdf", None, BASE_URL + "/ct/file_1/lecture.pdf")
+        # 版が分からない途中のファイルはつなげずに、最初からダウンロードする
+        self.write_part(b"x" * 1000, None)
+
+        result = self.client.download_files([file], self.directory.name)[0]
+        self.assertEqual(ManabaDownloadStatus.DOWNLOADED, result.status)
+        self.assertNotIn("Range", self.adapter.requests[-1].headers)
+        with open(result.path, "rb") as f:
+            self.assertEqual(CONTENT, f.read())
+
+    def write_part(self,
+                   content: bytes,
+                   validator: Optional[str]) -> None:
+        with open(os.path.join(self.directory.name, "lecture.pdf.part"), "wb") as f:
+            f.write(content)
+        if validator is not None:
+            with open(os.path.join(self.directory.name, "lecture.pdf.part.validator"), "w", encoding="utf-8") as f:
+                f.write(validator)
+
+    def test_unsafe_names(self) -> None:
+        names = [".", "..", "../../escape.pdf", "dir\\..\\win.pdf", "nul\x00.pdf", "Guide.pdf", "guide.pdf"]
+        files = [ManabaFile(manaba.ManabaModel(), name, None, BASE_URL + "/ct/file_%d/download" % index)
+                 for index, name in enumerate(names)]
+        results = self.client.download_files(files, self.directory.name)
+        self.assertEqual([ManabaDownloadStatus.DOWNLOADED] * len(names), [result.status for result in results])
+        self.assertEqual(["file", "file (2)", "escape.pdf", "win.pdf", "nul_.pdf", "Guide.pdf", "guide (2).pdf"],
+                         [os.path.basename(result.path) for result in results])
+        for result in results:
+            self.assertEqual(self.directory.name, os.path.dirname(result.path))
+        self.assertEqual(len(names), len(os.listdir(self.directory.name)))
+
+    def test_failed(self) -> None:
+        file = ManabaFile(manaba.ManabaModel(), "missing.pdf", None, BASE_URL + "/ct/missing.pdf")
+        result = self.client.download_files([file], self.directory.name)[0]
+        self.assertEqual(ManabaDownloadStatus.FAILED, result.status)
+        self.assertIsInstance(result.error, manaba.ManabaNotFound)
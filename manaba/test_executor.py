@@ -0,0 +1,29 @@
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+from manaba import Manaba
+from manaba import test_conformance
+from manaba.test_conformance import BASE_URL, FixtureAdapter, dump, fixture_manaba
+
+
+class TestParseExecutor(TestCase):
+    """
+    parse_executor に ProcessPoolExecutor を指定しても、同じモデルを返すかを調べる
+    """
+
+    CALLS = test_conformance.TestAsyncConformance.CALLS
+
+    def test_process_pool(self) -> None:
+        client = fixture_manaba("html5lib")
+        expected = [dump(getattr(client, method)(*args)) for method, args in self.CALLS]
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            pooled = Manaba(BASE_URL, parse_executor=executor)
+            pooled.session.mount(BASE_URL, FixtureAdapter())
+            self.assertTrue(pooled.login("fixture", "fixture"))
+            self.assertEqual(expected, [dump(getattr(pooled, method)(*args)) for method, args in self.CALLS])
+
+            # 親モデルへの参照も復元される
+            thread = pooled.get_thread(1001, 3001)
+            assert thread.comments is not None
+            self.assertIs(thread.comments[0], thread.comments[0].files[0].parent)
@@ -0,0 +1,150 @@
+import os
+import tracemalloc
+from unittest import TestCase
+from urllib.parse import parse_qs, urlparse
+
+import manaba
+from manaba import Manaba, ManabaThread, ManabaThreadComment
+from manaba.parsers import ThreadCommentStream
+from manaba.standin import ManabaStandInServer
+from manaba.test_conformance import BASE_URL, FIXTURES_DIR, dump, fixture_manaba
+
+
+class TestThreadSince(TestCase):
+    """
+    get_thread_since が差分を取得・マージし、削除・編集されたコメントを検出するかを調べる
+    """
+
+    def test_merge(self) -> None:
+        client = fixture_manaba("html5lib")
+        full = client.get_thread(1001, 3001)
+        assert full.comments is not None
+
+        # 3 件目までを保持していて、3 件目はその後編集された
+        edited = full.comments[2]
+        held_comment = ManabaThreadComment(edited.course_id, edited.thread_id, edited.comment_id, edited.title,
+                                           edited.author, edited.posted_at, edited.reply_to_id, False, "<p>編集前</p>")
+        held = ManabaThread(1001, 3001, full.title, full.comments[:2] + [held_comment])
+
+        update = client.get_thread_since(1001, 3001, 3, held, page_len=2)
+        self.assertEqual([4], [comment.comment_id for comment in update.new_comments])
+        self.assertEqual([3], [comment.comment_id for comment in update.changed_comments])
+        self.assertEqual(dump(full), dump(update.thread))
+
+    def test_without_thread(self) -> None:
+        client = fixture_manaba("html5lib")
+        update = client.get_thread_since(1001, 3001, 2)
+        assert update.thread.comments is not None
+        self.assertEqual([3, 4], [comment.comment_id for comment in update.thread.comments])
+        self.assertEqual([], update.changed_comments)
+
+        latest = client.get_latest_trace()
+        assert latest is not None
+        self.assertEqual(["50"], parse_qs(urlparse(latest.url).query)["pagelen"])
+
+
+class TestIterators(TestCase):
+    """
+    iter_news / iter_thread_comments がページを順に取得し、モデルを返すかを調べる
+    """
+
+    def test_iter_news(self) -> None:
+        client = fixture_manaba("html5lib")
+        self.assertEqual(dump(client.get_news_list(1001)), dump(list(client.iter_news(1001))))
+
+        # フィクスチャーは start_id を無視するため、2 ページ目はすべて取得済みとなり終了する
+        news = client.iter_news(1001, page_size=1)
+        self.assertEqual(4002, next(news).news_id)
+        self.assertEqual([4001], [item.news_id for item in news])
+        latest = client.get_latest_trace()
+        assert latest is not None
+        self.assertEqual({"pagelen": ["1"], "start_id": ["1"]}, parse_qs(urlparse(latest.url).query))
+
+    def test_iter_news_posted(self) -> None:
+        with ManabaStandInServer(courses=1, news=100) as server:
+            client = Manaba(server.base_url, "html.parser")
+            self.assertTrue(client.login("standin", "standin"))
+            news = client.iter_news(1001, page_size=50)
+            news_ids = [next(news).news_id]
+            # 取得中にニュースが掲載され、2 ページ目以降の範囲が 1 件ずれる
+            server.news += 1
+            news_ids.extend(item.news_id for item in news)
+        self.assertEqual(list(range(4100, 4000, -1)), news_ids)
+
+    def test_iter_thread_comments(self) -> None:
+        client = fixture_manaba("html5lib")
+        thread = client.get_thread(1001, 3001)
+        assert thread.comments is not None
+        self.assertEqual(dump(list(reversed(thread.comments))),
+                         dump(list(client.iter_thread_comments(1001, 3001, page_size=2))))
+
+    def test_iter_thread_comments_posted(self) -> None:
+        with ManabaStandInServer(courses=1, threads=1, comments=100) as server:
+            client = Manaba(server.base_url, "html.parser")
+            self.assertTrue(client.login("standin", "standin"))
+            comments = client.iter_thread_comments(1001, 3001, page_size=50)
+            comment_ids = [next(comments).comment_id]
+            # 取得中にコメントが投稿され、2 ページ目以降の範囲が 1 件ずれる
+            server.comments += 1
+            comment_ids.extend(comment.comment_id for comment in comments)
+        self.assertEqual(list(range(100, 0, -1)), comment_ids)
+
+
+class TestStreamThread(TestCase):
+    """
+    stream_thread / ThreadCommentStream がページを受信しながら、get_thread と同じコメントを返すかを調べる
+    """
+
+    @staticmethod
+    def thread_page(count: int) -> bytes:
+        with open(os.path.join(FIXTURES_DIR, "course_1001_topics_3001_tflat.html"), "rb") as f:
+            body = f.read()
+        start = body.index(b'<div class="articlecontainer">')
+        end = body.index(b'<div class="articlecontainer">', start + 1)
+        article = body[start:end]
+        articles = b"".join(article.replace(b'articlenumber">1<', b'articlenumber">' + str(i).encode() + b"<")
+                            for i in range(1, count + 1))
+        return body[:start] + articles + body[body.rindex(b"</div>\n</div>\n<div id=\"footer\">"):]
+
+    def test_stream_thread(self) -> None:
+        for backend in ["html5lib", "lxml", "html.parser"]:
+            with self.subTest(backend=backend):
+                client = fixture_manaba(backend)
+                thread = client.get_thread(1001, 3001)
+                # 小さいチャンクでタグ・文字参照・マルチバイト文字の途中で区切られても同じ結果になる
+                self.assertEqual(dump(thread.comments), dump(list(client.stream_thread(1001, 3001, chunk_size=7))))
+
+    def test_first_comment_before_end(self) -> None:
+        body = self.thread_page(100)
+        stream = ThreadCommentStream(1001, 3001, BASE_URL, "html.parser")
+        chunks = [body[i:i + 1024] for i in range(0, len(body), 1024)]
+        first = next(index for index, chunk in enumerate(chunks) if len(stream.feed(chunk)) != 0)
+        self.assertLess(first, 3)
+
+        comment_ids = [comment.comment_id for chunk in chunks[first + 1:] for comment in stream.feed(chunk)]
+        comment_ids += [comment.comment_id for comment in stream.close()]
+        self.assertEqual(list(range(2, 101)), comment_ids)
+
+    def test_memory(self) -> None:
+        body = self.thread_page(150)
+
+        tracemalloc.start()
+        stream = ThreadCommentStream(1001, 3001, BASE_URL, "html.parser")
+        for i in range(0, len(body), 4096):
+            stream.feed(body[i:i + 4096])
+        stream.close()
+        _, stream_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        manaba.parsers.parse_thread(body, 1001, 3001, BASE_URL, "html.parser")
+        _, full_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # ページ全体の木を作らないため、コメント数が多いほど差が大きくなる
+        self.assertLess(stream_peak * 4, full_peak)
+
+    def test_login_page(self) -> None:
+        client = fixture_manaba("html5lib", {"/ct/course_1001_topics_3001_tflat": "login.html"})
+        with self.assertRaises(manaba.ManabaNotLoggedIn):
+            list(client.stream_thread(1001, 3001))
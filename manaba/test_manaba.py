@@ -5,6 +5,7 @@ from unittest import TestCase
 
 import manaba
 from manaba import Manaba
+from manaba.cassette import ManabaCassette
 from manaba.models.ManabaAnswerViewType import get_answer_view_type_from_name
 from manaba.models.ManabaFile import ManabaFile
 from manaba.models.ManabaPortfolioType import get_portfolio_type_from_name
@@ -31,7 +32,13 @@ class TestManaba(TestCase):
             self.tests = self.config["tests"]
 
         self.base_url = self.config["base_url"]
-        self.manaba = Manaba(self.base_url)
+
+        # MANABA_CASSETTE_DIR を指定した場合は、テストごとのカセットに記録 (MANABA_CASSETTE_MODE=record) または再生する
+        cassette: Optional[ManabaCassette] = None
+        if "MANABA_CASSETTE_DIR" in os.environ:
+            cassette = ManabaCassette(os.path.join(os.environ["MANABA_CASSETTE_DIR"], self.id() + ".json"),
+                                      os.environ.get("MANABA_CASSETTE_MODE", "replay"))
+        self.manaba = Manaba(self.base_url, transport=cassette)
 
         self.assertFalse(self.manaba.login("XXXXXXXX", "XXXXXXXX"), "ログインに失敗するべきなのに失敗しませんでした。")
 
@@ -43,6 +50,9 @@ class TestManaba(TestCase):
         self.courses_count: dict[str, int] = {}
         self.courses_all_count: dict[str, int] = {}
 
+    def tearDown(self) -> None:
+        self.manaba.session.close()
+
     def test_get_courses_from_thumbnail(self) -> None:
         # Change to thumbnail format
         response = self.manaba.session.get(self.base_url + "/ct/home_course?chglistformat=thumbnail")
@@ -0,0 +1,124 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+from manaba import Manaba, ManabaCache, ManabaFetchEvent, ManabaNotFound, test_conformance
+from manaba.metrics import ManabaLatencyHistogram, ManabaMetrics
+from manaba.test_cache import CountingAdapter, cached_manaba
+from manaba.test_conformance import BASE_URL, FixtureAdapter, fixture_manaba
+
+
+class TestFetchEvents(TestCase):
+    """
+    get_* でページを取得するたびに、observers にページ取得イベントが渡されるかを調べる
+    """
+
+    def test_events(self) -> None:
+        events: list[ManabaFetchEvent] = []
+        client = fixture_manaba("html.parser")
+        client.add_observer(events.append)
+        for method, args in test_conformance.TestAsyncConformance.CALLS:
+            getattr(client, method)(*args)
+
+        self.assertEqual([method for method, _ in test_conformance.TestAsyncConformance.CALLS],
+                         [event.endpoint for event in events])
+        for event in events:
+            with self.subTest(endpoint=event.endpoint):
+                self.assertEqual(200, event.status)
+                self.assertIsNone(event.error)
+                self.assertFalse(event.cached)
+                self.assertGreater(event.bytes_received, 0)
+                self.assertGreater(event.parse_time, 0)
+                self.assertGreaterEqual(event.build_time, 0)
+                self.assertAlmostEqual(event.network_time + event.parse_time + event.build_time, event.total_time)
+
+    def test_error(self) -> None:
+        events: list[ManabaFetchEvent] = []
+        client = fixture_manaba("html.parser")
+        client.add_observer(events.append)
+        with self.assertRaises(ManabaNotFound):
+            client.get_course(9999)
+
+        self.assertEqual(1, len(events))
+        self.assertEqual("get_course", events[0].endpoint)
+        self.assertIsInstance(events[0].error, ManabaNotFound)
+        self.assertFalse(events[0].cached)
+        self.assertEqual(0, events[0].parse_time)
+
+    def test_cache(self) -> None:
+        metrics = ManabaMetrics()
+        adapter = CountingAdapter(etag=True)
+        client = cached_manaba(ManabaCache(ttl=0), adapter)
+        client.add_observer(metrics)
+        for _ in range(3):
+            client.get_report(1001, 2001)
+
+        report = metrics.endpoint("get_report")
+        assert report is not None
+        self.assertEqual((3, 0, 2), (report.requests, report.errors, report.cached))
+        self.assertEqual(1, report.parse.count)
+        self.assertEqual(3, report.network.count)
+
+    def test_parse_executor(self) -> None:
+        metrics = ManabaMetrics()
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            client = Manaba(BASE_URL, "html.parser", parse_executor=executor, observers=[metrics])
+            client.session.mount(BASE_URL, FixtureAdapter())
+            self.assertTrue(client.login("fixture", "fixture"))
+            client.get_thread(1001, 3001)
+
+        thread = metrics.endpoint("get_thread")
+        assert thread is not None
+        self.assertEqual(1, thread.requests)
+        self.assertGreater(thread.parse.sum, 0)
+
+
+class TestMetrics(TestCase):
+    """
+    ManabaMetrics, ManabaLatencyHistogram の集計を調べる
+    """
+
+    def test_histogram(self) -> None:
+        histogram = ManabaLatencyHistogram((0.1, 0.2, 0.4))
+        for value in [0.05, 0.15, 0.15, 0.3, 1.0]:
+            histogram.observe(value)
+
+        self.assertEqual(5, histogram.count)
+        self.assertAlmostEqual(1.65, histogram.sum)
+        self.assertAlmostEqual(0.33, histogram.mean)
+        self.assertEqual(1.0, histogram.max)
+        self.assertEqual([(0.1, 1), (0.2, 2), (0.4, 1), (math.inf, 1)], histogram.buckets)
+        self.assertAlmostEqual(0.1, histogram.quantile(0.2))
+        self.assertAlmostEqual(0.15, histogram.quantile(0.4))
+        self.assertAlmostEqual(0.4, histogram.quantile(0.8))
+        self.assertEqual(1.0, histogram.quantile(1))
+        self.assertEqual(0, ManabaLatencyHistogram().quantile(0.5))
+
+        with self.assertRaises(ValueError):
+            histogram.quantile(1.5)
+        with self.assertRaises(ValueError):
+            ManabaLatencyHistogram((0.2, 0.1))
+        with self.assertRaises(ValueError):
+            ManabaMetrics(())
+        with self.assertRaises(ValueError):
+            ManabaMetrics((0.1, 0.1))
+
+    def test_metrics(self) -> None:
+        metrics = ManabaMetrics((0.1, 1.0))
+        metrics(ManabaFetchEvent("get_course", "u", 200, 100, 0.05, 0.02, 0.01, False, None))
+        metrics(ManabaFetchEvent("get_course", "u", None, 0, 0.5, 0, 0, False, ManabaNotFound()))
+        metrics(ManabaFetchEvent("get_thread", "u", 200, 5000, 0.3, 0.5, 0.4, False, None))
+
+        self.assertEqual(["get_course", "get_thread"], metrics.endpoints)
+        course = metrics.endpoint("get_course")
+        assert course is not None
+        self.assertEqual((2, 1, 0, 100), (course.requests, course.errors, course.cached, course.bytes_received))
+        self.assertAlmostEqual(0.58, course.total.sum)
+        self.assertEqual([(0.1, 1), (1.0, 1), (math.inf, 0)], course.total.buckets)
+        self.assertIsNone(metrics.endpoint("get_news"))
+
+        lines = metrics.summary().splitlines()
+        self.assertEqual(["endpoint", "get_thread", "get_course"], [line.split()[0] for line in lines])
+
+        metrics.clear()
+        self.assertEqual([], metrics.endpoints)
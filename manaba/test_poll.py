@@ -0,0 +1,92 @@
+from unittest import TestCase
+
+import manaba
+from manaba import Manaba
+from manaba.metrics import ManabaMetrics
+from manaba.models.ManabaCourse import ManabaCourse
+from manaba.models.ManabaPollTarget import ManabaPollTarget
+from manaba.standin import ManabaStandInServer
+from manaba.test_conformance import BASE_URL, dump, fixture_manaba
+
+
+class TestPoll(TestCase):
+    """
+    plan_poll がステータスランプから取得する一覧を決め、poll がその一覧と詳細情報のみを取得するかを調べる
+    """
+
+    def test_plan_poll(self) -> None:
+        with ManabaStandInServer(courses=8) as server:
+            metrics = ManabaMetrics()
+            client = Manaba(server.base_url, "html.parser", observers=[metrics])
+            self.assertTrue(client.login("standin", "standin"))
+            targets = client.plan_poll()
+        # スタンドインサーバーはコース ID の各ビットを news, deadline, grad, thread, individual ランプとして表示する
+        self.assertEqual([
+            (1001, ["threads", "news_list"]),
+            (1002, ["querys", "surveys", "reports", "threads"]),
+            (1003, ["querys", "surveys", "reports", "threads", "news_list"]),
+            (1004, ["querys", "reports", "threads"]),
+            (1005, ["querys", "reports", "threads", "news_list"]),
+            (1006, ["querys", "surveys", "reports", "threads"]),
+            (1007, ["querys", "surveys", "reports", "threads", "news_list"]),
+        ], [(target.course_id, target.kinds) for target in targets])
+        self.assertEqual(["get_courses"], metrics.endpoints)
+        self.assertEqual(1, (metrics.endpoint("get_courses") or self.fail()).requests)
+
+    def test_plan_poll_course_ids(self) -> None:
+        with ManabaStandInServer(courses=8) as server:
+            client = Manaba(server.base_url, "html.parser")
+            self.assertTrue(client.login("standin", "standin"))
+            # 1008 は個人ランプのみ点いているため対象としない
+            targets = client.plan_poll([1001, 1008])
+        self.assertEqual([1001], [target.course_id for target in targets])
+
+    def test_poll(self) -> None:
+        with ManabaStandInServer(courses=8, querys=2, surveys=2, reports=2, threads=2, news=2) as server:
+            metrics = ManabaMetrics()
+            client = Manaba(server.base_url, "html.parser", observers=[metrics])
+            self.assertTrue(client.login("standin", "standin"))
+            snapshots = client.poll(max_workers=4)
+            expected = client.snapshot_course(1003, max_workers=4)
+
+        self.assertEqual(list(range(1001, 1008)), [snapshot.course_id for snapshot in snapshots])
+        for snapshot in snapshots:
+            self.assertIsNone(snapshot.course)
+            self.assertEqual([], snapshot.contents)
+            self.assertEqual([], snapshot.errors)
+        self.assertEqual(([], [], []), (snapshots[0].querys, snapshots[0].surveys, snapshots[0].reports))
+        self.assertEqual([], snapshots[3].surveys)
+        self.assertEqual(dump(expected.querys), dump(snapshots[2].querys))
+        self.assertEqual(dump(expected.threads), dump(snapshots[2].threads))
+        self.assertEqual(dump(expected.news), dump(snapshots[2].news))
+
+        # 一覧はランプが点いているコースのみ取得する (snapshot_course の 1 コース分を除く)
+        requests = {endpoint: (metrics.endpoint(endpoint) or self.fail()).requests for endpoint in metrics.endpoints}
+        self.assertEqual(1, requests["get_courses"])
+        self.assertEqual(6 + 1, requests["get_querys"])
+        self.assertEqual(4 + 1, requests["get_surveys"])
+        self.assertEqual(7 + 1, requests["get_threads"])
+        self.assertEqual(4 + 1, requests["get_news_list"])
+        self.assertEqual(1, requests["get_contents"])
+
+    def test_snapshot_kinds(self) -> None:
+        client = fixture_manaba("html.parser")
+        snapshot = client.snapshot_course(1001, kinds=["reports"])
+        self.assertIsNone(snapshot.course)
+        self.assertEqual(([], [], []), (snapshot.querys, snapshot.threads, snapshot.news))
+        self.assertEqual([dump(client.get_report(1001, 2001)), dump(client.get_report(1001, 2002))],
+                         dump(snapshot.reports))
+        self.assertEqual([("report", 2003)], [(error.kind, error.item_id) for error in snapshot.errors])
+
+        with self.assertRaises(ValueError):
+            client.snapshot_course(1001, kinds=["files"])
+
+    def test_poll_errors(self) -> None:
+        client = fixture_manaba("html.parser")
+        course = ManabaCourse("コース", 1001, None, None, None, None)
+        snapshots = client.poll([ManabaPollTarget(course, ["threads"])])
+        self.assertEqual([dump(client.get_thread(1001, 3001))], dump(snapshots[0].threads))
+        self.assertEqual([("thread", 3002)], [(error.kind, error.item_id) for error in snapshots[0].errors])
+
+    def test_not_logged_in(self) -> None:
+        self.assertRaises(manaba.ManabaNotLoggedIn, Manaba(BASE_URL).poll, [])
@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import cast
+from unittest import TestCase
+from unittest.mock import patch
+
+from manaba import Manaba, ManabaCourse, ManabaNotFound, ManabaNotLoggedIn
+from manaba.models.ManabaTrace import ManabaTrace
+from manaba.pool import ManabaPool
+from manaba.standin import ManabaStandInServer
+
+
+def max_overlap(traces: list[ManabaTrace]) -> int:
+    """
+    同時に実行していたリクエスト数の最大値
+    """
+    edges = sorted([(trace.started_at.timestamp(), 1) for trace in traces] +
+                   [(trace.started_at.timestamp() + trace.elapsed, -1) for trace in traces])
+    current = peak = 0
+    for _, edge in edges:
+        current += edge
+        peak = max(peak, current)
+    return peak
+
+
+class TestManabaPool(TestCase):
+    """
+    ManabaPool が複数のアカウントでログインし、処理を公平に実行するかを調べる
+    """
+
+    def test_login_all(self) -> None:
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        login = Manaba.login
+
+        def counting_login(client: Manaba, username: str, password: str) -> bool:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            try:
+                time.sleep(0.02)
+                return login(client, username, password)
+            finally:
+                with lock:
+                    active -= 1
+
+        with ManabaStandInServer() as server, ManabaPool(server.base_url, "html.parser", login_concurrency=2) as pool:
+            for index in range(6):
+                pool.add_account("student%d" % index, "password")
+            with patch.object(Manaba, "login", counting_login):
+                self.assertEqual({"student%d" % index: True for index in range(6)}, pool.login_all())
+            self.assertEqual(2, peak)
+
+            with self.assertRaises(ValueError):
+                pool.add_account("student0", "password")
+
+    def test_login_interval(self) -> None:
+        with ManabaStandInServer() as server, ManabaPool(server.base_url, login_interval=0.05) as pool:
+            for index in range(3):
+                pool.add_account("student%d" % index, "password")
+            start = time.monotonic()
+            self.assertTrue(all(pool.login_all().values()))
+            self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+    def test_submit(self) -> None:
+        with ManabaStandInServer(courses=3) as server, ManabaPool(server.base_url, "html.parser") as pool:
+            pool.add_account("alice", "password")
+            pool.add_account("bob", "password")
+            pool.add_account("carol", "password")
+            self.assertTrue(pool.login("alice"))
+            self.assertTrue(pool.login("bob"))
+
+            courses = list(pool.map([("alice", "get_course", (1001,)), ("bob", "get_course", (1003,))]))
+            self.assertEqual(["コース 1001", "コース 1003"], [cast(ManabaCourse, course).name for course in courses])
+            self.assertEqual(3, len(cast(list[ManabaCourse], pool.submit("bob", "get_courses").result())))
+            with self.assertRaises(ManabaNotFound):
+                pool.submit("alice", "get_course", 9999).result()
+            with self.assertRaises(ManabaNotLoggedIn):
+                pool.submit("carol", "get_course", 1001).result()
+
+            with self.assertRaises(ValueError):
+                pool.submit("dave", "get_course", 1001)
+            with self.assertRaises(ValueError):
+                pool.submit("alice", "_get", "https://example.com")
+            with self.assertRaises(ValueError):
+                pool.submit("alice", "no_such_method")
+
+        with self.assertRaises(RuntimeError):
+            pool.submit("alice", "get_course", 1001)
+
+    def test_fairness(self) -> None:
+        with ManabaStandInServer(latency=0.02) as server, \
+                ManabaPool(server.base_url, "html.parser", max_workers=2, per_account=1) as pool:
+            pool.add_account("heavy", "password")
+            pool.add_account("light", "password")
+            self.assertTrue(all(pool.login_all().values()))
+            pool.client("heavy").trace.clear()
+            pool.client("light").trace.clear()
+
+            heavy = [pool.submit("heavy", "get_course", 1001) for _ in range(12)]
+            light = [pool.submit("light", "get_course", 1001) for _ in range(2)]
+            for future in heavy + light:
+                future.result()
+
+            heavy_traces = pool.client("heavy").trace.query()
+            light_traces = pool.client("light").trace.query()
+            # light の処理は heavy の待ち行列が空くのを待たずに実行される
+            self.assertLess(light_traces[-1].started_at, heavy_traces[4].started_at)
+            self.assertEqual(1, max_overlap(heavy_traces))
+
+    def test_per_account(self) -> None:
+        with ManabaStandInServer(courses=12, latency=0.02) as server, \
+                ManabaPool(server.base_url, "html.parser", max_workers=8, per_account=3) as pool:
+            pool.add_account("student", "password")
+            self.assertTrue(pool.login("student"))
+            pool.client("student").trace.clear()
+            for future in [pool.submit("student", "get_course", course_id) for course_id in range(1001, 1013)]:
+                future.result()
+            self.assertIn(max_overlap(pool.client("student").trace.query()), [2, 3])
+
+    def test_shared_transport(self) -> None:
+        pool = ManabaPool("https://manaba.example.com")
+        first = pool.add_account("alice", "password")
+        second = pool.add_account("bob", "password")
+        self.assertIs(first.session.get_adapter("https://manaba.example.com/ct/home"),
+                      second.session.get_adapter("https://manaba.example.com/ct/home"))
+        pool.close()
+
+        with self.assertRaises(ValueError):
+            ManabaPool("https://manaba.example.com", per_account=0)
@@ -0,0 +1,104 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from unittest import TestCase, skipIf
+
+from manaba import Manaba
+from manaba.ratelimit import ManabaRateLimiter
+from manaba.test_conformance import BASE_URL, FixtureAdapter
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+def acquire_times(path: str,
+                  count: int,
+                  start_at: float) -> list[float]:
+    """
+    状態ファイルを共有するレートリミッターで count 回リクエストを送信できるまで待ち、その時刻を返す (別プロセスで実行する)
+    """
+    limiter = ManabaRateLimiter(20, 1, path=path)
+    time.sleep(max(start_at - time.time(), 0))
+    times = []
+    for _ in range(count):
+        limiter.acquire("manaba.example.com")
+        times.append(time.time())
+    return times
+
+
+class TestRateLimiter(TestCase):
+    """
+    ManabaRateLimiter がホストごとにリクエストを制限するかを調べる
+    """
+
+    def test_burst(self) -> None:
+        limiter = ManabaRateLimiter(20, 3)
+        start = time.monotonic()
+        for _ in range(3):
+            self.assertEqual(0, limiter.acquire("manaba.example.com"))
+        self.assertLess(time.monotonic() - start, 0.05)
+        for _ in range(4):
+            limiter.acquire("manaba.example.com")
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    def test_hosts(self) -> None:
+        limiter = ManabaRateLimiter(1000, 1, hosts={"slow.example.com": (5, 2)})
+        self.assertEqual((5, 2), limiter.limit("slow.example.com"))
+        self.assertEqual((1000, 1), limiter.limit("fast.example.com"))
+        self.assertEqual(0, limiter.reserve("slow.example.com"))
+        self.assertEqual(0, limiter.reserve("slow.example.com"))
+        self.assertAlmostEqual(0.2, limiter.reserve("slow.example.com"), places=2)
+        self.assertAlmostEqual(0.4, limiter.reserve("slow.example.com"), places=2)
+        self.assertEqual(0, limiter.reserve("fast.example.com"))
+
+    def test_threads(self) -> None:
+        limiter = ManabaRateLimiter(50, 1)
+        times: list[float] = []
+        lock = threading.Lock()
+
+        def run() -> None:
+            for _ in range(3):
+                limiter.acquire("manaba.example.com")
+                with lock:
+                    times.append(time.monotonic())
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(12, len(times))
+        self.assertGreaterEqual(max(times) - start, 11 / 50 - 0.01)
+
+    @skipIf(fcntl is None, "fcntl is not available")
+    def test_processes(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ratelimit.json")
+            start_at = time.time() + 2
+            with multiprocessing.get_context("spawn").Pool(2) as pool:
+                results = pool.starmap(acquire_times, [(path, 5, start_at), (path, 5, start_at)])
+        times = sorted(results[0] + results[1])
+        # 同時に開始した 2 プロセス合計で、1 秒あたり 20 リクエスト (0.05 秒間隔) に制限される
+        self.assertGreater(min(b - a for a, b in zip(times, times[1:])), 0.03)
+
+    def test_manaba(self) -> None:
+        client = Manaba(BASE_URL, "html.parser", rate_limiter=ManabaRateLimiter(20, 1))
+        client.session.mount(BASE_URL, FixtureAdapter())
+        start = time.monotonic()
+        self.assertTrue(client.login("fixture", "fixture"))
+        for _ in range(3):
+            client.get_course(1001)
+        self.assertGreaterEqual(time.monotonic() - start, 4 / 20 - 0.01)
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            ManabaRateLimiter(0)
+        with self.assertRaises(ValueError):
+            ManabaRateLimiter(1, 0)
+        with self.assertRaises(ValueError):
+            ManabaRateLimiter(1, hosts={"manaba.example.com": (-1, 1)})
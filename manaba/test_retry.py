@@ -0,0 +1,90 @@
+from typing import Mapping, Optional
+from unittest import TestCase
+from urllib.parse import urlparse
+
+import requests
+from requests import PreparedRequest, Response
+
+import manaba
+from manaba import Manaba, ManabaRetryPolicy
+from manaba.test_cache import CountingAdapter
+from manaba.test_conformance import BASE_URL
+
+
+class FlakyAdapter(CountingAdapter):
+    """
+    指定したパスへの最初の数回のリクエストを失敗させるフィクスチャーアダプター
+    """
+
+    def __init__(self,
+                 failures: Mapping[str, list[str]],
+                 overrides: Optional[Mapping[str, str]] = None) -> None:
+        super().__init__(overrides)
+        # パス -> 失敗のさせ方 ("503", "connection", "expired") の一覧
+        self.failures = {path: list(kinds) for path, kinds in failures.items()}
+
+    def send(self,  # type: ignore[override] # pylint: disable=arguments-differ
+             request: PreparedRequest,
+             **kwargs: object) -> Response:
+        kinds = self.failures.get(urlparse(str(request.url)).path)
+        if request.method == "GET" and kinds:
+            kind = kinds.pop(0)
+            if kind == "connection":
+                self.requests.append(request)
+                raise requests.ConnectionError("connection reset")
+            path = "/ct/login" if kind == "expired" else "/ct/unavailable"
+            redirected = request.copy()
+            redirected.prepare_url(BASE_URL + path, None)
+            response = super().send(redirected, **kwargs)
+            response.status_code = 503 if kind == "503" else 200
+            return response
+        return super().send(request, **kwargs)
+
+
+def flaky_manaba(failures: Mapping[str, list[str]],
+                 retry: Optional[ManabaRetryPolicy]) -> tuple[Manaba, FlakyAdapter]:
+    client = Manaba(BASE_URL, retry=retry)
+    adapter = FlakyAdapter(failures)
+    client.session.mount(BASE_URL, adapter)
+    if not client.login("fixture", "fixture"):
+        raise AssertionError("fixture login failed")
+    adapter.requests.clear()
+    return client, adapter
+
+
+class TestRetry(TestCase):
+    def test_transient_errors(self) -> None:
+        client, adapter = flaky_manaba({"/ct/course_1001": ["503", "connection", "503"]},
+                                       ManabaRetryPolicy(backoff=0))
+        self.assertEqual(1001, client.get_course(1001).course_id)
+        self.assertEqual(4, len(adapter.requests))
+
+    def test_give_up(self) -> None:
+        client, _ = flaky_manaba({"/ct/course_1001": ["503", "503"]}, ManabaRetryPolicy(max_retries=1, backoff=0))
+        self.assertRaises(requests.HTTPError, client.get_course, 1001)
+
+        client, _ = flaky_manaba({"/ct/course_1001": ["503"]}, None)
+        self.assertRaises(requests.HTTPError, client.get_course, 1001)
+
+    def test_relogin(self) -> None:
+        client, adapter = flaky_manaba({"/ct/course_1001": ["expired"]}, ManabaRetryPolicy(backoff=0))
+        self.assertEqual(1001, client.get_course(1001).course_id)
+        # セッション切れ (ログインページ) -> 再ログイン (GET, POST, リダイレクト) -> 再試行
+        self.assertEqual([("GET", "/ct/login"), ("GET", "/ct/login"), ("POST", "/ct/login"), ("GET", "/ct/home"),
+                          ("GET", "/ct/course_1001")],
+                         [(request.method, urlparse(str(request.url)).path) for request in adapter.requests])
+
+        # 再ログインしても解決しない場合は、ログインしていない状態になる
+        client, _ = flaky_manaba({"/ct/course_1001": ["expired", "expired"]}, ManabaRetryPolicy(backoff=0))
+        self.assertRaises(manaba.ManabaNotLoggedIn, client.get_course, 1001)
+        self.assertRaises(manaba.ManabaNotLoggedIn, client.get_course, 1001)
+
+    def test_expired_without_retry(self) -> None:
+        client, _ = flaky_manaba({"/ct/course_1001": ["expired"]}, None)
+        self.assertRaises(manaba.ManabaNotLoggedIn, client.get_course, 1001)
+
+    def test_retry_after(self) -> None:
+        response = Response()
+        response.headers["Retry-After"] = "120"
+        self.assertEqual(30.0, ManabaRetryPolicy().delay(0, response))
+        self.assertLessEqual(ManabaRetryPolicy(backoff=1).delay(2), 4)
@@ -0,0 +1,59 @@
+import os
+import stat
+import tempfile
+from unittest import TestCase
+
+import manaba
+from manaba import Manaba
+from manaba.test_cache import CountingAdapter
+from manaba.test_conformance import BASE_URL, fixture_manaba
+
+
+class TestSession(TestCase):
+    """
+    save_session / load_session でログイン状態を復元できるかを調べる
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def restored(self,
+                 overrides: dict[str, str]) -> tuple[Manaba, CountingAdapter]:
+        client = Manaba(BASE_URL)
+        adapter = CountingAdapter(overrides)
+        client.session.mount(BASE_URL, adapter)
+        return client, adapter
+
+    def test_save_load(self) -> None:
+        client = fixture_manaba("html5lib")
+        client.session.cookies.set("sessionid", "fixture-session", domain="manaba.example.com", path="/")
+        client.save_session(self.path)
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.path).st_mode))
+
+        restored, adapter = self.restored({})
+        self.assertTrue(restored.load_session(self.path, verify=False))
+        self.assertEqual([], adapter.requests)
+        self.assertEqual("fixture-session", restored.session.cookies.get("sessionid"))
+        self.assertEqual(1001, restored.get_course(1001).course_id)
+
+        restored, adapter = self.restored({})
+        self.assertTrue(restored.load_session(self.path))
+        self.assertEqual(["/ct/home_course"], [request.path_url for request in adapter.requests])
+        self.assertEqual("sessionid=fixture-session", adapter.requests[0].headers["Cookie"])
+
+    def test_expired(self) -> None:
+        fixture_manaba("html5lib").save_session(self.path)
+        restored, _ = self.restored({"/ct/home_course": "login.html"})
+        self.assertFalse(restored.load_session(self.path))
+        self.assertRaises(manaba.ManabaNotLoggedIn, restored.get_course, 1001)
+
+    def test_missing(self) -> None:
+        client, adapter = self.restored({})
+        self.assertFalse(client.load_session(self.path))
+        self.assertRaises(manaba.ManabaNotLoggedIn, client.save_session, self.path)
+        self.assertFalse(client.is_session_valid())
+        self.assertEqual([], adapter.requests)
@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from manaba import Manaba, ManabaNotFound
+from manaba.standin import ManabaStandInServer
+
+
+class TestSingleFlight(TestCase):
+    """
+    複数のスレッドが同時に同じページを取得する場合に、リクエスト・パースが 1 回にまとめられるかを調べる
+    """
+
+    def fetch_concurrently(self,
+                           client: Manaba,
+                           method: str,
+                           *args: object) -> list[object]:
+        barrier = threading.Barrier(8)
+
+        def fetch(_: int) -> object:
+            barrier.wait()
+            try:
+                return getattr(client, method)(*args)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(executor.map(fetch, range(8)))
+
+    def test_coalesced(self) -> None:
+        with ManabaStandInServer(reports=5, latency=0.2) as server:
+            client = Manaba(server.base_url, "html.parser")
+            self.assertTrue(client.login("standin", "standin"))
+            requests = server.requests
+
+            results = self.fetch_concurrently(client, "get_reports", 1001)
+            self.assertEqual(requests + 1, server.requests)
+            self.assertTrue(all(result is results[0] for result in results))
+            self.assertEqual(5, len(results[0]))  # type: ignore[arg-type]
+
+            # 取得が終わった後の呼び出しはまとめない
+            self.assertIsNot(results[0], client.get_reports(1001))
+            self.assertEqual(requests + 2, server.requests)
+
+    def test_error(self) -> None:
+        with ManabaStandInServer(courses=1, latency=0.2) as server:
+            client = Manaba(server.base_url, "html.parser")
+            self.assertTrue(client.login("standin", "standin"))
+            requests = server.requests
+
+            results = self.fetch_concurrently(client, "get_course", 1002)
+            self.assertEqual(requests + 1, server.requests)
+            self.assertTrue(all(isinstance(result, ManabaNotFound) for result in results))
+
+    def test_disabled(self) -> None:
+        with ManabaStandInServer(latency=0.2) as server:
+            client = Manaba(server.base_url, "html.parser", single_flight=False)
+            self.assertTrue(client.login("standin", "standin"))
+            requests = server.requests
+
+            self.fetch_concurrently(client, "get_course", 1001)
+            self.assertEqual(requests + 8, server.requests)
@@ -0,0 +1,42 @@
+from unittest import TestCase
+
+import manaba
+from manaba import Manaba
+from manaba.test_conformance import BASE_URL, dump, fixture_manaba
+
+
+class TestSnapshotCourse(TestCase):
+    """
+    snapshot_course が個別に取得した結果と同じモデルを返し、取得に失敗した項目を記録するかを調べる
+    """
+
+    def test_snapshot_course(self) -> None:
+        client = fixture_manaba("html5lib")
+        snapshot = client.snapshot_course(1001, max_workers=4)
+
+        self.assertEqual(dump(client.get_course(1001)), dump(snapshot.course))
+        self.assertEqual([dump(client.get_query(1001, 2001)), dump(client.get_drill(1001, 2003))],
+                         dump(snapshot.querys))
+        self.assertEqual([dump(client.get_report(1001, 2001)), dump(client.get_report(1001, 2002))],
+                         dump(snapshot.reports))
+        self.assertEqual([dump(client.get_thread(1001, 3001))], dump(snapshot.threads))
+        self.assertEqual([dump(client.get_news(1001, 4002)), dump(client.get_news(1001, 4001))], dump(snapshot.news))
+        self.assertEqual(["abc123"], [content.content_id for content in snapshot.contents])
+        self.assertEqual([dump(client.get_content_page("abc123", 5001))], dump(snapshot.contents[0].pages))
+
+        # フィクスチャーのない詳細ページは ManabaNotFound として記録される
+        self.assertEqual({("query", 2002), ("survey", 2002), ("survey", 2003), ("report", 2003), ("thread", 3002),
+                          ("content_pages", "def456"), ("content_page", 5002)},
+                         {(error.kind, error.item_id) for error in snapshot.errors})
+        for error in snapshot.errors:
+            self.assertIsInstance(error.error, manaba.ManabaNotFound)
+
+    def test_list_error(self) -> None:
+        client = fixture_manaba("html5lib", {"/ct/course_1001_report": "missing.html"})
+        snapshot = client.snapshot_course(1001)
+        self.assertEqual([], snapshot.reports)
+        self.assertIn(("reports", None), [(error.kind, error.item_id) for error in snapshot.errors])
+        self.assertEqual(2, len(snapshot.news))
+
+    def test_not_logged_in(self) -> None:
+        self.assertRaises(manaba.ManabaNotLoggedIn, Manaba(BASE_URL).snapshot_course, 1001)
@@ -0,0 +1,208 @@
+import asyncio
+import os
+import tempfile
+import time
+from unittest import TestCase, skipIf
+
+import requests
+
+import manaba
+from manaba import Manaba, ManabaCache, ManabaDownloadStatus, ManabaNotFound, ManabaNotLoggedIn, ManabaRetryPolicy
+from manaba.standin import ManabaStandInServer
+
+try:
+    from manaba.aio import AsyncManaba
+except ImportError:  # aiohttp がインストールされていない
+    AsyncManaba = None  # type: ignore[assignment,misc]
+
+
+class TestStandInServer(TestCase):
+    """
+    ManabaStandInServer が指定したデータ量のページを、パーサーが想定するマークアップで返すかを調べる
+    """
+
+    def test_pages(self) -> None:
+        with ManabaStandInServer(courses=5, querys=4, surveys=2, reports=3, threads=2, comments=120, news=30,
+                                 contents=2, pages=4) as server:
+            client = Manaba(server.base_url, "html.parser")
+            self.assertTrue(client.login("standin", "standin"))
+
+            self.assertEqual([1001, 1002, 1003, 1004, 1005], [course.course_id for course in client.get_courses()])
+            self.assertEqual(5, len(client.get_courses_all()))
+            for list_format in ["thumbnail", "list", "timetable"]:
+                markup = server.render("home_course", {"chglistformat": [list_format]})
+                assert markup is not None
+                with self.subTest(list_format=list_format):
+                    self.assertEqual(5, len(manaba.parsers.parse_courses(markup, "html.parser")))
+            self.assertEqual("コース 1003", client.get_course(1003).name)
+
+            querys = client.get_querys(1001)
+            self.assertEqual([False, False, False, True], [query.is_drill for query in querys])
+            self.assertEqual("query 2", client.get_query(1001, 2002).title)
+            self.assertEqual("drill 4", client.get_drill(1001, 2004).title)
+            self.assertEqual(2, len(client.get_surveys(1001)))
+            self.assertEqual("survey 2", client.get_survey(1001, 2002).title)
+            self.assertEqual(3, len(client.get_reports(1001)))
+            self.assertEqual("report 3", client.get_report(1001, 2003).title)
+
+            self.assertEqual(2, len(client.get_threads(1001)))
+            thread = client.get_thread(1001, 3002)
+            self.assertEqual(list(range(1, 121)), [comment.comment_id for comment in thread.comments or []])
+            self.assertEqual(list(range(120, 0, -1)),
+                             [comment.comment_id for comment in client.iter_thread_comments(1001, 3002)])
+            self.assertEqual(120, len(list(client.stream_thread(1001, 3002))))
+
+            self.assertEqual(list(range(4030, 4000, -1)), [news.news_id for news in client.iter_news(1001, page_size=7)])
+            self.assertEqual("ニュース 7", client.get_news(1001, 4007).title)
+
+            contents = client.get_contents(1002)
+            self.assertEqual(["c1002n1", "c1002n2"], [content.content_id for content in contents])
+            self.assertEqual(4, len(client.get_content_pages("c1002n2")))
+            page = client.get_content_page("c1002n2", 5003)
+            self.assertEqual("ページ 3", page.title)
+            self.assertEqual(1, len(page.files or []))
+
+    def test_not_found(self) -> None:
+        with ManabaStandInServer(courses=1) as server:
+            client = Manaba(server.base_url)
+            self.assertTrue(client.login("standin", "standin"))
+            for method, args in [("get_course", (1002,)), ("get_report", (1001, 2004)), ("get_drill", (1001, 2001)),
+                                 ("get_news", (1001, 4021)), ("get_content_page", ("c1001n1", 5004))]:
+                with self.subTest(method=method), self.assertRaises(ManabaNotFound):
+                    getattr(client, method)(*args)
+
+    def test_session(self) -> None:
+        with ManabaStandInServer() as server:
+            response = requests.get(server.base_url + "/ct/home_course")
+            self.assertEqual("/ct/login", response.url[len(server.base_url):])
+
+    def test_errors(self) -> None:
+        with ManabaStandInServer(error_rate=1, error_status=503) as server:
+            client = Manaba(server.base_url)
+            self.assertTrue(client.login("standin", "standin"))
+            with self.assertRaises(requests.HTTPError):
+                client.get_courses()
+            self.assertEqual(1, server.errors)
+
+        with ManabaStandInServer(error_rate=0.5, seed=1) as server:
+            client = Manaba(server.base_url, retry=ManabaRetryPolicy(max_retries=20, backoff=0))
+            self.assertTrue(client.login("standin", "standin"))
+            for course_id in range(1001, 1011):
+                client.get_course(course_id)
+            self.assertGreater(server.errors, 0)
+            self.assertEqual(server.requests - server.errors, 10 + 3)
+
+    def test_headers(self) -> None:
+        with ManabaStandInServer(file_size=100) as server:
+            session = requests.Session()
+            session.cookies.set("sessionid", "standin")
+            page = session.get(server.base_url + "/ct/home_course")
+            file = session.get(server.base_url + "/ct/file_5001/page1.pdf")
+        self.assertEqual("text/html; charset=UTF-8", page.headers["Content-Type"])
+        self.assertEqual("application/octet-stream", file.headers["Content-Type"])
+        self.assertEqual(100, len(file.content))
+
+    def test_validators(self) -> None:
+        with ManabaStandInServer(threads=1, comments=3, file_size=100) as server:
+            session = requests.Session()
+            session.cookies.set("sessionid", "standin")
+            url = server.base_url + "/ct/course_1001_topics_3001_tflat"
+            response = session.get(url)
+            etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+            self.assertEqual((etag, last_modified),
+                             (session.get(url).headers["ETag"], session.get(url).headers["Last-Modified"]))
+            self.assertEqual(304, session.get(url, headers={"If-None-Match": etag}).status_code)
+            self.assertEqual(304, session.get(url, headers={"If-Modified-Since": last_modified}).status_code)
+
+            # 内容が変わると検証子も変わる
+            server.comments = 4
+            self.assertEqual(200, session.get(url, headers={"If-None-Match": etag}).status_code)
+            self.assertEqual(200, session.get(url, headers={"If-Modified-Since": last_modified}).status_code)
+
+            file_url = server.base_url + "/ct/file_5001/page1.pdf"
+            file_etag = session.get(file_url).headers["ETag"]
+            response = session.get(file_url, headers={"Range": "bytes=40-", "If-Range": file_etag})
+            self.assertEqual((206, "bytes 40-99/100", 60),
+                             (response.status_code, response.headers["Content-Range"], len(response.content)))
+            response = session.get(file_url, headers={"Range": "bytes=40-", "If-Range": '"other"'})
+            self.assertEqual((200, 100), (response.status_code, len(response.content)))
+            response = session.get(file_url, headers={"Range": "bytes=100-", "If-Range": file_etag})
+            self.assertEqual(416, response.status_code)
+
+    def test_revalidate_and_resume(self) -> None:
+        with ManabaStandInServer(threads=1, comments=3, file_size=100) as server, \
+                tempfile.TemporaryDirectory() as directory:
+            cache = ManabaCache()
+            client = Manaba(server.base_url, cache=cache)
+            self.assertTrue(client.login("standin", "standin"))
+            client.get_thread(1001, 3001)
+            client.get_thread(1001, 3001)
+            self.assertEqual((1, 1), (cache.hits, cache.misses))
+            server.comments = 4
+            self.assertEqual(4, len(client.get_thread(1001, 3001).comments or []))
+            self.assertEqual((1, 2), (cache.hits, cache.misses))
+
+            files = client.get_content_page("c1001n1", 5001).files
+            path = os.path.join(directory, files[0].name)
+            with open(path + ".part", "wb") as f:
+                f.write(b"\0" * 40)
+            with open(path + ".part.validator", "w", encoding="utf-8") as f:
+                f.write(requests.head(files[0].download_url, cookies={"sessionid": "standin"}).headers["ETag"])
+            results = client.download_files(files, directory)
+            self.assertEqual((ManabaDownloadStatus.RESUMED, 60), (results[0].status, results[0].downloaded_bytes))
+            self.assertEqual(100, os.path.getsize(path))
+
+    def test_latency(self) -> None:
+        with ManabaStandInServer(latency=0.05) as server:
+            client = Manaba(server.base_url)
+            self.assertTrue(client.login("standin", "standin"))
+            start = time.monotonic()
+            for _ in range(3):
+                client.get_course(1001)
+            self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    @skipIf(AsyncManaba is None, "aiohttp is not installed")
+    def test_async(self) -> None:
+        async def run(base_url: str) -> list[int]:
+            async with AsyncManaba(base_url, "html.parser") as client:
+                self.assertTrue(await client.login("standin", "standin"))
+                threads = await asyncio.gather(*[client.get_thread(course_id, 3001) for course_id in range(1001, 1021)])
+                return [len(thread.comments or []) for thread in threads]
+
+        with ManabaStandInServer(courses=20, comments=50) as server:
+            self.assertEqual([50] * 20, asyncio.run(run(server.base_url)))
+
+    @skipIf(AsyncManaba is None, "aiohttp is not installed")
+    def test_async_session_expired(self) -> None:
+        async def run(base_url: str) -> None:
+            async with AsyncManaba(base_url, "html.parser") as client:
+                self.assertTrue(await client.login("standin", "standin"))
+                self.assertEqual("コース 1001", (await client.get_course(1001)).name)
+                # セッション切れ: ログインページにリダイレクトされる
+                client.session.cookie_jar.clear()
+                with self.assertRaises(ManabaNotLoggedIn):
+                    await client.get_course(1001)
+                with self.assertRaises(ManabaNotLoggedIn):
+                    await client.get_course(1001)
+
+        with ManabaStandInServer(courses=1) as server:
+            asyncio.run(run(server.base_url))
+
+    @skipIf(AsyncManaba is None, "aiohttp is not installed")
+    def test_async_errors(self) -> None:
+        async def run(base_url: str) -> None:
+            async with AsyncManaba(base_url, "html.parser") as client:
+                self.assertTrue(await client.login("standin", "standin"))
+                with self.assertRaises(requests.HTTPError):
+                    await client.get_course(1001)
+
+        with ManabaStandInServer(courses=1, error_rate=1) as server:
+            asyncio.run(run(server.base_url))
+            base_url = server.base_url
+
+        async def closed() -> None:
+            async with AsyncManaba(base_url, "html.parser") as client:
+                with self.assertRaises(requests.ConnectionError):
+                    await client.login("standin", "standin")
+
+        asyncio.run(closed())
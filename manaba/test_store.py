@@ -0,0 +1,94 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from manaba import Manaba, ManabaCache, ManabaFetchEvent, ManabaThreadComment
+from manaba.standin import ManabaStandInServer
+from manaba.store import ManabaStore, fingerprint
+from manaba.test_cache import CountingAdapter, cached_manaba
+from manaba.test_conformance import dump, fixture_manaba
+
+
+class TestManabaStore(TestCase):
+    """
+    ManabaStore への保存と Manaba.sync の差分同期を調べる
+    """
+
+    def test_put_get(self) -> None:
+        client = fixture_manaba("html5lib")
+        thread = client.get_thread(1001, 3001)
+        assert thread.comments is not None
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "manaba.sqlite3")
+            with ManabaStore(path) as store:
+                for comment in thread.comments:
+                    store.put(1001, "thread_comment", "3001_" + str(comment.comment_id), comment)
+            with ManabaStore(path) as store:
+                self.assertEqual(dump(thread.comments), dump(store.items(1001, "thread_comment", "3001_")))
+                self.assertEqual(fingerprint(thread.comments[0]), store.get_fingerprint(1001, "thread_comment", "3001_1"))
+                stored = store.get(1001, "thread_comment", "3001_1")
+                assert isinstance(stored, ManabaThreadComment)
+                self.assertIs(stored, stored.files[0].parent)
+                self.assertIsNone(store.get(1001, "thread_comment", "3002_1"))
+
+    def test_sync(self) -> None:
+        adapter = CountingAdapter()
+        client = cached_manaba(ManabaCache(), adapter)
+        with ManabaStore(":memory:") as store:
+            result = client.sync(store, [1001])
+            self.assertIn((1001, "report", "2001"), result.updated)
+            self.assertIn((1001, "thread_comment", "3001_4"), result.updated)
+            self.assertIn((1001, "content_page", "abc123_5001"), result.updated)
+            self.assertIn(("report", 2003), [(error.kind, error.item_id) for error in result.errors])
+            self.assertEqual(dump(client.get_news(1001, 4001)), dump(store.get(1001, "news", 4001)))
+            self.assertNotIn(1002, [key[0] for key in store.keys()])
+
+            # 変更がなければ、一覧ページとスレッドの最新ページ以外は取得しない
+            adapter.requests.clear()
+            result = client.sync(store, [1001])
+            self.assertEqual([], result.updated)
+            paths = [str(request.path_url) for request in adapter.requests]
+            self.assertNotIn("/ct/course_1001_report_2001", paths)
+            self.assertNotIn("/ct/course_1001_news_4001", paths)
+            self.assertIn("/ct/course_1001_report", paths)
+
+            # 一覧ページの項目が変われば、その項目の詳細ページのみ取得する
+            adapter.overrides["/ct/course_1001_report"] = "course_1001_report_changed.html"
+            adapter.requests.clear()
+            result = client.sync(store, [1001])
+            self.assertEqual([(1001, "report", "2001")], result.updated)
+
+    def test_sync_content_page_error(self) -> None:
+        adapter = CountingAdapter()
+        client = cached_manaba(ManabaCache(), adapter)
+        with ManabaStore(":memory:") as store:
+            result = client.sync(store, [1001])
+            # ページ 5002 の取得に失敗したため、コンテンツは保存せず次回の同期で取得しなおす
+            self.assertIn(("content_page", "abc123_5002"), [(error.kind, error.item_id) for error in result.errors])
+            self.assertIsNone(store.get_fingerprint(1001, "content", "abc123"))
+
+            adapter.overrides["/ct/page_abc123_5002"] = "page_abc123_5001.html"
+            result = client.sync(store, [1001])
+            self.assertIn((1001, "content_page", "abc123_5002"), result.updated)
+            self.assertIn((1001, "content", "abc123"), result.updated)
+            self.assertIsNotNone(store.get_fingerprint(1001, "content", "abc123"))
+
+    def test_sync_thread_posted(self) -> None:
+        with ManabaStandInServer(courses=1, querys=0, surveys=0, reports=0, threads=1, comments=120, news=0,
+                                 contents=0) as server:
+            client = Manaba(server.base_url, "html.parser")
+            self.assertTrue(client.login("standin", "standin"))
+            posted: list[str] = []
+
+            def post(event: ManabaFetchEvent) -> None:
+                # スレッドの 1 ページ目を取得した直後にコメントが投稿され、2 ページ目以降の範囲が 1 件ずれる
+                if event.endpoint == "get_thread" and len(posted) == 0:
+                    posted.append(event.url)
+                    server.comments += 1
+
+            client.add_observer(post)
+            with ManabaStore(":memory:") as store:
+                client.sync(store, [1001])
+                comment_ids = [comment.comment_id for comment in store.items(1001, "thread_comment", "3001_")
+                               if isinstance(comment, ManabaThreadComment)]
+        self.assertEqual(list(range(1, 121)), sorted(comment_ids))
@@ -0,0 +1,104 @@
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from urllib.parse import urlparse
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+
+from manaba import Manaba, ManabaNotLoggedIn, ManabaRetryPolicy
+from manaba.standin import ManabaStandInServer
+from manaba.test_conformance import BASE_URL, FixtureAdapter
+from manaba.trace import ManabaTraceBuffer
+
+
+class TestThreadSafety(TestCase):
+    """
+    1 つの Manaba を複数のスレッドから同時に使用できるかを調べる
+    """
+
+    def test_shared_client(self) -> None:
+        with ManabaStandInServer(courses=16, comments=30, latency=0.01) as server:
+            client = Manaba(server.base_url, "html.parser", pool_size=4, trace=ManabaTraceBuffer(max_entries=1000))
+            self.assertTrue(client.login("standin", "standin"))
+            adapter = client.session.get_adapter(server.base_url)
+            assert isinstance(adapter, HTTPAdapter)
+            self.assertEqual(4, adapter._pool_maxsize)  # type: ignore[attr-defined]
+
+            course_ids = list(range(1001, 1017))
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                names = list(executor.map(lambda course_id: client.get_course(course_id).name, course_ids))
+                threads = list(executor.map(lambda course_id: client.get_thread(course_id, 3001), course_ids))
+
+            self.assertEqual(["コース %d" % course_id for course_id in course_ids], names)
+            self.assertEqual([list(range(1, 31))] * 16,
+                             [[comment.comment_id for comment in thread.comments or []] for thread in threads])
+            self.assertEqual(1, len([trace for trace in client.trace.query() if trace.method == "POST"]))
+
+    def test_concurrent_relogin(self) -> None:
+        with ManabaStandInServer(courses=8, latency=0.02) as server:
+            client = Manaba(server.base_url, "html.parser", retry=ManabaRetryPolicy(backoff=0), pool_size=8,
+                            trace=ManabaTraceBuffer(max_entries=1000))
+            self.assertTrue(client.login("standin", "standin"))
+            client.trace.clear()
+
+            # セッション切れ: すべてのスレッドがログインページにリダイレクトされる
+            client.session.cookies.clear()
+            course_ids = list(range(1001, 1009))
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                names = list(executor.map(lambda course_id: client.get_course(course_id).name, course_ids))
+
+            self.assertEqual(["コース %d" % course_id for course_id in course_ids], names)
+            self.assertEqual(1, len([trace for trace in client.trace.query() if trace.method == "POST"]))
+
+    def test_stream_thread_relogin(self) -> None:
+        client = Manaba(BASE_URL, "html.parser")
+
+        class ReloginAdapter(FixtureAdapter):
+            def send(self,  # type: ignore[override] # pylint: disable=arguments-differ
+                     request: PreparedRequest,
+                     **kwargs: object) -> Response:
+                if "/ct/course_1001_topics_3001" not in str(request.url):
+                    return super().send(request, **kwargs)
+                # 古いセッションでスレッドを取得している間に、他のスレッドが再ログインした
+                client.login("fixture", "fixture")
+                self.overrides[urlparse(str(request.url)).path] = "login.html"
+                return super().send(request, **kwargs)
+
+        client.session.mount(BASE_URL, ReloginAdapter())
+        self.assertTrue(client.login("fixture", "fixture"))
+        with self.assertRaises(ManabaNotLoggedIn):
+            list(client.stream_thread(1001, 3001))
+        # 再ログイン後のセッションは切れたものとしない
+        self.assertEqual(1001, client.get_course(1001).course_id)
+
+    def test_latest_per_thread(self) -> None:
+        client = Manaba(BASE_URL, "html.parser", keep_latest_response=True)
+        client.session.mount(BASE_URL, FixtureAdapter())
+        self.assertTrue(client.login("fixture", "fixture"))
+        barrier = threading.Barrier(2)
+
+        def fetch(path: str) -> tuple[str, str]:
+            if path == "/ct/course_1001":
+                client.get_course(1001)
+            else:
+                client.get_reports(1001)
+            # 両方のスレッドがリクエストを送信してから、最後のトレース・レスポンスを取得する
+            barrier.wait()
+            trace = client.get_latest_trace()
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                response = client.get_latest_response()
+            assert trace is not None and response is not None
+            return trace.url, str(response.url)
+
+        paths = ["/ct/course_1001", "/ct/course_1001_report"]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            latest = list(executor.map(fetch, paths))
+        self.assertEqual([(BASE_URL + path, BASE_URL + path) for path in paths], latest)
+        self.assertEqual(BASE_URL + "/ct/home", (client.get_latest_trace() or self.fail()).url)
+
+    def test_invalid_pool_size(self) -> None:
+        with self.assertRaises(ValueError):
+            Manaba("https://manaba.example.com", pool_size=0)
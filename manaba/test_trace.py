@@ -0,0 +1,173 @@
+import datetime
+import gc
+import io
+import threading
+import weakref
+from unittest import TestCase
+from urllib.parse import urlparse
+
+import requests
+from requests import PreparedRequest, Response
+from urllib3 import HTTPResponse
+
+from manaba import Manaba, ManabaNotFound, ManabaRetryPolicy
+from manaba.test_conformance import BASE_URL, FixtureAdapter, fixture_manaba, fixture_response
+from manaba.trace import ManabaTraceBuffer
+
+
+class FlakyAdapter(FixtureAdapter):
+    """
+    ログイン後の最初のリクエストで接続エラーを発生させるフィクスチャーアダプター
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.failed = False
+
+    def send(self,  # type: ignore[override] # pylint: disable=arguments-differ
+             request: PreparedRequest,
+             **kwargs: object) -> Response:
+        if not self.failed and "/ct/course_" in str(request.url):
+            self.failed = True
+            raise requests.ConnectionError("connection reset")
+        return super().send(request, **kwargs)
+
+
+class LargeAdapter(FixtureAdapter):
+    """
+    フィクスチャーの本文に 1 MiB のコメントを付けて返し、返したレスポンスへの弱参照を保持するアダプター
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.responses: list[weakref.ref[Response]] = []
+
+    def send(self,  # type: ignore[override] # pylint: disable=arguments-differ
+             request: PreparedRequest,
+             **kwargs: object) -> Response:
+        status, body, headers = fixture_response(str(request.method), urlparse(str(request.url)).path, self.overrides)
+        body += b"<!--" + b"x" * (1024 * 1024) + b"-->"
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status, preload_content=False)
+        response = self.build_response(request, raw)
+        self.responses.append(weakref.ref(response))
+        return response
+
+
+class TestTraceBuffer(TestCase):
+    """
+    ManabaTraceBuffer にリクエストが記録され、検索できるかを調べる
+    """
+
+    def test_ring(self) -> None:
+        client = Manaba(BASE_URL, "html.parser", trace=ManabaTraceBuffer(max_entries=3))
+        client.session.mount(BASE_URL, FixtureAdapter())
+        self.assertIsNone(client.get_latest_trace())
+        self.assertTrue(client.login("secret-user", "secret-password"))
+        for course_id in [1001, 1001, 1001]:
+            client.get_course(course_id)
+        client.get_reports(1001)
+
+        self.assertEqual(3, len(client.trace))
+        traces = client.trace.query()
+        self.assertEqual([BASE_URL + "/ct/course_1001"] * 2 + [BASE_URL + "/ct/course_1001_report"],
+                         [trace.url for trace in traces])
+        latest = client.get_latest_trace()
+        assert latest is not None
+        self.assertIs(traces[-1], latest)
+        self.assertEqual(("GET", 200, threading.current_thread().name), (latest.method, latest.status,
+                                                                         latest.thread_name))
+        self.assertGreater(latest.size or 0, 0)
+        self.assertIsNone(latest.body)
+        self.assertGreaterEqual(latest.elapsed, 0)
+
+    def test_latest_response(self) -> None:
+        client = Manaba(BASE_URL, "html.parser", keep_latest_response=True)
+        client.session.mount(BASE_URL, FixtureAdapter())
+        self.assertTrue(client.login("fixture", "fixture"))
+        client.get_course(1001)
+        with self.assertWarns(DeprecationWarning):
+            response = client.get_latest_response()
+        assert response is not None
+        self.assertEqual(200, response.status_code)
+        self.assertIn("coursename", response.text)
+        latest = client.get_latest_trace()
+        assert latest is not None
+        self.assertEqual(response.url, latest.url)
+
+        with self.assertWarns(DeprecationWarning):
+            self.assertIsNone(fixture_manaba("html.parser").get_latest_response())
+
+    def test_response_released(self) -> None:
+        for keep in [False, True]:
+            with self.subTest(keep_latest_response=keep):
+                adapter = LargeAdapter()
+                client = Manaba(BASE_URL, "html.parser", keep_latest_response=keep)
+                client.session.mount(BASE_URL, adapter)
+                self.assertTrue(client.login("fixture", "fixture"))
+                client.get_course(1001)
+                gc.collect()
+                alive = [ref() is not None for ref in adapter.responses]
+                self.assertEqual(keep, alive[-1])
+                self.assertEqual([False] * (len(alive) - 1), alive[:-1])
+
+    def test_scrubbed(self) -> None:
+        client = Manaba(BASE_URL, "html.parser")
+        client.session.mount(BASE_URL, FixtureAdapter())
+        self.assertTrue(client.login("secret-user", "secret-password"))
+        self.assertEqual(["GET", "POST"], [trace.method for trace in client.trace.query()])
+        for trace in client.trace.query():
+            self.assertNotIn("secret", trace.url)
+
+    def test_body(self) -> None:
+        for compress in [False, True]:
+            with self.subTest(compress=compress):
+                client = Manaba(BASE_URL, "html.parser", trace=ManabaTraceBuffer(body_limit=100, compress=compress))
+                client.session.mount(BASE_URL, FixtureAdapter())
+                self.assertTrue(client.login("fixture", "fixture"))
+                client.get_course(1001)
+                latest = client.get_latest_trace()
+                assert latest is not None
+                self.assertEqual(client.session.get(BASE_URL + "/ct/course_1001").content[:100], latest.body)
+                self.assertTrue(latest.body_truncated)
+
+        client = Manaba(BASE_URL, "html.parser", trace=ManabaTraceBuffer(body_limit=None))
+        client.session.mount(BASE_URL, FixtureAdapter())
+        self.assertTrue(client.login("fixture", "fixture"))
+        client.get_course(1001)
+        latest = client.get_latest_trace()
+        assert latest is not None
+        self.assertEqual(latest.size, len(latest.body or b""))
+        self.assertFalse(latest.body_truncated)
+
+    def test_stream(self) -> None:
+        client = fixture_manaba("html.parser")
+        client.trace.clear()
+        self.assertEqual(4, len(list(client.stream_thread(1001, 3001))))
+        latest = client.get_latest_trace()
+        assert latest is not None
+        self.assertIsNone(latest.body)
+        self.assertIn("/ct/course_1001_topics_3001", latest.url)
+
+    def test_query(self) -> None:
+        client = Manaba(BASE_URL, "html.parser", retry=ManabaRetryPolicy(max_retries=1, backoff=0))
+        client.session.mount(BASE_URL, FlakyAdapter())
+        self.assertTrue(client.login("fixture", "fixture"))
+        since = datetime.datetime.now(datetime.timezone.utc)
+        client.get_course(1001)
+        with self.assertRaises(ManabaNotFound):
+            client.get_course(9999)
+
+        errors = client.trace.query(errors=True)
+        self.assertEqual([None, 404], [trace.status for trace in errors])
+        self.assertIn("connection reset", errors[0].error or "")
+        self.assertEqual(3, len(client.trace.query(url=r"/ct/course_\d+$", since=since)))
+        self.assertEqual([BASE_URL + "/ct/course_1001"],
+                         [trace.url for trace in client.trace.query(status=200, url="course_")])
+        self.assertEqual(1, len(client.trace.query(limit=1)))
+        self.assertEqual([], client.trace.query(thread_name="no-such-thread"))
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            ManabaTraceBuffer(max_entries=-1)
+        with self.assertRaises(ValueError):
+            ManabaTraceBuffer(body_limit=-1)
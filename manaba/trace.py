@@ -0,0 +1,173 @@
+"""
+manaba リクエストトレース
+
+:class:`manaba.Manaba` が送信したリクエストを、上限件数までのリングバッファーに記録します。
+レスポンスそのものは保持せず、URL・ステータスコード・所要時間・サイズと、必要に応じてレスポンス本文の先頭の一部のみを保持します。
+"""
+import datetime
+import re
+import threading
+import zlib
+from collections import deque
+from typing import Optional
+
+from requests import Response
+
+from manaba.cassette import scrub_url
+from manaba.models.ManabaTrace import ManabaTrace
+from manaba.parsers import JST
+
+
+class ManabaTraceBuffer:
+    """
+    manaba リクエストトレースのリングバッファー
+
+    Notes:
+        max_entries 件を超えると、古いトレースから破棄します。
+        レスポンス本文は既定では保持しません。body_limit を指定すると、本文の先頭 body_limit バイトまでを保持します。
+        ログインの認証情報は URL から取り除いて記録します。
+        複数のスレッドから同時に記録・検索することができます。
+    """
+
+    def __init__(self,
+                 max_entries: int = 100,
+                 body_limit: Optional[int] = 0,
+                 compress: bool = False) -> None:
+        """
+        manaba リクエストトレースのリングバッファー
+
+        Args:
+            max_entries: 保持するトレースの最大件数 (0 の場合は記録しない)
+            body_limit: 保持するレスポンス本文の最大バイト数 (0 の場合は保持しない、None の場合は本文全体を保持する)
+            compress: 保持するレスポンス本文を zlib で圧縮するか
+
+        Raises:
+            ValueError: max_entries または body_limit が負の場合
+        """
+        if max_entries < 0 or (body_limit is not None and body_limit < 0):
+            raise ValueError("max_entries and body_limit must be 0 or more")
+
+        self.__body_limit = body_limit
+        self.__compress = compress
+        self.__traces: deque[ManabaTrace] = deque(maxlen=max_entries)
+        self.__lock = threading.Lock()
+
+    @property
+    def max_entries(self) -> int:
+        """
+        保持するトレースの最大件数
+
+        Returns:
+            int: 最大件数
+        """
+        return self.__traces.maxlen or 0
+
+    def record(self,
+               method: str,
+               url: str,
+               started: float,
+               elapsed: float,
+               response: Optional[Response] = None,
+               error: Optional[BaseException] = None,
+               stream: bool = False) -> Optional[ManabaTrace]:
+        """
+        リクエストのトレースを記録する
+
+        Args:
+            method: リクエストメソッド
+            url: リクエストの URL (response がある場合はレスポンスの URL を使用する)
+            started: リクエストを開始した時刻 (time.time() の値)
+            elapsed: リクエストの開始からレスポンスの受信までの秒数
+            response: レスポンス
+            error: レスポンスを受け取れなかった場合の例外
+            stream: レスポンス本文を読み込まずに返すリクエストか (True の場合は本文を保持しない)
+
+        Returns:
+            Optional[ManabaTrace]: 記録したトレース (max_entries が 0 の場合は None)
+        """
+        if self.max_entries == 0:
+            return None
+
+        status: Optional[int] = None
+        size: Optional[int] = None
+        body: Optional[bytes] = None
+        truncated = False
+        if response is not None:
+            url = str(response.url)
+            status = response.status_code
+            if not stream:
+                content = response.content or b""
+                size = len(content)
+                if self.__body_limit != 0:
+                    truncated = self.__body_limit is not None and size > self.__body_limit
+                    body = content[:self.__body_limit]
+                    if self.__compress:
+                        body = zlib.compress(body, 1)
+            elif response.headers.get("Content-Length", "").isdigit():
+                size = int(response.headers["Content-Length"])
+
+        trace = ManabaTrace(method, scrub_url(url), status, datetime.datetime.fromtimestamp(started, JST),
+                            elapsed, size, threading.current_thread().name, repr(error) if error is not None else None,
+                            body, truncated, body is not None and self.__compress)
+        with self.__lock:
+            self.__traces.append(trace)
+        return trace
+
+    @property
+    def latest(self) -> Optional[ManabaTrace]:
+        """
+        最後に記録したトレース
+
+        Returns:
+            Optional[ManabaTrace]: トレース (ない場合は None)
+        """
+        with self.__lock:
+            return self.__traces[-1] if len(self.__traces) != 0 else None
+
+    def query(self,
+              url: Optional[str] = None,
+              status: Optional[int] = None,
+              errors: bool = False,
+              min_elapsed: Optional[float] = None,
+              since: Optional[datetime.datetime] = None,
+              thread_name: Optional[str] = None,
+              limit: Optional[int] = None) -> list[ManabaTrace]:
+        """
+        トレースを検索する
+
+        Args:
+            url: URL に一致する正規表現 (re.search で検索する)
+            status: ステータスコード
+            errors: レスポンスを受け取れなかった、またはステータスコードが 400 以上のトレースのみを返すか
+            min_elapsed: 所要時間の下限の秒数
+            since: リクエストを開始した日時の下限
+            thread_name: リクエストしたスレッドの名前
+            limit: 返す最大件数 (新しいものから数える)
+
+        Returns:
+            list[ManabaTrace]: 条件に一致するトレース (古い順)
+        """
+        pattern = re.compile(url) if url is not None else None
+        with self.__lock:
+            traces = list(self.__traces)
+        results = [trace for trace in traces if
+                   (pattern is None or pattern.search(trace.url) is not None) and
+                   (status is None or trace.status == status) and
+                   (not errors or trace.status is None or trace.status >= 400) and
+                   (min_elapsed is None or trace.elapsed >= min_elapsed) and
+                   (since is None or trace.started_at >= since) and
+                   (thread_name is None or trace.thread_name == thread_name)]
+        if limit is not None:
+            results = results[max(len(results) - limit, 0):]
+        return results
+
+    def clear(self) -> None:
+        """
+        記録したトレースを消去する
+        """
+        with self.__lock:
+            self.__traces.clear()
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__traces)
@@ -0,0 +1,219 @@
+"""
+manaba ページ URL 群
+
+同期クライアント (:class:`manaba.Manaba`) と非同期クライアント (:class:`manaba.aio.AsyncManaba`) で共通して使用します。
+"""
+from typing import Optional
+from urllib.parse import urlencode, urljoin
+
+
+def login_url(base_url: str) -> str:
+    """
+    ログインページの URL
+
+    Args:
+        base_url: manaba のベース URL
+
+    Returns:
+        str: ログインページの URL
+    """
+    return urljoin(base_url, "/ct/login")
+
+
+def courses_url(base_url: str) -> str:
+    """
+    参加しているコース一覧ページの URL
+
+    Args:
+        base_url: manaba のベース URL
+
+    Returns:
+        str: コース一覧ページの URL
+    """
+    return urljoin(base_url, "/ct/home_course")
+
+
+def courses_all_url(base_url: str) -> str:
+    """
+    参加しているすべてのコース一覧ページの URL
+
+    Args:
+        base_url: manaba のベース URL
+
+    Returns:
+        str: すべてのコース一覧ページの URL
+    """
+    return urljoin(base_url, "/ct/home_course_all")
+
+
+def course_url(base_url: str,
+               course_id: int,
+               suffix: str = "") -> str:
+    """
+    コースページの URL
+
+    Args:
+        base_url: manaba のベース URL
+        course_id: コース ID
+        suffix: コースページ以下のページを示すサフィックス (例えば "_report", "_report_123")
+
+    Returns:
+        str: コースページの URL
+    """
+    return urljoin(base_url, "/ct/course_" + str(course_id)) + suffix
+
+
+def querys_url(base_url: str,
+               course_id: int) -> str:
+    """
+    小テスト一覧ページの URL
+    """
+    return course_url(base_url, course_id, "_query")
+
+
+def query_url(base_url: str,
+              course_id: int,
+              query_id: int) -> str:
+    """
+    小テスト詳細ページの URL
+    """
+    return course_url(base_url, course_id, "_query_" + str(query_id))
+
+
+def drill_url(base_url: str,
+              course_id: int,
+              drill_id: int) -> str:
+    """
+    小テストドリル詳細ページの URL
+    """
+    return course_url(base_url, course_id, "_drill_" + str(drill_id))
+
+
+def surveys_url(base_url: str,
+                course_id: int) -> str:
+    """
+    アンケート一覧ページの URL
+    """
+    return course_url(base_url, course_id, "_survey")
+
+
+def survey_url(base_url: str,
+               course_id: int,
+               survey_id: int) -> str:
+    """
+    アンケート詳細ページの URL
+    """
+    return course_url(base_url, course_id, "_survey_" + str(survey_id))
+
+
+def reports_url(base_url: str,
+                course_id: int) -> str:
+    """
+    レポート一覧ページの URL
+    """
+    return course_url(base_url, course_id, "_report")
+
+
+def report_url(base_url: str,
+               course_id: int,
+               report_id: int) -> str:
+    """
+    レポート詳細ページの URL
+    """
+    return course_url(base_url, course_id, "_report_" + str(report_id))
+
+
+def threads_url(base_url: str,
+                course_id: int) -> str:
+    """
+    スレッド一覧ページの URL
+    """
+    return course_url(base_url, course_id, "_topics")
+
+
+def thread_url(base_url: str,
+               course_id: int,
+               thread_id: int,
+               start_id: Optional[int] = None,
+               page_len: int = 10000) -> str:
+    """
+    スレッド詳細ページ (フラット表示) の URL
+
+    Args:
+        base_url: manaba のベース URL
+        course_id: コース ID
+        thread_id: スレッド ID
+        start_id: 直近から何番目から取得するか (指定しない場合はすべて)
+        page_len: 1 ページで最大何件コメント取得するか
+
+    Returns:
+        str: スレッド詳細ページの URL
+    """
+    params = {
+        "pagelen": page_len
+    }
+    if start_id is not None:
+        params["start_id"] = start_id
+
+    return course_url(base_url, course_id, "_topics_" + str(thread_id) + "_tflat?" + urlencode(params))
+
+
+def news_list_url(base_url: str,
+                  course_id: int,
+                  start_id: Optional[int] = None,
+                  page_len: int = 10000) -> str:
+    """
+    コースニュース一覧ページの URL
+
+    Args:
+        base_url: manaba のベース URL
+        course_id: コース ID
+        start_id: 直近から何番目から取得するか (指定しない場合はすべて)
+        page_len: 1 ページで最大何件取得するか
+
+    Returns:
+        str: コースニュース一覧ページの URL
+    """
+    params = {
+        "pagelen": page_len
+    }
+    if start_id is not None:
+        params["start_id"] = start_id
+
+    return course_url(base_url, course_id, "_news?" + urlencode(params))
+
+
+def news_url(base_url: str,
+             course_id: int,
+             news_id: int) -> str:
+    """
+    コースニュース詳細ページの URL
+    """
+    return course_url(base_url, course_id, "_news_" + str(news_id))
+
+
+def contents_url(base_url: str,
+                 course_id: int) -> str:
+    """
+    コンテンツ一覧ページの URL
+    """
+    return course_url(base_url, course_id, "_page")
+
+
+def content_url(base_url: str,
+                content_id: str,
+                page_id: Optional[int] = None) -> str:
+    """
+    コンテンツページの URL
+
+    Args:
+        base_url: manaba のベース URL
+        content_id: コンテンツ ID
+        page_id: コンテンツページ ID (指定しない場合はコンテンツのトップページ)
+
+    Returns:
+        str: コンテンツページの URL
+    """
+    if page_id is None:
+        return urljoin(base_url, "/ct/page_" + str(content_id))
+    return urljoin(base_url, "/ct/page_" + str(content_id) + "_" + str(page_id))
@@ -5,6 +5,10 @@ setuptools.setup(
     version='2.3.3',
     packages=setuptools.find_packages(),
     install_requires=["beautifulsoup4", "requests", "html5lib"],
+    extras_require={
+        "lxml": ["lxml"],
+        "async": ["aiohttp"],
+    },
     url='https://github.com/book000/get-manaba',
     license='MIT',
     author='Tomachi',